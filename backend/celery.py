@@ -1,3 +1,17 @@
+"""
+Colas:
+    celery          orquestación (procesar_consulta*, finalizar_consulta). En modo
+                    local (BOT_EJECUCION=local) aquí corren también los bots.
+    bots_navegador  grupos de bots Playwright, reintentar_bot y renovar_sesiones → dimensionar por memoria
+    bots_http       grupos de bots HTTP puros (aiohttp/httpx) → alta concurrencia
+    reportes        generación de consolidados (WeasyPrint)
+
+Ejemplo de workers:
+    celery -A backend worker -Q celery -c 4 -n orquestador@%h
+    celery -A backend worker -Q bots_navegador -c 2 --max-memory-per-child=3000000 -n navegador@%h
+    celery -A backend worker -Q bots_http -c 8 -n http@%h
+    celery -A backend worker -Q reportes -c 2 -n reportes@%h
+"""
 import os
 from celery import Celery
 
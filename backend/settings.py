@@ -30,6 +30,17 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'America/Bogota'
+CELERY_IMPORTS = ('core.task',)  # las tasks viven en core/task.py (autodiscover busca tasks.py)
+
+# Colas por clase de trabajo (ver backend/celery.py para lanzar cada worker).
+# Los grupos de bots (ejecutar_grupo_bots) se envían a bots_navegador / bots_http
+# explícitamente según la clase de recurso de cada bot.
+CELERY_TASK_DEFAULT_QUEUE = 'celery'
+CELERY_TASK_ROUTES = {
+    'core.task.reintentar_bot': {'queue': 'bots_navegador'},
+    'core.task.renovar_sesiones': {'queue': 'bots_navegador'},
+    'core.task.generar_consolidado_task': {'queue': 'reportes'},
+}
 
 from decouple import config, Csv
 
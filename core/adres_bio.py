@@ -1,8 +1,10 @@
 # core/fallbacks/adres_bio.py
-import os, re, tempfile
+import re
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
 from core.resolver.captcha_img2 import resolver_captcha_imagen
+from core.resolver.ocr_local import resolver_captcha_local, reportar_captcha
+from core.resolver.telemetria import en_fuente, reintentos_captcha
 
 URL = "https://aplicaciones.adres.gov.co/bdua_internet/Pages/ConsultarAfiliadoWeb.aspx"
 TIPO_DOC_MAP = {
@@ -13,12 +15,13 @@ TIPO_DOC_MAP = {
 async def consultar_adres_bio(cedula: str, tipo_doc):
     """Lee ADRES y retorna info biográfica en dict. NO guarda en BD."""
     tipo_val = TIPO_DOC_MAP.get((tipo_doc or "CC").upper(), "CC")
-    tmpdir = tempfile.gettempdir()
-    max_intentos = 10
+    # Mismo captcha que el bot adres: anota y lee la misma tasa de aceptación
+    en_fuente("adres")
+    max_intentos = await reintentos_captcha(10)
 
     async with async_playwright() as p:
-        # Ojo: headless=False para imitar el flujo que ya te funciona con captcha
-        browser = await p.chromium.launch(headless=False)
+        # Headless con perfil sigiloso (ver obtener_datos_candidato en core/task.py)
+        browser = await p.chromium.launch(headless=True)
         page = await browser.new_page()
         await page.goto(URL)
 
@@ -30,13 +33,8 @@ async def consultar_adres_bio(cedula: str, tipo_doc):
 
         # === bucle captcha idéntico al patrón que te funciona ===
         for intento in range(1, max_intentos + 1):
-            cap_path = os.path.join(tmpdir, f"captcha_adres_{cedula}.png")
-            await page.locator('img#Capcha_CaptchaImageUP').screenshot(path=cap_path)
-            captcha_texto = await resolver_captcha_imagen(cap_path)
-            try:
-                os.remove(cap_path)
-            except Exception:
-                pass
+            captcha_png = await page.locator('img#Capcha_CaptchaImageUP').screenshot()
+            captcha_texto = await resolver_captcha_local(captcha_png, "adres", remoto=resolver_captcha_imagen)
 
             try:
                 async with page.expect_popup() as popup_info:
@@ -53,12 +51,14 @@ async def consultar_adres_bio(cedula: str, tipo_doc):
             if await pagina_resultado.locator('span#Capcha_ctl00').is_visible():
                 txt = (await pagina_resultado.locator('span#Capcha_ctl00').inner_text()).strip().lower()
                 if "no es valido" in txt:
+                    reportar_captcha(aceptado=False)
                     try:
                         if pagina_resultado is not page:
                             await pagina_resultado.close()
                     except Exception:
                         pass
                     continue
+            reportar_captcha(aceptado=True)
             break  # salió bien
 
         # === ¿No afiliado? ===
@@ -1,12 +1,16 @@
 import os
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
+from core.utils.warm_pages import pagina_caliente, registrar_pagina_caliente
 from django.conf import settings
 from asgiref.sync import sync_to_async
 import traceback
 
 from core.models import Consulta, Resultado, Fuente
 from core.resolver.captcha_img import resolver_captcha_imagen
+from core.resolver.ocr_local import resolver_captcha_local, reportar_captcha
+from core.resolver.telemetria import reintentos_captcha
 
 url = "https://www.adres.gov.co/consulte-su-eps"
 nombre_sitio = "adres"
@@ -192,8 +196,24 @@ async def _extraer_mensaje_y_score(pagina):
 #                     BOT PRINCIPAL ADRES
 # ====================================================================
 
+# ====================================================================
+#        PÁGINA CALIENTE (core/utils/warm_pages.py): iframe BDUA cargado
+# ====================================================================
+
+async def _preparar_caliente(contexto):
+    pagina = await contexto.new_page()
+    await pagina.goto(url, wait_until="networkidle")
+    return pagina if await _formulario_listo(pagina) else None
+
+async def _formulario_listo(pagina):
+    form_ctx = await get_iframe_form(pagina) or pagina
+    return await localizar_input_num(form_ctx) is not None
+
+registrar_pagina_caliente(nombre_sitio, preparar=_preparar_caliente, listo=_formulario_listo)
+
+
 async def consultar_adres(consulta_id: int, cedula: str, tipo_doc: str):
-    max_intentos = 10
+    max_intentos = await reintentos_captcha(10)
 
     try:
         await sync_to_async(Consulta.objects.get)(id=consulta_id)
@@ -210,10 +230,10 @@ async def consultar_adres(consulta_id: int, cedula: str, tipo_doc: str):
 
         async with async_playwright() as p:
             navegador = await p.chromium.launch(headless=headless_flag, slow_mo=slow_mo)
-            contexto = await navegador.new_context()
-            pagina = await contexto.new_page()
-
-            await pagina.goto(url, wait_until="networkidle")
+            contexto, pagina = await pagina_caliente(navegador, nombre_sitio)
+            if pagina is None:
+                pagina = await contexto.new_page()
+                await pagina.goto(url, wait_until="networkidle")
 
             # ───── Obtener iframe del formulario ─────
             form_ctx = await get_iframe_form(pagina)
@@ -255,7 +275,7 @@ async def consultar_adres(consulta_id: int, cedula: str, tipo_doc: str):
                 else:
                     await form_ctx.screenshot(path=captcha_path)
 
-                captcha_text = await resolver_captcha_imagen(captcha_path)
+                captcha_text = await resolver_captcha_local(captcha_path, "adres", remoto=resolver_captcha_imagen)
 
                 if not captcha_text:
                     await form_ctx.wait_for_timeout(1200)
@@ -272,13 +292,16 @@ async def consultar_adres(consulta_id: int, cedula: str, tipo_doc: str):
                         await form_ctx.click('input#btnConsultar')
                     pagina_resultado = await pop.value
                     await pagina_resultado.wait_for_load_state("networkidle")
+                    reportar_captcha(aceptado=True)
                     break
                 except:
                     # si no hubo popup, revisar páginas
                     pages = contexto.pages
                     if len(pages) > 1:
                         pagina_resultado = pages[-1]
+                        reportar_captcha(aceptado=True)
                         break
+                    reportar_captcha(aceptado=False)
 
             if pagina_resultado is None:
                 pagina_resultado = pagina
@@ -305,7 +328,7 @@ async def consultar_adres(consulta_id: int, cedula: str, tipo_doc: str):
                 # tomar screenshot más ligera cuando se pida (full_page puede ser lento)
                 full_page_flag = not os.environ.get('DISABLE_SCREENSHOT_FULLPAGE', '').lower() in ['1','true','yes']
                 if full_page_flag:
-                    await pagina_resultado.screenshot(path=img_path, full_page=True)
+                    await captura_completa(pagina_resultado, img_path, full_page=True)
                 else:
                     await pagina_resultado.screenshot(path=img_path, full_page=False)
             except:
@@ -3,7 +3,8 @@ import re
 from datetime import datetime
 from typing import Optional, Tuple
 
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 
@@ -169,7 +170,7 @@ async def consultar_adres_transito(consulta_id: int, cedula: str):
             absolute_path = os.path.join(absolute_folder, screenshot_name)
             relative_path = os.path.join(relative_folder, screenshot_name)
 
-            await pagina.screenshot(path=absolute_path, full_page=True)
+            await captura_completa(pagina, absolute_path, full_page=True)
             await navegador.close()
 
         # Fallback si no encontramos el ancla/mensaje
@@ -199,7 +200,7 @@ async def consultar_adres_transito(consulta_id: int, cedula: str):
                 screenshot_name = f"ERROR_{nombre_sitio}_{cedula}_{timestamp}.png"
                 absolute_path = os.path.join(absolute_folder, screenshot_name)
                 relative_path = os.path.join(relative_folder, screenshot_name)
-                await pagina.screenshot(path=absolute_path, full_page=True)
+                await captura_completa(pagina, absolute_path, full_page=True)
             else:
                 relative_path = ""
         except Exception:
@@ -6,7 +6,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -98,7 +99,7 @@ async def consultar_afdb(consulta_id: int, nombre: str, apellido: str):
                     await page.evaluate("window.scrollTo(0, 0)")
                 except Exception:
                     pass
-                await page.screenshot(path=abs_png, full_page=True)
+                await captura_completa(page, abs_png, full_page=True)
 
                 await sync_to_async(Resultado.objects.create)(
                     consulta_id=consulta_id, fuente=fuente, score=score,
@@ -153,7 +154,7 @@ async def consultar_afdb(consulta_id: int, nombre: str, apellido: str):
                 await page.evaluate("window.scrollTo(0, 0)")
             except Exception:
                 pass
-            await page.screenshot(path=abs_png, full_page=True)
+            await captura_completa(page, abs_png, full_page=True)
 
             await sync_to_async(Resultado.objects.create)(
                 consulta_id=consulta_id, fuente=fuente, score=score,
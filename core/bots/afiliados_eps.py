@@ -4,7 +4,9 @@ import traceback
 from datetime import datetime
 from typing import Optional
 
-from playwright.async_api import async_playwright, Page, Dialog, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import Page, Dialog, TimeoutError as PlaywrightTimeoutError
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 
@@ -264,7 +266,7 @@ async def consultar_afiliados_eps(consulta_id: int, cedula: str, tipo_doc: str):
                 except Exception:
                     pass
                 try:
-                    await page.screenshot(path=abs_png, full_page=True)
+                    await captura_completa(page, abs_png, full_page=True)
                 except Exception:
                     pass
                 await _crear_resultado("Sin Validar", rel_png, "No se pudo pulsar el botón Consultar (evidencia guardada).", fuente, score=0)
@@ -292,7 +294,7 @@ async def consultar_afiliados_eps(consulta_id: int, cedula: str, tipo_doc: str):
 
             # tomar screenshot de la página (después de aceptar la alerta nativa)
             try:
-                await page.screenshot(path=abs_png, full_page=True)
+                await captura_completa(page, abs_png, full_page=True)
             except Exception:
                 try:
                     await page.screenshot(path=abs_png)
@@ -4,7 +4,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -100,7 +101,7 @@ async def consultar_apgml_search(consulta_id: int, nombre: str, apellido: str):
                     if h2_text.lower().startswith("0 search results"):
                         mensaje_final = h2_text  # usar exactamente el texto mostrado
                         try:
-                            await page.screenshot(path=absolute_png, full_page=True)
+                            await captura_completa(page, absolute_png, full_page=True)
                         except Exception:
                             pass
                         success = True
@@ -128,7 +129,7 @@ async def consultar_apgml_search(consulta_id: int, nombre: str, apellido: str):
                             mensaje_final = "Se encontraron resultados, pero sin coincidencia exacta del nombre."
 
                         try:
-                            await page.screenshot(path=absolute_png, full_page=True)
+                            await captura_completa(page, absolute_png, full_page=True)
                         except Exception:
                             pass
                         success = True
@@ -156,7 +157,7 @@ async def consultar_apgml_search(consulta_id: int, nombre: str, apellido: str):
                             score_final = 1
                             mensaje_final = "Se encontraron resultados, pero sin coincidencia exacta del nombre."
                     try:
-                        await page.screenshot(path=absolute_png, full_page=True)
+                        await captura_completa(page, absolute_png, full_page=True)
                     except Exception:
                         pass
                     success = True
@@ -2,7 +2,8 @@
 import os
 import re
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 
@@ -176,7 +177,7 @@ async def consultar_atf_noticias(consulta_id: int, nombre: str):
                 except Exception:
                     continue
             if not tomado:
-                await pagina.screenshot(path=absolute_path, full_page=True, type="png")
+                await captura_completa(pagina, absolute_path, full_page=True)
 
             await ctx.close()
             await navegador.close()
@@ -1,7 +1,8 @@
 # core/bots/atf_recompensas.py
 import os, re
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -108,7 +109,7 @@ async def consultar_atf_recompensas(consulta_id: int, nombre: str):
 
             if not tomado:
                 # Fallback: toda la página
-                await pagina.screenshot(path=abs_path, full_page=True, type="png")
+                await captura_completa(pagina, abs_path, full_page=True)
 
             # --- detectar mensaje / conteo de resultados ---
             mensaje = ""
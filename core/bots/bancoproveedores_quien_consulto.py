@@ -4,7 +4,9 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright, TimeoutError as PWTimeout
+from playwright.async_api import TimeoutError as PWTimeout
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 from core.resolver.captcha_v2 import resolver_captcha_v2
@@ -209,7 +211,7 @@ async def consultar_quien_consulto(consulta_id: int, numero: str, tipo_doc: str)
 
             # --- 7) Evidencia ---
             await page.wait_for_timeout(500)
-            await page.screenshot(path=abs_png, full_page=True)
+            await captura_completa(page, abs_png, full_page=True)
 
             await context.close()
             await browser.close()
@@ -223,7 +225,7 @@ async def consultar_quien_consulto(consulta_id: int, numero: str, tipo_doc: str)
         try:
             if page:
                 try:
-                    await page.screenshot(path=abs_png, full_page=True)
+                    await captura_completa(page, abs_png, full_page=True)
                 except Exception:
                     pass
         except Exception:
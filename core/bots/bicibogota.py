@@ -1,7 +1,8 @@
 # core/bots/bicibogota.py
 import os
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 
@@ -98,7 +99,7 @@ async def consultar_bicibogota(consulta_id: int, cedula: str, tipo_doc: str):
                     if status == 403:
                         debug_path = os.path.join(settings.MEDIA_ROOT, relative_folder, f"{nombre_sitio}_{cedula}_403_{timestamp}.png")
                         try:
-                            await pagina.screenshot(path=debug_path, full_page=True)
+                            await captura_completa(pagina, debug_path, full_page=True)
                         except Exception:
                             pass
                         # intentar fallback lanzando chrome por canal del sistema con flags más permisivos
@@ -146,7 +147,7 @@ async def consultar_bicibogota(consulta_id: int, cedula: str, tipo_doc: str):
                     # tomar screenshot de depuración
                     debug_path = os.path.join(absolute_folder, f"{nombre_sitio}_{cedula}_no_selector_{timestamp}.png")
                     try:
-                        await pagina.screenshot(path=debug_path, full_page=True)
+                        await captura_completa(pagina, debug_path, full_page=True)
                     except Exception:
                         pass
 
@@ -208,7 +209,7 @@ async def consultar_bicibogota(consulta_id: int, cedula: str, tipo_doc: str):
                 try:
                     await pagina.screenshot(path=absolute_path, full_page=False)
                 except Exception:
-                    await pagina.screenshot(path=absolute_path, full_page=True)
+                    await captura_completa(pagina, absolute_path, full_page=True)
 
         finally:
             if navegador:
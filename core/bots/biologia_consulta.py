@@ -5,7 +5,8 @@ import asyncio
 from datetime import datetime
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from core.models import Resultado, Fuente
 
 NOMBRE_SITIO = "biologia_consulta"
@@ -71,7 +72,7 @@ async def consultar_biologia_consulta(consulta_id: int, cedula: str):
             await asyncio.sleep(3)
 
             # Screenshot
-            await page.screenshot(path=abs_png, full_page=True)
+            await captura_completa(page, abs_png, full_page=True)
 
             await ctx.close()
             await browser.close()
@@ -2,7 +2,8 @@
 import os, re, asyncio
 from datetime import datetime
 from urllib.parse import urlencode
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -123,7 +124,7 @@ async def consultar_bis_dpl_legacy_pdf(consulta_id: int, cedula: str):
                 if _is_block_page(html):
                     # Dejar evidencia
                     try:
-                        await page.screenshot(path=out_png_abs, full_page=True)
+                        await captura_completa(page, out_png_abs, full_page=True)
                         screenshot_on_error = out_png_rel
                     except Exception:
                         pass
@@ -164,7 +165,7 @@ async def consultar_bis_dpl_legacy_pdf(consulta_id: int, cedula: str):
 
             # Screenshot de la página de resultados como evidencia rápida
             try:
-                await page.screenshot(path=out_png_abs, full_page=True)
+                await captura_completa(page, out_png_abs, full_page=True)
                 screenshot_on_error = out_png_rel
             except Exception:
                 pass
@@ -188,7 +189,7 @@ async def consultar_bis_dpl_legacy_pdf(consulta_id: int, cedula: str):
                 html = await page.content()
                 if _is_block_page(html):
                     try:
-                        await page.screenshot(path=out_png_abs, full_page=True)
+                        await captura_completa(page, out_png_abs, full_page=True)
                         screenshot_on_error = out_png_rel
                     except Exception:
                         pass
@@ -232,7 +233,7 @@ async def consultar_bis_dpl_legacy_pdf(consulta_id: int, cedula: str):
             if not png_ok:
                 # Fallback: screenshot de la página
                 try:
-                    await page.screenshot(path=out_png_abs, full_page=True)
+                    await captura_completa(page, out_png_abs, full_page=True)
                 except Exception:
                     pass
 
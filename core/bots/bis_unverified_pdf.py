@@ -2,7 +2,8 @@
 import os, re, unicodedata
 from datetime import datetime
 from urllib.parse import urlencode
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -135,7 +136,7 @@ async def consultar_bis_unverified_pdf(consulta_id: int, nombre: str):
 
             # Evidencia
             try:
-                await page.screenshot(path=out_png_abs, full_page=True)
+                await captura_completa(page, out_png_abs, full_page=True)
             except Exception:
                 pass
 
@@ -3,7 +3,8 @@ import os
 import re
 import unicodedata
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Fuente, Resultado
@@ -59,7 +60,7 @@ async def consultar_boletin_fiscalia(cedula: str, consulta_id: int, nombre: str)
             if await bloque.count() > 0:
                 await bloque.first.screenshot(path=absolute_path)
             else:
-                await pagina.screenshot(path=absolute_path, full_page=True)
+                await captura_completa(pagina, absolute_path, full_page=True)
 
             # ---------- lógica de resultados ----------
             # 0) "No hay resultados"
@@ -3,7 +3,8 @@ import os
 import re
 import unicodedata
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 
@@ -53,7 +54,7 @@ async def consultar_boletin_policia(cedula: str, consulta_id: int, nombre: str):
             if await cont.count() > 0:
                 await cont.first.screenshot(path=absolute_path)
             else:
-                await pagina.screenshot(path=absolute_path, full_page=True)
+                await captura_completa(pagina, absolute_path, full_page=True)
 
             # contar filas (cada resultado es .views-row)
             total_rows = 0
@@ -4,12 +4,14 @@ import re
 import unicodedata
 import asyncio
 import random
-import json
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional
 from urllib.parse import quote_plus, urlparse
 
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from playwright.async_api import Browser, BrowserContext, Page
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
+from core.utils.rotation import elegir_salida, reportar_salida, lista_env
 from django.conf import settings
 from asgiref.sync import sync_to_async
 
@@ -20,29 +22,9 @@ NOMBRE_SITIO = "boletin_procuraduria"
 # Configuración por defecto (puedes sobreescribir con variables de entorno)
 MAX_ATTEMPTS = int(os.getenv("BOLETIN_MAX_ATTEMPTS", "3"))
 HEADLESS_DEFAULT = os.getenv("BOLETIN_HEADLESS", "true").lower() == "true"
-PROXY_LIST_ENV = os.getenv("BOLETIN_PROXY_LIST")  # CSV or JSON array
-UA_LIST_ENV = os.getenv("BOLETIN_UA_LIST")  # CSV or JSON array
-
-
-def _parse_list_env(value: Optional[str]) -> List[str]:
-    if not value:
-        return []
-    value = value.strip()
-    try:
-        parsed = json.loads(value)
-        if isinstance(parsed, list):
-            return [str(x) for x in parsed if x]
-    except Exception:
-        pass
-    return [p.strip() for p in value.split(",") if p.strip()]
-
-
-def _default_user_agents() -> List[str]:
-    return [
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Safari/605.1.15",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0",
-    ]
+# Proxies/UAs propios (JSON o CSV); vacíos → ROTACION_PROXIES / ROTACION_UAS (core/utils/rotation.py)
+PROXY_LIST_ENV = os.getenv("BOLETIN_PROXY_LIST")
+UA_LIST_ENV = os.getenv("BOLETIN_UA_LIST")
 
 
 def _norm(s: str) -> str:
@@ -96,7 +78,7 @@ def _is_unavailable_text(text: str) -> bool:
 async def _save_screenshot(page: Optional[Page], absolute_path: str):
     try:
         if page:
-            await page.screenshot(path=absolute_path, full_page=True)
+            await captura_completa(page, absolute_path, full_page=True)
             return
     except Exception:
         pass
@@ -112,7 +94,7 @@ async def _save_screenshot(page: Optional[Page], absolute_path: str):
         pass
 
 
-async def _create_browser_context(p: Browser, ua: str, proxy: Optional[str], storage_state: Optional[str]) -> BrowserContext:
+async def _create_browser_context(p: Browser, ua: str, storage_state: Optional[str]) -> BrowserContext:
     context_kwargs = {
         "viewport": {"width": 1366, "height": 768},
         "user_agent": ua,
@@ -141,13 +123,13 @@ async def consultar_boletin_procuraduria(nombre: str, consulta_id: int, cedula:
     """
     Bot para buscar en el buscador de la Procuraduría.
     Firma: (nombre, consulta_id, cedula, headless=True/False)
-    - Detecta HTTP status (403) y reintenta con rotación de UA/proxy.
+    - Detecta HTTP status (403) y reintenta con otro UA/proxy (elegidos por salud, core/utils/rotation.py).
     - Guarda solo screenshot final en resultados/<consulta_id>/.
     - No guarda HTML.
     """
     headless = HEADLESS_DEFAULT if headless is None else bool(headless)
-    ua_list = _parse_list_env(UA_LIST_ENV) or _default_user_agents()
-    proxy_list = _parse_list_env(PROXY_LIST_ENV)
+    ua_list = lista_env(UA_LIST_ENV)
+    proxy_list = lista_env(PROXY_LIST_ENV)
 
     nombre = (nombre or "").strip()
     cedula = (cedula or "").strip()
@@ -179,8 +161,8 @@ async def consultar_boletin_procuraduria(nombre: str, consulta_id: int, cedula:
 
     while attempt < MAX_ATTEMPTS:
         attempt += 1
-        ua = random.choice(ua_list)
-        proxy = random.choice(proxy_list) if proxy_list else None
+        salida = await elegir_salida(NOMBRE_SITIO, proxies=proxy_list, uas=ua_list)
+        ua = salida["ua"]
 
         browser: Optional[Browser] = None
         context: Optional[BrowserContext] = None
@@ -189,14 +171,13 @@ async def consultar_boletin_procuraduria(nombre: str, consulta_id: int, cedula:
         try:
             async with async_playwright() as p:
                 launch_kwargs = {"headless": headless, "args": ["--no-sandbox", "--disable-blink-features=AutomationControlled"]}
-                if proxy:
-                    # Playwright expects proxy as dict on launch
-                    launch_kwargs["proxy"] = {"server": proxy}
+                if salida["proxy_pw"]:
+                    launch_kwargs["proxy"] = salida["proxy_pw"]
                 browser = await p.chromium.launch(**launch_kwargs)
 
                 # create context (storage_state not used here by default)
                 storage_state = os.getenv("BOLETIN_STORAGE_STATE")  # optional path
-                context = await _create_browser_context(browser, ua, proxy, storage_state)
+                context = await _create_browser_context(browser, ua, storage_state)
                 page = await context.new_page()
                 page.set_default_navigation_timeout(60000)
                 page.set_default_timeout(30000)
@@ -247,6 +228,7 @@ async def consultar_boletin_procuraduria(nombre: str, consulta_id: int, cedula:
 
                     # si recibimos 403 o detectamos texto de indisponibilidad, tomar evidencia y decidir reintento
                     if status == 403 or _is_unavailable_text(body_text):
+                        await reportar_salida(salida, ok=False)
                         png_name = f"{NOMBRE_SITIO}_{cedula}_attempt{attempt}_url{attempt_url}_{ts_base}.png"
                         abs_png = os.path.join(absolute_folder, png_name)
                         await _save_screenshot(page, abs_png)
@@ -308,6 +290,7 @@ async def consultar_boletin_procuraduria(nombre: str, consulta_id: int, cedula:
                         if coincidencias == 0 and cedula:
                             coincidencias = _norm(result_text).count(_norm(cedula))
 
+                    await reportar_salida(salida, ok=True)
                     score = _score_por_coincidencias(coincidencias)
                     mensaje = "se encontraron hallazgos" if coincidencias > 0 else "no se encontraron hallazgos"
                     estado = "Validada"
@@ -327,6 +310,7 @@ async def consultar_boletin_procuraduria(nombre: str, consulta_id: int, cedula:
 
         except Exception as e:
             last_exception = e
+            await reportar_salida(salida, ok=False)
             # intentar guardar captura de excepción si hay page/context
             try:
                 if page:
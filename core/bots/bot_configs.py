@@ -433,6 +433,8 @@ def get_bot_configs(consulta_id, datos):
          },
          {
              'name':'estado_cedula',
+             # Solo descarga el certificado: sin evidencia visual, no necesita fuentes
+             'red': {"bloquear": ["font"]},
              'func': consultar_estado_cedula,
                 'kwargs': {
                    'consulta_id': consulta_id,   # el id de la consulta en tu BD
@@ -491,6 +493,7 @@ def get_bot_configs(consulta_id, datos):
          {
              'name':'garantias_mobiliarias_nooficial',
              'func': consultar_garantias_mobiliarias_nooficial,
+             'sigilo': True,
                 'kwargs': {
                     'consulta_id':consulta_id,
                     'nombre':f"{datos.get('nombre', '')} {datos.get('apellido', '')}".strip(),
@@ -574,6 +577,7 @@ def get_bot_configs(consulta_id, datos):
         },
          {
              'name':'mas_buscados_policia_colombia',
+             'har': False,  # descarga con page.request (no pasa por context.route)
              'func': consultar_mas_buscados_policia_colombia,
                 'kwargs': {
                    'consulta_id': consulta_id,
@@ -585,6 +589,7 @@ def get_bot_configs(consulta_id, datos):
         {
             'name':'medical_devices',
             'func': consultar_medical_devices,
+            'sigilo': True,
             'kwargs': {
        'consulta_id': consulta_id,
                 'nombre_empresa': empresa
@@ -611,6 +616,7 @@ def get_bot_configs(consulta_id, datos):
         {
             'name':'ofac',
             'func': consultar_ofac_pdf,
+            'recurso': 'http',
             'kwargs': {
                 'consulta_id': consulta_id,
                 'nombre': f"{datos.get('nombre', '')} {datos.get('apellido', '')}".strip(),
@@ -675,6 +681,7 @@ def get_bot_configs(consulta_id, datos):
         },
         {
             'name':'registro_civil',
+            'har': False,  # descarga con page.request (no pasa por context.route)
             'func': consultar_registro_civil,
             'kwargs': {
        'consulta_id': consulta_id,
@@ -902,6 +909,7 @@ def get_bot_configs(consulta_id, datos):
         {
             'name':"state_designation_cartels",
             'func': consultar_state_designation_cartels_pdf,
+            'recurso': 'http',
             'kwargs': {
        'consulta_id': consulta_id,
                 'cedula': datos['cedula'],
@@ -948,6 +956,7 @@ def get_bot_configs(consulta_id, datos):
         {
             'name':'supersociedades_boletines_conceptos',
             "func": consultar_supersociedades_boletines,
+            "sigilo": True,
             "kwargs": {
                 "consulta_id": consulta_id,
                 "nombre": datos["nombre"],
@@ -993,6 +1002,7 @@ def get_bot_configs(consulta_id, datos):
         {
             'name':'ramajudicial_corte_constitucional_magistrados_anteriores',
             "func": consultar_ramajudicial_corte_constitucional_magistrados_anteriores,
+            "sigilo": True,
             "kwargs": {
                 "consulta_id": consulta_id,
                 "nombre": datos["nombre"],
@@ -1020,6 +1030,7 @@ def get_bot_configs(consulta_id, datos):
         {
             'name':'cgfm_mas_buscados',
             "func": consultar_cgfm_mas_buscados,
+            "sigilo": True,
             "kwargs": {
                 "consulta_id": consulta_id,
                 "nombre": datos["nombre"],
@@ -1326,6 +1337,7 @@ def get_bot_configs(consulta_id, datos):
         {
             "name": "moci_qatar_search",
             "func": consultar_moci_qatar_search,
+            "sigilo": True,
             "kwargs": {
                 "consulta_id": consulta_id,
                 "nombre": datos["nombre"],
@@ -1398,6 +1410,7 @@ def get_bot_configs(consulta_id, datos):
         {
             "name": "homeaffairs_search",
             "func": consultar_homeaffairs_search,
+            "sigilo": True,
             "kwargs": {
                 "consulta_id": consulta_id,
                 "nombre": datos["nombre"],
@@ -1416,6 +1429,7 @@ def get_bot_configs(consulta_id, datos):
         {
             "name": "mofa_bh_cte",
             "func": consultar_mofa_bh_cte,
+            "sigilo": True,
             "kwargs": {
                 "consulta_id": consulta_id,
                 "nombre": datos["nombre"],
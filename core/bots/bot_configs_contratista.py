@@ -64,6 +64,7 @@ def get_bot_configs_contratista(consulta_id, datos):
         {
             'name': 'sideap_comprobante',
             'func': consultar_sideap_comprobante,
+            'sigilo': True,
             'kwargs': {
                 'consulta_id': consulta_id,
                 'numero': datos['cedula'],
@@ -475,6 +476,8 @@ def get_bot_configs_contratista(consulta_id, datos):
         },
         {
             'name':'rama_vigencias',
+            # Solo descarga el PDF: sin captura ni captcha, no necesita imágenes ni fuentes
+            'red': {"bloquear": ["image", "font"]},
             'func': consultar_rama_vigencias_pdf,
             'kwargs': {
                 'consulta_id': consulta_id,
@@ -3,7 +3,7 @@ import os
 import re
 import zipfile
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
 from django.conf import settings
 from asgiref.sync import sync_to_async
 
@@ -6,14 +6,17 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 from core.resolver.captcha_v2 import resolver_captcha_v2  # tu helper (capsolver)
+from core.resolver.token_pool import registrar_token
 
 NOMBRE_SITIO = "ccap_validate_identity"
 URL = "https://app.ccap.org.co/Account/ValidateIdentityCardCertificate"
 SITEKEY = "6LfDGawZAAAAAEVnlq41I8B7ZmzpyLv8Kvw830Tw"
+registrar_token(NOMBRE_SITIO, URL, SITEKEY)
 
 # Selectores
 SEL_INPUT_CC        = "#CommonFieldsGraduateDto_IdentityCard"
@@ -178,7 +181,7 @@ async def consultar_ccap_validate_identity(consulta_id: int, numero: str):
                 # Full page + mensaje textual de la fuente (callout)
                 await page.evaluate("window.scrollTo(0,0)")
                 await page.wait_for_timeout(400)
-                await page.screenshot(path=abs_png, full_page=True)
+                await captura_completa(page, abs_png, full_page=True)
                 try:
                     callout = page.locator(SEL_CALLOUT_INFO_P).first
                     if await callout.is_visible(timeout=3000):
@@ -216,7 +219,7 @@ async def consultar_ccap_validate_identity(consulta_id: int, numero: str):
                     f"{NOMBRE_SITIO}_{safe_num}_{ts}_error.png"
                 )
                 try:
-                    await pg.screenshot(path=err_png, full_page=True)
+                    await captura_completa(pg, err_png, full_page=True)
                 except Exception:
                     pass
         except Exception:
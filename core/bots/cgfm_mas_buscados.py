@@ -6,7 +6,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -208,7 +209,7 @@ async def consultar_cgfm_mas_buscados(
 
         async with async_playwright() as p:
             browser = await p.chromium.launch(
-                headless=False,  # estable y rápido
+                headless=True,
                 args=["--disable-dev-shm-usage"]
             )
             ctx = await browser.new_context(
@@ -256,7 +257,7 @@ async def consultar_cgfm_mas_buscados(
             except Exception:
                 pass
 
-            await page.screenshot(path=abs_png, full_page=True)
+            await captura_completa(page, abs_png, full_page=True)
 
             await ctx.close()
             await browser.close()
@@ -290,7 +291,7 @@ async def consultar_cgfm_mas_buscados(
                         emer_name = f"{NOMBRE_SITIO}_ERROR_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
                         emer_abs = os.path.join(absolute_folder, emer_name)
                         emer_rel = os.path.join(relative_folder, emer_name)
-                        await pages[0].screenshot(path=emer_abs, full_page=True)
+                        await captura_completa(pages[0], emer_abs, full_page=True)
                         await _guardar_resultado(
                             consulta_id=consulta_id,
                             fuente_obj=fuente_obj,
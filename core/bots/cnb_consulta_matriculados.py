@@ -6,7 +6,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -173,7 +174,7 @@ async def consultar_cnb_consulta_matriculados(
                 pass
 
             # 9) Screenshot (página completa para capturar el iframe y mensajes)
-            await page.screenshot(path=abs_png, full_page=True)
+            await captura_completa(page, abs_png, full_page=True)
 
             await ctx.close()
             await browser.close()
@@ -6,7 +6,9 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+from playwright.async_api import TimeoutError as PlaywrightTimeout
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -181,7 +183,7 @@ async def consultar_cne_magistrados_busqueda_pdf(
                 score_final = 0
 
             # ===== GUARDAR IMAGEN EN LUGAR DE PDF =====
-            await page.screenshot(path=abs_png, full_page=True)
+            await captura_completa(page, abs_png, full_page=True)
 
             await ctx.close()
             await browser.close()
@@ -208,7 +210,7 @@ async def consultar_cne_magistrados_busqueda_pdf(
                     rel_error_png = os.path.join(relative_folder, error_png_name)
                     screenshot_path = rel_error_png
 
-                    await pages[0].screenshot(path=abs_error_png, full_page=True)
+                    await captura_completa(pages[0], abs_error_png, full_page=True)
             except Exception:
                 pass
             finally:
@@ -6,7 +6,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -141,7 +142,7 @@ async def consultar_colelectro_directorio(
             else:
                 # No se encontró: screenshot completo para evidencia
                 await asyncio.sleep(0.5)
-                await page.screenshot(path=abs_png, full_page=True)
+                await captura_completa(page, abs_png, full_page=True)
                 mensaje_res = f"No se encontró coincidencia para: '{buscado_simple or (nombre_simple or '') + ' ' + (apellido_simple or '')}'."
 
             await ctx.close()
@@ -7,7 +7,9 @@ from datetime import datetime, timedelta
 import fitz
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright, TimeoutError as PWTimeout
+from playwright.async_api import TimeoutError as PWTimeout
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -320,7 +322,7 @@ async def consultar_colombiacompra_procesos(
                     f"{NOMBRE_SITIO}_{safe_num}_{ts_shot}_{label}.png"
                 )
                 try:
-                    await page.screenshot(path=shot_path, full_page=True)
+                    await captura_completa(page, shot_path, full_page=True)
                     _dbg(consulta_id, f"Pantallazo [{label}] -> {shot_path}")
                 except Exception as ee:
                     _dbg(consulta_id, f"No se pudo tomar pantallazo [{label}]: {ee}")
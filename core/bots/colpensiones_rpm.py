@@ -7,7 +7,9 @@ from pathlib import Path
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright, TimeoutError as PWTimeout
+from playwright.async_api import TimeoutError as PWTimeout
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -270,10 +272,10 @@ async def consultar_colpensiones_rpm(consulta_id: int, cedula: str, tipo_doc: st
                         await embed.first.screenshot(path=abs_png)
                         png_ok = True
                     else:
-                        await page.screenshot(path=abs_png, full_page=True)
+                        await captura_completa(page, abs_png, full_page=True)
                         png_ok = True
                 except Exception:
-                    await page.screenshot(path=abs_png, full_page=True)
+                    await captura_completa(page, abs_png, full_page=True)
                     png_ok = True
 
             # 6) Texto y decisión
@@ -1,5 +1,5 @@
 import os
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Fuente, Resultado
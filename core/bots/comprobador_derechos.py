@@ -2,7 +2,7 @@
 import os
 from datetime import datetime
 from django.conf import settings
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
 from asgiref.sync import sync_to_async
 
 from core.models import Consulta, Resultado, Fuente
@@ -6,14 +6,16 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
 
 from core.models import Resultado, Fuente
 from core.resolver.captcha_v2 import resolver_captcha_v2
+from core.resolver.token_pool import registrar_token
 
 NOMBRE_SITIO = "conalpe_certificado"
 URL = "https://www.conalpe.gov.co/tramitesyservicios/certificado"
 SITEKEY = "6LfxFFMaAAAAADxENUTb-3ZiVBFbmb9gcsznZgg5"
+registrar_token(NOMBRE_SITIO, URL, SITEKEY)
 
 SEL_INPUT_DOC   = 'input[formcontrolname="id"]'
 SEL_BTN_SUBMIT  = "button[type='submit']:has-text('Solicitar')"   # <- importante
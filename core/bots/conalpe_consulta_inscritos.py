@@ -6,14 +6,17 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 from core.resolver.captcha_v2 import resolver_captcha_v2  # Capsolver
+from core.resolver.token_pool import registrar_token
 
 NOMBRE_SITIO = "conalpe_consulta_inscritos"
 URL = "https://www.conalpe.gov.co/tramitesyservicios/Consulta-Inscritos"
 SITEKEY = "6LfxFFMaAAAAADxENUTb-3ZiVBFbmb9gcsznZgg5"  # del iframe
+registrar_token(NOMBRE_SITIO, URL, SITEKEY)
 
 # Selectores
 SEL_INPUT_CEDULA = 'input[formcontrolname="id"]'
@@ -191,7 +194,7 @@ async def consultar_conalpe_consulta_inscritos(
                 pass
 
             # 7) Screenshot
-            await page.screenshot(path=abs_png, full_page=True)
+            await captura_completa(page, abs_png, full_page=True)
 
             await ctx.close()
             await browser.close()
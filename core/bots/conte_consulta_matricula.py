@@ -5,10 +5,11 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
 
 from core.models import Resultado, Fuente
 from core.resolver.captcha_v2 import resolver_captcha_v2  # tu helper
+from core.resolver.token_pool import registrar_token
 
 NOMBRE_SITIO = "conte_consulta_matricula"
 URL = "https://solicitudmatricula.conte.org.co:8080/consulta-matricula"
@@ -21,6 +22,7 @@ SEL_BTN_CONSULTAR   = "vaadin-button:has-text('Consultar')"
 
 # Sitekey reCAPTCHA (de la página)
 SITEKEY = "6LddT-ElAAAAAEJWK99x4Ni9hp7yup2APq8Dm1Pi"
+registrar_token(NOMBRE_SITIO, URL, SITEKEY)
 
 # Hints de resultados
 RESULT_HINTS = ["vaadin-grid", "[role='grid']", "table", ".resultado", ".result"]
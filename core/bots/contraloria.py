@@ -1,14 +1,15 @@
 ﻿# core/bots/contraloria_certificado.py
 import os
 import re
-import asyncio
 from datetime import datetime
 from pathlib import Path
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
-import aiohttp
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import evidencia_pdf
+from core.resolver.cliente import resolver as resolver_tarea
+from core.utils.har_replay import captcha_grabado
 
 from core.models import Resultado, Fuente
 
@@ -29,33 +30,14 @@ POPPLER_PATH = getattr(settings, "POPPLER_PATH", os.getenv("POPPLER_PATH"))  # e
 TESSERACT_CMD = getattr(settings, "TESSERACT_CMD", os.getenv("TESSERACT_CMD"))  # ej: r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
 # ---------------- CAPTCHA ----------------
+@captcha_grabado
 async def _resolver_captcha_cappy():
-    create_url = "https://api.capsolver.com/createTask"
-    result_url = "https://api.capsolver.com/getTaskResult"
-    async with aiohttp.ClientSession() as session:
-        payload = {
-            "clientKey": CAPSOLVER_API_KEY,
-            "task": {
-                "type": "ReCaptchaV2TaskProxyLess",
-                "websiteURL": PAGE_URL,
-                "websiteKey": SITE_KEY
-            }
-        }
-        async with session.post(create_url, json=payload) as resp:
-            task_response = await resp.json()
-        if "taskId" not in task_response:
-            raise RuntimeError(f"No se pudo crear la tarea CAPTCHA: {task_response}")
-        task_id = task_response["taskId"]
-
-        for _ in range(40):
-            await asyncio.sleep(2)
-            async with session.post(result_url, json={"clientKey": CAPSOLVER_API_KEY, "taskId": task_id}) as resp:
-                result = await resp.json()
-            if result.get("status") == "ready":
-                return result["solution"]["gRecaptchaResponse"]
-            if result.get("status") == "failed":
-                raise RuntimeError("Falló el CAPTCHA: " + result.get("errorDescription", "Sin detalle"))
-        raise RuntimeError("Timeout esperando respuesta del CAPTCHA")
+    # Cliente asyncio compartido (sesión y sondeo de getTaskResult comunes a todos los bots)
+    solucion = await resolver_tarea(
+        {"type": "ReCaptchaV2TaskProxyLess", "websiteURL": PAGE_URL, "websiteKey": SITE_KEY},
+        clave=CAPSOLVER_API_KEY,
+    )
+    return solucion["gRecaptchaResponse"]
 
 # --------------- UTILIDADES TEXTO/IMAGEN ---------------
 def _normalize(s: str) -> str:
@@ -91,20 +73,6 @@ def _texto_pdf_pymupdf(path: str) -> str:
     except Exception:
         return ""
 
-def _render_pdf_primera_pagina_pymupdf(path_pdf: str, path_png: str, zoom: float = 2.0) -> bool:
-    """Render limpio al estilo de tu segunda imagen (preferido)."""
-    try:
-        import fitz  # PyMuPDF
-        with fitz.open(path_pdf) as doc:
-            if doc.page_count == 0:
-                return False
-            pg = doc[0]
-            pix = pg.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
-            pix.save(path_png)
-        return os.path.exists(path_png) and os.path.getsize(path_png) > 0
-    except Exception:
-        return False
-
 def _render_pdf_primera_pagina_pdf2image(path_pdf: str, path_png: str, dpi: int = 300) -> bool:
     """Render con pdf2image (requiere Poppler)."""
     try:
@@ -155,9 +123,9 @@ def _decidir(texto: str) -> tuple[str, int]:
 async def consultar_contraloria(consulta_id: int, cedula: str, tipo_doc: str, **kwargs):
     """
     - Descarga PDF del certificado (con captcha).
-    - Evidencia PNG: PyMuPDF (preferido) -> pdf2image -> <embed>.
+    - Evidencia: el PDF (core/utils/evidence_encoder.evidencia_pdf) -> pdf2image -> <embed>.
     - Texto: pypdf -> pdfminer -> PyMuPDF -> OCR (fallback).
-    - Guarda Resultado con el PNG.
+    - Guarda Resultado con la evidencia.
     """
     fuente_obj = await sync_to_async(lambda: Fuente.objects.filter(nombre=NOMBRE_SITIO).first())()
     if not fuente_obj:
@@ -177,7 +145,6 @@ async def consultar_contraloria(consulta_id: int, cedula: str, tipo_doc: str, **
     abs_pdf = os.path.join(absolute_folder, pdf_name)
     rel_pdf = os.path.join(relative_folder, pdf_name).replace("\\", "/")
     abs_png = os.path.join(absolute_folder, png_name)
-    rel_png = os.path.join(relative_folder, png_name).replace("\\", "/")
     abs_txt = os.path.join(absolute_folder, txt_name)
     abs_txt_ocr = os.path.join(absolute_folder, txt_ocr_name)
 
@@ -222,19 +189,22 @@ async def consultar_contraloria(consulta_id: int, cedula: str, tipo_doc: str, **
             download = await dl.value
             await download.save_as(abs_pdf)
 
-            # 4) Evidencia PNG:
-            #    (a) PyMuPDF (idéntico a tu 'estado_cedula')
-            rendered = _render_pdf_primera_pagina_pymupdf(abs_pdf, abs_png, zoom=2.0)
-            if not rendered:
+            # 4) Evidencia:
+            #    (a) el PDF tal cual (o PNG según EVIDENCIA_PDF), fuera del loop
+            evidencia_abs = await evidencia_pdf(abs_pdf, abs_png)
+            if not evidencia_abs and _render_pdf_primera_pagina_pdf2image(abs_pdf, abs_png, dpi=300):
                 # (b) pdf2image (si hay Poppler)
-                rendered = _render_pdf_primera_pagina_pdf2image(abs_pdf, abs_png, dpi=300)
-            if not rendered:
+                evidencia_abs = abs_png
+            if not evidencia_abs:
                 # (c) Fallback: screenshot del <embed>
                 await _screenshot_pdf_element(context, abs_pdf, abs_png)
+                evidencia_abs = abs_png
 
             await browser.close()
             browser = None
 
+        rel_evidencia = os.path.join(relative_folder, os.path.basename(evidencia_abs)).replace("\\", "/")
+
         # 5) Texto del PDF: pypdf -> pdfminer -> PyMuPDF
         text = _texto_pdf_pypdf(abs_pdf)
         if not text.strip():
@@ -253,7 +223,10 @@ async def consultar_contraloria(consulta_id: int, cedula: str, tipo_doc: str, **
 
         # 6) OCR si aún no detectamos frase
         if "no se detectó frase" in msg.lower():
-            ocr_text = _ocr_png(abs_png)
+            png_ocr = evidencia_abs if evidencia_abs and not evidencia_abs.lower().endswith(".pdf") else (
+                await evidencia_pdf(abs_pdf, abs_png, max_paginas=1, modo="png") or abs_png
+            )
+            ocr_text = _ocr_png(png_ocr)
             try:
                 with open(abs_txt_ocr, "w", encoding="utf-8") as f:
                     f.write(ocr_text or "")
@@ -268,12 +241,12 @@ async def consultar_contraloria(consulta_id: int, cedula: str, tipo_doc: str, **
             estado="Validada",
             mensaje=msg,
             score=score,
-            archivo=rel_png
+            archivo=rel_evidencia
         )
 
         return {
             "estado": "Validada",
-            "archivo_png": rel_png,
+            "archivo": rel_evidencia,
             "archivo_pdf": rel_pdf,
             "mensaje": msg,
             "score": score
@@ -293,4 +266,4 @@ async def consultar_contraloria(consulta_id: int, cedula: str, tipo_doc: str, **
             score=0,
             archivo=""
         )
-        return {"estado": "Sin Validar", "archivo_png": "", "archivo_pdf": "", "mensaje": str(e), "score": 0}
+        return {"estado": "Sin Validar", "archivo": "", "archivo_pdf": "", "mensaje": str(e), "score": 0}
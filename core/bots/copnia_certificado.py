@@ -6,7 +6,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -286,7 +287,7 @@ async def consultar_copnia_certificado(consulta_id: int, cedula: str, tipo_doc:
                 try:
                     if await no_data_msg.is_visible(timeout=2000):
                         await page.evaluate("window.scrollTo(0,0)")
-                        await page.screenshot(path=abs_png, full_page=True)
+                        await captura_completa(page, abs_png, full_page=True)
                         await context.close(); await navegador.close(); navegador = None
                         await _guardar_resultado(consulta_id, fuente_obj, "Validada",
                                                  "No se encontraron matrículas", rel_png, score=0)
@@ -294,7 +295,7 @@ async def consultar_copnia_certificado(consulta_id: int, cedula: str, tipo_doc:
                 except Exception:
                     pass
                 await page.evaluate("window.scrollTo(0,0)")
-                await page.screenshot(path=abs_png, full_page=True)
+                await captura_completa(page, abs_png, full_page=True)
                 await context.close(); await navegador.close(); navegador = None
                 await _guardar_resultado(consulta_id, fuente_obj, "Validada",
                                          "Resultado de consulta (sin detalle claro)", rel_png, score=0)
@@ -326,7 +327,7 @@ async def consultar_copnia_certificado(consulta_id: int, cedula: str, tipo_doc:
                     recortado = await _screenshot_pdf_only(page, abs_png)
                     if not recortado:
                         await page.evaluate("window.scrollTo(0,0)")
-                        await page.screenshot(path=abs_png, full_page=True)
+                        await captura_completa(page, abs_png, full_page=True)
                     await context.close(); await navegador.close(); navegador = None
                     await _guardar_resultado(consulta_id, fuente_obj, "Validada",
                                              "Certificado generado (visor)", rel_png, score=1)
@@ -345,7 +346,7 @@ async def consultar_copnia_certificado(consulta_id: int, cedula: str, tipo_doc:
                 await viewer.wait_for_timeout(MEDIUM)
                 rec = await _screenshot_pdf_only(viewer, abs_png)
                 if not rec:
-                    await viewer.screenshot(path=abs_png, full_page=True)
+                    await captura_completa(viewer, abs_png, full_page=True)
                 await viewer.close()
 
             # Cerrar navegador
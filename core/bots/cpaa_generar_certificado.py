@@ -6,7 +6,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -82,7 +83,7 @@ async def _render_pdf_to_png(abs_pdf: str, abs_png: str, context) -> bool:
         viewer = await context.new_page()
         await viewer.goto(f"file://{abs_pdf}", wait_until="load")
         await viewer.wait_for_timeout(900)
-        await viewer.screenshot(path=abs_png, full_page=True)
+        await captura_completa(viewer, abs_png, full_page=True)
         await viewer.close()
         return True
     except Exception:
@@ -262,7 +263,7 @@ async def consultar_cpaa_generar_certificado(consulta_id: int, tipo_doc: str, nu
 
             if not tiene_generar:
                 # No hay certificado para descargar → evidencia de la página con el mensaje que muestre
-                await page.screenshot(path=abs_png, full_page=True)
+                await captura_completa(page, abs_png, full_page=True)
                 await ctx.close(); await browser.close(); browser = None
                 await sync_to_async(Resultado.objects.create)(
                     consulta_id=consulta_id,
@@ -289,7 +290,7 @@ async def consultar_cpaa_generar_certificado(consulta_id: int, tipo_doc: str, nu
                     download = await dl.value
                 except Exception:
                     # si aún no, evidencia
-                    await page.screenshot(path=abs_png, full_page=True)
+                    await captura_completa(page, abs_png, full_page=True)
                     await ctx.close(); await browser.close(); browser = None
                     await sync_to_async(Resultado.objects.create)(
                         consulta_id=consulta_id,
@@ -307,7 +308,7 @@ async def consultar_cpaa_generar_certificado(consulta_id: int, tipo_doc: str, nu
             ok = await _render_pdf_to_png(abs_pdf, abs_png, ctx)
             if not ok:
                 # respaldo: screenshot de la vista actual
-                await page.screenshot(path=abs_png, full_page=True)
+                await captura_completa(page, abs_png, full_page=True)
 
             # 10) Leer PDF y armar mensaje
             text = _pdf_text_pypdf(abs_pdf)
@@ -6,7 +6,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -101,7 +102,7 @@ async def _render_pdf_to_png(abs_pdf: str, abs_png: str, context) -> bool:
         viewer = await context.new_page()
         await viewer.goto(f"file://{abs_pdf}", wait_until="load")
         await viewer.wait_for_timeout(MEDIUM)
-        await viewer.screenshot(path=abs_png, full_page=True)
+        await captura_completa(viewer, abs_png, full_page=True)
         await viewer.close()
         return True
     except Exception:
@@ -222,7 +223,7 @@ async def consultar_cpae_certificado(consulta_id: int, tipo_doc: str, cedula: st
                         continue
                 if not clicked:
                     # No se pudo abrir el desplegable
-                    await page.screenshot(path=abs_png, full_page=True)
+                    await captura_completa(page, abs_png, full_page=True)
                     await browser.close(); browser = None
                     await sync_to_async(Resultado.objects.create)(
                         consulta_id=consulta_id,
@@ -254,7 +255,7 @@ async def consultar_cpae_certificado(consulta_id: int, tipo_doc: str, cedula: st
                 except Exception:
                     pass
                 await page.wait_for_timeout(600)
-                await page.screenshot(path=abs_png, full_page=True)
+                await captura_completa(page, abs_png, full_page=True)
 
                 await browser.close(); browser = None
                 await sync_to_async(Resultado.objects.create)(
@@ -276,7 +277,7 @@ async def consultar_cpae_certificado(consulta_id: int, tipo_doc: str, cedula: st
 
             if count == 0:
                 # Nada para elegir → evidencia y salir
-                await page.screenshot(path=abs_png, full_page=True)
+                await captura_completa(page, abs_png, full_page=True)
                 await browser.close(); browser = None
                 await sync_to_async(Resultado.objects.create)(
                     consulta_id=consulta_id,
@@ -324,7 +325,7 @@ async def consultar_cpae_certificado(consulta_id: int, tipo_doc: str, cedula: st
                 except Exception:
                     # Sin evento de descarga → evidencia del estado
                     await page.wait_for_timeout(XLONG)
-                    await page.screenshot(path=abs_png, full_page=True)
+                    await captura_completa(page, abs_png, full_page=True)
                     await browser.close(); browser = None
                     await sync_to_async(Resultado.objects.create)(
                         consulta_id=consulta_id,
@@ -344,7 +345,7 @@ async def consultar_cpae_certificado(consulta_id: int, tipo_doc: str, cedula: st
             ok = await _render_pdf_to_png(abs_pdf, abs_png, context)
             if not ok:
                 # respaldo: screenshot de la página
-                await page.screenshot(path=abs_png, full_page=True)
+                await captura_completa(page, abs_png, full_page=True)
 
             await browser.close(); browser = None
 
@@ -5,7 +5,8 @@ import asyncio
 from datetime import datetime
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -121,7 +122,7 @@ async def consultar_cpae_verify_licensure(consulta_id: int, tipo_doc: str, cedul
                 except Exception:
                     continue
 
-            await page.screenshot(path=out_png_abs, full_page=True)
+            await captura_completa(page, out_png_abs, full_page=True)
 
             await ctx.close()
             await browser.close()
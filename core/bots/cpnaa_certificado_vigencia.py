@@ -5,12 +5,13 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
 
 from core.models import Resultado, Fuente
 
 # Usa tu helper existente de capsolver
 from core.resolver.captcha_v2 import resolver_captcha_v2  # async (url, sitekey)
+from core.resolver.token_pool import registrar_token
 
 NOMBRE_SITIO = "cpnaa_certificado_vigencia"
 URL = "https://www.cpnaa.gov.co/certificado-vigencia-profesional/"
@@ -20,6 +21,7 @@ IFRAME_SEL = 'iframe[src*="oficinavirtual.cpnaa.gov.co/tramites/certificado_de_v
 
 # Sitekey que diste (misma del CPNAA)
 RECAPTCHA_SITEKEY = "6Lf2UcMZAAAAAMBlukQO3XsknMUsIEnWI2GXuX0z"
+registrar_token(NOMBRE_SITIO, URL, RECAPTCHA_SITEKEY)
 
 # Selectores (DENTRO del iframe)
 SEL_TIPO_DOC     = "#x_document_type"
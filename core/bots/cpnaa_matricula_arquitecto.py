@@ -5,18 +5,20 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
 
 from core.models import Resultado, Fuente
 
 # ← ajusta el import a donde tengas tu helper de captcha:
 from core.resolver.captcha_v2 import resolver_captcha_v2  # async (url, sitekey)
+from core.resolver.token_pool import registrar_token
 
 NOMBRE_SITIO = "cpnaa_matricula_arquitecto"
 URL = "https://www.cpnaa.gov.co/matricula-profesional-de-arquitecto-d69/"
 
 # Sitekey que compartiste
 RECAPTCHA_SITEKEY = "6Lf2UcMZAAAAAMBlukQO3XsknMUsIEnWI2GXuX0z"
+registrar_token(NOMBRE_SITIO, URL, RECAPTCHA_SITEKEY)
 
 # Selectores
 SEL_TIPO_DOC   = "#doc_type"
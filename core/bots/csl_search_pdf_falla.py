@@ -4,7 +4,8 @@ from datetime import datetime
 from urllib.parse import urlencode
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -140,7 +141,7 @@ async def consultar_csl_search_pdf(consulta_id: int, nombre: str):
 
             # Pantallazo SIEMPRE (luego de que todo está cargado)
             try:
-                await page.screenshot(path=out_png_abs, full_page=True)
+                await captura_completa(page, out_png_abs, full_page=True)
             except Exception:
                 pass
 
@@ -4,7 +4,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -109,7 +110,7 @@ async def consultar_cssf(consulta_id: int, nombre: str, apellido: str):
                 except Exception:
                     mensaje_final = "Désolé, aucun résultat"
                 try:
-                    await page.screenshot(path=absolute_png, full_page=True)
+                    await captura_completa(page, absolute_png, full_page=True)
                 except Exception:
                     pass
                 success = True  # consulta válida, sin hallazgos (score 1)
@@ -158,7 +159,7 @@ async def consultar_cssf(consulta_id: int, nombre: str, apellido: str):
                     mensaje_final = "Se encontraron resultados, pero sin coincidencia exacta del nombre."
 
                 try:
-                    await page.screenshot(path=absolute_png, full_page=True)
+                    await captura_completa(page, absolute_png, full_page=True)
                 except Exception:
                     pass
 
@@ -5,7 +5,8 @@ import asyncio
 from datetime import datetime
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -90,7 +91,7 @@ async def consultar_dea(consulta_id: int, cedula: str):
                 html0 = await page.content()
                 if _is_blocked_html(html0, page.url):
                     try:
-                        await page.screenshot(path=png_abs, full_page=True)
+                        await captura_completa(page, png_abs, full_page=True)
                     except Exception:
                         pass
                     await navegador.close()
@@ -136,7 +137,7 @@ async def consultar_dea(consulta_id: int, cedula: str):
                 html1 = await page.content()
                 if _is_blocked_html(html1, page.url):
                     try:
-                        await page.screenshot(path=png_abs, full_page=True)
+                        await captura_completa(page, png_abs, full_page=True)
                     except Exception:
                         pass
                     await navegador.close()
@@ -173,7 +174,7 @@ async def consultar_dea(consulta_id: int, cedula: str):
 
             # Evidencia (siempre)
             try:
-                await page.screenshot(path=png_abs, full_page=True)
+                await captura_completa(page, png_abs, full_page=True)
             except Exception:
                 pass
 
@@ -198,7 +199,7 @@ async def consultar_dea(consulta_id: int, cedula: str):
                 try:
                     page = await navegador.new_page()
                     await page.goto(URL, timeout=15000)
-                    await page.screenshot(path=png_abs, full_page=True)
+                    await captura_completa(page, png_abs, full_page=True)
                 except Exception:
                     pass
                 await navegador.close()
@@ -1,7 +1,8 @@
 # bots/defunciones.py
 import os
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 
@@ -87,7 +88,7 @@ async def consultar_defunciones(consulta_id: int, cedula: str):
                 # subir al tope por si quedó scrolleado y dar un respiro al layout
                 await page.evaluate("window.scrollTo(0, 0)")
                 await page.wait_for_timeout(400)
-                await page.screenshot(path=absolute_path, full_page=True)
+                await captura_completa(page, absolute_path, full_page=True)
             except Exception:
                 # último recurso: intentarlo sin full_page
                 await page.screenshot(path=absolute_path, full_page=False)
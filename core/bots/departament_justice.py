@@ -6,7 +6,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -92,7 +93,7 @@ async def consultar_departament_justice(consulta_id: int, nombre: str):
                     score = 10
 
             # Screenshot
-            await pagina.screenshot(path=absolute_path, full_page=True)
+            await captura_completa(pagina, absolute_path, full_page=True)
             await navegador.close()
             navegador = None
 
@@ -4,7 +4,8 @@ import asyncio
 from datetime import datetime
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -144,7 +145,7 @@ async def consultar_dian_formalizacion_personas(
                 score = 10
 
             # 7) Screenshot
-            await page.screenshot(path=absolute_path, full_page=True)
+            await captura_completa(page, absolute_path, full_page=True)
 
             await browser.close()
             browser = None
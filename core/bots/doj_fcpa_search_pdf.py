@@ -7,7 +7,8 @@ from datetime import datetime
 from urllib.parse import urlencode
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -132,7 +133,7 @@ async def consultar_doj_fcpa_search_pdf(consulta_id: int, cedula: str):
 
             # Bloqueo temprano 403
             if await _is_403_blocked(page):
-                try: await page.screenshot(path=out_png_abs, full_page=True)
+                try: await captura_completa(page, out_png_abs, full_page=True)
                 except Exception: pass
                 await browser.close()
                 await sync_to_async(Resultado.objects.create)(
@@ -170,7 +171,7 @@ async def consultar_doj_fcpa_search_pdf(consulta_id: int, cedula: str):
 
             # Bloqueo 403 luego de enviar
             if await _is_403_blocked(page):
-                try: await page.screenshot(path=out_png_abs, full_page=True)
+                try: await captura_completa(page, out_png_abs, full_page=True)
                 except Exception: pass
                 await browser.close()
                 await sync_to_async(Resultado.objects.create)(
@@ -184,7 +185,7 @@ async def consultar_doj_fcpa_search_pdf(consulta_id: int, cedula: str):
             # Evidencia (captura de pantalla)
             try:
                 await asyncio.sleep(0.5)
-                await page.screenshot(path=out_png_abs, full_page=True)
+                await captura_completa(page, out_png_abs, full_page=True)
             except Exception:
                 pass
 
@@ -4,7 +4,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -119,7 +120,7 @@ async def consultar_ebrd(consulta_id: int, nombre: str, apellido: str):
                     mensaje_final = "No results found. Please try a different search word or phrase."
 
                 try:
-                    await page.screenshot(path=absolute_png, full_page=True)
+                    await captura_completa(page, absolute_png, full_page=True)
                 except Exception:
                     pass
                 success = True
@@ -153,7 +154,7 @@ async def consultar_ebrd(consulta_id: int, nombre: str, apellido: str):
                 mensaje_final = "Se encontraron coincidencias." if hit else "No hay coincidencias."
 
                 try:
-                    await page.screenshot(path=absolute_png, full_page=True)
+                    await captura_completa(page, absolute_png, full_page=True)
                 except Exception:
                     pass
                 success = True
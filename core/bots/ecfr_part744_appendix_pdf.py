@@ -4,7 +4,8 @@ from datetime import datetime
 from urllib.parse import urlencode
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -108,7 +109,7 @@ async def consultar_ecfr_part744_appendix_pdf(consulta_id: int, nombre: str):
             # Bloqueo temprano
             if await _is_request_access(page):
                 try:
-                    await page.screenshot(path=out_png_abs, full_page=True)
+                    await captura_completa(page, out_png_abs, full_page=True)
                 except Exception:
                     pass
                 await navegador.close(); navegador = None
@@ -154,7 +155,7 @@ async def consultar_ecfr_part744_appendix_pdf(consulta_id: int, nombre: str):
                 # Bloqueo también en plan B
                 if await _is_request_access(page):
                     try:
-                        await page.screenshot(path=out_png_abs, full_page=True)
+                        await captura_completa(page, out_png_abs, full_page=True)
                     except Exception:
                         pass
                     await navegador.close(); navegador = None
@@ -220,7 +221,7 @@ async def consultar_ecfr_part744_appendix_pdf(consulta_id: int, nombre: str):
             # SI AQUÍ apareciera Request Access (algunas rutas redirigen), salimos.
             if await _is_request_access(page):
                 try:
-                    await page.screenshot(path=out_png_abs, full_page=True)
+                    await captura_completa(page, out_png_abs, full_page=True)
                 except Exception:
                     pass
                 await browser.close()
@@ -257,7 +258,7 @@ async def consultar_ecfr_part744_appendix_pdf(consulta_id: int, nombre: str):
             except Exception:
                 png_ok = False
             if not png_ok:
-                await page.screenshot(path=out_png_abs, full_page=True)
+                await captura_completa(page, out_png_abs, full_page=True)
 
             await browser.close()
 
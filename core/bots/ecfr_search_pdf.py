@@ -6,7 +6,8 @@ from datetime import datetime
 from urllib.parse import urlencode
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -114,7 +115,7 @@ async def consultar_ecfr_search_pdf(consulta_id: int, nombre: str):
 
             # Gate temprano
             if await _is_request_access(page):
-                try: await page.screenshot(path=out_png_abs, full_page=True)
+                try: await captura_completa(page, out_png_abs, full_page=True)
                 except Exception: pass
                 await navegador.close(); navegador = None
                 await sync_to_async(Resultado.objects.create)(
@@ -151,7 +152,7 @@ async def consultar_ecfr_search_pdf(consulta_id: int, nombre: str):
 
             # Gate tras enviar
             if await _is_request_access(page):
-                try: await page.screenshot(path=out_png_abs, full_page=True)
+                try: await captura_completa(page, out_png_abs, full_page=True)
                 except Exception: pass
                 await navegador.close(); navegador = None
                 await sync_to_async(Resultado.objects.create)(
@@ -207,7 +208,7 @@ async def consultar_ecfr_search_pdf(consulta_id: int, nombre: str):
 
             # Evidencia temprana por si algo falla después
             try:
-                await page.screenshot(path=out_png_abs, full_page=True)
+                await captura_completa(page, out_png_abs, full_page=True)
             except Exception:
                 pass
 
@@ -228,7 +229,7 @@ async def consultar_ecfr_search_pdf(consulta_id: int, nombre: str):
 
             # Si aquí aparece el gate, dejamos evidencia y salimos Sin Validar
             if await _is_request_access(page):
-                try: await page.screenshot(path=out_png_abs, full_page=True)
+                try: await captura_completa(page, out_png_abs, full_page=True)
                 except Exception: pass
                 await browser.close()
                 await sync_to_async(Resultado.objects.create)(
@@ -272,7 +273,7 @@ async def consultar_ecfr_search_pdf(consulta_id: int, nombre: str):
 
             if not png_ok:
                 try:
-                    await page.screenshot(path=out_png_abs, full_page=True)
+                    await captura_completa(page, out_png_abs, full_page=True)
                 except Exception:
                     pass
 
@@ -5,7 +5,7 @@ con soporte para:
  - detección de reCAPTCHA v2/v3 y Cloudflare Turnstile
  - integración con CapSolver (o proveedor compatible) con proxy en la tarea
  - inyección de token y submit forzado
- - perfil persistente (launch_persistent_context) y storageState opcional
+ - perfil persistente (launch_persistent_context) sembrado con la sesión de core/utils/session_store.py
  - fingerprint hardening, movimientos humanos y logging detallado
 Variables de entorno:
  - EMB_HEADLESS (true|false)
@@ -25,6 +25,7 @@ import re
 import json
 import time
 import asyncio
+import shutil
 import logging
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs
@@ -32,7 +33,11 @@ from urllib.parse import urlparse, parse_qs
 import httpx
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright, BrowserContext, Page
+from playwright.async_api import BrowserContext, Page
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
+from core.utils.session_store import obtener_sesion, guardar_sesion
+from core.resolver.cliente import resolver as resolver_tarea
 
 from core.models import Resultado, Fuente
 
@@ -115,7 +120,7 @@ def _is_cloudflare_challenge(body_text: str) -> bool:
 
 async def _save_screenshot(page: Page, path: str):
     try:
-        await page.screenshot(path=path, full_page=True)
+        await captura_completa(page, path, full_page=True)
     except Exception:
         try:
             await page.screenshot(path=path)
@@ -160,52 +165,21 @@ def _extract_ray_id(body_text: str) -> str:
 # -------------------------
 # CapSolver integration
 # -------------------------
-async def _capsolver_create_task(payload: dict) -> dict:
+async def _capsolver_resolver(payload: dict, timeout: int = SOLVER_TIMEOUT) -> dict:
+    """createTask + getTaskResult por el cliente asyncio compartido (core/resolver/cliente.py)."""
     if not CAPSOLVER_API_KEY:
         logger.warning("No CAPSOLVER_API_KEY configurada")
         return {}
-    url = CAPSOLVER_API_URL.rstrip("/") + "/createTask"
-    body = {"clientKey": CAPSOLVER_API_KEY, **payload}
     logger.info("Enviando createTask a CapSolver: %s", json.dumps(payload, default=str))
-    async with httpx.AsyncClient(timeout=30) as client:
-        try:
-            r = await client.post(url, json=body)
-            logger.info("createTask status: %s", r.status_code)
-            try:
-                j = r.json()
-                logger.info("createTask response: %s", json.dumps(j, default=str))
-                return j
-            except Exception:
-                logger.exception("No se pudo parsear JSON de createTask")
-                return {}
-        except Exception as e:
-            logger.exception("Error en createTask: %s", e)
-            return {}
-
-async def _capsolver_get_result(task_id: str, timeout: int = SOLVER_TIMEOUT) -> dict:
-    if not CAPSOLVER_API_KEY:
+    try:
+        solucion = await resolver_tarea(
+            payload["task"], clave=CAPSOLVER_API_KEY, url=CAPSOLVER_API_URL, timeout=timeout
+        )
+    except Exception as e:
+        logger.warning("CapSolver sin solución: %s", e)
         return {}
-    url = CAPSOLVER_API_URL.rstrip("/") + "/getTaskResult"
-    body = {"clientKey": CAPSOLVER_API_KEY, "taskId": task_id}
-    logger.info("Iniciando polling getTaskResult para taskId=%s", task_id)
-    async with httpx.AsyncClient(timeout=30) as client:
-        start = time.time()
-        while time.time() - start < timeout:
-            try:
-                r = await client.post(url, json=body)
-                logger.info("getTaskResult status: %s", r.status_code)
-                try:
-                    j = r.json()
-                    logger.info("getTaskResult response: %s", json.dumps(j, default=str))
-                    if j.get("errorId") == 0 and j.get("status") == "ready":
-                        return j
-                except Exception:
-                    logger.exception("No se pudo parsear JSON de getTaskResult")
-            except Exception as e:
-                logger.exception("Error en getTaskResult: %s", e)
-            await asyncio.sleep(5)
-    logger.warning("Timeout esperando resultado del solver para taskId=%s", task_id)
-    return {}
+    logger.info("CapSolver solución recibida (%s)", payload["task"].get("type"))
+    return solucion or {}
 
 def _capsolver_proxy_payload(proxy: str):
     if not proxy:
@@ -245,15 +219,7 @@ async def resolver_capsolver_recaptcha_v2(page_url: str, sitekey: str, invisible
     if proxy_payload:
         task["task"]["type"] = "RecaptchaV2Task"
         task["task"].update(proxy_payload)
-    create = await _capsolver_create_task(task)
-    task_id = create.get("taskId") or create.get("id")
-    logger.info("CapSolver createTask id: %s", task_id)
-    if not task_id:
-        return ""
-    result = await _capsolver_get_result(task_id, timeout=timeout)
-    if not result:
-        return ""
-    sol = result.get("solution") or {}
+    sol = await _capsolver_resolver(task, timeout=timeout)
     token = sol.get("gRecaptchaResponse") or sol.get("token") or ""
     logger.info("Token recibido (len): %s", len(token) if token else 0)
     return token or ""
@@ -274,15 +240,7 @@ async def resolver_capsolver_recaptcha_v3(page_url: str, sitekey: str, action: s
         task["task"].update(proxy_payload)
     if action:
         task["task"]["pageAction"] = action
-    create = await _capsolver_create_task(task)
-    task_id = create.get("taskId") or create.get("id")
-    logger.info("CapSolver createTask v3 id: %s", task_id)
-    if not task_id:
-        return ""
-    result = await _capsolver_get_result(task_id, timeout=timeout)
-    if not result:
-        return ""
-    sol = result.get("solution") or {}
+    sol = await _capsolver_resolver(task, timeout=timeout)
     token = sol.get("gRecaptchaResponse") or sol.get("token") or ""
     logger.info("Token v3 recibido (len): %s", len(token) if token else 0)
     return token or ""
@@ -331,17 +289,7 @@ async def resolver_capsolver_turnstile(page_url: str, sitekey: str, timeout: int
     if proxy_payload:
         task["task"]["type"] = "TurnstileTask"
         task["task"].update(proxy_payload)
-    create = await _capsolver_create_task(task)
-    logger.info("createTask Turnstile response: %s", json.dumps(create, default=str))
-    task_id = create.get("taskId") or create.get("id")
-    if not task_id:
-        logger.warning("No se obtuvo taskId para Turnstile")
-        return ""
-    result = await _capsolver_get_result(task_id, timeout=timeout)
-    logger.info("getTaskResult Turnstile: %s", json.dumps(result, default=str))
-    if not result:
-        return ""
-    sol = result.get("solution") or {}
+    sol = await _capsolver_resolver(task, timeout=timeout)
     token = sol.get("gRecaptchaResponse") or sol.get("token") or sol.get("response") or ""
     return token or ""
 
@@ -660,6 +608,14 @@ async def consultar_embajada_alemania_funcionarios(consulta_id: int, nombre: str
             except Exception:
                 pass
 
+            # Cookies de la última sesión válida (compartida entre workers)
+            sesion = await obtener_sesion(NOMBRE_SITIO)
+            if sesion and sesion.get("cookies"):
+                try:
+                    await context.add_cookies(sesion["cookies"])
+                except Exception:
+                    pass
+
             pages = context.pages
             page: Page = pages[0] if pages else await context.new_page()
 
@@ -791,11 +747,14 @@ async def consultar_embajada_alemania_funcionarios(consulta_id: int, nombre: str
                 mensaje_final = "Se encontraron hallazgos"
 
             await _save_screenshot(page, abs_png)
+            await guardar_sesion(NOMBRE_SITIO, context)
 
             try:
                 await context.close()
             except Exception:
                 pass
+            # El perfil por consulta ya no hace falta: la sesión vive en el session_store
+            shutil.rmtree(user_data_dir, ignore_errors=True)
 
         await _crear_resultado(consulta_id, fuente_obj, score_final, "Validada", mensaje_final, rel_png)
 
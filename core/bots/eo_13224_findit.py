@@ -3,7 +3,8 @@ import os, re, urllib.parse, random, asyncio
 from datetime import datetime
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -133,7 +134,7 @@ async def consultar_eo_13224_findit(consulta_id: int, cedula: str):
                             mensaje_final = _no_results_text(cedula)
                         score_final = 1
                         try:
-                            await page.screenshot(path=absolute_png, full_page=True)
+                            await captura_completa(page, absolute_png, full_page=True)
                         except Exception:
                             pass
                         success = True
@@ -181,7 +182,7 @@ async def consultar_eo_13224_findit(consulta_id: int, cedula: str):
                         mensaje_final = "No se han encontrado coincidencias."
 
                     try:
-                        await page.screenshot(path=absolute_png, full_page=True)
+                        await captura_completa(page, absolute_png, full_page=True)
                     except Exception:
                         pass
 
@@ -5,7 +5,8 @@ import asyncio
 from datetime import datetime
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -188,7 +189,7 @@ async def consultar_epa_fugitives_search_pdf(consulta_id: int, nombre: str):
                 except Exception:
                     continue
             if not tomado:
-                await page.screenshot(path=out_png_abs, full_page=True, type="png")
+                await captura_completa(page, out_png_abs, full_page=True)
 
             final_url = page.url
 
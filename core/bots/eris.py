@@ -1,12 +1,12 @@
 # core/bots/eris.py
 import os
 import asyncio
-from pathlib import Path
 from datetime import datetime
 from urllib.parse import parse_qs, urlparse
 
 from django.conf import settings
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.session_store import obtener_sesion, guardar_sesion, registrar_renovador
 from asgiref.sync import sync_to_async
 
 from core.resolver.captcha_v2 import resolver_captcha_v2
@@ -15,9 +15,7 @@ from core.models import Consulta, Resultado, Fuente
 url = "https://eris.contaduria.gov.co/BDME/"
 nombre_sitio = "eris"
 
-STORAGE_DIR = Path(getattr(settings, "BASE_DIR", ".")) / "storage_state"
-STORAGE_DIR.mkdir(parents=True, exist_ok=True)
-STORAGE_FILE = STORAGE_DIR / "estado_sesion_eris.json"
+ENLACE_BDME = "//a[contains(text(), 'Consultas al Boletín de Deudores Morosos del Estado')]"
 
 TIPO_DOC_MAP = {
     'CC': '28979',
@@ -30,6 +28,14 @@ TIPO_DOC_MAP = {
     'PEP': '263418'
 }
 
+@registrar_renovador(nombre_sitio)
+async def _renovar_sesion(context):
+    pagina = await context.new_page()
+    await pagina.goto(url)
+    await pagina.wait_for_selector(ENLACE_BDME, timeout=30000)
+    return True
+
+
 async def consultar_eris(consulta_id: int, cedula: str, tipo_doc: str):
     async def _get_fuente():
         return await sync_to_async(lambda: Fuente.objects.filter(nombre=nombre_sitio).first())()
@@ -63,8 +69,9 @@ async def consultar_eris(consulta_id: int, cedula: str, tipo_doc: str):
             navegador = await p.chromium.launch(headless=True)
 
             context_kwargs = {}
-            if STORAGE_FILE.exists():
-                context_kwargs["storage_state"] = str(STORAGE_FILE)
+            sesion = await obtener_sesion(nombre_sitio)
+            if sesion:
+                context_kwargs["storage_state"] = sesion
             context = await navegador.new_context(**context_kwargs)
 
             pagina = await context.new_page()
@@ -74,10 +81,7 @@ async def consultar_eris(consulta_id: int, cedula: str, tipo_doc: str):
             max_retries = 10
             for intento in range(max_retries):
                 try:
-                    await pagina.wait_for_selector(
-                        "//a[contains(text(), 'Consultas al Boletín de Deudores Morosos del Estado')]",
-                        timeout=3000
-                    )
+                    await pagina.wait_for_selector(ENLACE_BDME, timeout=3000)
                     break
                 except Exception:
                     print(f"⚠️ Intento {intento+1}: enlace no encontrado, recargando...")
@@ -87,9 +91,7 @@ async def consultar_eris(consulta_id: int, cedula: str, tipo_doc: str):
                 raise Exception("No se encontró el enlace después de varios intentos.")
 
             # Clic en el enlace
-            await pagina.locator(
-                "//a[contains(text(), 'Consultas al Boletín de Deudores Morosos del Estado')]"
-            ).click()
+            await pagina.locator(ENLACE_BDME).click()
 
             # Seleccionar tipo doc y llenar número
             await pagina.wait_for_selector("select.gwt-ListBox")
@@ -151,11 +153,8 @@ async def consultar_eris(consulta_id: int, cedula: str, tipo_doc: str):
             else:
                 score = None
 
-            # Guardar estado de sesión
-            try:
-                await context.storage_state(path=str(STORAGE_FILE))
-            except Exception:
-                pass
+            # Guardar estado de sesión (compartido entre workers)
+            await guardar_sesion(nombre_sitio, context)
 
             await navegador.close()
 
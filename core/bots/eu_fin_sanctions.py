@@ -3,7 +3,8 @@ import os, re, asyncio, unicodedata
 from datetime import datetime
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -231,7 +232,7 @@ async def consultar_eu_fin_sanctions(consulta_id: int, nombre_completo: str):
 
             # Screenshot SIEMPRE (pantalla completa)
             try:
-                await page.screenshot(path=out_png_abs, full_page=True)
+                await captura_completa(page, out_png_abs, full_page=True)
             except Exception:
                 pass
 
@@ -6,7 +6,8 @@ import asyncio
 from datetime import datetime
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -61,7 +62,7 @@ async def _screenshot_to_pdf(page, out_pdf_abs):
     from reportlab.lib.utils import ImageReader
     tmp_png = out_pdf_abs.replace(".pdf", ".png")
     os.makedirs(os.path.dirname(out_pdf_abs), exist_ok=True)
-    await page.screenshot(path=tmp_png, full_page=True)
+    await captura_completa(page, tmp_png, full_page=True)
     img = ImageReader(tmp_png)
     iw, ih = img.getSize()
     pdf = canvas.Canvas(out_pdf_abs, pagesize=(iw, ih))
@@ -210,7 +211,7 @@ async def consultar_eu_most_wanted_pdf(consulta_id: int, nombre: str):
 
             # Screenshot temprano (lista)
             try:
-                await page.screenshot(path=out_png_list, full_page=True)
+                await captura_completa(page, out_png_list, full_page=True)
             except Exception:
                 pass
 
@@ -268,7 +269,7 @@ async def consultar_eu_most_wanted_pdf(consulta_id: int, nombre: str):
                     final_url = page.url
                     # Screenshot detalle
                     try:
-                        await page.screenshot(path=out_png_det, full_page=True)
+                        await captura_completa(page, out_png_det, full_page=True)
                         selected_png = out_png_det
                     except Exception:
                         selected_png = out_png_list
@@ -3,7 +3,8 @@ import os, re, asyncio
 from datetime import datetime
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 # Ajusta a tu app real
 from core.models import Resultado, Fuente
@@ -96,7 +97,7 @@ async def consultar_eu_sanctions_tracker(consulta_id: int, nombre_completo: str)
                         break
 
             if inp is None:
-                await page.screenshot(path=absolute_path, full_page=True)
+                await captura_completa(page, absolute_path, full_page=True)
                 await context.close(); await navegador.close(); navegador = None
                 await sync_to_async(Resultado.objects.create)(
                     consulta_id=consulta_id, fuente=fuente_obj, score=0,
@@ -134,7 +135,7 @@ async def consultar_eu_sanctions_tracker(consulta_id: int, nombre_completo: str)
             try:
                 nores = page.locator(".ts-dropdown .no-results:has-text('No results found')")
                 if await nores.count() > 0 and await nores.first.is_visible():
-                    await page.screenshot(path=absolute_path, full_page=True)
+                    await captura_completa(page, absolute_path, full_page=True)
                     await context.close(); await navegador.close(); navegador = None
                     # score 0 y mensaje plano "No results found"
                     await sync_to_async(Resultado.objects.create)(
@@ -165,7 +166,7 @@ async def consultar_eu_sanctions_tracker(consulta_id: int, nombre_completo: str)
                     await asyncio.sleep(0.5)
                 except Exception:
                     pass
-                await page.screenshot(path=absolute_path, full_page=True)
+                await captura_completa(page, absolute_path, full_page=True)
             else:
                 # Fallback: Enter + capturar algo del estado actual
                 try:
@@ -176,7 +177,7 @@ async def consultar_eu_sanctions_tracker(consulta_id: int, nombre_completo: str)
                 # intentar detectar si apareció algo en pantalla
                 if await page.locator(".ts-dropdown .option").count() > 0:
                     found = True
-                await page.screenshot(path=absolute_path, full_page=True)
+                await captura_completa(page, absolute_path, full_page=True)
 
             await context.close()
             await navegador.close()
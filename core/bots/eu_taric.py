@@ -3,7 +3,8 @@ import os, re, asyncio, html
 from datetime import datetime
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -140,7 +141,7 @@ async def consultar_eu_taric(consulta_id: int, nombre_completo: str):
 
             # 3.5 Captura
             try:
-                await page.screenshot(path=absolute_path, full_page=True)
+                await captura_completa(page, absolute_path, full_page=True)
             except Exception:
                 pass
 
@@ -4,7 +4,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -128,7 +129,7 @@ async def consultar_eur_lex_2022_398(consulta_id: int, nombre: str, apellido: st
                     mensaje_final = "No results found."
                 try:
                     await _clean_page_css(page)
-                    await page.screenshot(path=absolute_png, full_page=True)
+                    await captura_completa(page, absolute_png, full_page=True)
                 except Exception:
                     pass
                 success = True
@@ -163,7 +164,7 @@ async def consultar_eur_lex_2022_398(consulta_id: int, nombre: str, apellido: st
 
                 try:
                     await _clean_page_css(page)
-                    await page.screenshot(path=absolute_png, full_page=True)
+                    await captura_completa(page, absolute_png, full_page=True)
                 except Exception:
                     pass
 
@@ -7,7 +7,8 @@ from urllib.parse import quote_plus
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -197,7 +198,7 @@ async def consultar_fac_busqueda_pdf(
                 score_final = 0  # sin coincidencia exacta
 
             # 6) Screenshot de página completa (único)
-            await page.screenshot(path=abs_png_path, full_page=True)
+            await captura_completa(page, abs_png_path, full_page=True)
 
             # Cerrar
             await ctx.close()
@@ -219,7 +220,7 @@ async def consultar_fac_busqueda_pdf(
         # Screenshot de error si es posible (sin duplicar nombre)
         try:
             if page:
-                await page.screenshot(path=abs_png_path, full_page=True)
+                await captura_completa(page, abs_png_path, full_page=True)
         except Exception:
             pass
         finally:
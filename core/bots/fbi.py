@@ -1,5 +1,6 @@
 # consulta/fbi_topten.py (versión async adaptada a BD)
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 import os
 import re
 import asyncio
@@ -170,7 +171,7 @@ async def consultar_fbi(consulta_id: int, nombre: str):
                 await asyncio.sleep(0.3)
             except Exception:
                 pass
-            await page.screenshot(path=absolute_path, full_page=True)
+            await captura_completa(page, absolute_path, full_page=True)
 
             await context.close()
             await navegador.close()
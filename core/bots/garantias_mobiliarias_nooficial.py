@@ -2,7 +2,9 @@ import os
 import asyncio
 from urllib.parse import quote_plus
 from django.conf import settings
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
 
@@ -33,7 +35,7 @@ async def consultar_garantias_mobiliarias_nooficial(consulta_id, nombre, nro_bie
         async with async_playwright() as p:
             print("[RGM] Lanzando navegador...")
             browser = await p.chromium.launch(
-                headless=False,
+                headless=True,
                 args=["--disable-blink-features=AutomationControlled"]
             )
 
@@ -89,7 +91,7 @@ async def consultar_garantias_mobiliarias_nooficial(consulta_id, nombre, nro_bie
                     abs_path = os.path.join(absolute_folder, nombre_archivo)
                     rel_path = os.path.join(relative_folder, nombre_archivo)
                     print("[RGM] Tomando captura final (URL directa) en:", abs_path)
-                    await page.screenshot(path=abs_path, full_page=True)
+                    await captura_completa(page, abs_path, full_page=True)
                     # leer mensaje de resultado
                     score = 6
                     mensaje = "Consulta ejecutada correctamente."
@@ -371,7 +373,7 @@ async def consultar_garantias_mobiliarias_nooficial(consulta_id, nombre, nro_bie
 
             print("[RGM] Tomando captura final en:", abs_path)
             try:
-                await page.screenshot(path=abs_path, full_page=True)
+                await captura_completa(page, abs_path, full_page=True)
                 print("[RGM] Captura final tomada")
             except Exception as e:
                 print(f"[RGM][WARN] Falló tomar screenshot: {e}")
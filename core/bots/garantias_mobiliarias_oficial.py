@@ -2,7 +2,9 @@ import os
 import asyncio
 from datetime import datetime
 from django.conf import settings
-from playwright.async_api import async_playwright, TimeoutError as PWTimeoutError
+from playwright.async_api import TimeoutError as PWTimeoutError
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from asgiref.sync import sync_to_async
 
 from core.models import Resultado, Fuente
@@ -88,7 +90,7 @@ async def consultar_garantias_mobiliarias_oficial(consulta_id, cedula):
             absolute_path = os.path.join(absolute_folder, screenshot_name)
             relative_path = os.path.join(relative_folder, screenshot_name)
 
-            await pagina.screenshot(path=absolute_path, full_page=True)
+            await captura_completa(pagina, absolute_path, full_page=True)
 
             # Registrar resultado
             await sync_to_async(Resultado.objects.create)(
@@ -4,7 +4,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -127,7 +128,7 @@ async def consultar_govuk_article_exactname(consulta_id: int, nombre: str, apell
 
             # 6) Screenshot (siempre que success)
             try:
-                await page.screenshot(path=absolute_png, full_page=True)
+                await captura_completa(page, absolute_png, full_page=True)
             except Exception:
                 pass
 
@@ -6,7 +6,8 @@ import asyncio
 from datetime import datetime
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -169,7 +170,7 @@ async def consultar_guardia_civil_buscados_pdf(consulta_id: int, nombre: str):
             # Screenshot temprano (respaldo)
             try:
                 await asyncio.sleep(0.8)
-                await page.screenshot(path=out_png_lista_abs, full_page=True)
+                await captura_completa(page, out_png_lista_abs, full_page=True)
             except Exception:
                 pass
 
@@ -211,7 +212,7 @@ async def consultar_guardia_civil_buscados_pdf(consulta_id: int, nombre: str):
 
                 # Refrescar screenshot lista
                 try:
-                    await page.screenshot(path=out_png_lista_abs, full_page=True)
+                    await captura_completa(page, out_png_lista_abs, full_page=True)
                 except Exception:
                     pass
 
@@ -245,7 +246,7 @@ async def consultar_guardia_civil_buscados_pdf(consulta_id: int, nombre: str):
                     final_url = page.url
                     # Screenshot detalle
                     try:
-                        await page.screenshot(path=out_png_detalle_abs, full_page=True)
+                        await captura_completa(page, out_png_detalle_abs, full_page=True)
                         selected_png_abs = out_png_detalle_abs
                     except Exception:
                         # si falla, nos quedamos con el de lista
@@ -9,7 +9,9 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -73,7 +75,7 @@ async def _save_debug_artifacts(page, absolute_folder, prefix):
         print(f"[RGM][WARN] No se pudo guardar HTML debug: {e}")
         html_path = ""
     try:
-        await page.screenshot(path=png_path, full_page=True)
+        await captura_completa(page, png_path, full_page=True)
         print(f"[RGM] DEBUG: Screenshot guardado en: {png_path}")
     except Exception as e:
         print(f"[RGM][WARN] No se pudo guardar screenshot debug: {e}")
@@ -84,7 +86,7 @@ async def consultar_homeaffairs_search(consulta_id: int, nombre: str, apellido:
     """
     Flujo robusto para consultar homeaffairs.gov.au:
     - Intenta URL directa en modo headless (por defecto).
-    - Si recibe bloqueo (403 / Access Denied) o resultado inesperado, ejecuta una comparación headful.
+    - Si recibe bloqueo (403 / Access Denied) o resultado inesperado, repite en un contexto nuevo (perfil sigiloso) para comparar.
     - Guarda artefactos (HTML + screenshots) para diagnóstico.
     - No intenta evadir bloqueos; marca la consulta para revisión humana si está bloqueada.
     """
@@ -204,11 +206,11 @@ async def consultar_homeaffairs_search(consulta_id: int, nombre: str, apellido:
                 except Exception:
                     pass
 
-            # Si estamos en headless y detectamos bloqueo, ejecutar headful para comparar (solo diagnóstico)
+            # Si detectamos bloqueo, reintentar en un contexto nuevo (headless con perfil sigiloso, core/utils/stealth.py) para diagnóstico
             if headless and blocked:
-                print("[RGM] Ejecutando comparación en modo headful para evidencias (headful run)...")
+                print("[RGM] Reintentando en un contexto nuevo para evidencias...")
                 try:
-                    # Cerrar contexto actual y lanzar uno headful
+                    # Cerrar contexto actual y lanzar uno nuevo
                     try:
                         await context.close()
                     except Exception:
@@ -218,7 +220,7 @@ async def consultar_homeaffairs_search(consulta_id: int, nombre: str, apellido:
                     except Exception:
                         pass
 
-                    navegador = await p.chromium.launch(headless=False, args=["--disable-blink-features=AutomationControlled"])
+                    navegador = await p.chromium.launch(headless=True, args=["--disable-blink-features=AutomationControlled"])
                     context = await navegador.new_context(
                         viewport={"width": 1400, "height": 900},
                         locale="en-AU",
@@ -230,7 +232,7 @@ async def consultar_homeaffairs_search(consulta_id: int, nombre: str, apellido:
                     page.on("console", lambda msg: print(f"[RGM][PAGE CONSOLE headful] {msg.type}: {msg.text}"))
                     page.on("response", lambda resp: print(f"[RGM][RESPONSE headful] {resp.status} {resp.url}"))
 
-                    # Navegar de nuevo en modo headful
+                    # Navegar de nuevo en el contexto nuevo
                     try:
                         resp2 = await _goto_with_retries(page, search_url, attempts=2, base_delay=1.0, timeout=GOTO_TIMEOUT_MS)
                         status2 = resp2.status if resp2 else None
@@ -293,7 +295,7 @@ async def consultar_homeaffairs_search(consulta_id: int, nombre: str, apellido:
                                 "Try refining your search with some different key words or looking under a different function"
                             )
                         try:
-                            await page.screenshot(path=absolute_png, full_page=True)
+                            await captura_completa(page, absolute_png, full_page=True)
                         except Exception:
                             pass
                         success = True
@@ -331,7 +333,7 @@ async def consultar_homeaffairs_search(consulta_id: int, nombre: str, apellido:
                             mensaje_final = "Se encontraron resultados, pero sin coincidencia exacta del nombre."
 
                         try:
-                            await page.screenshot(path=absolute_png, full_page=True)
+                            await captura_completa(page, absolute_png, full_page=True)
                         except Exception:
                             pass
 
@@ -3,7 +3,8 @@ import os, re
 from datetime import datetime
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from core.models import Resultado, Fuente
 
 URL = "https://www.ice.gov/most-wanted"
@@ -36,7 +37,7 @@ async def _screenshot_to_pdf(page, out_pdf_abs):
     tmp_png = out_pdf_abs.replace(".pdf", ".png")
     os.makedirs(os.path.dirname(out_pdf_abs), exist_ok=True)
 
-    await page.screenshot(path=tmp_png, full_page=True)
+    await captura_completa(page, tmp_png, full_page=True)
 
     img = ImageReader(tmp_png)
     iw, ih = img.getSize()
@@ -1,7 +1,7 @@
 # consulta/pruebas_icfes.py
 import os
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
 from django.conf import settings
 from asgiref.sync import sync_to_async
 
@@ -3,7 +3,8 @@ import os, re, base64, unicodedata
 from datetime import datetime
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -225,7 +226,7 @@ async def consultar_idb_sanctioned_png(consulta_id: int, nombre: str):
             except Exception:
                 pass
             try:
-                await page.screenshot(path=out_png_abs, full_page=True)
+                await captura_completa(page, out_png_abs, full_page=True)
             except Exception:
                 _fallback_png(out_png_abs, "BID – evidencia no disponible (captura fallida).")
 
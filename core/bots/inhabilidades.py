@@ -1,16 +1,20 @@
 # consulta/inhabilidades_async.py
 import os
 from datetime import datetime, date
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout  # ★
+from playwright.async_api import TimeoutError as PlaywrightTimeout  # ★
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 
 from core.models import Resultado, Fuente
 from core.resolver.captcha_v2 import resolver_captcha_v2  # async
+from core.resolver.token_pool import registrar_token
 
 PAGE_URL = "https://inhabilidades.policia.gov.co:8080/"
 SITE_KEY = "6LflZLwUAAAAAP6-I_SuqVa1YDSTqfMyk43peb_M"
 NOMBRE_SITIO = "inhabilidades"
+registrar_token(NOMBRE_SITIO, PAGE_URL, SITE_KEY)
 
 def normalizar_fecha(value) -> str:
     if value is None:
@@ -66,7 +70,7 @@ async def consultar_inhabilidades(
         fecha_formateada = normalizar_fecha(fecha_exp)
 
         async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True, slow_mo=250)
+            browser = await p.chromium.launch(headless=True)
             context = await browser.new_context(
                 viewport={"width": 1440, "height": 900},
                 device_scale_factor=1.5,
@@ -87,7 +91,7 @@ async def consultar_inhabilidades(
             except PlaywrightTimeout as te:
                 # Screenshot y registrar como caída/lento
                 try:
-                    await page.screenshot(path=absolute_path, full_page=True)
+                    await captura_completa(page, absolute_path, full_page=True)
                 except Exception:
                     pass
                 await sync_to_async(Resultado.objects.create)(
@@ -229,7 +233,7 @@ async def consultar_inhabilidades(
                 pass
 
             # 9) Screenshot SIEMPRE
-            await page.screenshot(path=absolute_path, full_page=True)
+            await captura_completa(page, absolute_path, full_page=True)
             await page.wait_for_timeout(200)
 
             await browser.close()
@@ -1,6 +1,7 @@
 import os
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 
@@ -49,7 +50,7 @@ async def consultar_inpec(consulta_id: int, cedula: str, apellidos: str):
                 await pagina.goto(url, timeout=15000)  # 15s timeout
             except Exception:
                 # Tomar pantallazo si la página no carga
-                await pagina.screenshot(path=absolute_path, full_page=True)
+                await captura_completa(pagina, absolute_path, full_page=True)
                 await sync_to_async(Resultado.objects.create)(
                     consulta_id=consulta_id,
                     fuente=fuente_obj,
@@ -99,7 +100,7 @@ async def consultar_inpec(consulta_id: int, cedula: str, apellidos: str):
                     score_final = 10
 
             # Pantallazo final
-            await pagina.screenshot(path=absolute_path, full_page=True)
+            await captura_completa(pagina, absolute_path, full_page=True)
 
             # Guardar resultado en BD
             await sync_to_async(Resultado.objects.create)(
@@ -121,7 +122,7 @@ async def consultar_inpec(consulta_id: int, cedula: str, apellidos: str):
         # Capturar pantallazo en caso de error
         try:
             if navegador is not None:
-                await pagina.screenshot(path=absolute_path, full_page=True)
+                await captura_completa(pagina, absolute_path, full_page=True)
                 await navegador.close()
         except:
             pass
@@ -2,11 +2,14 @@
 import os
 import asyncio
 import random
-import json
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional
 
-from playwright.async_api import async_playwright, Page, BrowserContext
+from playwright.async_api import Page, BrowserContext
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
+from core.utils.session_store import obtener_sesion, guardar_sesion
+from core.utils.rotation import elegir_salida, reportar_salida, lista_env
 from django.conf import settings
 from asgiref.sync import sync_to_async
 
@@ -19,8 +22,9 @@ NOMBRE_SITIO = "interpol"
 MAX_ATTEMPTS = int(os.getenv("INTERPOL_MAX_ATTEMPTS", "4"))
 HEADLESS_DEFAULT = os.getenv("INTERPOL_HEADLESS", "false").lower() == "true"
 STORAGE_STATE_PATH = os.getenv("INTERPOL_STORAGE_STATE")  # ruta opcional a storageState.json
-PROXY_LIST = os.getenv("INTERPOL_PROXY_LIST")  # opcional: JSON array string o CSV "http://u:p@host:port,..." 
-USER_AGENT_LIST = os.getenv("INTERPOL_UA_LIST")  # opcional: JSON array string or CSV
+# Proxies/UAs propios (JSON o CSV); vacíos → ROTACION_PROXIES / ROTACION_UAS (core/utils/rotation.py)
+PROXY_LIST = os.getenv("INTERPOL_PROXY_LIST")
+USER_AGENT_LIST = os.getenv("INTERPOL_UA_LIST")
 
 # Selectores
 SEL_FORNAME = "#forename"
@@ -47,25 +51,6 @@ def _crear_resultado(consulta_id, fuente, score, estado, mensaje, archivo):
     )
 
 # Utilidades
-def _parse_list_env(value: Optional[str]) -> List[str]:
-    if not value:
-        return []
-    value = value.strip()
-    try:
-        parsed = json.loads(value)
-        if isinstance(parsed, list):
-            return [str(x) for x in parsed if x]
-    except Exception:
-        pass
-    return [p.strip() for p in value.split(",") if p.strip()]
-
-def _default_user_agents() -> List[str]:
-    return [
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Safari/605.1.15",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0",
-    ]
-
 def _is_block_page_text(text: str) -> bool:
     if not text:
         return False
@@ -100,7 +85,7 @@ async def _save_screenshot_only(absolute_folder: str, prefix: str, page: Optiona
     absolute_png = os.path.join(absolute_folder, png_name)
     try:
         if page:
-            await page.screenshot(path=absolute_png, full_page=True)
+            await captura_completa(page, absolute_png, full_page=True)
     except Exception:
         try:
             if page:
@@ -120,7 +105,7 @@ async def _save_screenshot_only(absolute_folder: str, prefix: str, page: Optiona
 async def consultar_interpol(consulta_id: int, nombre: str, apellido: str, cedula: str):
     """
     Versión que solo guarda capturas PNG al finalizar cada intento y no guarda HTML.
-    Mantiene reintentos, rotación de UA/proxy y storageState opcional.
+    Mantiene reintentos, rotación de UA/proxy por salud (core/utils/rotation.py) y storageState opcional.
     """
     # preparar carpeta
     relative_folder = os.path.join("resultados", str(consulta_id))
@@ -128,9 +113,12 @@ async def consultar_interpol(consulta_id: int, nombre: str, apellido: str, cedul
     os.makedirs(absolute_folder, exist_ok=True)
 
     # cargar configuraciones
-    ua_list = _parse_list_env(USER_AGENT_LIST) or _default_user_agents()
-    proxy_list = _parse_list_env(PROXY_LIST)
-    storage_state = STORAGE_STATE_PATH if STORAGE_STATE_PATH and os.path.exists(STORAGE_STATE_PATH) else None
+    ua_list = lista_env(USER_AGENT_LIST)
+    proxy_list = lista_env(PROXY_LIST)
+    # Sesión compartida entre workers; INTERPOL_STORAGE_STATE queda como semilla manual
+    storage_state = await obtener_sesion(NOMBRE_SITIO)
+    if not storage_state and STORAGE_STATE_PATH and os.path.exists(STORAGE_STATE_PATH):
+        storage_state = STORAGE_STATE_PATH
     headless_env = HEADLESS_DEFAULT
 
     fuente_obj = await _get_fuente(NOMBRE_SITIO)
@@ -143,14 +131,14 @@ async def consultar_interpol(consulta_id: int, nombre: str, apellido: str, cedul
         browser = None
         context: Optional[BrowserContext] = None
         page = None
-        ua = random.choice(ua_list)
-        proxy = random.choice(proxy_list) if proxy_list else None
+        salida = await elegir_salida(NOMBRE_SITIO, proxies=proxy_list, uas=ua_list)
+        ua = salida["ua"]
 
         try:
             async with async_playwright() as p:
                 launch_kwargs = {"headless": headless_env, "args": ["--no-sandbox", "--disable-blink-features=AutomationControlled"]}
-                if proxy:
-                    launch_kwargs["proxy"] = {"server": proxy}
+                if salida["proxy_pw"]:
+                    launch_kwargs["proxy"] = salida["proxy_pw"]
                 browser = await p.chromium.launch(**launch_kwargs)
 
                 context_kwargs = {
@@ -199,6 +187,7 @@ async def consultar_interpol(consulta_id: int, nombre: str, apellido: str, cedul
                     body_text = ""
 
                 if _is_block_page_text(body_text):
+                    await reportar_salida(salida, ok=False)
                     # tomar captura final de bloqueo y registrar
                     rel_png = await _save_screenshot_only(absolute_folder, f"attempt{attempt}_blocked", page)
                     await _crear_resultado(consulta_id, fuente_obj, 0, "Sin Validar",
@@ -287,8 +276,10 @@ async def consultar_interpol(consulta_id: int, nombre: str, apellido: str, cedul
                     score = 0
                     mensaje = "No se detectó texto de resultados. Revisar captura."
 
-                # registrar resultado y cerrar
+                # registrar resultado, guardar la sesión (cookies/consentimiento) y cerrar
+                await reportar_salida(salida, ok=True)
                 await _crear_resultado(consulta_id, fuente_obj, score, "Validada", mensaje, rel_png)
+                await guardar_sesion(NOMBRE_SITIO, context)
 
                 try:
                     await context.close()
@@ -303,6 +294,7 @@ async def consultar_interpol(consulta_id: int, nombre: str, apellido: str, cedul
 
         except Exception as e:
             last_exception = e
+            await reportar_salida(salida, ok=False)
             # intentar guardar captura de excepción si hay page
             try:
                 if page:
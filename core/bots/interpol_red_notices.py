@@ -1,6 +1,7 @@
 import os
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -125,7 +126,7 @@ async def consultar_interpol_red_notices(consulta_id: int, nombre: str, cedula):
                 mensaje_final = "No hay coincidencias para los parametros ingresados"
 
             # 4) Pantallazo completo
-            await page.screenshot(path=absolute_path, full_page=True)
+            await captura_completa(page, absolute_path, full_page=True)
 
             await context.close()
             await browser.close()
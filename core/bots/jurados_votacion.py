@@ -1,6 +1,7 @@
 import os
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 import asyncio
@@ -82,7 +83,7 @@ async def consultar_jurados_votacion(consulta_id: int, cedula: str):
                 await pagina.wait_for_selector("#consulta_resp", timeout=8000)
 
                 # Guardar pantallazo completo de la página
-                await pagina.screenshot(path=absolute_path, full_page=True)
+                await captura_completa(pagina, absolute_path, full_page=True)
 
                 # Extraer mensaje completo de #consulta_resp
                 elemento = pagina.locator("#consulta_resp")
@@ -119,7 +120,7 @@ async def consultar_jurados_votacion(consulta_id: int, cedula: str):
                         absolute_folder,
                         f"{nombre_sitio}_{cedula}_{timestamp}_error.png"
                     )
-                    await pagina.screenshot(path=error_path, full_page=True)
+                    await captura_completa(pagina, error_path, full_page=True)
                     relative_path = os.path.join(relative_folder, os.path.basename(error_path))
             except Exception:
                 relative_path = ""
@@ -2,7 +2,8 @@
 from datetime import datetime
 from pathlib import Path
 
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import evidencia_pdf, captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 
@@ -28,20 +29,6 @@ NOT_FOUND_FALLBACK = (
 POPPLER_PATH = getattr(settings, "POPPLER_PATH", os.getenv("POPPLER_PATH"))
 
 # ---------- Render helpers (SOLO documento) ----------
-def _render_pdf_primera_pagina_pymupdf(path_pdf: str, path_png: str, zoom: float = 2.0) -> bool:
-    """Render nítido con PyMuPDF (preferido)."""
-    try:
-        import fitz  # PyMuPDF
-        with fitz.open(path_pdf) as doc:
-            if doc.page_count == 0:
-                return False
-            pg = doc[0]
-            pix = pg.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
-            pix.save(path_png)
-        return os.path.exists(path_png) and os.path.getsize(path_png) > 0
-    except Exception:
-        return False
-
 def _render_pdf_primera_pagina_pdf2image(path_pdf: str, path_png: str, dpi: int = 300) -> bool:
     """Render con pdf2image (requiere Poppler)."""
     try:
@@ -134,6 +121,7 @@ async def consultar_libreta_militar(consulta_id: int, cedula: str, tipo_doc: str
         abs_png = os.path.join(absolute_folder, png_name)
         rel_png = os.path.join(relative_folder, png_name).replace("\\", "/")
         abs_pdf = os.path.join(absolute_folder, pdf_name)
+        rel_evidencia = rel_png
 
         async with async_playwright() as p:
             # ===== Navegador y contexto (HEADLESS con stealth) =====
@@ -275,9 +263,11 @@ async def consultar_libreta_militar(consulta_id: int, cedula: str, tipo_doc: str
                             download = await dl_info.value
                             await download.save_as(abs_pdf)
 
-                            # Render SOLO documento
-                            if _render_pdf_primera_pagina_pymupdf(abs_pdf, abs_png, zoom=2.0) or \
-                               _render_pdf_primera_pagina_pdf2image(abs_pdf, abs_png, dpi=300):
+                            # SOLO documento: el PDF (o PNG según EVIDENCIA_PDF)
+                            evidencia_abs = await evidencia_pdf(abs_pdf, abs_png)
+                            if evidencia_abs:
+                                rel_evidencia = os.path.join(relative_folder, os.path.basename(evidencia_abs)).replace("\\", "/")
+                            elif _render_pdf_primera_pagina_pdf2image(abs_pdf, abs_png, dpi=300):
                                 pass
                             else:
                                 # Como último recurso, abrir file:// y capturar <embed>
@@ -288,7 +278,7 @@ async def consultar_libreta_militar(consulta_id: int, cedula: str, tipo_doc: str
                                 await viewer.close()
                                 if not ok:
                                     # fallback final: screenshot general de la página (no ideal)
-                                    await pagina.screenshot(path=abs_png, full_page=True)
+                                    await captura_completa(pagina, abs_png, full_page=True)
                         except Exception:
                             # Puede que se abra en popup el visor PDF
                             try:
@@ -298,7 +288,7 @@ async def consultar_libreta_militar(consulta_id: int, cedula: str, tipo_doc: str
                                 await popup.wait_for_timeout(800)
                                 ok = await _screenshot_pdf_embed(popup, abs_png)
                                 if not ok:
-                                    await popup.screenshot(path=abs_png, full_page=True)
+                                    await captura_completa(popup, abs_png, full_page=True)
                                 await popup.close()
                             except Exception:
                                 # Último recurso: capturar el contenedor principal
@@ -306,17 +296,17 @@ async def consultar_libreta_militar(consulta_id: int, cedula: str, tipo_doc: str
                                 if await cont.count() > 0:
                                     await cont.screenshot(path=abs_png)
                                 else:
-                                    await pagina.screenshot(path=abs_png, full_page=True)
+                                    await captura_completa(pagina, abs_png, full_page=True)
                     else:
                         # No hay botón de certificado; capturar resultado visible
                         cont = (host or pagina).locator('div.container-fluid[style*="min-height: 40vh;"]').first
                         if await cont.count() > 0:
                             await cont.screenshot(path=abs_png)
                         else:
-                            await pagina.screenshot(path=abs_png, full_page=True)
+                            await captura_completa(pagina, abs_png, full_page=True)
                 except Exception:
                     # Si algo falla en el flujo del PDF, deja evidencia general
-                    await pagina.screenshot(path=abs_png, full_page=True)
+                    await captura_completa(pagina, abs_png, full_page=True)
 
             else:
                 # Caso NO encontrado: capturamos el error
@@ -325,9 +315,9 @@ async def consultar_libreta_militar(consulta_id: int, cedula: str, tipo_doc: str
                     if await contenedor.count() > 0:
                         await contenedor.screenshot(path=abs_png)
                     else:
-                        await pagina.screenshot(path=abs_png, full_page=True)
+                        await captura_completa(pagina, abs_png, full_page=True)
                 except Exception:
-                    await pagina.screenshot(path=abs_png, full_page=True)
+                    await captura_completa(pagina, abs_png, full_page=True)
 
             # Cerrar navegador
             try:
@@ -338,14 +328,14 @@ async def consultar_libreta_militar(consulta_id: int, cedula: str, tipo_doc: str
             navegador = None
             ctx = None
 
-        # Registrar resultado (apuntamos SIEMPRE al PNG generado)
+        # Registrar resultado (el PDF del certificado o el PNG generado)
         await sync_to_async(Resultado.objects.create)(
             consulta_id=consulta_id,
             fuente=fuente_obj,
             score=score_final,
             estado="Validada",
             mensaje=mensaje_final,
-            archivo=rel_png
+            archivo=rel_evidencia
         )
 
     except Exception as e:
@@ -4,16 +4,20 @@ import asyncio
 from datetime import datetime
 from typing import Optional
 
-from playwright.async_api import async_playwright, Page, Response
+from playwright.async_api import Page, Response
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 
 from core.models import Resultado, Fuente
 from core.resolver.captcha_v2 import resolver_captcha_v2  # versión async que devuelve token
+from core.resolver.token_pool import registrar_token
 
 URL = "https://wsp.registraduria.gov.co/censo/consultar/"
 SITE_KEY = "6LcthjAgAAAAAFIQLxy52074zanHv47cIvmIHglH"
 NOMBRE_SITIO = "lugar_votacion"
+registrar_token(NOMBRE_SITIO, URL, SITE_KEY)
 
 GOTO_TIMEOUT_MS = 30_000
 
@@ -249,7 +253,7 @@ async def consultar_lugar_votacion(consulta_id: int, cedula: str):
                         fh.write(html)
                 except Exception:
                     pass
-                await page.screenshot(path=absolute_path, full_page=True)
+                await captura_completa(page, absolute_path, full_page=True)
                 raise Exception("No se pudo pulsar el botón de envío en la página.")
 
             # 8) Esperar resultado: selector #consulta o #success o cambio en DOM
@@ -263,7 +267,7 @@ async def consultar_lugar_votacion(consulta_id: int, cedula: str):
                         fh.write(html)
                 except Exception:
                     pass
-                await page.screenshot(path=absolute_path, full_page=True)
+                await captura_completa(page, absolute_path, full_page=True)
                 raise Exception("No se detectó el contenedor de resultado tras enviar la consulta.")
 
             # 9) Analizar resultado (igual que tu lógica original)
@@ -322,10 +326,10 @@ async def consultar_lugar_votacion(consulta_id: int, cedula: str):
                 if await elemento.count() > 0:
                     await elemento.screenshot(path=absolute_path)
                 else:
-                    await page.screenshot(path=absolute_path, full_page=True)
+                    await captura_completa(page, absolute_path, full_page=True)
             except Exception:
                 try:
-                    await page.screenshot(path=absolute_path, full_page=True)
+                    await captura_completa(page, absolute_path, full_page=True)
                 except Exception:
                     pass
 
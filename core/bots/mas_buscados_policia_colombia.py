@@ -1,6 +1,7 @@
 import os
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 import zipfile
@@ -119,7 +120,7 @@ async def consultar_mas_buscados_policia_colombia(consulta_id: int, cedula: str,
 
             # --------- 3) SIEMPRE: captura de pantalla ---------
             try:
-                await pagina.screenshot(path=abs_screenshot, full_page=True)
+                await captura_completa(pagina, abs_screenshot, full_page=True)
             except Exception:
                 # último recurso: nada
                 pass
@@ -3,7 +3,9 @@ import os
 import re
 import asyncio
 from datetime import datetime, date
-from playwright.async_api import async_playwright, TimeoutError as PWTimeoutError
+from playwright.async_api import TimeoutError as PWTimeoutError
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -170,7 +172,7 @@ async def consultar_mediacion(consulta_id, cedula, tipo_doc, fecha_expedicion):
                 abs_png = os.path.join(absolute_folder, shot)
                 rel_png = os.path.join(relative_folder, shot).replace("\\", "/")
                 try:
-                    await pagina.screenshot(path=abs_png, full_page=True)
+                    await captura_completa(pagina, abs_png, full_page=True)
                 except Exception:
                     await pagina.screenshot(path=abs_png, full_page=False)
 
@@ -196,7 +198,7 @@ async def consultar_mediacion(consulta_id, cedula, tipo_doc, fecha_expedicion):
             err = os.path.join(absolute_folder, f"mediacion_{cedula}_{ts}_error.png")
             try:
                 if pagina:
-                    await pagina.screenshot(path=err, full_page=True)
+                    await captura_completa(pagina, err, full_page=True)
                 else:
                     err = ""
             except Exception:
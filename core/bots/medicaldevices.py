@@ -23,7 +23,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -181,7 +182,7 @@ async def consultar_medical_devices(consulta_id: int, nombre_empresa: str, headl
                 except Exception:
                     pass
 
-            # Si hay bloqueo y estamos en headless, ejecutar headful para comparar (solo evidencia)
+            # Si hay bloqueo, reintentar en un contexto nuevo (headless con perfil sigiloso, core/utils/stealth.py) solo para evidencia
             if headless and blocked:
                 try:
                     try:
@@ -193,7 +194,7 @@ async def consultar_medical_devices(consulta_id: int, nombre_empresa: str, headl
                     except Exception:
                         pass
 
-                    navegador = await p.chromium.launch(headless=False)
+                    navegador = await p.chromium.launch(headless=True)
                     context = await navegador.new_context(
                         viewport={"width": 1366, "height": 768},
                         user_agent=("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -294,7 +295,7 @@ async def consultar_medical_devices(consulta_id: int, nombre_empresa: str, headl
 
                     # Captura de la página completa del resultado
                     try:
-                        await page.screenshot(path=abs_png, full_page=True)
+                        await captura_completa(page, abs_png, full_page=True)
                     except Exception:
                         try:
                             await page.screenshot(path=abs_png, full_page=False)
@@ -314,7 +315,7 @@ async def consultar_medical_devices(consulta_id: int, nombre_empresa: str, headl
 
                     # Captura de la página completa cuando no hay resultados
                     try:
-                        await page.screenshot(path=abs_png, full_page=True)
+                        await captura_completa(page, abs_png, full_page=True)
                     except Exception:
                         try:
                             await page.screenshot(path=abs_png, full_page=False)
@@ -324,7 +325,7 @@ async def consultar_medical_devices(consulta_id: int, nombre_empresa: str, headl
             except Exception:
                 # En caso de error al parsear, tomar captura completa como fallback
                 try:
-                    await page.screenshot(path=abs_png, full_page=True)
+                    await captura_completa(page, abs_png, full_page=True)
                 except Exception:
                     pass
 
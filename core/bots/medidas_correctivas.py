@@ -2,7 +2,8 @@ import os
 import asyncio
 import random
 from datetime import datetime
-from playwright.async_api import async_playwright, TimeoutError as PWTimeoutError
+from playwright.async_api import TimeoutError as PWTimeoutError
+from core.utils.browser_pool import async_playwright
 from django.conf import settings
 from asgiref.sync import sync_to_async
 
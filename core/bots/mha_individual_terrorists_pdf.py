@@ -6,7 +6,7 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
 import fitz  # PyMuPDF
 
 from core.models import Resultado, Fuente
@@ -9,7 +9,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from core.utils.browser_pool import async_playwright
 
 from core.models import Resultado, Fuente
 
@@ -191,7 +192,7 @@ async def consultar_moci_qatar_search(consulta_id: int, nombre: str, apellido: s
                 except Exception:
                     pass
 
-            # Si está bloqueado en headless, ejecutar headful para evidencia (solo screenshot)
+            # Si está bloqueado, evidencia en un contexto nuevo (perfil sigiloso, core/utils/stealth.py; solo screenshot)
             if headless and blocked:
                 try:
                     try:
@@ -203,7 +204,7 @@ async def consultar_moci_qatar_search(consulta_id: int, nombre: str, apellido: s
                     except Exception:
                         pass
 
-                    navegador = await p.chromium.launch(headless=False, args=["--disable-blink-features=AutomationControlled"])
+                    navegador = await p.chromium.launch(headless=True, args=["--disable-blink-features=AutomationControlled"])
                     context = await navegador.new_context(viewport={"width": 1400, "height": 900}, locale="en-US", timezone_id="America/Bogota")
                     page = await context.new_page()
                     try:
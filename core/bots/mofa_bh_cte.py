@@ -8,7 +8,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -160,7 +161,7 @@ async def _save_screenshot_letter(page, folder, prefix):
     except Exception:
         # Fallback: intentar full_page
         try:
-            await page.screenshot(path=png_path, full_page=True)
+            await captura_completa(page, png_path, full_page=True)
             return png_path
         except Exception:
             try:
@@ -304,7 +305,7 @@ async def consultar_mofa_bh_cte(consulta_id: int, nombre: str, apellido: str, he
                 except Exception:
                     pass
 
-            # 6) Si bloqueado en headless, hacer evidencia headful (solo screenshot)
+            # 6) Si bloqueado, evidencia en un contexto nuevo (perfil sigiloso, core/utils/stealth.py; solo screenshot)
             if headless and blocked:
                 try:
                     try:
@@ -316,7 +317,7 @@ async def consultar_mofa_bh_cte(consulta_id: int, nombre: str, apellido: str, he
                     except Exception:
                         pass
 
-                    navegador = await p.chromium.launch(headless=False, args=["--disable-blink-features=AutomationControlled"])
+                    navegador = await p.chromium.launch(headless=True, args=["--disable-blink-features=AutomationControlled"])
                     context = await navegador.new_context(viewport={"width": 1400, "height": 900}, device_scale_factor=1, locale="en-US", timezone_id="Asia/Bahrain")
                     page = await context.new_page()
                     try:
@@ -3,7 +3,8 @@ import re
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs
 
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 
@@ -237,7 +238,7 @@ async def consultar_movilidad_bogota(consulta_id: int, cedula: str, tipo_doc: st
                 pass
 
             # Evidencia con el estado visible (modal o tabla)
-            await pagina.screenshot(path=absolute_path, full_page=True)
+            await captura_completa(pagina, absolute_path, full_page=True)
             await navegador.close()
             navegador = None
 
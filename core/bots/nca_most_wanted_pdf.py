@@ -1,7 +1,8 @@
 import os
 import re
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -18,7 +19,7 @@ def _safe_name(s: str) -> str:
 
 async def _screenshot_page(page, out_png_abs: str):
     os.makedirs(os.path.dirname(out_png_abs), exist_ok=True)
-    await page.screenshot(path=out_png_abs, full_page=True)
+    await captura_completa(page, out_png_abs, full_page=True)
 
 PRINT_FIX = """
 @media print {
@@ -1,7 +1,8 @@
 # core/bots/nevis_fsrc_pdf_search.py
 import os
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -92,7 +93,7 @@ async def consultar_nevis_fsrc_pdf_search(consulta_id: int, cedula, nombre: str,
                 fname = f"{base}_hit_{i}.png"
                 abs_path = os.path.join(absolute_folder, fname)
                 rel_path = os.path.join(relative_folder, fname)
-                await page.screenshot(path=abs_path, full_page=True)
+                await captura_completa(page, abs_path, full_page=True)
                 archivos.append(rel_path)
 
                 # Crear un Resultado por cada captura
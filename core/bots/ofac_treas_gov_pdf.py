@@ -1,7 +1,8 @@
 import os
 import re
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -94,7 +95,7 @@ async def consultar_ofac_treas_pdf(consulta_id: int, nombre: str, cedula):
                     mensaje = "Se encontraron resultados"
 
                 # Tomar pantallazo completo
-                await page.screenshot(path=absolute_path, full_page=True)
+                await captura_completa(page, absolute_path, full_page=True)
                 await browser.close()
 
             # Guardar en BD
@@ -118,7 +119,7 @@ async def consultar_ofac_treas_pdf(consulta_id: int, nombre: str, cedula):
                 error_abs = os.path.join(absolute_folder, error_png)
                 error_rel = os.path.join(relative_folder, error_png)
                 if 'page' in locals():
-                    await page.screenshot(path=error_abs, full_page=True)
+                    await captura_completa(page, error_abs, full_page=True)
             except Exception:
                 error_rel = ""
 
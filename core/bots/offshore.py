@@ -5,7 +5,9 @@ import unicodedata
 import urllib.parse
 import asyncio
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
+from core.utils.page_settle import esperar_estable
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -132,7 +134,7 @@ async def _accept_terms_and_submit(page, checkbox_selectors=None, submit_selecto
             except Exception:
                 continue
         try:
-            await page.wait_for_timeout(300)
+            await esperar_estable(page, reemplaza_ms=300)
         except Exception:
             pass
         for btn_sel in submit_selectors:
@@ -144,7 +146,7 @@ async def _accept_terms_and_submit(page, checkbox_selectors=None, submit_selecto
                         try:
                             await page.wait_for_load_state("networkidle", timeout=8000)
                         except Exception:
-                            await page.wait_for_timeout(700)
+                            await esperar_estable(page, reemplaza_ms=700)
                         return True
                     except Exception:
                         try:
@@ -153,7 +155,7 @@ async def _accept_terms_and_submit(page, checkbox_selectors=None, submit_selecto
                             try:
                                 await page.wait_for_load_state("networkidle", timeout=8000)
                             except Exception:
-                                await page.wait_for_timeout(700)
+                                await esperar_estable(page, reemplaza_ms=700)
                             return True
                         except Exception:
                             pass
@@ -171,7 +173,7 @@ async def _accept_terms_and_submit(page, checkbox_selectors=None, submit_selecto
                             try:
                                 await page.wait_for_load_state("networkidle", timeout=8000)
                             except Exception:
-                                await page.wait_for_timeout(500)
+                                await esperar_estable(page, reemplaza_ms=500)
                             return True
                         except Exception:
                             continue
@@ -191,7 +193,7 @@ async def _save_screenshot_letter(page, folder, prefix):
             await page.evaluate("() => document.fonts.ready")
         except Exception:
             pass
-        await asyncio.sleep(0.25)
+        await esperar_estable(page, reemplaza_ms=250)
         page_size = await page.evaluate("""() => ({w: document.documentElement.scrollWidth, h: document.documentElement.scrollHeight, vw: window.innerWidth, vh: window.innerHeight})""")
         total_w = int(page_size.get("w", 0) or 0)
         total_h = int(page_size.get("h", 0) or 0)
@@ -227,7 +229,7 @@ async def _save_screenshot_letter(page, folder, prefix):
     except Exception:
         pass
     try:
-        await page.screenshot(path=png_path, full_page=True)
+        await captura_completa(page, png_path, full_page=True)
         return png_path
     except Exception:
         try:
@@ -290,7 +292,7 @@ async def consultar_offshore(consulta_id: int, nombre: str, cedula, headless=Tru
                     await _wait_for_networkidle_with_retries(page, retries=2, base_delay=0.5, timeout=15000)
                 except Exception:
                     pass
-                await page.wait_for_timeout(2000)
+                await esperar_estable(page, reemplaza_ms=2000)
                 # intentar aceptar términos/modal en la search results si aparece
                 try:
                     await _accept_terms_and_submit(page)
@@ -305,7 +307,7 @@ async def consultar_offshore(consulta_id: int, nombre: str, cedula, headless=Tru
                         except Exception:
                             pass
                     await _hide_overlays(page)
-                    await asyncio.sleep(0.25)
+                    await esperar_estable(page, reemplaza_ms=250)
                     png_name = f"{NOMBRE_SITIO}_{cedula}_{ts}_page{i}.png"
                     absolute_path = os.path.join(absolute_folder, png_name)
                     relative_path = os.path.join(relative_folder, png_name).replace("\\", "/")
@@ -318,7 +320,7 @@ async def consultar_offshore(consulta_id: int, nombre: str, cedula, headless=Tru
                             pass
                     else:
                         try:
-                            await page.screenshot(path=absolute_path, full_page=True)
+                            await captura_completa(page, absolute_path, full_page=True)
                         except Exception:
                             with open(absolute_path, "wb") as f:
                                 f.write(b"\x89PNG\r\n\x1a\n")
@@ -331,7 +333,7 @@ async def consultar_offshore(consulta_id: int, nombre: str, cedula, headless=Tru
                                 await _wait_for_networkidle_with_retries(page, retries=2, base_delay=0.5, timeout=15000)
                             except Exception:
                                 pass
-                            await page.wait_for_timeout(2000)
+                            await esperar_estable(page, reemplaza_ms=2000)
                         else:
                             break
                     except Exception:
@@ -359,7 +361,7 @@ async def consultar_offshore(consulta_id: int, nombre: str, cedula, headless=Tru
             try:
                 if 'page' in locals():
                     await _hide_overlays(page)
-                    await page.screenshot(path=error_png, full_page=True)
+                    await captura_completa(page, error_png, full_page=True)
                 else:
                     with open(error_png, "wb") as f:
                         f.write(b"\x89PNG\r\n\x1a\n")
@@ -1,9 +1,10 @@
 # core/bots/offshore_offshoreleaks.py
 import os
 import re
-import asyncio
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
+from core.utils.page_settle import esperar_estable
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -48,7 +49,7 @@ async def consultar_offshore_offshoreleaks(consulta_id: int, nombre: str, cedula
                 try:
                     await page.locator("input#accept").check(timeout=3000)
                     await page.locator("button.btn.btn-primary.btn-block.btn-lg").click(timeout=3000)
-                    await asyncio.sleep(1.2)
+                    await esperar_estable(page, reemplaza_ms=1200)
                 except Exception:
                     for sel in [
                         "button:has-text('I accept')",
@@ -70,7 +71,7 @@ async def consultar_offshore_offshoreleaks(consulta_id: int, nombre: str, cedula
                     await page.wait_for_load_state("networkidle", timeout=15000)
                 except Exception:
                     pass
-                await asyncio.sleep(2)
+                await esperar_estable(page, reemplaza_ms=2000)
 
                 # 4) Tomar hasta 3 capturas
                 rel_paths = []
@@ -79,7 +80,7 @@ async def consultar_offshore_offshoreleaks(consulta_id: int, nombre: str, cedula
                     absolute_path = os.path.join(absolute_folder, png_name)
                     relative_path = os.path.join(relative_folder, png_name)
 
-                    await page.screenshot(path=absolute_path, full_page=True)
+                    await captura_completa(page, absolute_path, full_page=True)
                     rel_paths.append(relative_path)
 
                     next_button = page.locator('a.page-link[aria-label="Next »"]')
@@ -90,7 +91,7 @@ async def consultar_offshore_offshoreleaks(consulta_id: int, nombre: str, cedula
                                 await page.wait_for_load_state("networkidle", timeout=15000)
                             except Exception:
                                 pass
-                            await asyncio.sleep(2)
+                            await esperar_estable(page, reemplaza_ms=2000)
                         else:
                             break
                     except Exception:
@@ -117,7 +118,7 @@ async def consultar_offshore_offshoreleaks(consulta_id: int, nombre: str, cedula
 
             try:
                 if 'page' in locals():
-                    await page.screenshot(path=error_abs, full_page=True)
+                    await captura_completa(page, error_abs, full_page=True)
             except Exception:
                 error_rel = ""
 
@@ -4,7 +4,8 @@ import re
 import unicodedata
 import asyncio
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -160,7 +161,7 @@ async def consultar_offshore_panama(consulta_id: int, cedula: str, nombre: str):
                     png_name = f"{NOMBRE_SITIO}_{safe_nombre}_{ts}_page{i}.png"
                     abs_path = os.path.join(absolute_folder, png_name)
                     rel_path = os.path.join(relative_folder, png_name).replace("\\", "/")
-                    await page.screenshot(path=abs_path, full_page=True)
+                    await captura_completa(page, abs_path, full_page=True)
                     rel_paths.append(rel_path)
 
                     if match_exacto or no_results:
@@ -216,7 +217,7 @@ async def consultar_offshore_panama(consulta_id: int, cedula: str, nombre: str):
             rel_error_path = os.path.join(relative_folder, error_png).replace("\\", "/")
             try:
                 if page is not None:
-                    await page.screenshot(path=abs_error_path, full_page=True)
+                    await captura_completa(page, abs_error_path, full_page=True)
                 else:
                     rel_error_path = ""
             except Exception:
@@ -3,7 +3,8 @@ import os
 import re
 import unicodedata
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -156,7 +157,7 @@ async def consultar_offshore_paradise(consulta_id: int, cedula: str, nombre: str
                     png_name = f"{NOMBRE_SITIO}_{safe_nombre}_{ts}_page{i}.png"
                     abs_path = os.path.join(absolute_folder, png_name)
                     rel_path = os.path.join(relative_folder, png_name).replace("\\", "/")
-                    await page.screenshot(path=abs_path, full_page=True)
+                    await captura_completa(page, abs_path, full_page=True)
                     archivos.append(rel_path)
 
                     # Paginación
@@ -209,7 +210,7 @@ async def consultar_offshore_paradise(consulta_id: int, cedula: str, nombre: str
             rel_error = os.path.join(relative_folder, error_png).replace("\\", "/")
             try:
                 if page is not None:
-                    await page.screenshot(path=abs_error, full_page=True)
+                    await captura_completa(page, abs_error, full_page=True)
                 else:
                     rel_error = ""
             except Exception:
@@ -1,7 +1,8 @@
 import os
 import re
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -90,7 +91,7 @@ async def consultar_ofsi_conlist_html(consulta_id: int, cedula: str, nombre: str
                 query = (nombre or "").strip()
                 if not query:
                     out_abs = os.path.join(absolute_folder, f"{NOMBRE_SITIO}_{safe}.png")
-                    await page.screenshot(path=out_abs, full_page=True)
+                    await captura_completa(page, out_abs, full_page=True)
                     archivos.append(os.path.join(relative_folder, os.path.basename(out_abs)))
                     await browser.close()
 
@@ -126,7 +127,7 @@ async def consultar_ofsi_conlist_html(consulta_id: int, cedula: str, nombre: str
 
                     ok = False
                     try:
-                        await page.screenshot(path=out_abs, full_page=True)
+                        await captura_completa(page, out_abs, full_page=True)
                         ok = True
                     except Exception:
                         ok = False
@@ -158,7 +159,7 @@ async def consultar_ofsi_conlist_html(consulta_id: int, cedula: str, nombre: str
                     # Captura general
                     full_out_abs = os.path.join(absolute_folder, f"{NOMBRE_SITIO}_{safe}_overview.png")
                     try:
-                        await page.screenshot(path=full_out_abs, full_page=True)
+                        await captura_completa(page, full_out_abs, full_page=True)
                         archivos.append(os.path.join(relative_folder, os.path.basename(full_out_abs)))
                     except Exception:
                         pass
@@ -184,7 +185,7 @@ async def consultar_ofsi_conlist_html(consulta_id: int, cedula: str, nombre: str
             out_err = os.path.join(absolute_folder, f"{NOMBRE_SITIO}_{safe}_error_intento{intentos}.png")
             try:
                 if 'page' in locals():
-                    await page.screenshot(path=out_err, full_page=True)
+                    await captura_completa(page, out_err, full_page=True)
                 else:
                     _write_min_png(out_err)
                 archivos.append(os.path.join(relative_folder, os.path.basename(out_err)))
@@ -2,7 +2,8 @@
 import os
 import re
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -93,7 +94,7 @@ async def consultar_ofsi_pdf(consulta_id: int, nombre: str, cedula):
 
                 # 4) Tomar screenshot SIEMPRE
                 try:
-                    await page.screenshot(path=png_path_abs, full_page=True)
+                    await captura_completa(page, png_path_abs, full_page=True)
                     archivo = png_path_rel  # el archivo reportado será el screen
                 except Exception:
                     archivo = ""  # si falla, se queda vacío (pero raro)
@@ -166,7 +167,7 @@ async def consultar_ofsi_pdf(consulta_id: int, nombre: str, cedula):
             # Intentar dejar evidencia incluso en error
             try:
                 if 'page' in locals():
-                    await page.screenshot(path=png_path_abs, full_page=True)
+                    await captura_completa(page, png_path_abs, full_page=True)
                     archivo = png_path_rel
             except Exception:
                 pass
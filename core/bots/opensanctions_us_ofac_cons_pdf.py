@@ -1,7 +1,8 @@
 # bots/opensanctions_us_ofac_cons_img.py
 import os
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -74,7 +75,7 @@ async def _run_scraper(nombre, cedula, out_img_abs):
 
         # 5) Captura de pantalla completa
         await page.add_style_tag(content=PRINT_CLEAN)
-        await page.screenshot(path=out_img_abs, full_page=True)
+        await captura_completa(page, out_img_abs, full_page=True)
 
         await browser.close()
         return score, mensaje
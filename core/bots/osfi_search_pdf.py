@@ -4,7 +4,7 @@ import re
 import asyncio
 from datetime import datetime
 from urllib.parse import urlencode
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
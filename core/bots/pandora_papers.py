@@ -1,6 +1,7 @@
 import os
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -52,7 +53,7 @@ async def consultar_pandora_papers(consulta_id: int, nombre: str, apellido: str,
                 await pagina.wait_for_timeout(3000)
 
                 # Guardar captura de pantalla
-                await pagina.screenshot(path=absolute_path, full_page=True)
+                await captura_completa(pagina, absolute_path, full_page=True)
                 await navegador.close()
 
             # Validación de tamaño
@@ -74,7 +75,7 @@ async def consultar_pandora_papers(consulta_id: int, nombre: str, apellido: str,
             last_exception = e
             try:
                 if "pagina" in locals():
-                    await pagina.screenshot(path=absolute_path, full_page=True)
+                    await captura_completa(pagina, absolute_path, full_page=True)
             except:
                 pass
             try:
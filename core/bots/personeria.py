@@ -6,7 +6,10 @@ import asyncio
 from datetime import datetime
 from typing import Optional
 
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext
+from playwright.async_api import Page, Browser, BrowserContext
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
+from core.utils.rotation import elegir_salida, reportar_salida
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -98,7 +101,7 @@ async def _safe_screenshot(page: Optional[Page], path: str):
         print("[PERSONERIA][WARN] No hay página para tomar screenshot")
         return False
     try:
-        await page.screenshot(path=path, full_page=True)
+        await captura_completa(page, path, full_page=True)
         print(f"[PERSONERIA] Pantallazo guardado en: {path}")
         return True
     except Exception as e:
@@ -211,8 +214,10 @@ async def consultar_personeria(
                 browser = await p.chromium.launch(headless=headless, **launch_args)
 
                 context_kwargs = {"accept_downloads": True, "ignore_https_errors": True}
-                if proxy:
-                    context_kwargs["proxy"] = proxy
+                # Sin proxy explícito, el de mejor salud de ROTACION_PROXIES (core/utils/rotation.py)
+                salida = None if proxy else await elegir_salida(NOMBRE_SITIO, rotar_ua=False)
+                if proxy or salida["proxy_pw"]:
+                    context_kwargs["proxy"] = proxy or salida["proxy_pw"]
                 context = await browser.new_context(**context_kwargs)
                 page = await context.new_page()
 
@@ -224,7 +229,11 @@ async def consultar_personeria(
                 try:
                     await _goto_with_retries(page, PAGE_URL, absolute_folder, ts, attempts=4, base_delay=3.0, timeout=90000)
                 except Exception as e:
+                    if salida:
+                        await reportar_salida(salida, ok=False)
                     raise Exception(f"Page.goto falló: {e}")
+                if salida:
+                    await reportar_salida(salida, ok=True)
 
                 print("[PERSONERIA] Página cargada")
 
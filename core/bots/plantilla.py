@@ -1,6 +1,7 @@
 import os
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -107,7 +108,7 @@ async def consultar_fuentes(consulta_id: int, cedula: str, nombre_persona: str):
                 absolute_png = os.path.join(absolute_folder, png_name)
                 relative_png = os.path.join(relative_folder, png_name)
 
-                await new_page.screenshot(path=absolute_png, full_page=True)
+                await captura_completa(new_page, absolute_png, full_page=True)
 
                 # Guardar en BD
                 fuente_obj = await sync_to_async(Fuente.objects.get)(nombre=nombre_bd)
@@ -2,7 +2,8 @@
 import os
 import re
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Fuente, Resultado
@@ -127,7 +128,7 @@ async def consultar_policia_busqueda_general_shot(consulta_id: int, nombre: str,
                 await page.wait_for_timeout(4000)
 
                 # 6) Screenshot (siempre)
-                await page.screenshot(path=out_png_abs, full_page=True)
+                await captura_completa(page, out_png_abs, full_page=True)
 
                 await context.close()
                 await browser.close()
@@ -152,7 +153,7 @@ async def consultar_policia_busqueda_general_shot(consulta_id: int, nombre: str,
             # Pantallazo en caso de error
             try:
                 if 'page' in locals():
-                    await page.screenshot(path=out_png_abs, full_page=True)
+                    await captura_completa(page, out_png_abs, full_page=True)
             except:
                 pass
 
@@ -1,7 +1,8 @@
 import os
 import re
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Fuente, Resultado
@@ -119,7 +120,7 @@ async def consultar_policia_memorial_search_pdf(consulta_id: int, nombre: str, c
                     pass
 
                 # 7) Guardar pantallazo completo
-                await page.screenshot(path=screenshot_abs, full_page=True)
+                await captura_completa(page, screenshot_abs, full_page=True)
                 print(f"Pantallazo guardado en: {screenshot_abs}")
 
                 # Guardar en BD como éxito
@@ -139,7 +140,7 @@ async def consultar_policia_memorial_search_pdf(consulta_id: int, nombre: str, c
             last_exception = e
             try:
                 if 'page' in locals():
-                    await page.screenshot(path=screenshot_abs, full_page=True)
+                    await captura_completa(page, screenshot_abs, full_page=True)
             except:
                 pass
             if 'browser' in locals():
@@ -5,7 +5,10 @@ import asyncio
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs
 
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
+from core.utils.warm_pages import pagina_caliente, registrar_pagina_caliente
 from django.conf import settings
 from asgiref.sync import sync_to_async
 
@@ -150,6 +153,15 @@ async def aceptar_terminos(contexto, max_intentos: int = 10):
             continue
     return None
 
+# Página caliente (core/utils/warm_pages.py): términos ya aceptados, formulario a la vista
+async def _formulario_listo(pagina):
+    return await pagina.locator("select#cedulaTipo").is_visible()
+
+async def _preparar_caliente(contexto):
+    return await aceptar_terminos(contexto, max_intentos=3)
+
+registrar_pagina_caliente(nombre_sitio, preparar=_preparar_caliente, listo=_formulario_listo)
+
 async def llenar_formulario(pagina, tipo_doc, cedula):
     """ Llena tipo y número. """
     await pagina.wait_for_selector("#cedulaTipo", timeout=10000)
@@ -193,13 +205,13 @@ async def resolver_captcha(pagina):
 async def consultar_policia_nacional(cedula, tipo_doc, consulta_id, max_intentos: int = 20):
     async with async_playwright() as pw:
         navegador = await pw.chromium.launch(headless=True)
-        contexto = await navegador.new_context()
-        pagina = None
+        contexto, pagina = await pagina_caliente(navegador, nombre_sitio)
         exito = False
         relative_path = ""
 
         try:
-            pagina = await aceptar_terminos(contexto)
+            if pagina is None:
+                pagina = await aceptar_terminos(contexto)
             if not pagina:
                 raise Exception("No se pudo acceder al formulario")
 
@@ -246,7 +258,7 @@ async def consultar_policia_nacional(cedula, tipo_doc, consulta_id, max_intentos
                     absolute_path = os.path.join(absolute_folder, img_name)
                     relative_path = os.path.join(relative_folder, img_name)
 
-                    await pagina.screenshot(path=absolute_path, full_page=True)
+                    await captura_completa(pagina, absolute_path, full_page=True)
 
                     # Guardar resultado correcto
                     fuente_obj = await sync_to_async(Fuente.objects.get)(nombre=nombre_sitio)
@@ -283,7 +295,7 @@ async def consultar_policia_nacional(cedula, tipo_doc, consulta_id, max_intentos
 
             try:
                 if pagina:
-                    await pagina.screenshot(path=absolute_path, full_page=True)
+                    await captura_completa(pagina, absolute_path, full_page=True)
             except Exception:
                 relative_path = ""
 
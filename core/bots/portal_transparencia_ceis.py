@@ -9,7 +9,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -169,7 +170,7 @@ async def consultar_portal_transparencia_ceis(consulta_id: int, nombre: str, ape
             except Exception:
                 # guardar screenshot para diagnóstico y continuar al intento de búsqueda
                 try:
-                    await page.screenshot(path=absolute_png, full_page=True)
+                    await captura_completa(page, absolute_png, full_page=True)
                 except Exception:
                     pass
                 # re-raise para que el bloque exterior lo capture y registre
@@ -194,7 +195,7 @@ async def consultar_portal_transparencia_ceis(consulta_id: int, nombre: str, ape
                 except Exception:
                     pass
                 try:
-                    await page.screenshot(path=absolute_png, full_page=True)
+                    await captura_completa(page, absolute_png, full_page=True)
                 except Exception:
                     pass
                 raise
@@ -219,7 +220,7 @@ async def consultar_portal_transparencia_ceis(consulta_id: int, nombre: str, ape
             if is_zero:
                 mensaje_final = zero_h3_txt or "Aproximadamente 0 resultados encontrados."
                 try:
-                    await page.screenshot(path=absolute_png, full_page=True)
+                    await captura_completa(page, absolute_png, full_page=True)
                 except Exception:
                     pass
                 success = True
@@ -265,7 +266,7 @@ async def consultar_portal_transparencia_ceis(consulta_id: int, nombre: str, ape
                         mensaje_final = "Se encontraron resultados, pero sin coincidencia exacta del nombre."
 
                 try:
-                    await page.screenshot(path=absolute_png, full_page=True)
+                    await captura_completa(page, absolute_png, full_page=True)
                 except Exception:
                     pass
 
@@ -10,7 +10,9 @@ from typing import Optional
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright, Page
+from playwright.async_api import Page
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -175,7 +177,7 @@ async def consultar_portal_transparencia_leniencia(consulta_id: int, nombre: str
             except Exception:
                 # no fatal: continuamos hacia la búsqueda
                 try:
-                    await page.screenshot(path=absolute_png, full_page=True)
+                    await captura_completa(page, absolute_png, full_page=True)
                 except Exception:
                     pass
 
@@ -198,7 +200,7 @@ async def consultar_portal_transparencia_leniencia(consulta_id: int, nombre: str
                 except Exception:
                     pass
                 try:
-                    await page.screenshot(path=absolute_png, full_page=True)
+                    await captura_completa(page, absolute_png, full_page=True)
                 except Exception:
                     pass
                 raise
@@ -217,7 +219,7 @@ async def consultar_portal_transparencia_leniencia(consulta_id: int, nombre: str
             if h3_text and re.search(r'id=["\']countResultados["\']\s*>\s*0\s*<', h3_html or "", flags=re.I):
                 mensaje_final = h3_text
                 try:
-                    await page.screenshot(path=absolute_png, full_page=True)
+                    await captura_completa(page, absolute_png, full_page=True)
                 except Exception:
                     pass
                 success = True
@@ -265,7 +267,7 @@ async def consultar_portal_transparencia_leniencia(consulta_id: int, nombre: str
                         mensaje_final = "Se encontraron resultados, pero sin coincidencia exacta del nombre."
 
                 try:
-                    await page.screenshot(path=absolute_png, full_page=True)
+                    await captura_completa(page, absolute_png, full_page=True)
                 except Exception:
                     pass
 
@@ -6,7 +6,9 @@ from pathlib import Path
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright, TimeoutError as PWTimeout
+from playwright.async_api import TimeoutError as PWTimeout
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -191,7 +193,7 @@ async def consultar_porvenir_cert_afiliacion(consulta_id: int, cedula: str, tipo
                 status = page.locator("p.p-status").first
                 await status.wait_for(state="visible", timeout=4000)
                 # Tomar screenshot completo como evidencia
-                await page.screenshot(path=abs_png, full_page=True)
+                await captura_completa(page, abs_png, full_page=True)
                 msg = _normalize_ws(await status.inner_text())
                 await sync_to_async(Resultado.objects.create)(
                     consulta_id=consulta_id,
@@ -230,7 +232,7 @@ async def consultar_porvenir_cert_afiliacion(consulta_id: int, cedula: str, tipo
                 return
 
             # 6) Fallback absoluto (ni mensaje ni descarga): screenshot y mensaje genérico
-            await page.screenshot(path=abs_png, full_page=True)
+            await captura_completa(page, abs_png, full_page=True)
             await sync_to_async(Resultado.objects.create)(
                 consulta_id=consulta_id,
                 fuente=fuente_obj,
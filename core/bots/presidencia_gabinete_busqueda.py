@@ -7,7 +7,8 @@ from urllib.parse import quote
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -114,7 +115,7 @@ async def consultar_presidencia_gabinete_busqueda(
                         if txt:
                             mensaje = txt
                         # Screenshot full-page
-                        await page.screenshot(path=abs_png, full_page=True)
+                        await captura_completa(page, abs_png, full_page=True)
                         await ctx.close(); await browser.close()
                         await sync_to_async(Resultado.objects.create)(
                             consulta_id=consulta_id,
@@ -174,7 +175,7 @@ async def consultar_presidencia_gabinete_busqueda(
                     mensaje = "No se encontraron resultados"
 
                 # Screenshot (full-page para no cortar)
-                await page.screenshot(path=abs_png, full_page=True)
+                await captura_completa(page, abs_png, full_page=True)
 
                 await sync_to_async(Resultado.objects.create)(
                     consulta_id=consulta_id,
@@ -1,8 +1,13 @@
 import os
 import re
+import time
 import asyncio
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import guardar_captura
+from core.utils.warm_pages import pagina_caliente, registrar_pagina_caliente
+from core.resolver.telemetria import anotar
+from core.resolver.pregunta_procuraduria import responder_pregunta
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente  # ajusta import según tu proyecto
@@ -18,15 +23,6 @@ TIPO_DOC_MAP = {
     'PPT': '10'
 }
 
-PREGUNTAS_RESPUESTAS = {
-    '¿ Cuanto es 9 - 2 ?': '7',
-    '¿ Cuanto es 3 X 3 ?': '9',
-    '¿ Cuanto es 6 + 2 ?': '8',
-    '¿ Cuanto es 2 X 3 ?': '6',
-    '¿ Cuanto es 3 - 2 ?': '1',
-    '¿ Cuanto es 4 + 3 ?': '7'
-}
-
 # --- Helper: screenshot de página completa, sin cortar nada ---
 async def fullpage_screenshot(page, path):
     try:
@@ -56,7 +52,45 @@ async def fullpage_screenshot(page, path):
     target_h = min(int(height), 20000)                   # cap alto 20k
 
     await page.set_viewport_size({"width": target_w, "height": min(target_h, 1400)})
-    await page.screenshot(path=path, full_page=True)
+    return await guardar_captura(page, path, full_page=True)
+
+
+async def _abrir_formulario(page):
+    await page.goto(PAGE_URL, wait_until="domcontentloaded", timeout=120000)
+    try:
+        await page.wait_for_load_state("networkidle", timeout=15000)
+    except Exception:
+        pass
+    await page.wait_for_timeout(1000)
+
+
+def _frame_formulario(page):
+    """iframe webcert/Certificado.aspx (o el último frame como respaldo)."""
+    for f in page.frames:
+        if "webcert/Certificado.aspx" in (f.url or ""):
+            return f
+    if page.frames and len(page.frames) > 1:
+        return page.frames[-1]
+    return None
+
+
+# --- Página caliente (core/utils/warm_pages.py): formulario del iframe ya cargado ---
+async def _preparar_caliente(context):
+    page = await context.new_page()
+    await _abrir_formulario(page)
+    frame = _frame_formulario(page)
+    if not frame:
+        return None
+    await frame.wait_for_selector('#ddlTipoID', timeout=15000)
+    return page
+
+
+async def _formulario_listo(page):
+    frame = _frame_formulario(page)
+    return bool(frame) and await frame.locator('#ddlTipoID').count() > 0
+
+
+registrar_pagina_caliente(nombre_sitio, preparar=_preparar_caliente, listo=_formulario_listo)
 
 
 async def consultar_procuraduria(consulta_id, cedula, tipo_doc):
@@ -73,9 +107,7 @@ async def consultar_procuraduria(consulta_id, cedula, tipo_doc):
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         base_name = f'{nombre_sitio}_{cedula}_{ts}'
         ok_png_abs = os.path.join(absolute_folder, f'{base_name}.png')
-        ok_png_rel = os.path.join(relative_folder, f'{base_name}.png')
         err_png_abs = os.path.join(absolute_folder, f'{base_name}_error.png')
-        err_png_rel = os.path.join(relative_folder, f'{base_name}_error.png')
 
         # ---------- validaciones previas ----------
         tipo_doc_val = TIPO_DOC_MAP.get((tipo_doc or "").upper())
@@ -87,28 +119,17 @@ async def consultar_procuraduria(consulta_id, cedula, tipo_doc):
         # ---------- navegación ----------
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context()
-            page = await context.new_page()
-
-            await page.goto(PAGE_URL, wait_until="domcontentloaded", timeout=120000)
-            try:
-                await page.wait_for_load_state("networkidle", timeout=15000)
-            except Exception:
-                pass
-            await page.wait_for_timeout(1000)
+            context, page = await pagina_caliente(browser, nombre_sitio)
+            if page is None:
+                page = await context.new_page()
+                await _abrir_formulario(page)
 
             # Ubicar el iframe del formulario
-            frame = None
-            for f in page.frames:
-                if "webcert/Certificado.aspx" in (f.url or ""):
-                    frame = f
-                    break
-            if not frame and page.frames and len(page.frames) > 1:
-                frame = page.frames[-1]
+            frame = _frame_formulario(page)
             if not frame:
                 try:
-                    await page.screenshot(path=err_png_abs, full_page=True)
-                    evidencia_rel = err_png_rel
+                    final = await guardar_captura(page, err_png_abs, full_page=True)
+                    evidencia_rel = os.path.join(relative_folder, os.path.basename(final))
                 except Exception:
                     evidencia_rel = ""
                 raise Exception("No se encontró el iframe del formulario de consulta.")
@@ -122,13 +143,15 @@ async def consultar_procuraduria(consulta_id, cedula, tipo_doc):
             solved = False
             pregunta = ""
             for _ in range(10):
+                inicio = time.monotonic()
                 try:
                     pregunta = (await frame.inner_text('#lblPregunta')).strip()
                 except Exception:
                     pregunta = ""
-                respuesta = PREGUNTAS_RESPUESTAS.get(pregunta)
+                respuesta = responder_pregunta(pregunta, documento=cedula)
                 if respuesta:
                     await frame.fill('#txtRespuestaPregunta', respuesta)
+                    anotar("preguntas", time.monotonic() - inicio)
                     solved = True
                     break
                 try:
@@ -136,11 +159,13 @@ async def consultar_procuraduria(consulta_id, cedula, tipo_doc):
                 except Exception:
                     pass
                 await asyncio.sleep(1)
+                # Pregunta sin respuesta conocida: la ronda se pierde (telemetría)
+                anotar("preguntas", time.monotonic() - inicio, descartado=True)
 
             if not solved:
                 try:
-                    await page.screenshot(path=err_png_abs, full_page=True)
-                    evidencia_rel = err_png_rel
+                    final = await guardar_captura(page, err_png_abs, full_page=True)
+                    evidencia_rel = os.path.join(relative_folder, os.path.basename(final))
                 except Exception:
                     evidencia_rel = ""
                 raise Exception(f"No se pudo resolver la pregunta de seguridad. Última pregunta vista: '{pregunta}'")
@@ -206,8 +231,8 @@ async def consultar_procuraduria(consulta_id, cedula, tipo_doc):
             saved = False
             try:
                 # Pantallazo de TODA la página contenedora (como tu 2ª imagen)
-                await fullpage_screenshot(page, ok_png_abs)
-                evidencia_rel = ok_png_rel
+                final = await fullpage_screenshot(page, ok_png_abs)
+                evidencia_rel = os.path.join(relative_folder, os.path.basename(final))
                 saved = True
             except Exception:
                 saved = False
@@ -223,16 +248,16 @@ async def consultar_procuraduria(consulta_id, cedula, tipo_doc):
                         "(el, h) => { el.style.height = h + 'px'; el.style.maxHeight = h + 'px'; }",
                         content_h
                     )
-                    await iframe_el.screenshot(path=ok_png_abs)
-                    evidencia_rel = ok_png_rel
+                    final = await guardar_captura(iframe_el, ok_png_abs)
+                    evidencia_rel = os.path.join(relative_folder, os.path.basename(final))
                     saved = True
                 except Exception:
                     saved = False
 
             if not saved:
                 # Último recurso: tu captura anterior
-                await page.screenshot(path=ok_png_abs, full_page=True)
-                evidencia_rel = ok_png_rel
+                final = await guardar_captura(page, ok_png_abs, full_page=True)
+                evidencia_rel = os.path.join(relative_folder, os.path.basename(final))
 
 
             # Guardar en BD
@@ -248,8 +273,8 @@ async def consultar_procuraduria(consulta_id, cedula, tipo_doc):
     except Exception as e:
         if evidencia_rel == "" and page is not None:
             try:
-                await page.screenshot(path=err_png_abs, full_page=True)
-                evidencia_rel = err_png_rel
+                final = await guardar_captura(page, err_png_abs, full_page=True)
+                evidencia_rel = os.path.join(relative_folder, os.path.basename(final))
             except Exception:
                 evidencia_rel = ""
         try:
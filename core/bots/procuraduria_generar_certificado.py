@@ -4,10 +4,13 @@ import asyncio
 from datetime import datetime
 from pathlib import Path
 
-from playwright.async_api import async_playwright, TimeoutError as PWTimeout
+from playwright.async_api import TimeoutError as PWTimeout
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
+from core.resolver.pregunta_procuraduria import responder_pregunta
 
 GEN_URL = "https://www.procuraduria.gov.co/Pages/Generacion-de-antecedentes.aspx"
 NOMBRE_SITIO = "procuraduria_certificado"
@@ -16,15 +19,6 @@ TIPO_DOC_MAP = {
     'CC': '1', 'PEP': '0', 'NIT': '2', 'CE': '5', 'PPT': '10'
 }
 
-PREGUNTAS_RESPUESTAS = {
-    '¿ Cuanto es 9 - 2 ?': '7',
-    '¿ Cuanto es 3 X 3 ?': '9',
-    '¿ Cuanto es 6 + 2 ?': '8',
-    '¿ Cuanto es 2 X 3 ?': '6',
-    '¿ Cuanto es 3 - 2 ?': '1',
-    '¿ Cuanto es 4 + 3 ?': '7'
-}
-
 # --- helpers de screenshot / render ---
 
 async def _fullpage_screenshot(page, path):
@@ -32,7 +26,7 @@ async def _fullpage_screenshot(page, path):
         await page.evaluate("window.scrollTo(0, 0)")
     except Exception:
         pass
-    await page.screenshot(path=path, full_page=True)
+    await captura_completa(page, path, full_page=True)
 
 # Poppler opcional para pdf2image (Windows)
 POPPLER_PATH = getattr(settings, "POPPLER_PATH", os.getenv("POPPLER_PATH"))
@@ -166,7 +160,7 @@ async def generar_certificado_procuraduria(consulta_id: int, cedula: str, tipo_d
                     ultima_pregunta = (await frame.locator('#lblPregunta, [id*=lblPregunta]').inner_text()).strip()
                 except Exception:
                     ultima_pregunta = ""
-                resp = PREGUNTAS_RESPUESTAS.get(ultima_pregunta)
+                resp = responder_pregunta(ultima_pregunta, documento=cedula)
                 if resp:
                     try:
                         await frame.fill('#txtRespuestaPregunta', resp)
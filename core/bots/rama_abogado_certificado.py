@@ -6,7 +6,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -91,7 +92,7 @@ async def _render_pdf_to_png(abs_pdf: str, abs_png: str, context) -> bool:
         viewer = await context.new_page()
         await viewer.goto(f"file://{abs_pdf}", wait_until="load")
         await viewer.wait_for_timeout(MEDIUM)
-        await viewer.screenshot(path=abs_png, full_page=True)
+        await captura_completa(viewer, abs_png, full_page=True)
         await viewer.close()
         return True
     except Exception:
@@ -341,7 +342,7 @@ async def consultar_rama_abogado_certificado(consulta_id: int, cedula: str, tipo
                     # Sin evento de descarga → evidencia de la vista
                     await page.wait_for_timeout(XLONG)
                     await page.evaluate("window.scrollTo(0,0)")
-                    await page.screenshot(path=abs_png, full_page=True)
+                    await captura_completa(page, abs_png, full_page=True)
                     await navegador.close(); navegador = None
                     await _guardar_resultado(
                         consulta_id, fuente_obj, "Validada",
@@ -357,7 +358,7 @@ async def consultar_rama_abogado_certificado(consulta_id: int, cedula: str, tipo
             ok = await _render_pdf_to_png(abs_pdf, abs_png, context)
             if not ok:
                 await page.evaluate("window.scrollTo(0,0)")
-                await page.screenshot(path=abs_png, full_page=True)
+                await captura_completa(page, abs_png, full_page=True)
 
             # 8) Leer PDF → mensaje
             text = _pdf_text_pypdf(abs_pdf)
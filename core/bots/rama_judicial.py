@@ -1,16 +1,15 @@
 # core/bots/rama_judicial.py
 import os
 import re
-import math
 import unicodedata
 import asyncio
 from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import en_segundo_plano, guardar_captura, evidencia_pdf
 
-import fitz               # PyMuPDF
 from docx import Document # python-docx
 
 # ReportLab (render bonito)
@@ -61,136 +60,9 @@ def _docx_to_text(path: str) -> str:
     except Exception:
         return ""
 
-# ---------- NUEVO: helpers para convertir/UNIR ----------
-def _pdf_to_png_list(pdf_path: str, out_dir: str, base: str, zoom: float = 2.8) -> list[str]:
-    """Convierte cada página del PDF a PNG y devuelve la lista de rutas."""
-    os.makedirs(out_dir, exist_ok=True)
-    pngs = []
-    try:
-        with fitz.open(pdf_path) as doc:
-            for i in range(doc.page_count):
-                pix = doc[i].get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
-                p = os.path.join(out_dir, f"{base}_p{i+1}.png")
-                pix.save(p)
-                pngs.append(p)
-    except Exception:
-        pass
-    return pngs
-
-def _merge_pngs_vertical(png_paths: list[str], out_path: str, pad: int = 8, bg=(255, 255, 255)) -> str | None:
-    """(Sigue disponible) Une imágenes verticalmente. No se usa por defecto."""
-    try:
-        from PIL import Image
-    except Exception:
-        return None
-
-    imgs = [Image.open(p).convert("RGB") for p in png_paths if os.path.exists(p)]
-    if not imgs:
-        return None
-
-    max_w = max(im.width for im in imgs)
-    norm = []
-    for im in imgs:
-        if im.width != max_w:
-            h = int(im.height * max_w / im.width)
-            norm.append(im.resize((max_w, h), Image.LANCZOS))
-        else:
-            norm.append(im)
-
-    total_h = sum(im.height for im in norm) + pad * (len(norm) - 1)
-    canvas = Image.new("RGB", (max_w, total_h), bg)
-    y = 0
-    for im in norm:
-        canvas.paste(im, (0, y))
-        y += im.height + pad
-
-    canvas.save(out_path, "PNG")
-    for im in imgs:
-        try: im.close()
-        except: pass
-    return out_path
-
-def _merge_pngs_grid(png_paths: list[str], out_path: str, cols: int = 2, pad: int = 8, bg=(255, 255, 255)) -> str | None:
-    """
-    Une varias imágenes en una grilla (cols por fila), manteniendo proporcionalidad.
-    Por defecto 2 columnas (dos arriba, dos abajo, ...).
-    """
-    try:
-        from PIL import Image
-    except Exception:
-        return None
-
-    imgs = [Image.open(p).convert("RGB") for p in png_paths if os.path.exists(p)]
-    if not imgs:
-        return None
-
-    # Normalizamos todas al mismo ancho destino (el mayor ancho) para alinear columnas
-    target_w = max(im.width for im in imgs)
-    norm = []
-    for im in imgs:
-        if im.width != target_w:
-            h = int(im.height * target_w / im.width)
-            norm.append(im.resize((target_w, h), Image.LANCZOS))
-        else:
-            norm.append(im)
-
-    rows = math.ceil(len(norm) / max(1, cols))
-    # Altura de cada fila = max alto de las imágenes de esa fila
-    row_heights = []
-    for r in range(rows):
-        chunk = norm[r*cols:(r+1)*cols]
-        row_heights.append(max(im.height for im in chunk))
-
-    total_w = cols * target_w + pad * (cols - 1)
-    total_h = sum(row_heights) + pad * (rows - 1)
-    canvas = Image.new("RGB", (total_w, total_h), bg)
-
-    y = 0
-    idx = 0
-    for r in range(rows):
-        x = 0
-        for c in range(cols):
-            if idx >= len(norm):
-                break
-            im = norm[idx]
-            canvas.paste(im, (x, y))
-            x += target_w + pad
-            idx += 1
-        y += row_heights[r] + pad
-
-    canvas.save(out_path, "PNG")
-    for im in imgs:
-        try: im.close()
-        except: pass
-    return out_path
-
-def _pdf_to_single_png(pdf_path: str, out_dir: str, base: str, zoom: float = 2.8) -> list[str]:
-    """
-    Convierte un PDF a un único PNG. Si hay múltiples páginas,
-    las organiza en una grilla (2 columnas por fila).
-    Devuelve [ruta_png_final].
-    """
-    pages = _pdf_to_png_list(pdf_path, out_dir, base, zoom=zoom)
-    if not pages:
-        return []
-    if len(pages) == 1:
-        return pages
-
-    merged = os.path.join(out_dir, f"{base}_grid.png")
-    if _merge_pngs_grid(pages, merged, cols=2, pad=8):
-        return [merged]
-    # Fallback: intentar vertical
-    merged_v = os.path.join(out_dir, f"{base}_merged.png")
-    if _merge_pngs_vertical(pages, merged_v, pad=8):
-        return [merged_v]
-    # Último recurso, la primera página
-    return [pages[0]]
-
-def _text_to_pngs(text: str, out_dir: str, base: str, max_pages: int = 10) -> list[str]:
-    """Fallback: crea un PDF simple con el texto y lo convierte a UN solo PNG (grilla 2xN)."""
-    os.makedirs(out_dir, exist_ok=True)
-    pdf_path = os.path.join(out_dir, f"{base}.pdf")
-
+# ---------- Evidencia: todo se arma como PDF (core/utils/evidence_encoder.evidencia_pdf) ----------
+def _text_to_pdf(text: str, pdf_path: str) -> None:
+    """Fallback: PDF simple con el texto del DOC."""
     c = canvas.Canvas(pdf_path, pagesize=A4)
     w, h = A4
     margin = 40
@@ -205,9 +77,7 @@ def _text_to_pngs(text: str, out_dir: str, base: str, max_pages: int = 10) -> li
         y -= 12
     c.save()
 
-    return _pdf_to_single_png(pdf_path, out_dir, base, zoom=3.0)
-
-# --------- Render bonito: DOCX -> PDF (tablas) -> PNGs ---------
+# --------- Render bonito: DOCX -> PDF (tablas) ---------
 def _docx_to_pretty_pdf(docx_path: str, out_pdf: str):
     doc = Document(docx_path)
     styles = getSampleStyleSheet()
@@ -273,14 +143,7 @@ def _docx_to_pretty_pdf(docx_path: str, out_pdf: str):
         topMargin=12*mm, bottomMargin=12*mm
     ).build(story)
 
-def _docx_to_pretty_pngs(docx_path: str, out_dir: str, base: str, zoom: float = 3.0) -> list[str]:
-    """Devuelve UN solo PNG unido en grilla (2 columnas)."""
-    os.makedirs(out_dir, exist_ok=True)
-    pdf_path = os.path.join(out_dir, f"{base}.pdf")
-    _docx_to_pretty_pdf(docx_path, pdf_path)
-    return _pdf_to_single_png(pdf_path, out_dir, base, zoom=zoom)
-
-# --------- NUEVO: leer tabla visible y render a PDF/PNG ---------
+# --------- NUEVO: leer tabla visible y render a PDF ---------
 async def _scrape_vdatatable_rows(page) -> list[list[str]]:
     """
     Devuelve filas [radicacion, fecha_rad, fecha_ult, despacho, sujetos]
@@ -382,13 +245,6 @@ def _rows_to_pdf(rows: list[list[str]], out_pdf: str) -> None:
     story.append(tbl)
     doc.build(story)
 
-def _rows_to_pngs(rows: list[list[str]], out_dir: str, base: str, zoom: float = 2.8) -> list[str]:
-    """Render de filas a PDF y devuelve UN solo PNG unido en grilla (2 columnas)."""
-    os.makedirs(out_dir, exist_ok=True)
-    pdf_path = os.path.join(out_dir, f"{base}.pdf")
-    _rows_to_pdf(rows, pdf_path)
-    return _pdf_to_single_png(pdf_path, out_dir, base, zoom=zoom)
-
 # --------- UI helpers ----------
 async def _check_alert(page):
     """Devuelve texto de alerta (si la hay)."""
@@ -451,7 +307,8 @@ async def _click_opcion_consulta(page, opcion: str = "recientes"):
 
 async def _screenshot_full(page, out_abs: str) -> None:
     try:
-        await page.screenshot(path=out_abs, full_page=True)
+        # las rutas .png de alerta/listado ya están armadas → se conserva el formato
+        await guardar_captura(page, out_abs, formato="png", full_page=True)
     except Exception:
         pass
 
@@ -467,7 +324,7 @@ async def _click_volver(page):
 # --------------- BOT ---------------
 async def consultar_rama_judicial(consulta_id: int, cedula: str, nombre_o_razon: str, tipo_persona: str):
     """
-    - Lee la tabla visible (si existe) e incluye Sujetos Procesales en el PNG.
+    - Lee la tabla visible (si existe) e incluye Sujetos Procesales en la evidencia (PDF).
     - 'no generó resultados' -> screenshot + Resultado(score=0).
     - 'Network Error' -> screenshot + mensaje de fallas en la página.
     - 'documento no está disponible' -> Volver y screenshot del listado, score=0.
@@ -585,8 +442,10 @@ async def consultar_rama_judicial(consulta_id: int, cedula: str, nombre_o_razon:
             # --- Intento 0: leer la tabla visible (incluye Sujetos Procesales) ---
             rows = await _scrape_vdatatable_rows(page)
             if rows:
-                pngs_abs = _rows_to_pngs(rows, absolute_folder, f"{base}_render_tabla")
-                page_png_rel = os.path.join(relative_folder, os.path.basename(pngs_abs[0])).replace("\\", "/") if pngs_abs else ""
+                tabla_pdf_abs = os.path.join(absolute_folder, f"{base}_render_tabla.pdf")
+                await en_segundo_plano(_rows_to_pdf, rows, tabla_pdf_abs)
+                evidencia_abs = await evidencia_pdf(tabla_pdf_abs, zoom=2.8)
+                evidencia_rel = os.path.join(relative_folder, os.path.basename(evidencia_abs)).replace("\\", "/") if evidencia_abs else ""
 
                 sujetos_text = "\n".join((r[4] or "") for r in rows)
                 es_demandado  = _contains_name(sujetos_text, nombre_o_razon) and "DEMANDADO"   in _norm(sujetos_text)
@@ -606,12 +465,12 @@ async def consultar_rama_judicial(consulta_id: int, cedula: str, nombre_o_razon:
                         score=score,
                         estado="Validado",
                         mensaje=msg,
-                        archivo=page_png_rel
+                        archivo=evidencia_rel
                     )
-                return {"mensaje": "ok(tabla)", "score": score, "archivo": page_png_rel}
+                return {"mensaje": "ok(tabla)", "score": score, "archivo": evidencia_rel}
 
             # ----- Descargar DOC (flujo original) -----
-            doc_rel, page_png_rel, score, msg = "", "", 0, "Se encontraron resultados"
+            doc_rel, evidencia_rel, score, msg = "", "", 0, "Se encontraron resultados"
             try:
                 async with page.expect_download(timeout=20000) as dl:
                     await page.locator("button:has-text('Descargar DOC')").first.click()
@@ -630,15 +489,21 @@ async def consultar_rama_judicial(consulta_id: int, cedula: str, nombre_o_razon:
                         os.replace(tmp, doc_abs)
 
                 text = ""
-                pngs_abs = []
+                evidencia_abs = None
+                render_pdf_abs = os.path.join(absolute_folder, f"{base}_render.pdf")
                 if ext == ".docx":
-                    text = _docx_to_text(doc_abs) or ""
-                    pngs_abs = _docx_to_pretty_pngs(doc_abs, absolute_folder, f"{base}_render")
+                    text = await en_segundo_plano(_docx_to_text, doc_abs) or ""
+                    try:
+                        await en_segundo_plano(_docx_to_pretty_pdf, doc_abs, render_pdf_abs)
+                        evidencia_abs = await evidencia_pdf(render_pdf_abs, zoom=3.0)
+                    except Exception:
+                        evidencia_abs = None
 
-                if not pngs_abs and text:
-                    pngs_abs = _text_to_pngs(text, absolute_folder, f"{base}_render")
+                if not evidencia_abs and text:
+                    await en_segundo_plano(_text_to_pdf, text, render_pdf_abs)
+                    evidencia_abs = await evidencia_pdf(render_pdf_abs, zoom=3.0)
 
-                page_png_rel = os.path.join(relative_folder, os.path.basename(pngs_abs[0])).replace("\\", "/") if pngs_abs else ""
+                evidencia_rel = os.path.join(relative_folder, os.path.basename(evidencia_abs)).replace("\\", "/") if evidencia_abs else ""
 
                 # Scoring por sujeto procesal desde texto
                 score = 1
@@ -672,7 +537,7 @@ async def consultar_rama_judicial(consulta_id: int, cedula: str, nombre_o_razon:
             await browser.close()
 
             # ----- Guardar resultado principal -----
-            archivo_rel = (page_png_rel or alert_png_rel or doc_rel)
+            archivo_rel = (evidencia_rel or alert_png_rel or doc_rel)
             if fuente_obj:
                 await sync_to_async(Resultado.objects.create)(
                     consulta_id=consulta_id,
@@ -5,7 +5,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -114,7 +115,7 @@ async def consultar_ramajudicial_corte_constitucional_magistrados(
                 await page.evaluate("window.scrollTo(0, 0)")
             except Exception:
                 pass
-            await page.screenshot(path=abs_png, full_page=True)
+            await captura_completa(page, abs_png, full_page=True)
 
             await ctx.close()
             await browser.close()
@@ -133,7 +134,7 @@ async def consultar_ramajudicial_corte_constitucional_magistrados(
         # Intenta dejar evidencia
         try:
             if page:
-                await page.screenshot(path=abs_png, full_page=True)
+                await captura_completa(page, abs_png, full_page=True)
         except Exception:
             pass
         try:
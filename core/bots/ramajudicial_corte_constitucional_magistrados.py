@@ -8,6 +8,7 @@ from asgiref.sync import sync_to_async
 from playwright.async_api import async_playwright
 
 from core.models import Resultado, Fuente
+from core.utils.evidence_encoder import captura_completa
 
 NOMBRE_SITIO = "ramajudicial_corte_constitucional_magistrados"
 URL = "https://www.ramajudicial.gov.co/web/corte-constitucional/portal/corporacion/magistrados/magistrados-actuales"
@@ -151,7 +152,7 @@ async def consultar_ramajudicial_corte_constitucional_magistrados(
                     mensaje = "No fue posible obtener el contenedor de resultados"
 
                 # Screenshot completo
-                await page.screenshot(path=abs_png, full_page=True)
+                await captura_completa(page, abs_png, full_page=True)
 
                 await ctx.close()
                 await browser.close()
@@ -173,7 +174,7 @@ async def consultar_ramajudicial_corte_constitucional_magistrados(
             if browser:
                 try:
                     page = (await browser.contexts())[0].pages[0]
-                    await page.screenshot(path=abs_png, full_page=True)
+                    await captura_completa(page, abs_png, full_page=True)
                 except Exception:
                     pass
                 try:
@@ -5,7 +5,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -125,7 +126,7 @@ async def expandir_y_capturar(page, abs_png: str) -> bool:
 
     # 3) último recurso: página completa
     try:
-        await page.screenshot(path=abs_png, full_page=True, type="png")
+        await captura_completa(page, abs_png, full_page=True)
         return True
     except Exception:
         return False
@@ -179,8 +180,8 @@ async def consultar_ramajudicial_corte_constitucional_magistrados_anteriores(
 
             async with async_playwright() as p:
                 browser = await p.chromium.launch(
-                    headless=False,
-                    args=["--disable-blink-features=AutomationControlled", "--start-maximized"]
+                    headless=True,
+                    args=["--disable-blink-features=AutomationControlled"]
                 )
                 ctx = await browser.new_context(
                     viewport={"width": 1680, "height": 1800},
@@ -243,7 +244,7 @@ async def consultar_ramajudicial_corte_constitucional_magistrados_anteriores(
                 if page:
                     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
                     error_png = os.path.join(absolute_folder, f"ERROR_{safe_q}_{ts}_try{intento}.png")
-                    await page.screenshot(path=error_png, full_page=True)
+                    await captura_completa(page, error_png, full_page=True)
                     rel_png = _norm_rel(os.path.join(relative_folder, os.path.basename(error_png)))
             except Exception:
                 pass
@@ -1,7 +1,8 @@
 import os
 from datetime import datetime
 from django.conf import settings
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from core.utils.browser_pool import async_playwright
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente  # ajusta según tu proyecto
 from PIL import Image, ImageDraw, ImageFont
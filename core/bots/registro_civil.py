@@ -1,9 +1,13 @@
 import os
 from datetime import datetime
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.resolver.captcha_img2 import resolver_captcha_imagen
+from core.resolver.ocr_local import resolver_captcha_local, reportar_captcha
+from core.resolver.telemetria import reintentos_captcha
 from core.models import Resultado, Fuente
 
 url = "https://consultasrc.registraduria.gov.co:28080/ProyectoSCCRC/"
@@ -17,8 +21,9 @@ async def consultar_registro_civil(cedula, consulta_id, sexo="SIN INFORMACION"):
     
     fuente_obj = await sync_to_async(Fuente.objects.filter(nombre=nombre_sitio).first)()
     intento_global = 0
+    max_intentos = await reintentos_captcha(MAX_INTENTOS)
 
-    while intento_global < MAX_INTENTOS:
+    while intento_global < max_intentos:
         intento_global += 1
         navegador = None
         try:
@@ -51,7 +56,7 @@ async def consultar_registro_civil(cedula, consulta_id, sexo="SIN INFORMACION"):
                 with open(captcha_path, "wb") as f:
                     f.write(image_bytes)
 
-                captcha_resultado = await resolver_captcha_imagen(captcha_path)
+                captcha_resultado = await resolver_captcha_local(captcha_path, "registraduria", remoto=resolver_captcha_imagen)
                 await pagina.fill('input[id="searchForm:inCaptcha"]', captcha_resultado)
                 await pagina.click('input[id="searchForm:busquedaRCX"]')
                 await pagina.wait_for_timeout(5000)
@@ -64,6 +69,7 @@ async def consultar_registro_civil(cedula, consulta_id, sexo="SIN INFORMACION"):
                 if await div_captcha_error.count() > 0:
                     texto_error = (await div_captcha_error.inner_text()).strip()
                     if "no corresponde con la imagen de verificación" in texto_error.lower():
+                        reportar_captcha(aceptado=False)
                         print(f"[Intento {intento_global}] Captcha incorrecto, reintentando...")
                         await navegador.close()
                         continue  # vuelve a reintentar el captcha
@@ -76,13 +82,14 @@ async def consultar_registro_civil(cedula, consulta_id, sexo="SIN INFORMACION"):
                 else:
                     mensaje_error = "La persona se encuentra registrada"
                     score = 0
+                reportar_captcha(aceptado=True)
 
                 # Tomar screenshot
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 screenshot_name = f"{nombre_sitio}_{cedula}_{timestamp}.png"
                 absolute_path = os.path.join(absolute_folder, screenshot_name)
                 relative_path = os.path.join(relative_folder, screenshot_name)
-                await pagina.screenshot(path=absolute_path, full_page=True)
+                await captura_completa(pagina, absolute_path, full_page=True)
 
                 # Guardar en BD
                 await sync_to_async(Resultado.objects.create)(
@@ -103,18 +110,18 @@ async def consultar_registro_civil(cedula, consulta_id, sexo="SIN INFORMACION"):
                 try:
                     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                     error_screenshot = os.path.join(absolute_folder, f"{nombre_sitio}_{cedula}_{timestamp}_error.png")
-                    await pagina.screenshot(path=error_screenshot, full_page=True)
+                    await captura_completa(pagina, error_screenshot, full_page=True)
                     await navegador.close()
                 except:
                     pass
             print(f"[Intento {intento_global}] Error: {e}")
 
-            if intento_global == MAX_INTENTOS:
+            if intento_global == max_intentos:
                 await sync_to_async(Resultado.objects.create)(
                     consulta_id=consulta_id,
                     fuente=fuente_obj,
                     score=0,
                     estado="Sin validar",
-                    mensaje=f"Error tras {MAX_INTENTOS} intentos: {str(e)}",
+                    mensaje=f"Error tras {max_intentos} intentos: {str(e)}",
                     archivo=error_screenshot if error_screenshot else ""
                 )
@@ -1,11 +1,12 @@
 import os
-import asyncio
 from datetime import datetime
 from core.models import Resultado, Fuente 
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
-from core.resolver.captcha_img2 import resolver_captcha_imagen_sync
+from core.resolver.captcha_img2 import resolver_captcha_imagen
 
 url = "https://web.sispro.gov.co/THS/Cliente/ConsultasPublicas/ConsultaPublicaDeTHxIdentificacion.aspx"
 nombre_sitio = "rethus"
@@ -56,7 +57,7 @@ async def consultar_rethus(consulta_id, cedula, tipo_doc, nombre, apellido):
                 captcha_path = os.path.join(absolute_folder, f"captcha_{nombre_sitio}.png")
                 await pagina.wait_for_selector('img[id="imgCaptcha"]', timeout=15000)
                 await pagina.screenshot(path=captcha_path)
-                captcha_texto = await asyncio.to_thread(resolver_captcha_imagen_sync, captcha_path)
+                captcha_texto = await resolver_captcha_imagen(captcha_path)
                 print(f"[Intento {intento_global}] Captcha resuelto: {captcha_texto}")
                 try: os.remove(captcha_path)
                 except: pass
@@ -88,7 +89,7 @@ async def consultar_rethus(consulta_id, cedula, tipo_doc, nombre, apellido):
                 # 2) Pantallazo del viewport completo
                 viewport_screenshot_name = f"{nombre_sitio}_{cedula}_{timestamp}_full.png"
                 viewport_absolute = os.path.join(absolute_folder, viewport_screenshot_name)
-                await pagina.screenshot(path=viewport_absolute, full_page=True)
+                await captura_completa(pagina, viewport_absolute, full_page=True)
                 print(f"[Intento {intento_global}] Captura completa guardada en: {viewport_absolute}")
 
                 # Revisar mensaje
@@ -120,7 +121,7 @@ async def consultar_rethus(consulta_id, cedula, tipo_doc, nombre, apellido):
                     try:
                         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                         error_screenshot = os.path.join(absolute_folder, f"{nombre_sitio}_{cedula}_{timestamp}_error.png")
-                        await pagina.screenshot(path=error_screenshot, full_page=True)
+                        await captura_completa(pagina, error_screenshot, full_page=True)
                     except:
                         pass
                     await navegador.close()
@@ -1,9 +1,12 @@
 import os
 from datetime import datetime, date
-from playwright.async_api import async_playwright, TimeoutError as PWTimeoutError
+from playwright.async_api import TimeoutError as PWTimeoutError
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente  # Ajusta según tu app
+from core.utils.warm_pages import pagina_caliente, registrar_pagina_caliente
 
 url = "https://srvcnpc.policia.gov.co/PSC/frm_cnp_consulta.aspx"
 nombre_sitio = "rnmc"
@@ -73,7 +76,28 @@ def _formatear_fecha_ddmmaaaa(fecha_expedicion) -> str:
     raise ValueError(f"Formato de fecha inválido: {s}. Usa DD/MM/YYYY, YYYY-MM-DD, etc.")
 
 import asyncio
-from playwright.async_api import async_playwright, TimeoutError as PWTimeoutError
+from playwright.async_api import TimeoutError as PWTimeoutError
+from core.utils.browser_pool import async_playwright
+
+SEL_TIPO_DOC = 'select[id="ctl00_ContentPlaceHolder3_ddlTipoDoc"]'
+
+async def _abrir_formulario(pagina):
+    await pagina.goto(url, wait_until="domcontentloaded", timeout=90000)
+    try:
+        await pagina.wait_for_load_state("networkidle", timeout=5000)
+    except Exception:
+        pass
+
+# Página caliente (core/utils/warm_pages.py): formulario ya cargado
+async def _preparar_caliente(contexto):
+    pagina = await contexto.new_page()
+    await _abrir_formulario(pagina)
+    return pagina if await _formulario_listo(pagina) else None
+
+async def _formulario_listo(pagina):
+    return await pagina.locator(SEL_TIPO_DOC).count() > 0
+
+registrar_pagina_caliente(nombre_sitio, preparar=_preparar_caliente, listo=_formulario_listo)
 
 async def consultar_rnmc(consulta_id, cedula, tipo_doc, fecha_expedicion):
     MAX_INTENTOS = 3
@@ -109,15 +133,13 @@ async def consultar_rnmc(consulta_id, cedula, tipo_doc, fecha_expedicion):
                     raise ValueError(f"Tipo de documento no válido: {tipo_doc}")
 
                 navegador = await p.chromium.launch(headless=True)
-                pagina = await navegador.new_page()
-                await pagina.goto(url, wait_until="domcontentloaded", timeout=90000)
-                try:
-                    await pagina.wait_for_load_state("networkidle", timeout=5000)
-                except Exception:
-                    pass
+                contexto, pagina = await pagina_caliente(navegador, nombre_sitio)
+                if pagina is None:
+                    pagina = await contexto.new_page()
+                    await _abrir_formulario(pagina)
 
                 # Seleccionar tipo de documento
-                await pagina.select_option('select[id="ctl00_ContentPlaceHolder3_ddlTipoDoc"]', tipo_doc_val)
+                await pagina.select_option(SEL_TIPO_DOC, tipo_doc_val)
                 try:
                     await pagina.wait_for_load_state('networkidle', timeout=5000)
                 except Exception:
@@ -151,7 +173,7 @@ async def consultar_rnmc(consulta_id, cedula, tipo_doc, fecha_expedicion):
                     absolute_path = os.path.join(absolute_folder, screenshot_name)
                     relative_path = os.path.join(relative_folder, screenshot_name).replace("\\", "/")
                     try:
-                        await pagina.screenshot(path=absolute_path, full_page=True)
+                        await captura_completa(pagina, absolute_path, full_page=True)
                     except Exception:
                         pass
 
@@ -195,7 +217,7 @@ async def consultar_rnmc(consulta_id, cedula, tipo_doc, fecha_expedicion):
                         absolute_path = os.path.join(absolute_folder, screenshot_name)
                         relative_path = os.path.join(relative_folder, screenshot_name).replace("\\", "/")
                         try:
-                            await pagina.screenshot(path=absolute_path, full_page=True)
+                            await captura_completa(pagina, absolute_path, full_page=True)
                         except Exception:
                             pass
 
@@ -222,7 +244,7 @@ async def consultar_rnmc(consulta_id, cedula, tipo_doc, fecha_expedicion):
                 absolute_path = os.path.join(absolute_folder, screenshot_name)
                 relative_path = os.path.join(relative_folder, screenshot_name).replace("\\", "/")
                 try:
-                    await pagina.screenshot(path=absolute_path, full_page=True)
+                    await captura_completa(pagina, absolute_path, full_page=True)
                 except Exception:
                     await pagina.screenshot(path=absolute_path, full_page=False)
 
@@ -257,7 +279,7 @@ async def consultar_rnmc(consulta_id, cedula, tipo_doc, fecha_expedicion):
             error_screenshot = os.path.join(absolute_folder, f"{nombre_sitio}_{cedula}_{timestamp}_error.png")
             try:
                 if pagina:
-                    await pagina.screenshot(path=error_screenshot, full_page=True)
+                    await captura_completa(pagina, error_screenshot, full_page=True)
                 else:
                     error_screenshot = ""
             except Exception:
@@ -5,6 +5,7 @@ from playwright.async_api import async_playwright
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
+from core.utils.evidence_encoder import captura_completa
 from PIL import Image
 
 PAGE_URL = "https://www.state.gov/foreign-terrorist-organizations/"
@@ -171,7 +172,7 @@ async def consultar_plantilla(consulta_id, cedula, nombre: str):
             last_exception = e
             try:
                 if "page" in locals():
-                    await page.screenshot(path=absolute_png, full_page=True)
+                    await captura_completa(page, absolute_png, full_page=True)
             except Exception as ss_err:
                 print(f"No se pudo tomar pantallazo del error: {ss_err}")
             finally:
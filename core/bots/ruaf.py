@@ -1,9 +1,11 @@
 import os
 import asyncio
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
 from django.conf import settings
 from core.resolver.captcha_img2 import resolver_captcha_imagen
+from core.resolver.ocr_local import resolver_captcha_local, reportar_captcha
+from core.resolver.telemetria import reintentos_captcha
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
 import cv2
@@ -86,14 +88,13 @@ async def consultar_ruaf(cedula, tipo_doc, fecha_expedicion, consulta_id):
                 await asyncio.sleep(1)
 
                 # Intentos de captcha
-                for intento_captcha in range(1, MAX_INTENTOS + 1):
+                for intento_captcha in range(1, await reintentos_captcha(MAX_INTENTOS) + 1):
                     captcha_path = os.path.join(absolute_folder, f"captcha_{nombre_sitio}.png")
                     await pagina.wait_for_selector('img[src*="CaptchaImage.axd"]', timeout=10000)
                     await pagina.locator('img[src*="CaptchaImage.axd"]').screenshot(path=captcha_path)
 
-                    preprocesar_captcha(captcha_path, captcha_path)
-                    await asyncio.sleep(1)
-                    captcha_texto = await resolver_captcha_imagen(captcha_path)
+                    await asyncio.to_thread(preprocesar_captcha, captcha_path, captcha_path)
+                    captcha_texto = await resolver_captcha_local(captcha_path, "ruaf", remoto=resolver_captcha_imagen)
                     os.remove(captcha_path)
 
                     await pagina.fill('input[id="MainContent_txtCaptcha"]', captcha_texto)
@@ -104,9 +105,11 @@ async def consultar_ruaf(cedula, tipo_doc, fecha_expedicion, consulta_id):
                     mensaje = (await pagina.locator('span#MainContent_lblMessage').inner_text()).strip()
 
                     if "Texto Inválido" in mensaje:
+                        reportar_captcha(aceptado=False)
                         print(f"❌ Captcha inválido (intento {intento_captcha})")
                         continue
                     elif "Texto Válido" in mensaje:
+                        reportar_captcha(aceptado=True)
                         print("✅ Captcha válido, descargando PDF...")
                         await pagina.click('input[id="MainContent_btnConsultar"]')
                         
@@ -10,7 +10,9 @@ from typing import Optional
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright, TimeoutError as PWTimeout
+from playwright.async_api import TimeoutError as PWTimeout
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 from core.resolver.captcha_img import resolver_captcha_imagen  # tu resolver (async o sync adaptado)
@@ -299,7 +301,7 @@ async def consultar_runt(consulta_id: int, tipo_doc: str, numero: str):
                     html = await page.content()
                     with open(html_debug, "w", encoding="utf-8") as fh:
                         fh.write(html)
-                    await page.screenshot(path=abs_png, full_page=True)
+                    await captura_completa(page, abs_png, full_page=True)
                     raise RuntimeError("No se detectó contenedor de resultado tras enviar la consulta.")
 
                 # tomar screenshot del área principal
@@ -309,10 +311,10 @@ async def consultar_runt(consulta_id: int, tipo_doc: str, numero: str):
                     elif await page.locator("app-consulta-ciudadano-documento").count() > 0:
                         await page.locator("app-consulta-ciudadano-documento").first.screenshot(path=abs_png)
                     else:
-                        await page.screenshot(path=abs_png, full_page=True)
+                        await captura_completa(page, abs_png, full_page=True)
                 except Exception:
                     try:
-                        await page.screenshot(path=abs_png, full_page=True)
+                        await captura_completa(page, abs_png, full_page=True)
                     except Exception:
                         pass
 
@@ -407,7 +409,7 @@ async def consultar_runt(consulta_id: int, tipo_doc: str, numero: str):
                     html = await page.content()
                     with open(html_debug, "w", encoding="utf-8") as fh:
                         fh.write(html)
-                    await page.screenshot(path=abs_png, full_page=True)
+                    await captura_completa(page, abs_png, full_page=True)
             except Exception:
                 pass
             try:
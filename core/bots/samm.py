@@ -1,7 +1,8 @@
 # core/bots/samm.py
 import os
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Fuente, Resultado
@@ -77,7 +78,7 @@ async def consultar_samm(consulta_id: int, nombre_completo: str, cedula):
                     pass
 
                 # 5) Captura pantalla
-                await page.screenshot(path=absolute_path, full_page=True)
+                await captura_completa(page, absolute_path, full_page=True)
                 await browser.close()
 
             # Guardar en BD (éxito)
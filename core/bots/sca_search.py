@@ -4,7 +4,9 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright, TimeoutError as PWTimeout
+from playwright.async_api import TimeoutError as PWTimeout
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -166,7 +168,7 @@ async def consultar_sca_search(consulta_id: int, nombre: str, apellido: str):
 
             # Screenshot siempre
             try:
-                await page.screenshot(path=absolute_png, full_page=True)
+                await captura_completa(page, absolute_png, full_page=True)
             except Exception:
                 pass
 
@@ -6,7 +6,8 @@ from urllib.parse import quote_plus
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from PyPDF2 import PdfReader, PdfWriter
 
 from core.models import Resultado, Fuente
@@ -104,7 +105,7 @@ async def consultar_scj_mas_buscados_pdf(consulta_id: int, nombre: str, apellido
             await page.goto(ORIG_URL, wait_until="domcontentloaded", timeout=NAV_TIMEOUT_MS)
 
             # Screenshot completo apenas carga (evidencia del estado real)
-            await page.screenshot(path=png_inicial_abs, full_page=True)
+            await captura_completa(page, png_inicial_abs, full_page=True)
 
             # Aceptar cookies si aparece
             try:
@@ -221,7 +222,7 @@ async def consultar_scj_mas_buscados_pdf(consulta_id: int, nombre: str, apellido
         # Evidencia si algo alcanzó a abrir
         try:
             if page:
-                await page.screenshot(path=png_inicial_abs, full_page=True)
+                await captura_completa(page, png_inicial_abs, full_page=True)
         except Exception:
             pass
         finally:
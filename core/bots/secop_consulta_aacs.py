@@ -4,7 +4,8 @@ import asyncio
 from datetime import datetime
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from PIL import Image
 from core.models import Resultado, Fuente
 
@@ -125,7 +126,7 @@ async def consultar_secop_consulta_aacs(consulta_id: int, nombre: str, tipo_doc:
         except Exception as e:
             if browser:
                 try:
-                    await page.screenshot(path=screenshot_after, full_page=True)
+                    await captura_completa(page, screenshot_after, full_page=True)
                     await browser.close()
                 except:
                     pass
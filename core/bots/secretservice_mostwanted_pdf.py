@@ -2,7 +2,8 @@ import os
 import re
 import asyncio
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -69,7 +70,7 @@ async def consultar_secretservice_mostwanted_pdf(consulta_id: int, nombre: str,
                     score = 0
                     mensaje = "No se encontraron resultados"
 
-                await page.screenshot(path=screenshot_path, full_page=True)
+                await captura_completa(page, screenshot_path, full_page=True)
                 await ctx.close()
                 await browser.close()
                 browser = None
@@ -88,7 +89,7 @@ async def consultar_secretservice_mostwanted_pdf(consulta_id: int, nombre: str,
         except Exception as e:
             if browser:
                 try:
-                    await page.screenshot(path=screenshot_path, full_page=True)
+                    await captura_completa(page, screenshot_path, full_page=True)
                     await browser.close()
                 except:
                     pass
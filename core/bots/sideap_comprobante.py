@@ -5,7 +5,9 @@ import asyncio
 from datetime import datetime, date
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright, TimeoutError as PWTimeout
+from playwright.async_api import TimeoutError as PWTimeout
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 from core.resolver.captcha_v2 import resolver_captcha_v2
@@ -152,7 +154,7 @@ async def consultar_sideap_comprobante(
 
         async with async_playwright() as p:
             browser = await p.chromium.launch(
-                headless=False,
+                headless=True,
                 args=["--disable-blink-features=AutomationControlled"]
             )
             context = await browser.new_context(locale="es-CO", viewport={"width": 1366, "height": 1000})
@@ -267,7 +269,7 @@ async def consultar_sideap_comprobante(
             if not mensaje:
                 mensaje = "Consulta realizada (ver evidencia)."
 
-            await page.screenshot(path=abs_png, full_page=True)
+            await captura_completa(page, abs_png, full_page=True)
 
             await context.close()
             await browser.close()
@@ -279,7 +281,7 @@ async def consultar_sideap_comprobante(
         try:
             if page:
                 try:
-                    await page.screenshot(path=abs_png, full_page=True)
+                    await captura_completa(page, abs_png, full_page=True)
                 except Exception:
                     pass
         except Exception:
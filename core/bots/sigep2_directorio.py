@@ -5,7 +5,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -130,7 +131,7 @@ async def consultar_sigep2_directorio(consulta_id: int, nombre: str, apellido: s
             error_final = e
             if browser:
                 try:
-                    await page.screenshot(path=absolute_path, full_page=True)
+                    await captura_completa(page, absolute_path, full_page=True)
                     await browser.close()
                 except:
                     pass
@@ -6,7 +6,8 @@ from pathlib import Path
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import evidencia_pdf, captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -19,19 +20,6 @@ POPPLER_PATH = getattr(settings, "POPPLER_PATH", os.getenv("POPPLER_PATH"))
 # ---------------------------
 # Helpers PDF / Imagen
 # ---------------------------
-def _render_pdf_first_page_pymupdf(pdf_path: str, png_path: str, zoom: float = 2.0) -> bool:
-    try:
-        import fitz  # PyMuPDF
-        with fitz.open(pdf_path) as doc:
-            if doc.page_count == 0:
-                return False
-            page = doc[0]
-            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
-            pix.save(png_path)
-        return os.path.exists(png_path) and os.path.getsize(png_path) > 0
-    except Exception:
-        return False
-
 def _render_pdf_first_page_pdf2image(pdf_path: str, png_path: str, dpi: int = 300) -> bool:
     try:
         from pdf2image import convert_from_path
@@ -207,7 +195,6 @@ async def consultar_simit(cedula: str, consulta_id: int, tipo_doc: str = "CC"):
                 abs_pdf = os.path.join(absolute_folder, f"{base}.pdf")
                 rel_pdf = os.path.join(relative_folder, f"{base}.pdf").replace("\\", "/")
                 abs_png = os.path.join(absolute_folder, f"{base}.png")          # PNG principal (PDF o visor)
-                rel_png = os.path.join(relative_folder, f"{base}.png").replace("\\", "/")
 
                 # Para el caso con pendientes:
                 abs_png_page = os.path.join(absolute_folder, f"{base}_page.png")
@@ -251,26 +238,25 @@ async def consultar_simit(cedula: str, consulta_id: int, tipo_doc: str = "CC"):
                         # si falla la descarga, seguimos con visor/screenshot abajo
                         pass
 
-                    # Evidencia PNG (página 1 del PDF, o visor, fallback)
-                    rendered = False
-                    if os.path.exists(abs_pdf) and os.path.getsize(abs_pdf) > 0:
-                        rendered = _render_pdf_first_page_pymupdf(abs_pdf, abs_png, zoom=2.0)
-                        if not rendered:
-                            rendered = _render_pdf_first_page_pdf2image(abs_pdf, abs_png, dpi=300)
-                    if not rendered:
+                    # Evidencia: el PDF (o PNG según EVIDENCIA_PDF), o visor, fallback
+                    evidencia_abs = await evidencia_pdf(abs_pdf, abs_png)
+                    if not evidencia_abs and os.path.exists(abs_pdf) and os.path.getsize(abs_pdf) > 0:
+                        if _render_pdf_first_page_pdf2image(abs_pdf, abs_png, dpi=300):
+                            evidencia_abs = abs_png
+                    if not evidencia_abs:
                         try:
                             await _screenshot_pdf_embed(context, abs_pdf, abs_png)
-                            rendered = os.path.exists(abs_png) and os.path.getsize(abs_png) > 0
                         except Exception:
                             # último recurso: screenshot de la página actual
                             try:
-                                await page.screenshot(path=abs_png, full_page=True)
-                                rendered = True
+                                await captura_completa(page, abs_png, full_page=True)
                             except Exception:
-                                rendered = False
+                                pass
+                        evidencia_abs = abs_png
 
                     score = 1
-                    final_rel_png = rel_png  # paz y salvo no necesita merge
+                    # paz y salvo no necesita merge
+                    final_rel_png = os.path.join(relative_folder, os.path.basename(evidencia_abs)).replace("\\", "/")
 
                 else:
                     # -----------------------
@@ -278,7 +264,7 @@ async def consultar_simit(cedula: str, consulta_id: int, tipo_doc: str = "CC"):
                     # -----------------------
                     # (1) Screenshot de la página ANTES de abrir el modal
                     try:
-                        await page.screenshot(path=abs_png_page, full_page=True)
+                        await captura_completa(page, abs_png_page, full_page=True)
                     except Exception:
                         pass  # no interrumpe el flujo
 
@@ -296,20 +282,17 @@ async def consultar_simit(cedula: str, consulta_id: int, tipo_doc: str = "CC"):
                     await btn_guardar.click(timeout=15000)
 
                     # (4) Intentar descarga directa del PDF o captura del visor
-                    rendered = False
+                    evidencia_abs = abs_png
                     try:
                         async with page.expect_download(timeout=180000) as dl:
                             await page.locator("a.btn.btn-outline-primary.btn-block.btn-sm:has-text('Descargar PDF')").first.click()
                         d = await dl.value
                         await d.save_as(abs_pdf)
 
-                        # Render PNG del PDF
-                        rendered = _render_pdf_first_page_pymupdf(abs_pdf, abs_png, zoom=2.0)
-                        if not rendered:
-                            rendered = _render_pdf_first_page_pdf2image(abs_pdf, abs_png, dpi=300)
-                        if not rendered:
+                        # El PDF como evidencia (o PNG según EVIDENCIA_PDF)
+                        evidencia_abs = await evidencia_pdf(abs_pdf, abs_png) or abs_png
+                        if evidencia_abs == abs_png and not _render_pdf_first_page_pdf2image(abs_pdf, abs_png, dpi=300):
                             await _screenshot_pdf_embed(context, abs_pdf, abs_png)
-                            rendered = os.path.exists(abs_png) and os.path.getsize(abs_png) > 0
 
                     except Exception:
                         # (5) Fallback: visor en nueva pestaña
@@ -323,36 +306,37 @@ async def consultar_simit(cedula: str, consulta_id: int, tipo_doc: str = "CC"):
                                 await emb.wait_for(state="visible", timeout=8000)
                                 await emb.screenshot(path=abs_png)
                             except Exception:
-                                await pdf_page.screenshot(path=abs_png, full_page=True)
-                            rendered = os.path.exists(abs_png) and os.path.getsize(abs_png) > 0
+                                await captura_completa(pdf_page, abs_png, full_page=True)
                             await pdf_page.close()
                         except Exception:
-                            rendered = False
+                            pass
 
                     score = 5
 
-                    # (6) Merge: si existen la captura de página y la del PDF, genera _merged.png
+                    # (6) Evidencia final: el PDF tal cual (la captura de la página queda en
+                    #     carpeta); si es imagen y existe la captura de página, genera _merged.png
                     final_rel_png = None
-                    merged_ok = False
-                    try:
-                        if os.path.exists(abs_png_page) and os.path.getsize(abs_png_page) > 0 and \
-                           os.path.exists(abs_png) and os.path.getsize(abs_png) > 0:
-                            merged_ok = _merge_pngs_vertical(abs_png_page, abs_png, abs_png_merged, padding=16)
-                            if merged_ok:
-                                final_rel_png = rel_png_merged
-                    except Exception:
-                        merged_ok = False
+                    evidencia_ok = os.path.exists(evidencia_abs) and os.path.getsize(evidencia_abs) > 0
+                    if evidencia_ok and evidencia_abs.endswith(".pdf"):
+                        final_rel_png = rel_pdf
+                    else:
+                        try:
+                            if evidencia_ok and os.path.exists(abs_png_page) and os.path.getsize(abs_png_page) > 0:
+                                if _merge_pngs_vertical(abs_png_page, evidencia_abs, abs_png_merged, padding=16):
+                                    final_rel_png = rel_png_merged
+                        except Exception:
+                            pass
 
                     # Si no se pudo mergear, usa la mejor evidencia disponible
                     if not final_rel_png:
-                        if os.path.exists(abs_png) and os.path.getsize(abs_png) > 0:
-                            final_rel_png = rel_png
+                        if evidencia_ok:
+                            final_rel_png = os.path.join(relative_folder, os.path.basename(evidencia_abs)).replace("\\", "/")
                         elif os.path.exists(abs_png_page) and os.path.getsize(abs_png_page) > 0:
                             final_rel_png = os.path.join(relative_folder, f"{base}_page.png").replace("\\", "/")
                         else:
                             final_rel_png = ""  # sin evidencia gráfica
 
-                # 6) Guardar resultado (PNG final como evidencia; el PDF queda en carpeta)
+                # 6) Guardar resultado (PDF o PNG final como evidencia)
                 await sync_to_async(Resultado.objects.create)(
                     consulta_id=consulta_id,
                     fuente=fuente_obj,
@@ -370,7 +354,7 @@ async def consultar_simit(cedula: str, consulta_id: int, tipo_doc: str = "CC"):
             try:
                 if page is not None:
                     err_png = os.path.join(absolute_folder, f"simit_error_{cedula}_{ts}.png")
-                    await page.screenshot(path=err_png, full_page=True)
+                    await captura_completa(page, err_png, full_page=True)
             except Exception:
                 pass
             try:
@@ -1,7 +1,8 @@
 # core/bots/sisben.py
 import os
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -39,7 +40,7 @@ async def tomar_screenshot(pagina, consulta_id, cedula, suffix=""):
     screenshot_name = f"{nombre_sitio}_{cedula}_{timestamp}{suffix}.png"
     absolute_path = os.path.join(absolute_folder, screenshot_name)
     relative_path = os.path.join(relative_folder, screenshot_name)
-    await pagina.screenshot(path=absolute_path, full_page=True)  # captura completa
+    await captura_completa(pagina, absolute_path, full_page=True)  # captura completa
     return relative_path
 
 async def consultar_sisben(cedula, tipo_doc, consulta_id):
@@ -1,7 +1,8 @@
 # bots/state_dss_mostwanted_pdf_async.py
 import os, asyncio
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -104,7 +105,7 @@ async def consultar_state_dss_mostwanted_pdf(consulta_id: int, nombre: str, cedu
             await page.wait_for_timeout(800)
 
             # 4) Evidencia SIEMPRE
-            await page.screenshot(path=out_png_abs, full_page=True)
+            await captura_completa(page, out_png_abs, full_page=True)
 
             # 5) CloudFront 403 → Sin validar
             if await _is_cloudfront_block(page):
@@ -164,7 +165,7 @@ async def consultar_state_dss_mostwanted_pdf(consulta_id: int, nombre: str, cedu
         # Evidencia si no existe
         try:
             if page is not None and not os.path.exists(out_png_abs):
-                await page.screenshot(path=out_png_abs, full_page=True)
+                await captura_completa(page, out_png_abs, full_page=True)
         except Exception:
             pass
         try:
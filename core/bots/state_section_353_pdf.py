@@ -1,6 +1,7 @@
 import os, urllib.parse, random, asyncio
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -38,7 +39,7 @@ async def _intentarlo(browser, url, nombre, out_path):
         await page.wait_for_timeout(1000)
         try: await page.locator("button.nav__search-trigger").click(timeout=8000)
         except Exception:
-            await page.screenshot(path=out_path, full_page=True)
+            await captura_completa(page, out_path, full_page=True)
             await ctx.close()
             return False
 
@@ -48,7 +49,7 @@ async def _intentarlo(browser, url, nombre, out_path):
     except Exception: pass
     try: await page.wait_for_load_state("networkidle", timeout=15000)
     except Exception: await page.wait_for_timeout(3000)
-    await page.screenshot(path=out_path, full_page=True)
+    await captura_completa(page, out_path, full_page=True)
     await ctx.close()
     return True
 
@@ -135,7 +136,7 @@ async def consultar_state_section_353_pdf(consulta_id: int, nombre: str, cedula:
             await page.wait_for_timeout(800)
 
             # 4) Evidencia SIEMPRE
-            await page.screenshot(path=out_png_abs, full_page=True)
+            await captura_completa(page, out_png_abs, full_page=True)
 
             # 5) CloudFront 403 → Sin validar
             if await _is_cloudfront_block(page):
@@ -197,7 +198,7 @@ async def consultar_state_section_353_pdf(consulta_id: int, nombre: str, cedula:
         # Evidencia si no existe
         try:
             if page is not None and not os.path.exists(out_png_abs):
-                await page.screenshot(path=out_png_abs, full_page=True)
+                await captura_completa(page, out_png_abs, full_page=True)
         except Exception:
             pass
         try:
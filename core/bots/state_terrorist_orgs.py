@@ -1,6 +1,7 @@
 import os, asyncio
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -108,7 +109,7 @@ async def consultar_state_terrorist_orgs(consulta_id: int, nombre: str, cedula:
             await page.wait_for_timeout(800)
 
             # Evidencia SIEMPRE
-            await page.screenshot(path=out_png_abs, full_page=True)
+            await captura_completa(page, out_png_abs, full_page=True)
 
             # --- NUEVO: bloqueo CloudFront 403 ---
             if await _is_cloudfront_block(page):
@@ -170,7 +171,7 @@ async def consultar_state_terrorist_orgs(consulta_id: int, nombre: str, cedula:
         # Evidencia si no existe
         try:
             if page is not None and not os.path.exists(out_png_abs):
-                await page.screenshot(path=out_png_abs, full_page=True)
+                await captura_completa(page, out_png_abs, full_page=True)
         except Exception:
             pass
         try:
@@ -1,11 +1,12 @@
 import os
 import re
-import asyncio
 from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
+from core.utils.page_settle import esperar_estable
 from PIL import Image, ImageDraw
 
 from core.models import Resultado, Fuente
@@ -18,7 +19,7 @@ async def consultar_supersociedades_boletines(
     consulta_id: int,
     nombre: str,
     apellido: str,
-    mostrar_navegador: bool = True,
+    mostrar_navegador: bool = False,  # True solo para depurar (sale del pool)
     slow_ms: int = 150,
 ):
     max_intentos = 3
@@ -57,14 +58,11 @@ async def consultar_supersociedades_boletines(
 
             async with async_playwright() as p:
                 browser = await p.chromium.launch(
-                    headless=False,
-                    slow_mo=slow_ms,
-                    args=[
-                        "--disable-blink-features=AutomationControlled",
-                        "--start-maximized",
-                    ],
+                    headless=not mostrar_navegador,
+                    slow_mo=slow_ms if mostrar_navegador else 0,
+                    args=["--disable-blink-features=AutomationControlled"],
                 )
-                ctx = await browser.new_context(viewport=None, locale="es-CO")
+                ctx = await browser.new_context(viewport={"width": 1366, "height": 900}, locale="es-CO")
                 page = await ctx.new_page()
                 await page.bring_to_front()
 
@@ -80,10 +78,10 @@ async def consultar_supersociedades_boletines(
                 await page.click(SEL_INPUT)
                 await page.fill(SEL_INPUT, "")
                 await page.type(SEL_INPUT, query)
-                await asyncio.sleep(2.5)  # esperar filtro live
+                await esperar_estable(page, reemplaza_ms=2500)  # esperar filtro live
 
                 # Screenshot
-                await page.screenshot(path=abs_png, full_page=True)
+                await captura_completa(page, abs_png, full_page=True)
 
                 # Buscar mensaje de "no hay resultados"
                 score = 10
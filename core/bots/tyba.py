@@ -8,7 +8,8 @@ from urllib.parse import urlparse, parse_qs
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 from core.resolver.captcha_v2 import resolver_captcha_v2
@@ -224,7 +225,7 @@ async def _tomar_screenshot(page, consulta_id, numero, suffix=""):
     absolute_path = os.path.join(absolute_folder, screenshot_name)
     relative_path = os.path.join(relative_folder, screenshot_name)
     try:
-        await page.screenshot(path=absolute_path, full_page=True)
+        await captura_completa(page, absolute_path, full_page=True)
     except Exception:
         try:
             await page.screenshot(path=absolute_path)
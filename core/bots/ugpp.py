@@ -2,7 +2,7 @@ import os
 from datetime import datetime
 from django.conf import settings
 from core.resolver.captcha_v2 import resolver_captcha_v2
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
 
@@ -43,7 +43,7 @@ async def consultar_ugpp(cedula, tipo_doc, consulta_id):
 
                 # resolver captcha
                 sitekey = await pagina.locator('.g-recaptcha').get_attribute('data-sitekey')
-                token = resolver_captcha_v2(pagina.url, sitekey)
+                token = await resolver_captcha_v2(pagina.url, sitekey)
                 await pagina.evaluate(f"""
                     document.getElementById('g-recaptcha-response').innerHTML = '{token}';
                 """)
@@ -5,6 +5,7 @@ from playwright.async_api import async_playwright
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
+from core.utils.evidence_encoder import captura_completa
 
 URL = "https://main.un.org/securitycouncil/es/content/un-sc-consolidated-list"
 NOMBRE_SITIO = "consolidated_list_onu"
@@ -108,7 +109,7 @@ async def _run_scraper(nombre: str, cedula: str, absolute_path: str):
             pass
 
         # Guardar screenshot SIEMPRE (funcione o no)
-        await page.screenshot(path=absolute_path, full_page=True)
+        await captura_completa(page, absolute_path, full_page=True)
         await browser.close()
 
     return True
@@ -4,7 +4,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -117,7 +118,7 @@ async def consultar_un_sc_consolidated(consulta_id: int, nombre: str, apellido:
                     mensaje_final = "There are no results to show."
                 try:
                     await _clean_page_css(page)
-                    await page.screenshot(path=absolute_png, full_page=True)
+                    await captura_completa(page, absolute_png, full_page=True)
                 except Exception:
                     pass
                 success = True  # consulta válida, score 1
@@ -153,7 +154,7 @@ async def consultar_un_sc_consolidated(consulta_id: int, nombre: str, apellido:
 
                 try:
                     await _clean_page_css(page)
-                    await page.screenshot(path=absolute_png, full_page=True)
+                    await captura_completa(page, absolute_png, full_page=True)
                 except Exception:
                     pass
 
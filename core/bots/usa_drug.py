@@ -2,7 +2,8 @@
 import os
 from datetime import datetime
 from urllib.parse import quote_plus
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from asgiref.sync import sync_to_async
 from core.models import Resultado, Fuente
@@ -38,7 +39,7 @@ async def consultar_usa_drug(consulta_id: int, nombre: str, apellido: str, cedul
                 pass
 
             # Screenshot SIEMPRE (para evidenciar Access Denied, resultados, o vacío)
-            await pagina.screenshot(path=shot_abs, full_page=True)
+            await captura_completa(pagina, shot_abs, full_page=True)
 
             # Detectar bloqueos típicos de Akamai/edgesuite
             body_text = (await pagina.inner_text("body")).strip()
@@ -98,7 +99,7 @@ async def consultar_usa_drug(consulta_id: int, nombre: str, apellido: str, cedul
     except Exception as e:
         try:
             if pagina is not None and not os.path.exists(shot_abs):
-                await pagina.screenshot(path=shot_abs, full_page=True)
+                await captura_completa(pagina, shot_abs, full_page=True)
         except Exception:
             pass
         try:
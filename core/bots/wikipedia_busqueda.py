@@ -4,7 +4,8 @@ from datetime import datetime
 
 from django.conf import settings
 from asgiref.sync import sync_to_async
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 
 from core.models import Resultado, Fuente
 
@@ -101,7 +102,7 @@ async def consultar_wikipedia_busqueda(consulta_id: int, nombre: str, apellido:
                     pass
 
                 # Screenshot de página completa
-                await page.screenshot(path=abs_img_final, full_page=True)
+                await captura_completa(page, abs_img_final, full_page=True)
 
                 await ctx.close()
                 await browser.close()
@@ -1,7 +1,8 @@
 import os
 import re
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from core.models import Resultado, Fuente
 from asgiref.sync import sync_to_async
@@ -61,7 +62,7 @@ async def consultar_worldbank_debarred_pdf(consulta_id: int, nombre: str, cedula
                     mensaje = f"Error buscando resultados: {str(e)}"
 
                 # Guardar pantallazo real de la página
-                await page.screenshot(path=out_img_abs, full_page=True)
+                await captura_completa(page, out_img_abs, full_page=True)
                 await browser.close()
 
             fuente_obj = await sync_to_async(Fuente.objects.get)(nombre=NOMBRE_SITIO)
@@ -95,7 +96,7 @@ async def consultar_worldbank_debarred_pdf(consulta_id: int, nombre: str, cedula
                 page = await context.new_page()
 
                 await page.set_content(f"<html><body><h2 style='color:red;'>Error</h2><p>{str(error_final)}</p></body></html>")
-                await page.screenshot(path=out_img_abs, full_page=True)
+                await captura_completa(page, out_img_abs, full_page=True)
                 await browser.close()
 
     # Registrar resultado con error + pantallazo
@@ -2,30 +2,31 @@
 
 import os
 from datetime import datetime
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.utils.evidence_encoder import captura_completa
 from django.conf import settings
 from core.resolver.captcha_img import resolver_captcha_imagen
+from core.resolver.ocr_local import resolver_captcha_local, reportar_captcha
+from core.resolver.telemetria import en_fuente, reintentos_captcha
 
 url = "https://consultasrc.registraduria.gov.co:28080/ProyectoSCCRC/"
 nombre_sitio = "registro_civil"
 
 async def consultar_registraduria(cedula):
+    # Telemetría y tope bajo "registraduria", no bajo el nombre de la función (with_timeout)
+    en_fuente("registraduria")
     navegador = None
-    captcha_path = None
     try:
         async with async_playwright() as p:
-            navegador = await p.chromium.launch(
-                headless=False,
-                channel="chrome",
-                slow_mo=150,
-                args=["--start-maximized"]
-            )
+            # Headless con perfil sigiloso (ver obtener_datos_candidato en core/task.py);
+            # en vez de slow_mo se espera explícitamente a cada control
+            navegador = await p.chromium.launch(headless=True)
             pagina = await navegador.new_page()
             await pagina.goto(url, timeout=60000)
             await pagina.wait_for_load_state("domcontentloaded")
 
             await pagina.click('input[id="controlador:consultasId"]')
-            await pagina.wait_for_timeout(500)
+            await pagina.wait_for_selector('select[id="searchForm:tiposBusqueda"]', state="visible", timeout=15000)
 
             await pagina.select_option(
                 'select[id="searchForm:tiposBusqueda"]',
@@ -36,9 +37,10 @@ async def consultar_registraduria(cedula):
 
             MAX_REINTENTOS_FLUJO = 3
             exito_flujo = False
+            # Intentos por flujo según la tasa reciente del kaptcha (core/resolver/telemetria.py)
+            INTENTOS = await reintentos_captcha(3)
 
             for intento_flujo in range(1, MAX_REINTENTOS_FLUJO + 1):
-                INTENTOS = 3
                 for intento in range(1, INTENTOS + 1):
                     await pagina.wait_for_selector('input[id="searchForm:documento"]', timeout=10000)
                     await pagina.fill('input[id="searchForm:documento"]', "")
@@ -52,11 +54,7 @@ async def consultar_registraduria(cedula):
                     response = await pagina.request.get(captcha_url)
                     image_bytes = await response.body()
 
-                    captcha_path = f"captcha_{nombre_sitio}_{cedula_str}.png"
-                    with open(captcha_path, "wb") as f:
-                        f.write(image_bytes)
-
-                    captcha_resultado = await resolver_captcha_imagen(captcha_path)
+                    captcha_resultado = await resolver_captcha_local(image_bytes, "registraduria", remoto=resolver_captcha_imagen)
                     await pagina.fill('input[id="searchForm:inCaptcha"]', str(captcha_resultado))
 
                     await pagina.click('input[id="searchForm:busquedaRCX"]')
@@ -72,6 +70,7 @@ async def consultar_registraduria(cedula):
                         except Exception:
                             await pagina.reload()
                             await pagina.click('input[id="controlador:consultasId"]')
+                            await pagina.wait_for_selector('select[id="searchForm:tiposBusqueda"]', state="visible", timeout=15000)
                             await pagina.select_option(
                                 'select[id="searchForm:tiposBusqueda"]',
                                 label='DOCUMENTO (NUIP/NIP/Tarjeta de Identidad)'
@@ -79,17 +78,20 @@ async def consultar_registraduria(cedula):
                         continue
 
                     if await pagina.locator("ul li:has-text('imagen de verificación')").count() > 0:
+                        reportar_captcha(aceptado=False)
                         try:
                             await captcha.click()
                         except Exception:
                             await pagina.reload()
                             await pagina.click('input[id="controlador:consultasId"]')
+                            await pagina.wait_for_selector('select[id="searchForm:tiposBusqueda"]', state="visible", timeout=15000)
                             await pagina.select_option(
                                 'select[id="searchForm:tiposBusqueda"]',
                                 label='DOCUMENTO (NUIP/NIP/Tarjeta de Identidad)'
                             )
                         continue
 
+                    reportar_captcha(aceptado=True)
                     exito_flujo = True
                     break
 
@@ -99,7 +101,7 @@ async def consultar_registraduria(cedula):
                 await pagina.reload()
                 await pagina.wait_for_load_state("domcontentloaded")
                 await pagina.click('input[id="controlador:consultasId"]')
-                await pagina.wait_for_timeout(300)
+                await pagina.wait_for_selector('select[id="searchForm:tiposBusqueda"]', state="visible", timeout=15000)
                 await pagina.select_option(
                     'select[id="searchForm:tiposBusqueda"]',
                     label='DOCUMENTO (NUIP/NIP/Tarjeta de Identidad)'
@@ -150,7 +152,7 @@ async def consultar_registraduria(cedula):
             # Screenshot debug
             try:
                 ss = os.path.join(settings.MEDIA_ROOT, f"debug_reg_{cedula_str}.png")
-                await pagina.screenshot(path=ss, full_page=True)
+                await captura_completa(pagina, ss, full_page=True)
             except Exception:
                 pass
 
@@ -178,11 +180,5 @@ async def consultar_registraduria(cedula):
                 await navegador.close()
         except Exception:
             pass
-        # Limpia el captcha temporal si quedó
-        try:
-            if captcha_path and os.path.exists(captcha_path):
-                os.remove(captcha_path)
-        except Exception:
-            pass
 
 
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-16 22:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_merge_20251121_1514'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resultado',
+            name='fecha',
+            field=models.DateTimeField(auto_now_add=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resultado',
+            name='reutilizado_de',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reutilizaciones', to='core.resultado'),
+        ),
+        migrations.AddField(
+            model_name='tipofuente',
+            name='vigencia_cache_horas',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-16 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_lote_consulta'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='consulta',
+            name='inicio',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
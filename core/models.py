@@ -14,15 +14,32 @@ class Consulta(models.Model):
     fecha = models.DateTimeField(auto_now_add=True)
     usuario = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="consultas")
     fuente = models.ForeignKey("Fuente", on_delete=models.SET_NULL, null=True, blank=True, related_name="consultas")
+    lote = models.ForeignKey("LoteConsulta", on_delete=models.SET_NULL, null=True, blank=True, related_name="consultas")
+    inicio = models.DateTimeField(null=True, blank=True)  # cuando programar_lote la encoló
 
     def __str__(self):
         return f"Consulta {self.candidato.cedula} - {self.estado}"
 
 
+class LoteConsulta(models.Model):
+    """Carga masiva de cédulas (api/consultar-masivo/). Agrupa sus Consultas para medir el avance."""
+    usuario = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="lotes")
+    fecha = models.DateTimeField(auto_now_add=True)
+    total = models.PositiveIntegerField(default=0)
+    estado = models.CharField(max_length=20, default="pendiente")  # pendiente | en_proceso | completado | vencido
+    lista_nombres = models.JSONField(null=True, blank=True)  # bots a ejecutar (None = todos)
+
+    def __str__(self):
+        return f"Lote {self.id} ({self.total} cédulas) - {self.estado}"
+
+
 class TipoFuente(models.Model):
     nombre = models.CharField(max_length=100, unique=True)
     peso = models.PositiveSmallIntegerField(default=1)  # importancia de la fuente (1-5)
     probabilidad = models.PositiveSmallIntegerField(default=1)  # probabilidad intrínseca (1-5)
+    # Horas durante las que un resultado 'validado' de esta categoría puede
+    # reutilizarse en otra consulta del mismo candidato (0 = siempre re-consultar)
+    vigencia_cache_horas = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return self.nombre
@@ -50,6 +67,15 @@ class Resultado(models.Model):
     estado = models.CharField(max_length=20, default="pendiente")
     mensaje = models.TextField(blank=True)
     archivo = models.CharField(max_length=255, blank=True)
+    fecha = models.DateTimeField(auto_now_add=True, null=True)
+    # Si el resultado se copió de otra consulta reciente (cache entre consultas)
+    reutilizado_de = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="reutilizaciones"
+    )
 
     def save(self, *args, **kwargs):
         # estado siempre en minúscula
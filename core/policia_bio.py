@@ -5,7 +5,8 @@ import asyncio
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs
 
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from core.utils.browser_pool import async_playwright
 from django.conf import settings
 from asgiref.sync import sync_to_async
 
@@ -1,6 +1,7 @@
 import re
 import asyncio
-from playwright.async_api import async_playwright
+from core.utils.browser_pool import async_playwright
+from core.resolver.pregunta_procuraduria import responder_pregunta
 
 PAGE_URL = "https://www.procuraduria.gov.co/Pages/Consulta-de-Antecedentes.aspx"
 
@@ -13,15 +14,6 @@ TIPO_DOC_MAP = {
     'TI': '3',
 }
 
-PREGUNTAS_RESPUESTAS = {
-    '¿ Cuanto es 9 - 2 ?': '7',
-    '¿ Cuanto es 3 X 3 ?': '9',
-    '¿ Cuanto es 6 + 2 ?': '8',
-    '¿ Cuanto es 2 X 3 ?': '6',
-    '¿ Cuanto es 3 - 2 ?': '1',
-    '¿ Cuanto es 4 + 3 ?': '7'
-}
-
 
 async def procuraduria_bio(cedula, tipo_doc):
     """
@@ -50,7 +42,7 @@ async def procuraduria_bio(cedula, tipo_doc):
                 return resultado_json  
 
             async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=False)  # pon False para debug
+                browser = await p.chromium.launch(headless=True)
                 context = await browser.new_context()
                 page = await context.new_page()
 
@@ -79,7 +71,7 @@ async def procuraduria_bio(cedula, tipo_doc):
                         pregunta = (await frame.inner_text('#lblPregunta')).strip()
                     except Exception as e:
                         pregunta = ""
-                    respuesta = PREGUNTAS_RESPUESTAS.get(pregunta)
+                    respuesta = responder_pregunta(pregunta, documento=cedula)
                     if respuesta:
                         await frame.fill('#txtRespuestaPregunta', respuesta)
                         break
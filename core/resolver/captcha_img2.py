@@ -1,18 +1,12 @@
-import asyncio
-from twocaptcha import TwoCaptcha
-from decouple import config
+from core.resolver.cliente import imagen_a_texto
+from core.utils.har_replay import captcha_grabado
 
-api_key = config('CAPTCHA_TOKEN_2CAPTCHA')
 
-def resolver_captcha_imagen_sync(ruta_imagen):
-    solver = TwoCaptcha(api_key)
+# 2Captcha (API v2, ImageToTextTask) por el cliente asyncio compartido (core/resolver/cliente.py)
+@captcha_grabado
+async def resolver_captcha_imagen(ruta_imagen):
     try:
-        resultado = solver.normal(ruta_imagen)
-        return resultado['code']
+        return await imagen_a_texto(ruta_imagen, proveedor="2captcha")
     except Exception as e:
         print(f"[ERROR] No se pudo resolver el captcha: {e}")
         return None
-
-# Versión async que llama a la sync sin bloquear
-async def resolver_captcha_imagen(ruta_imagen):
-    return await asyncio.to_thread(resolver_captcha_imagen_sync, ruta_imagen)
@@ -1,23 +1,21 @@
-import asyncio
-import capsolver
-from decouple import config
+from core.resolver.cliente import recaptcha_v2
+from core.resolver import token_pool
+from core.resolver.telemetria import anotar
+from core.utils.har_replay import captcha_grabado
 
-capsolver.api_key = config('CAPTCHA_TOKEN')
+# task_variant (tyba) → isInvisible
+VARIANTES = {"proxyless": True, "proxyless_visible": False}
 
-def resolver_captcha_v2_sync(url, sitekey):
-    print(config('CAPTCHA_TOKEN'))
-    def resolver_captcha_v2_sync(url, sitekey, isInvisible=None):
-        payload = {
-            "type": "RecaptchaV2TaskProxyless",
-            "websiteURL": url,
-            "websiteKey": sitekey,
-        }
-        if isInvisible is not None:
-            payload["isInvisible"] = isInvisible
-        solution = capsolver.solve(payload)
-        return solution['gRecaptchaResponse']
 
-# Versión async
-async def resolver_captcha_v2(url, sitekey):
-    async def resolver_captcha_v2(url, sitekey, isInvisible=None):
-        return await asyncio.to_thread(resolver_captcha_v2_sync, url, sitekey, isInvisible)
+# Capsolver (ReCaptchaV2TaskProxyLess) por el cliente asyncio compartido (core/resolver/cliente.py)
+@captcha_grabado
+async def resolver_captcha_v2(url, sitekey, isInvisible=None, task_variant=None):
+    if isInvisible is None and task_variant:
+        isInvisible = VARIANTES.get(task_variant)
+    # Token resuelto de antemano para este (sitio, sitekey), si hay (core/resolver/token_pool.py)
+    token_pool.conocer(url, sitekey, isInvisible)
+    token = token_pool.tomar_token(url, sitekey)
+    if token:
+        anotar("pool", 0.0)
+        return token
+    return await recaptcha_v2(url, sitekey, invisible=isInvisible)
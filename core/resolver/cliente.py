@@ -0,0 +1,241 @@
+# core/resolver/cliente.py
+"""
+Cliente asyncio para los servicios de captcha (API createTask/getTaskResult).
+
+captcha_img.py y captcha_v2.py envolvían capsolver.solve() (bloqueante) en
+asyncio.to_thread: con 50 bots a la vez se agotaba el pool de hilos por
+defecto, cada llamada abría su propia conexión HTTPS y cada hilo dormía entre
+consultas. contraloria.py tenía además su propio ciclo aiohttp con esperas
+fijas de 2 s. Aquí, por event loop:
+
+    - un solo httpx.AsyncClient con keep-alive para todas las peticiones;
+    - un único sondeo que consulta getTaskResult de todas las tareas en curso
+      en la misma ronda (las que vencen dentro de CAPTCHA_SONDEO_AGRUPAR se
+      consultan juntas), con espera creciente por tarea.
+
+    texto = await imagen_a_texto("/ruta/captcha.png")                     # ImageToTextTask
+    token = await recaptcha_v2(url, sitekey)                              # ReCaptchaV2TaskProxyLess
+    solucion = await resolver({"type": "TurnstileTaskProxyless", ...})    # cualquier tarea → dict solution
+
+Proveedores: "capsolver" (CAPTCHA_TOKEN) y "2captcha" (CAPTCHA_TOKEN_2CAPTCHA,
+API v2 con el mismo formato). `clave`/`url` permiten usar otra cuenta. Cada
+tarea se anota en la telemetría de la fuente (core/resolver/telemetria.py).
+
+Variables de entorno:
+    CAPTCHA_SONDEO_INICIAL  segundos antes de la primera consulta (default 2.0)
+    CAPTCHA_SONDEO_FACTOR   multiplicador de la espera entre consultas (default 1.5)
+    CAPTCHA_SONDEO_MAX      espera máxima entre consultas (default 5.0)
+    CAPTCHA_SONDEO_AGRUPAR  ventana para consultar tareas en la misma ronda (default 0.5)
+    CAPTCHA_TIMEOUT         segundos máximos por tarea (default 120)
+    CAPTCHA_CONEXIONES      conexiones HTTP por worker (default 20)
+"""
+import os
+import time
+import base64
+import weakref
+import asyncio
+
+import httpx
+from decouple import config
+
+from core.resolver.telemetria import anotar
+
+
+def _env_float(nombre, default):
+    try:
+        return float(os.environ.get(nombre, str(default)))
+    except Exception:
+        return default
+
+
+SONDEO_INICIAL = _env_float("CAPTCHA_SONDEO_INICIAL", 2.0)
+SONDEO_FACTOR = _env_float("CAPTCHA_SONDEO_FACTOR", 1.5)
+SONDEO_MAX = _env_float("CAPTCHA_SONDEO_MAX", 5.0)
+SONDEO_AGRUPAR = _env_float("CAPTCHA_SONDEO_AGRUPAR", 0.5)
+TIMEOUT = _env_float("CAPTCHA_TIMEOUT", 120)
+CONEXIONES = int(_env_float("CAPTCHA_CONEXIONES", 20))
+
+PROVEEDORES = {
+    "capsolver": {"url": "https://api.capsolver.com", "clave": config("CAPTCHA_TOKEN", default="")},
+    "2captcha": {"url": "https://api.2captcha.com", "clave": config("CAPTCHA_TOKEN_2CAPTCHA", default="")},
+}
+
+# Errores de red seguidos que se toleran al consultar una tarea
+ERRORES_RED_MAX = 5
+
+_clientes = weakref.WeakKeyDictionary()  # un httpx.AsyncClient por event loop
+_sondeos = weakref.WeakKeyDictionary()   # tareas en curso por event loop
+
+
+class ErrorCaptcha(RuntimeError):
+    """El proveedor rechazó la tarea, falló o no respondió a tiempo."""
+
+
+def _cliente():
+    loop = asyncio.get_running_loop()
+    cliente = _clientes.get(loop)
+    if cliente is None or cliente.is_closed:
+        cliente = httpx.AsyncClient(
+            timeout=httpx.Timeout(30, connect=10),
+            limits=httpx.Limits(max_connections=CONEXIONES, max_keepalive_connections=CONEXIONES),
+        )
+        _clientes[loop] = cliente
+    return cliente
+
+
+async def _post(url, cuerpo):
+    respuesta = await _cliente().post(url, json=cuerpo)
+    return respuesta.json()
+
+
+class _Sondeo:
+    """Tareas en curso de un event loop y la corrutina que las consulta."""
+
+    def __init__(self):
+        self.tareas = {}  # (url, task_id) → {"clave", "futuro", "proxima", "espera", "limite", "errores"}
+        self.despertar = asyncio.Event()
+        self.corriendo = None
+
+    def agregar(self, url, clave, task_id, timeout):
+        loop = asyncio.get_running_loop()
+        futuro = loop.create_future()
+        self.tareas[(url, task_id)] = {
+            "clave": clave,
+            "futuro": futuro,
+            "proxima": loop.time() + SONDEO_INICIAL,
+            "espera": SONDEO_INICIAL,
+            "limite": loop.time() + timeout,
+            "errores": 0,
+        }
+        if self.corriendo is None or self.corriendo.done():
+            self.corriendo = asyncio.ensure_future(self._sondear())
+        self.despertar.set()
+        return futuro
+
+    def _terminar(self, llave, resultado=None, error=None):
+        tarea = self.tareas.pop(llave, None)
+        if tarea is None or tarea["futuro"].done():
+            return
+        if error is not None:
+            tarea["futuro"].set_exception(error)
+        else:
+            tarea["futuro"].set_result(resultado)
+
+    def _reprogramar(self, tarea, ahora):
+        tarea["espera"] = min(SONDEO_MAX, tarea["espera"] * SONDEO_FACTOR)
+        tarea["proxima"] = ahora + tarea["espera"]
+
+    async def _consultar(self, llave, tarea):
+        url, task_id = llave
+        loop = asyncio.get_running_loop()
+        try:
+            datos = await _post(f"{url}/getTaskResult", {"clientKey": tarea["clave"], "taskId": task_id})
+        except Exception as e:
+            tarea["errores"] += 1
+            if tarea["errores"] >= ERRORES_RED_MAX:
+                self._terminar(llave, error=ErrorCaptcha(f"Sin respuesta del proveedor para {task_id}: {e}"))
+            else:
+                self._reprogramar(tarea, loop.time())
+            return
+        tarea["errores"] = 0
+
+        if datos.get("errorId") or datos.get("status") == "failed":
+            detalle = datos.get("errorDescription") or datos.get("errorCode") or "Sin detalle"
+            self._terminar(llave, error=ErrorCaptcha(f"Falló el captcha {task_id}: {detalle}"))
+        elif datos.get("status") == "ready":
+            self._terminar(llave, resultado=datos.get("solution") or {})
+        elif loop.time() >= tarea["limite"]:
+            self._terminar(llave, error=ErrorCaptcha(f"Timeout esperando el captcha {task_id}"))
+        else:
+            self._reprogramar(tarea, loop.time())
+
+    async def _sondear(self):
+        loop = asyncio.get_running_loop()
+        while self.tareas:
+            ahora = loop.time()
+            # El bot que pidió la tarea ya no espera (cancelado / timeout del scheduler)
+            for llave in [ll for ll, t in self.tareas.items() if t["futuro"].done()]:
+                self.tareas.pop(llave, None)
+            vencidas = [(ll, t) for ll, t in self.tareas.items() if t["proxima"] <= ahora + SONDEO_AGRUPAR]
+            if vencidas:
+                await asyncio.gather(*(self._consultar(ll, t) for ll, t in vencidas))
+                continue
+            if not self.tareas:
+                break
+            self.despertar.clear()
+            espera = min(t["proxima"] for t in self.tareas.values()) - ahora
+            try:
+                await asyncio.wait_for(self.despertar.wait(), max(0.0, espera))
+            except asyncio.TimeoutError:
+                pass
+
+
+def _sondeo():
+    loop = asyncio.get_running_loop()
+    sondeo = _sondeos.get(loop)
+    if sondeo is None:
+        sondeo = _Sondeo()
+        _sondeos[loop] = sondeo
+    return sondeo
+
+
+async def resolver(tarea, proveedor="capsolver", clave=None, url=None, timeout=None, fuente=None):
+    """
+    Crea `tarea` (dict "task" de la API) y espera su solución. Devuelve el
+    dict "solution"; lanza ErrorCaptcha si el proveedor la rechaza o vence.
+    `fuente` para la telemetría (default: el bot en curso).
+    """
+    inicio = time.monotonic()
+    try:
+        solucion = await _resolver(tarea, proveedor, clave, url, timeout)
+    except Exception:
+        anotar(proveedor, time.monotonic() - inicio, fuente=fuente, error=True)
+        raise
+    anotar(proveedor, time.monotonic() - inicio, fuente=fuente)
+    return solucion
+
+
+async def _resolver(tarea, proveedor, clave, url, timeout):
+    config_proveedor = PROVEEDORES[proveedor]
+    clave = clave or config_proveedor["clave"]
+    url = (url or config_proveedor["url"]).rstrip("/")
+    if not clave:
+        raise ErrorCaptcha(f"Sin clave para el proveedor de captcha '{proveedor}'")
+
+    datos = await _post(f"{url}/createTask", {"clientKey": clave, "task": tarea})
+    if datos.get("errorId"):
+        raise ErrorCaptcha(f"No se pudo crear la tarea captcha: {datos.get('errorDescription') or datos}")
+    # Las tareas de imagen suelen venir resueltas en la misma respuesta
+    if datos.get("status") == "ready" and datos.get("solution"):
+        return datos["solution"]
+    task_id = datos.get("taskId")
+    if not task_id:
+        raise ErrorCaptcha(f"No se pudo crear la tarea captcha: {datos}")
+    return await _sondeo().agregar(url, clave, task_id, timeout or TIMEOUT)
+
+
+def _leer(ruta):
+    with open(ruta, "rb") as f:
+        return f.read()
+
+
+async def imagen_a_texto(ruta_imagen, proveedor="capsolver", **kwargs):
+    """Texto del captcha de imagen en `ruta_imagen` (ruta o bytes)."""
+    if isinstance(ruta_imagen, (bytes, bytearray)):
+        datos = bytes(ruta_imagen)
+    else:
+        datos = await asyncio.to_thread(_leer, ruta_imagen)
+    solucion = await resolver(
+        {"type": "ImageToTextTask", "body": base64.b64encode(datos).decode("utf-8")},
+        proveedor=proveedor, **kwargs,
+    )
+    return solucion.get("text")
+
+
+async def recaptcha_v2(url, sitekey, invisible=None, proveedor="capsolver", **kwargs):
+    """Token gRecaptchaResponse para el reCAPTCHA v2 de `url`."""
+    tarea = {"type": "ReCaptchaV2TaskProxyLess", "websiteURL": url, "websiteKey": sitekey}
+    if invisible is not None:
+        tarea["isInvisible"] = invisible
+    solucion = await resolver(tarea, proveedor=proveedor, **kwargs)
+    return solucion.get("gRecaptchaResponse")
@@ -0,0 +1,191 @@
+# core/resolver/ocr_local.py
+"""
+OCR local (EasyOCR + OpenCV, CPU) para los captchas de texto simples, con el
+servicio remoto como respaldo.
+
+El kaptcha de la registraduría (consultar_registraduria, registro_civil), el
+Capcha_CaptchaImageUP de ADRES (adres, adres_bio) y el CaptchaImage.axd de
+RUAF se mandaban siempre a ImageToTextTask: ida y vuelta de red más la cola
+del proveedor en cada intento (adres_bio permite 10). Aquí cada sitio tiene su
+perfil (preproceso, caracteres permitidos, formato esperado y umbral de
+confianza); solo las imágenes que el OCR local no lee con confianza van al
+resolver remoto que el bot ya usaba:
+
+    texto = await resolver_captcha_local(ruta, "adres", remoto=resolver_captcha_imagen)
+    ...enviar el formulario...
+    reportar_captcha(aceptado=True)   # o False si el sitio dijo "captcha inválido"
+
+`reportar_captcha` cierra el último intento de la tarea actual: las lecturas
+locales se anotan como solver "local" y las remotas las anota el cliente con
+su proveedor (core/resolver/telemetria.py). Si easyocr no está instalado todo
+va al remoto.
+
+El preproceso y el OCR corren en un hilo (OpenCV y torch sueltan el GIL); el
+modelo se carga una sola vez por proceso.
+
+Variables de entorno:
+    CAPTCHA_OCR         1 | 0: usar el OCR local (default 1)
+    CAPTCHA_OCR_UMBRAL  confianza mínima por defecto para aceptar el texto local (default 0.6)
+    CAPTCHA_OCR_GPU     1 para usar GPU si torch la ve (default 0)
+"""
+import os
+import re
+import time
+import asyncio
+import tempfile
+import threading
+
+try:
+    import cv2
+    import numpy as np
+except Exception:  # sin OpenCV → sin preproceso local
+    cv2 = None
+
+try:
+    import easyocr
+except Exception:  # easyocr no instalado → todo al remoto
+    easyocr = None
+
+from core.resolver.telemetria import anotar, en_fuente, fuente_actual, reportar_captcha  # noqa: F401 (reportar_captcha lo usan los bots)
+
+
+def _env_float(nombre, default):
+    try:
+        return float(os.environ.get(nombre, str(default)))
+    except Exception:
+        return default
+
+
+HABILITADO = os.environ.get("CAPTCHA_OCR", "1").strip() not in ("0", "false", "no")
+UMBRAL = _env_float("CAPTCHA_OCR_UMBRAL", 0.6)
+GPU = os.environ.get("CAPTCHA_OCR_GPU", "0").strip() in ("1", "true", "si")
+
+_lector = None
+_lock_lector = threading.Lock()
+_sin_ocr = easyocr is None or cv2 is None
+
+
+# ---------------------------------------------------------------------------
+# Preprocesos (imagen BGR → imagen para el OCR)
+# ---------------------------------------------------------------------------
+def _binarizar(img, escala=2):
+    gris = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    gris = cv2.resize(gris, None, fx=escala, fy=escala, interpolation=cv2.INTER_CUBIC)
+    gris = cv2.medianBlur(gris, 3)
+    _, binaria = cv2.threshold(gris, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    # Texto oscuro sobre fondo claro
+    if np.mean(binaria) < 127:
+        binaria = cv2.bitwise_not(binaria)
+    return binaria
+
+
+def _kaptcha(img):
+    """Kaptcha (registraduría): líneas de ruido finas sobre el texto."""
+    binaria = _binarizar(img, escala=3)
+    nucleo = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
+    return cv2.morphologyEx(binaria, cv2.MORPH_CLOSE, nucleo)
+
+
+# sitio → perfil. "formato": regex que debe cumplir el texto leído.
+PERFILES = {
+    "registraduria": {
+        "preproceso": _kaptcha,
+        "permitidos": "abcdefghijklmnopqrstuvwxyz0123456789",
+        "formato": r"[a-z0-9]{4,6}",
+        "umbral": 0.7,
+    },
+    "adres": {
+        "preproceso": _binarizar,
+        "permitidos": "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789",
+        "formato": r"[A-Z0-9]{4,6}",
+    },
+    "ruaf": {
+        # ruaf.preprocesar_captcha ya deja las letras negras sobre blanco
+        "preproceso": _binarizar,
+        "permitidos": "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789",
+        "formato": r"[A-Za-z0-9]{4,8}",
+    },
+}
+
+
+def _reader():
+    global _lector, _sin_ocr
+    if _lector is None:
+        try:
+            _lector = easyocr.Reader(["en"], gpu=GPU, verbose=False)
+        except Exception:
+            # Sin modelo (descarga bloqueada, sin torch...) no se vuelve a intentar
+            _sin_ocr = True
+            raise
+    return _lector
+
+
+def _leer_local(datos, sitio):
+    """(texto, confianza) del OCR local. Corre en un hilo."""
+    perfil = PERFILES[sitio]
+    img = cv2.imdecode(np.frombuffer(datos, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        return "", 0.0
+    procesada = perfil["preproceso"](img)
+    with _lock_lector:
+        lecturas = _reader().readtext(procesada, allowlist=perfil["permitidos"], detail=1, paragraph=False)
+    if not lecturas:
+        return "", 0.0
+    # Izquierda → derecha; la confianza del conjunto es la del trozo más dudoso
+    lecturas.sort(key=lambda l: min(p[0] for p in l[0]))
+    texto = "".join(t for _, t, _ in lecturas).replace(" ", "")
+    return texto, float(min(c for _, _, c in lecturas))
+
+
+def _leer_archivo(ruta):
+    with open(ruta, "rb") as f:
+        return f.read()
+
+
+def _escribir(ruta, datos):
+    with open(ruta, "wb") as f:
+        f.write(datos)
+
+
+async def resolver_captcha_local(imagen, sitio, remoto):
+    """
+    Texto del captcha `imagen` (ruta o bytes) del `sitio` (clave de PERFILES).
+    Intenta el OCR local y, si la confianza o el formato no alcanzan, llama
+    `await remoto(ruta)` (el resolver que el bot ya usaba).
+    """
+    perfil = PERFILES.get(sitio)
+    # Sin fuente fijada ni bot en curso la fuente es el sitio; el remoto anota en la misma
+    en_fuente(fuente_actual(sitio))
+    datos = bytes(imagen) if isinstance(imagen, (bytes, bytearray)) else None
+
+    if HABILITADO and not _sin_ocr and perfil is not None:
+        inicio = time.monotonic()
+        try:
+            if datos is None:
+                datos = await asyncio.to_thread(_leer_archivo, imagen)
+            texto, confianza = await asyncio.to_thread(_leer_local, datos, sitio)
+        except Exception as e:
+            print(f"[captcha] sitio={sitio} error en el OCR local ({e}); se usa el remoto")
+            texto, confianza = "", 0.0
+        segundos = time.monotonic() - inicio
+        if confianza >= perfil.get("umbral", UMBRAL) and re.fullmatch(perfil["formato"], texto or ""):
+            print(f"[captcha] sitio={sitio} local conf={confianza:.2f} {segundos:.2f}s")
+            anotar("local", segundos)
+            return texto
+        print(f"[captcha] sitio={sitio} local descartado (conf={confianza:.2f} texto={texto!r}); remoto")
+        anotar("local", segundos, descartado=True)
+
+    ruta = imagen
+    if not isinstance(imagen, str):
+        # El resolver remoto recibe una ruta
+        fd, ruta = tempfile.mkstemp(prefix=f"captcha_{sitio}_", suffix=".png")
+        os.close(fd)
+        await asyncio.to_thread(_escribir, ruta, bytes(imagen))
+    try:
+        return await remoto(ruta)
+    finally:
+        if ruta is not imagen:
+            try:
+                os.remove(ruta)
+            except Exception:
+                pass
@@ -0,0 +1,106 @@
+# core/resolver/pregunta_procuraduria.py
+"""
+Respuesta a la pregunta de seguridad del formulario de la Procuraduría
+(#lblPregunta en webcert/Certificado.aspx).
+
+procuraduria, procuraduria_bio y procuraduria_generar_certificado solo
+respondían seis sumas/restas escritas a mano; con cualquier otra pregunta
+pulsaban ImageButton1 y esperaban 1 s, hasta 10–12 vueltas. Aquí se resuelve
+cualquier "¿ Cuanto es A op B ?" (+, -, X, *, /, también en palabras) y las
+preguntas de texto conocidas (capitales, dígitos del documento):
+
+    respuesta = responder_pregunta(pregunta, documento=cedula)   # None → refrescar
+
+Solo si devuelve None (pregunta nueva, o que pide un dato que no se tiene)
+el bot refresca la pregunta.
+"""
+import re
+import unicodedata
+
+# Operadores tal como aparecen (ya normalizados: minúsculas, sin tildes)
+OPERACIONES = {
+    "+": lambda a, b: a + b,
+    "mas": lambda a, b: a + b,
+    "-": lambda a, b: a - b,
+    "menos": lambda a, b: a - b,
+    "x": lambda a, b: a * b,
+    "*": lambda a, b: a * b,
+    "por": lambda a, b: a * b,
+    "/": lambda a, b: a / b,
+    "entre": lambda a, b: a / b,
+    "dividido en": lambda a, b: a / b,
+    "dividido por": lambda a, b: a / b,
+}
+
+NUMEROS = {
+    "cero": 0, "uno": 1, "dos": 2, "tres": 3, "cuatro": 4, "cinco": 5,
+    "seis": 6, "siete": 7, "ocho": 8, "nueve": 9, "diez": 10,
+}
+
+# Pregunta normalizada (sin "¿", "?" ni aclaraciones entre paréntesis) → respuesta
+PREGUNTAS_CONOCIDAS = {
+    "cual es la capital de colombia": "bogota",
+    "cual es la capital de antioquia": "medellin",
+    "cual es la capital del valle del cauca": "cali",
+    "cual es la capital del vallle del cauca": "cali",
+    "cual es la capital del atlantico": "barranquilla",
+    "cual es la capital de santander": "bucaramanga",
+    "cual es la capital de bolivar": "cartagena",
+}
+
+_OPERADOR = "|".join(re.escape(op) for op in sorted(OPERACIONES, key=len, reverse=True))
+_NUMERO = r"\d+|" + "|".join(NUMEROS)
+_ARITMETICA = re.compile(rf"cuanto es\s+({_NUMERO})\s*({_OPERADOR})\s*({_NUMERO})\b")
+_DIGITOS = re.compile(
+    r"escriba (?:los|las) (\w+) (primeros|primeras|ultimos|ultimas) digitos del documento"
+)
+
+
+def _normalizar(texto):
+    texto = unicodedata.normalize("NFKD", texto or "")
+    texto = "".join(c for c in texto if not unicodedata.combining(c)).lower()
+    texto = re.sub(r"\(.*?\)", " ", texto)
+    texto = re.sub(r"[¿?¡!.:]", " ", texto)
+    return re.sub(r"\s+", " ", texto).strip()
+
+
+def _numero(valor):
+    return int(valor) if valor.isdigit() else NUMEROS[valor]
+
+
+def _aritmetica(pregunta):
+    coincidencia = _ARITMETICA.search(pregunta)
+    if not coincidencia:
+        return None
+    a, operador, b = coincidencia.groups()
+    try:
+        resultado = OPERACIONES[operador](_numero(a), _numero(b))
+    except ZeroDivisionError:
+        return None
+    if resultado != int(resultado):
+        return None
+    return str(int(resultado))
+
+
+def _digitos(pregunta, documento):
+    coincidencia = _DIGITOS.search(pregunta)
+    if not coincidencia or not documento:
+        return None
+    cantidad, posicion = coincidencia.groups()
+    cantidad = int(cantidad) if cantidad.isdigit() else NUMEROS.get(cantidad)
+    digitos = re.sub(r"\D", "", str(documento))
+    if not cantidad or len(digitos) < cantidad:
+        return None
+    return digitos[:cantidad] if posicion.startswith("primer") else digitos[-cantidad:]
+
+
+def responder_pregunta(pregunta, documento=None):
+    """Respuesta a `pregunta` (texto de #lblPregunta) o None si no se sabe."""
+    normalizada = _normalizar(pregunta)
+    if not normalizada:
+        return None
+    return (
+        _aritmetica(normalizada)
+        or PREGUNTAS_CONOCIDAS.get(normalizada)
+        or _digitos(normalizada, documento)
+    )
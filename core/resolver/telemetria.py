@@ -0,0 +1,319 @@
+# core/resolver/telemetria.py
+"""
+Telemetría de captchas por fuente y presupuesto de reintentos adaptativo.
+
+Los bucles de captcha iban a ciegas: consultar_registraduria hace 3×3
+reintentos con recargas, adres_bio hasta 10, procuraduría cambia la pregunta
+hasta 10 veces. Aquí se anota cada intento de resolución (fuente, solver,
+latencia, error) y el veredicto del sitio:
+
+    - core/resolver/cliente.py anota cada tarea remota (solver = proveedor);
+    - core/resolver/ocr_local.py anota las lecturas locales (solver "local");
+    - core/resolver/captcha_v2.py anota los tokens servidos por el pool ("pool");
+    - el bot cierra el último intento con reportar_captcha(aceptado=True/False).
+
+Con eso cada bucle pide su tope según la tasa de aceptación reciente:
+
+    for intento in range(1, await reintentos_captcha(10) + 1):
+        ...
+
+Con buena tasa bastan pocos intentos; con una tasa bajo CAPTCHA_TASA_CAIDA la
+fuente está fallando ahora mismo y se deja un solo intento (sigue midiendo,
+así se recupera sola). Sin muestras suficientes se usa el máximo del bot.
+
+`resumen()` (endpoint api/captcha/telemetria/) da por fuente y solver
+intentos, aceptados, rechazados, errores, descartados, segundos gastados y
+latencia p50/p90/p95. Los datos viven en el Redis del broker para que la API
+vea lo de todos los workers; si Redis no responde quedan en la memoria del
+proceso.
+
+La fuente es la fijada con en_fuente() en la tarea (p.ej. la resolución de
+identidad, que corre etiquetada con el nombre de la función) o, si no, el bot
+en curso (bot_config "name"). La misma fuente se usa para anotar y para
+reintentos_captcha, así el tope lee lo que se escribió.
+
+Variables de entorno:
+    CAPTCHA_VENTANA_SEG   antigüedad máxima de los veredictos que cuentan para el tope (default 1800)
+    CAPTCHA_TASA_CAIDA    tasa de aceptación bajo la cual se deja un solo intento (default 0.1)
+"""
+import os
+import json
+import math
+import time
+import weakref
+import asyncio
+import contextvars
+
+from django.conf import settings
+
+from core.utils.network_profile import bot_actual
+
+try:
+    import redis.asyncio as aioredis
+except Exception:  # redis no instalado → telemetría en memoria del proceso
+    aioredis = None
+
+
+def _env_float(nombre, default):
+    try:
+        return float(os.environ.get(nombre, str(default)))
+    except Exception:
+        return default
+
+
+VENTANA_SEG = _env_float("CAPTCHA_VENTANA_SEG", 1800)
+TASA_CAIDA = _env_float("CAPTCHA_TASA_CAIDA", 0.1)
+
+# Veredictos recientes que se guardan por fuente
+VENTANA = 50
+# Veredictos mínimos para ajustar el tope
+MUESTRAS_MIN = 5
+# Probabilidad buscada de resolver dentro del tope
+CONFIANZA = 0.95
+# Muestras de latencia por fuente/solver
+MUESTRAS_MAX = 200
+VIGENCIA = 7 * 24 * 3600
+
+PREFIJO = "econfia:captcha"
+CAMPOS = ("intentos", "aceptados", "rechazados", "errores", "descartados", "segundos")
+
+_clientes = weakref.WeakKeyDictionary()  # un cliente Redis por event loop
+_memoria = {"contadores": {}, "latencias": {}, "veredictos": {}, "fuentes": set()}
+_pendientes = set()
+_avisado = False
+
+_fuente = contextvars.ContextVar("captcha_fuente", default=None)
+_ultimo = contextvars.ContextVar("captcha_ultimo", default=None)
+
+
+def en_fuente(nombre):
+    """Fija la fuente de los captchas de esta tarea; tiene prioridad sobre el bot en curso."""
+    _fuente.set(nombre)
+
+
+def fuente_actual(defecto=None):
+    bot = bot_actual() or {}
+    return _fuente.get() or bot.get("name") or defecto or "sin_fuente"
+
+
+def _cliente():
+    if aioredis is None:
+        return None
+    loop = asyncio.get_running_loop()
+    cliente = _clientes.get(loop)
+    if cliente is None:
+        url = getattr(settings, "CELERY_BROKER_URL", "redis://localhost:6379/0")
+        cliente = aioredis.from_url(url, socket_timeout=2, socket_connect_timeout=2)
+        _clientes[loop] = cliente
+    return cliente
+
+
+def _avisar(e):
+    global _avisado
+    if not _avisado:
+        print(f"[captcha] Redis no disponible ({e}); telemetría solo en este proceso")
+        _avisado = True
+
+
+def _claves(fuente, solver=None):
+    base = f"{PREFIJO}:{fuente}"
+    return base, f"{base}:{solver}:latencias", f"{base}:veredictos"
+
+
+# ---------------------------------------------------------------------------
+# Escritura
+# ---------------------------------------------------------------------------
+def _guardar_memoria(fuente, solver, incrementos, latencia, veredicto):
+    contadores = _memoria["contadores"].setdefault(fuente, {})
+    for campo, valor in incrementos.items():
+        contadores[f"{solver}|{campo}"] = contadores.get(f"{solver}|{campo}", 0) + valor
+    if latencia is not None:
+        muestras = _memoria["latencias"].setdefault((fuente, solver), [])
+        muestras.insert(0, latencia)
+        del muestras[MUESTRAS_MAX:]
+    if veredicto is not None:
+        veredictos = _memoria["veredictos"].setdefault(fuente, [])
+        veredictos.insert(0, veredicto)
+        del veredictos[VENTANA:]
+    _memoria["fuentes"].add(fuente)
+
+
+async def _guardar(fuente, solver, incrementos, latencia=None, veredicto=None):
+    cliente = _cliente()
+    if cliente is not None:
+        clave, clave_latencias, clave_veredictos = _claves(fuente, solver)
+        try:
+            pipe = cliente.pipeline(transaction=False)
+            for campo, valor in incrementos.items():
+                pipe.hincrbyfloat(clave, f"{solver}|{campo}", valor)
+            pipe.expire(clave, VIGENCIA)
+            if latencia is not None:
+                pipe.lpush(clave_latencias, round(latencia, 3))
+                pipe.ltrim(clave_latencias, 0, MUESTRAS_MAX - 1)
+                pipe.expire(clave_latencias, VIGENCIA)
+            if veredicto is not None:
+                pipe.lpush(clave_veredictos, json.dumps(veredicto))
+                pipe.ltrim(clave_veredictos, 0, VENTANA - 1)
+                pipe.expire(clave_veredictos, VIGENCIA)
+            pipe.sadd(f"{PREFIJO}:fuentes", fuente)
+            await pipe.execute()
+            return
+        except Exception as e:
+            _avisar(e)
+    _guardar_memoria(fuente, solver, incrementos, latencia, veredicto)
+
+
+def _programar(*args):
+    """Guarda sin bloquear al bot; fuera de un event loop queda en memoria."""
+    try:
+        tarea = asyncio.get_running_loop().create_task(_guardar(*args))
+    except RuntimeError:
+        _guardar_memoria(*args)
+        return
+    _pendientes.add(tarea)
+    tarea.add_done_callback(_pendientes.discard)
+
+
+def anotar(solver, segundos, fuente=None, error=False, descartado=False):
+    """
+    Un intento de resolución con `solver` que tardó `segundos`. error=True si
+    el solver falló; descartado=True si la respuesta no se usó (OCR local sin
+    confianza) y el captcha pasa a otro solver.
+    """
+    fuente = fuente or fuente_actual()
+    incrementos = {"intentos": 1, "segundos": segundos}
+    if descartado:
+        incrementos["descartados"] = 1
+        _programar(fuente, solver, incrementos, segundos, None)
+        return
+    if error:
+        incrementos["errores"] = 1
+        # Un solver que no responde también cuesta tiempo a la fuente
+        _programar(fuente, solver, incrementos, segundos, {"t": time.time(), "ok": 0})
+        _ultimo.set(None)
+        return
+    _programar(fuente, solver, incrementos, segundos, None)
+    _ultimo.set({"fuente": fuente, "solver": solver})
+
+
+def reportar_captcha(aceptado):
+    """El sitio aceptó (o rechazó) el último captcha resuelto en esta tarea."""
+    ultimo = _ultimo.get()
+    if not ultimo:
+        return
+    _ultimo.set(None)
+    _programar(
+        ultimo["fuente"], ultimo["solver"],
+        {"aceptados" if aceptado else "rechazados": 1},
+        None, {"t": time.time(), "ok": 1 if aceptado else 0},
+    )
+
+
+# ---------------------------------------------------------------------------
+# Lectura
+# ---------------------------------------------------------------------------
+def _decodificar(valor):
+    return valor.decode() if isinstance(valor, bytes) else valor
+
+
+async def _leer(fuente):
+    """(contadores, {solver: latencias}, veredictos) de la fuente."""
+    cliente = _cliente()
+    if cliente is not None:
+        clave, _, clave_veredictos = _claves(fuente)
+        try:
+            contadores = {
+                _decodificar(k): float(v) for k, v in (await cliente.hgetall(clave)).items()
+            }
+            solvers = {c.split("|", 1)[0] for c in contadores}
+            latencias = {}
+            for solver in solvers:
+                crudas = await cliente.lrange(_claves(fuente, solver)[1], 0, -1)
+                latencias[solver] = [float(v) for v in crudas]
+            veredictos = [json.loads(v) for v in await cliente.lrange(clave_veredictos, 0, -1)]
+            return contadores, latencias, veredictos
+        except Exception as e:
+            _avisar(e)
+    contadores = dict(_memoria["contadores"].get(fuente, {}))
+    latencias = {s: list(v) for (f, s), v in _memoria["latencias"].items() if f == fuente}
+    return contadores, latencias, list(_memoria["veredictos"].get(fuente, []))
+
+
+async def _fuentes():
+    cliente = _cliente()
+    if cliente is not None:
+        try:
+            return sorted(_decodificar(f) for f in await cliente.smembers(f"{PREFIJO}:fuentes"))
+        except Exception as e:
+            _avisar(e)
+    return sorted(_memoria["fuentes"])
+
+
+def _tasa_reciente(veredictos):
+    """(tasa de aceptación, muestras) con los veredictos de los últimos VENTANA_SEG."""
+    desde = time.time() - VENTANA_SEG
+    recientes = [v["ok"] for v in veredictos if v.get("t", 0) >= desde]
+    if not recientes:
+        return None, 0
+    return sum(recientes) / len(recientes), len(recientes)
+
+
+def _tope(tasa, muestras, maximo, minimo):
+    if tasa is None or muestras < MUESTRAS_MIN:
+        return maximo
+    if tasa < TASA_CAIDA:
+        return minimo
+    if tasa >= 1:
+        return max(minimo, 1)
+    # Intentos para resolver con probabilidad CONFIANZA si cada uno acierta con `tasa`
+    necesarios = math.ceil(math.log(1 - CONFIANZA) / math.log(1 - tasa))
+    return max(minimo, min(maximo, necesarios))
+
+
+async def reintentos_captcha(maximo, fuente=None, minimo=1):
+    """Intentos de captcha para esta ejecución según la tasa reciente de la fuente (entre minimo y maximo)."""
+    fuente = fuente or fuente_actual()
+    try:
+        _, _, veredictos = await _leer(fuente)
+    except Exception as e:
+        print(f"[captcha] fuente={fuente} sin telemetría ({e}); se usan {maximo} intentos")
+        return maximo
+    tasa, muestras = _tasa_reciente(veredictos)
+    tope = _tope(tasa, muestras, maximo, minimo)
+    if tope < maximo:
+        print(f"[captcha] fuente={fuente} tasa reciente {tasa:.0%} ({muestras} veredictos): {tope} de {maximo} intentos")
+    return tope
+
+
+def _percentil(valores, p):
+    if not valores:
+        return None
+    ordenados = sorted(valores)
+    return round(ordenados[min(len(ordenados) - 1, int(p * len(ordenados)))], 3)
+
+
+async def resumen(fuente=None):
+    """Por fuente: tasa reciente y, por solver, conteos, segundos gastados y latencia p50/p90/p95."""
+    salida = {}
+    for nombre in ([fuente] if fuente else await _fuentes()):
+        contadores, latencias, veredictos = await _leer(nombre)
+        tasa, muestras = _tasa_reciente(veredictos)
+        solvers = {}
+        for solver in sorted({c.split("|", 1)[0] for c in contadores}):
+            datos = {campo: contadores.get(f"{solver}|{campo}", 0) for campo in CAMPOS}
+            juzgados = datos["aceptados"] + datos["rechazados"]
+            muestras_lat = latencias.get(solver, [])
+            solvers[solver] = {
+                **{campo: int(datos[campo]) for campo in CAMPOS if campo != "segundos"},
+                "segundos": round(datos["segundos"], 1),
+                "precision": round(datos["aceptados"] / juzgados, 3) if juzgados else None,
+                "p50": _percentil(muestras_lat, 0.5),
+                "p90": _percentil(muestras_lat, 0.9),
+                "p95": _percentil(muestras_lat, 0.95),
+            }
+        salida[nombre] = {
+            "tasa_reciente": round(tasa, 3) if tasa is not None else None,
+            "veredictos_recientes": muestras,
+            "solvers": solvers,
+        }
+    return salida
@@ -0,0 +1,209 @@
+# core/resolver/token_pool.py
+"""
+Tokens reCAPTCHA v2 resueltos de antemano por (sitio, sitekey).
+
+tyba, policia_nacional, movilidad_bogota, ugpp, eris y varios más pedían el
+token recién al llegar al formulario y quedaban 10–60 s esperando al
+proveedor. Con este pool el worker mantiene, por cada par (websiteURL,
+websiteKey) conocido, unos pocos tokens frescos; resolver_captcha_v2
+(core/resolver/captcha_v2.py) toma uno si hay y solo si no hay resuelve en
+línea como antes.
+
+Los pares se conocen de dos formas:
+
+    registrar_token(NOMBRE_SITIO, URL, SITEKEY)   # bots con sitekey fijo (a nivel de módulo)
+    conocer(page.url, sitekey)                    # lo hace resolver_captcha_v2 con el bot en curso
+
+Un token de Google vence a los ~2 min: se descarta a los TOKENS_RECAPTCHA_VIDA_SEG
+sin usar. La cantidad objetivo por par es min(máximo de la fuente, consultas
+pendientes + en proceso), así que sin cola no se gasta en tokens (y no se
+repone con core/utils/har_replay.py activo). Las fuentes
+que comparten sitio y sitekey (conte vigencia/matrícula, conalpe, cpnaa)
+comparten los mismos tokens. El pool es
+por worker, y se repone cada vez que se toma un token y al arrancar los bots
+de una consulta, solo para las fuentes de esa consulta y poco antes de que
+les toque (`anticipar`): los de la primera ventana del scheduler enseguida;
+el resto cuando arranca el bot que va `capacidad` puestos antes, para que el
+token no venza esperando.
+
+Variables de entorno:
+    TOKENS_RECAPTCHA          fuentes habilitadas y tokens máximos por par, p.ej.
+                              "policia_nacional:3,tyba:2,eris" (default vacío = apagado)
+    TOKENS_RECAPTCHA_VIDA_SEG segundos de vida útil de un token (default 100)
+"""
+import os
+import time
+import asyncio
+from urllib.parse import urlsplit
+
+from asgiref.sync import sync_to_async
+
+from core.resolver.cliente import recaptcha_v2
+from core.utils import har_replay
+from core.utils.network_profile import bot_actual
+from core.utils.warm_pages import _leer_fuentes
+
+
+def _env_int(nombre, default):
+    try:
+        return int(os.environ.get(nombre, str(default)))
+    except Exception:
+        return default
+
+
+FUENTES = _leer_fuentes(os.environ.get("TOKENS_RECAPTCHA", ""))
+VIDA_SEG = _env_int("TOKENS_RECAPTCHA_VIDA_SEG", 100)
+
+# Cada cuánto se vuelve a contar la cola de consultas
+DEMANDA_SEG = 15
+# Espera tras una resolución fallida antes de reintentar el mismo par
+REINTENTO_SEG = 30
+
+# (host, sitekey) → {"fuentes", "url", "invisible"}
+REGISTRO = {}
+
+_listos = {}        # (host, sitekey) → [(token, creado)]
+_resolviendo = {}   # (host, sitekey) → cantidad en resolución
+_fallo_en = {}      # (host, sitekey) → monotonic del último fallo
+_totales = {}       # fuente → {"aciertos", "fallos", "vencidos"}
+_demanda = {"valor": 0, "en": None}
+
+
+def _clave(url, sitekey):
+    return (urlsplit(url).netloc.lower(), sitekey)
+
+
+def registrar_token(fuente, url, sitekey, invisible=None):
+    """Par (url, sitekey) de `fuente` para el que vale la pena tener tokens listos."""
+    spec = REGISTRO.setdefault(_clave(url, sitekey), {"fuentes": set(), "url": url, "invisible": invisible})
+    spec["fuentes"].add(fuente)
+
+
+def _habilitadas(spec):
+    return [f for f in spec["fuentes"] if f in FUENTES] if spec else []
+
+
+def conocer(url, sitekey, invisible=None):
+    """Registra el par que está resolviendo el bot en curso si su fuente está habilitada."""
+    bot = bot_actual() or {}
+    fuente = bot.get("name")
+    if fuente in FUENTES and url and sitekey:
+        registrar_token(fuente, url, sitekey, invisible)
+
+
+def _contar(fuentes, campo):
+    for fuente in fuentes:
+        acumulado = _totales.setdefault(fuente, {"aciertos": 0, "fallos": 0, "vencidos": 0})
+        acumulado[campo] += 1
+
+
+def _purgar(clave):
+    listos = _listos.get(clave, [])
+    ahora = time.monotonic()
+    vigentes = [(t, creado) for t, creado in listos if ahora - creado < VIDA_SEG]
+    for _ in range(len(listos) - len(vigentes)):
+        _contar(_habilitadas(REGISTRO[clave]), "vencidos")
+    _listos[clave] = vigentes
+    return vigentes
+
+
+def _contar_cola():
+    from core.models import Consulta
+    return Consulta.objects.filter(estado__in=("pendiente", "en_proceso")).count()
+
+
+async def _cola():
+    """Consultas pendientes + en proceso (cacheado DEMANDA_SEG)."""
+    ahora = time.monotonic()
+    if _demanda["en"] is None or ahora - _demanda["en"] > DEMANDA_SEG:
+        try:
+            _demanda["valor"] = await sync_to_async(_contar_cola)()
+        except Exception as e:
+            print(f"[tokens] No se pudo contar la cola de consultas: {e}")
+        _demanda["en"] = ahora
+    return _demanda["valor"]
+
+
+async def _resolver_uno(clave):
+    spec = REGISTRO[clave]
+    _resolviendo[clave] = _resolviendo.get(clave, 0) + 1
+    try:
+        token = await recaptcha_v2(spec["url"], clave[1], invisible=spec["invisible"], fuente="token_pool")
+        if token:
+            _listos.setdefault(clave, []).append((token, time.monotonic()))
+    except Exception as e:
+        print(f"[tokens] sitio={clave[0]} no se pudo resolver el token: {e}")
+        _fallo_en[clave] = time.monotonic()
+    finally:
+        _resolviendo[clave] -= 1
+
+
+async def _reponer(clave):
+    habilitadas = _habilitadas(REGISTRO.get(clave))
+    # Con el HAR grabando/reproduciendo los captchas salen del archivo, no del proveedor
+    if not habilitadas or har_replay.activo():
+        return
+    try:
+        if time.monotonic() - _fallo_en.get(clave, -REINTENTO_SEG) < REINTENTO_SEG:
+            return
+        objetivo = min(max(FUENTES[f] for f in habilitadas), await _cola())
+        faltan = objetivo - len(_purgar(clave)) - _resolviendo.get(clave, 0)
+        for _ in range(max(0, faltan)):
+            asyncio.ensure_future(_resolver_uno(clave))
+    except Exception as e:
+        print(f"[tokens] sitio={clave[0]} error reponiendo: {e}")
+
+
+def calentar(fuentes=None):
+    """
+    Programa la reposición de los pares habilitados (en el loop del worker);
+    con `fuentes`, solo de los pares de esas fuentes.
+    """
+    for clave, spec in list(REGISTRO.items()):
+        habilitadas = _habilitadas(spec)
+        if habilitadas and (fuentes is None or set(habilitadas) & set(fuentes)):
+            asyncio.ensure_future(_reponer(clave))
+
+
+def anticipar(bot_configs, capacidad, run_bot):
+    """
+    Calienta los tokens de la primera ventana de `bot_configs` y devuelve
+    `run_bot` envuelto: al arrancar el bot i calienta los del bot i + capacidad.
+    """
+    nombres = [b.get("name") for b in bot_configs]
+    posicion = {nombre: i for i, nombre in enumerate(nombres)}
+    calentar(set(nombres[:capacidad]))
+
+    async def _run_bot(bot):
+        siguiente = posicion.get(bot.get("name"), len(nombres)) + capacidad
+        if siguiente < len(nombres):
+            calentar({nombres[siguiente]})
+        return await run_bot(bot)
+
+    return _run_bot
+
+
+def tomar_token(url, sitekey):
+    """Token fresco para (url, sitekey), o None. Siempre programa la reposición."""
+    clave = _clave(url, sitekey)
+    habilitadas = _habilitadas(REGISTRO.get(clave))
+    if not habilitadas:
+        return None
+    listos = _purgar(clave)
+    token = listos.pop(0)[0] if listos else None
+    fuente = (bot_actual() or {}).get("name")
+    _contar([fuente] if fuente in habilitadas else habilitadas, "aciertos" if token else "fallos")
+    asyncio.ensure_future(_reponer(clave))
+    return token
+
+
+def resumen():
+    """Tokens listos y aciertos/fallos/vencidos por fuente en este proceso."""
+    listos = {}
+    for clave, spec in REGISTRO.items():
+        for fuente in spec["fuentes"]:
+            listos[fuente] = listos.get(fuente, 0) + len(_listos.get(clave, []))
+    return {
+        fuente: {"listos": listos.get(fuente, 0), **_totales.get(fuente, {})}
+        for fuente in FUENTES
+    }
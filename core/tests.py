@@ -16,3 +16,135 @@ class FuenteTestCase(TestCase):
 		with self.assertRaises(Exception):
 			# Intentar crear otra fuente con el mismo nombre y tipo debería fallar si hay restricción de unicidad
 			Fuente.objects.create(nombre="Unica", nombre_pila="Unica", tipo=self.tipo)
+
+
+import asyncio
+from django.test import SimpleTestCase
+from core.utils.bot_scheduler import ejecutar_bots, EntradasConsulta
+
+
+class BotSchedulerTestCase(SimpleTestCase):
+	def _bots(self):
+		async def dormir(segundos):
+			await asyncio.sleep(segundos)
+		# un bot lento y varios rápidos
+		return [
+			{"name": f"bot_{i}", "func": dormir, "kwargs": {"segundos": 0.3 if i == 0 else 0.05}, "peso": 1}
+			for i in range(8)
+		]
+
+	def _ejecutar(self, modo):
+		async def run_bot(bot):
+			await bot["func"](**bot["kwargs"])
+		return asyncio.run(ejecutar_bots(self._bots(), run_bot, capacidad=4, modo=modo))
+
+	def test_ventana_no_espera_al_bot_lento(self):
+		lotes = self._ejecutar("lotes")
+		ventana = self._ejecutar("ventana")
+		self.assertEqual(ventana["bots"], 8)
+		self.assertLess(ventana["makespan"], lotes["makespan"])
+
+	def test_peso_mayor_a_capacidad_no_bloquea(self):
+		bots = self._bots()
+		bots[1]["peso"] = 10
+		async def run_bot(bot):
+			await bot["func"](**bot["kwargs"])
+		reporte = asyncio.run(ejecutar_bots(bots, run_bot, capacidad=4))
+		self.assertEqual(reporte["bots"], 8)
+
+	def test_bots_de_cedula_no_esperan_la_identidad(self):
+		inicios = {}
+
+		async def consultar(cedula, nombre=""):
+			inicios[nombre or cedula] = asyncio.get_running_loop().time()
+
+		def construir(datos):
+			return [
+				{"name": "cedula", "func": consultar, "kwargs": {"cedula": datos["cedula"]}},
+				{"name": "nombre", "func": consultar, "kwargs": {"cedula": datos["cedula"], "nombre": datos["nombre"]}},
+				{"name": "sin_datos", "func": consultar, "kwargs": {"fecha_expedicion": datos["fecha_expedicion"]}},
+			]
+
+		async def run_bot(bot):
+			await bot["func"](**bot["kwargs"])
+
+		async def main():
+			entradas = EntradasConsulta({"cedula": "123"}, construir=construir)
+
+			async def identidad():
+				await asyncio.sleep(0.1)
+				entradas.actualizar({"nombre": "ANA"})
+				entradas.cerrar()
+
+			t0 = asyncio.get_running_loop().time()
+			_, reporte = await asyncio.gather(
+				identidad(),
+				ejecutar_bots(construir(entradas.datos), run_bot, capacidad=4, entradas=entradas),
+			)
+			return t0, reporte
+
+		t0, reporte = asyncio.run(main())
+		self.assertLess(inicios["123"] - t0, 0.05)
+		self.assertGreaterEqual(inicios["ANA"] - t0, 0.1)
+		self.assertEqual(reporte["omitidos"], ["sin_datos"])
+
+
+from core.resolver.pregunta_procuraduria import responder_pregunta
+
+
+class PreguntaProcuraduriaTestCase(SimpleTestCase):
+	def test_aritmetica(self):
+		self.assertEqual(responder_pregunta("¿ Cuanto es 9 - 2 ?"), "7")
+		self.assertEqual(responder_pregunta("¿ Cuanto es 3 X 3 ?"), "9")
+		self.assertEqual(responder_pregunta("¿ Cuanto es 12 + 7 ?"), "19")
+		self.assertEqual(responder_pregunta("¿Cuánto es 8 / 2?"), "4")
+		self.assertEqual(responder_pregunta("¿ Cuanto es cinco menos tres ?"), "2")
+
+	def test_preguntas_de_texto(self):
+		self.assertEqual(responder_pregunta("¿ Cual es la Capital de Colombia (sin tilde)?"), "bogota")
+		self.assertEqual(responder_pregunta("¿ Escriba los dos ultimos digitos del documento a consultar ?", documento="1020304050"), "50")
+		self.assertEqual(responder_pregunta("¿ Escriba los tres primeros digitos del documento a consultar ?", documento="1020304050"), "102")
+
+	def test_desconocida_devuelve_none(self):
+		self.assertIsNone(responder_pregunta("¿ Escriba las dos primeras letras del primer nombre ?"))
+		self.assertIsNone(responder_pregunta(""))
+		self.assertIsNone(responder_pregunta("¿ Cuanto es 7 / 2 ?"))
+
+
+from unittest import mock
+from core.resolver import telemetria
+from core.utils.network_profile import bot_en_curso
+
+
+class TelemetriaCaptchaTestCase(SimpleTestCase):
+	def setUp(self):
+		# Sin Redis: todo queda en la memoria del proceso
+		patcher = mock.patch.object(telemetria, "aioredis", None)
+		patcher.start()
+		self.addCleanup(patcher.stop)
+		memoria = {"contadores": {}, "latencias": {}, "veredictos": {}, "fuentes": set()}
+		patcher_memoria = mock.patch.object(telemetria, "_memoria", memoria)
+		patcher_memoria.start()
+		self.addCleanup(patcher_memoria.stop)
+
+	def test_tope(self):
+		self.assertEqual(telemetria._tope(None, 0, 10, 1), 10)
+		self.assertEqual(telemetria._tope(0.9, 3, 10, 1), 10)   # pocas muestras
+		self.assertEqual(telemetria._tope(0.05, 20, 10, 1), 1)  # fuente caída
+		self.assertEqual(telemetria._tope(0.9, 20, 10, 1), 2)
+		self.assertEqual(telemetria._tope(0.3, 20, 10, 1), 9)
+		self.assertEqual(telemetria._tope(1.0, 20, 10, 1), 1)
+
+	def test_tope_lee_la_fuente_que_se_anoto(self):
+		async def main():
+			# Como en la resolución de identidad: la tarea va etiquetada con el nombre de la función
+			bot_en_curso({"name": "consultar_registraduria"})
+			telemetria.en_fuente("registraduria")
+			for _ in range(6):
+				telemetria.anotar("capsolver", 0.5)
+				telemetria.reportar_captcha(aceptado=False)
+			await asyncio.gather(*telemetria._pendientes)
+			return await telemetria.reintentos_captcha(3), await telemetria.reintentos_captcha(3, fuente="registraduria")
+
+		self.assertEqual(asyncio.run(main()), (1, 1))
+		self.assertNotIn("consultar_registraduria", telemetria._memoria["fuentes"])
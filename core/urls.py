@@ -4,6 +4,8 @@ from . import views
 
 urlpatterns = [
     path('api/consultar/', views.api_consultar),
+    path('api/consultar-masivo/', views.api_consultar_masivo),
+    path('api/consultar-masivo/<int:lote_id>/', views.progreso_lote),
     path("api/consultas/", views.listar_consultas, name="listar_consultas"),
     path("api/consultas/<int:consulta_id>/", views.detalle_consulta, name="detalle_consulta"),
     path("api/resultados/<int:consulta_id>/", views.listar_resultados, name="listar_resultados"),
@@ -25,6 +27,8 @@ urlpatterns = [
     path("api/consolidado/<int:consulta_id>/<int:tipo_id>/", views.generar_consolidado_api, name="consolidado_api"),
     path("api/relanzar_bot/<int:resultado_id>/", views.api_reintentar_bot, name="reintentar_bot"),
     path("api/fuentes/", views.listar_fuentes, name="listar_fuentes"),  
+    path("api/captcha/telemetria/", views.telemetria_captcha, name="telemetria_captcha"),
+    path("api/navegadores/estado/", views.estado_navegadores, name="estado_navegadores"),
     path("api/resumen-consulta/<int:consulta_id>/", views.resumen_consulta, name="vista_resumen_consulta"),
     path("prueba", views.calcular_riesgo_interno),
     path("api/auth/password-reset/", views.password_reset_request, name="password_reset_request"),
@@ -0,0 +1,418 @@
+# core/utils/bot_scheduler.py
+"""
+Planificador de bots por ventana deslizante.
+
+Reemplaza los lotes fijos (`chunked` + `asyncio.gather` por lote): hay una
+capacidad de N "slots" y, en cuanto un bot termina y libera sus slots, arranca
+el siguiente que quepa. Un bot lento ya no deja ociosos al resto de slots.
+
+Cada bot ocupa `peso` slots:
+    - si el bot_config trae 'peso', se usa ese valor;
+    - si no, los bots de clase 'navegador' (ver `clase_recurso`) pesan
+      BOT_PESO_NAVEGADOR (default 2) y los 'http' pesan 1.
+
+Plazos:
+    - cada bot tiene un presupuesto de tiempo: 'timeout' en su bot_config o,
+      por defecto, BOT_TIMEOUT_NAVEGADOR / BOT_TIMEOUT_HTTP;
+    - la ejecución completa tiene un plazo global (`plazo`, p.ej. CONSULTA_DEADLINE).
+    Al vencer, la tarea del bot se cancela (sus `async with`/finally cierran
+    contexto y navegador) y se invoca `al_vencer(bot, segundos)` para que el
+    llamador registre el resultado 'timeout'.
+
+Dependencias de datos:
+    cada bot declara los campos de `datos` que necesita ('requiere' en su
+    bot_config o, si no viene, se infieren de sus kwargs: ver
+    `campos_requeridos`). Con `entradas` (EntradasConsulta) los bots que solo
+    necesitan la cédula arrancan de inmediato y los que dependen del nombre
+    esperan a que la identidad llegue; sus kwargs se reconstruyen con los datos
+    completos. Si las entradas se cierran sin el campo, el bot se omite y se
+    invoca `al_omitir(bot, faltantes)`.
+
+Memoria:
+    `pausa()` (p.ej. core.utils.browser_governor.saturado) → mientras devuelva
+    True no arrancan bots nuevos; los que están en curso siguen. Si no queda
+    ninguno en curso se arranca igual uno, para no detener la consulta.
+
+Variables de entorno:
+    BOT_SLOTS              capacidad total (default: BOT_BATCH_SIZE o 10)
+    BOT_PESO_NAVEGADOR     slots que ocupa un bot de navegador (default 2)
+    BOT_SCHEDULER          "ventana" (default) | "lotes" para comparar con el esquema anterior
+    BOT_TIMEOUT_NAVEGADOR  presupuesto por bot de navegador en segundos (default 240)
+    BOT_TIMEOUT_HTTP       presupuesto por bot HTTP en segundos (default 90)
+    CONSULTA_DEADLINE      plazo global por consulta en segundos (default 1200)
+"""
+import os
+import sys
+import asyncio
+import itertools
+from time import perf_counter
+
+
+def _env_int(nombre, default):
+    try:
+        return int(os.environ.get(nombre, str(default)))
+    except Exception:
+        return default
+
+
+def capacidad_por_defecto(default=10):
+    return _env_int("BOT_SLOTS", _env_int("BOT_BATCH_SIZE", default))
+
+
+# Clases de recurso: deciden peso, presupuesto y cola de Celery del bot
+RECURSO_NAVEGADOR = "navegador"
+RECURSO_HTTP = "http"
+
+
+def clase_recurso(bot):
+    """
+    'navegador' o 'http'. Se toma de 'recurso' en el bot_config; si no viene,
+    se infiere: módulo que usa Playwright → navegador, si no → http.
+    """
+    if bot.get("recurso") in (RECURSO_NAVEGADOR, RECURSO_HTTP):
+        return bot["recurso"]
+    func = bot.get("func")
+    modulo = sys.modules.get(getattr(func, "__module__", ""), None)
+    return RECURSO_NAVEGADOR if (modulo and hasattr(modulo, "async_playwright")) else RECURSO_HTTP
+
+
+def es_bot_navegador(bot):
+    return clase_recurso(bot) == RECURSO_NAVEGADOR
+
+
+def peso_bot(bot):
+    if bot.get("peso"):
+        return max(1, int(bot["peso"]))
+    return _env_int("BOT_PESO_NAVEGADOR", 2) if es_bot_navegador(bot) else 1
+
+
+def presupuesto_bot(bot):
+    """Segundos que se le permiten al bot antes de cancelarlo."""
+    if bot.get("timeout"):
+        return float(bot["timeout"])
+    if es_bot_navegador(bot):
+        return float(_env_int("BOT_TIMEOUT_NAVEGADOR", 240))
+    return float(_env_int("BOT_TIMEOUT_HTTP", 90))
+
+
+def plazo_consulta_por_defecto():
+    return float(_env_int("CONSULTA_DEADLINE", 1200))
+
+
+# kwarg del bot → campos de `datos` de los que sale
+CAMPOS_POR_KWARG = {
+    "cedula": ("cedula",),
+    "numero": ("cedula",),
+    "tipo_doc": ("tipo_doc",),
+    "nombre": ("nombre",),
+    "apellido": ("apellido",),
+    "nombre_completo": ("nombre", "apellido"),
+    "nombre_persona": ("nombre", "apellido"),
+    "nombre_o_razon": ("nombre",),
+    "fecha_expedicion": ("fecha_expedicion",),
+    "fecha_nacimiento": ("fecha_nacimiento",),
+}
+
+
+def campos_requeridos(bot):
+    """Campos de `datos` sin los cuales el bot no tiene sentido."""
+    if bot.get("requiere") is not None:
+        return tuple(bot["requiere"])
+    campos = []
+    for kwarg in (bot.get("kwargs") or {}):
+        for campo in CAMPOS_POR_KWARG.get(kwarg, ()):
+            if campo not in campos:
+                campos.append(campo)
+    return tuple(campos)
+
+
+class DatosParciales(dict):
+    """`datos` incompletos: un campo que aún no llega vale "" (get_bot_configs usa datos['x'])."""
+
+    def __missing__(self, clave):
+        return ""
+
+
+class EntradasConsulta:
+    """
+    Datos de la consulta que van llegando mientras corren los bots.
+
+        entradas = EntradasConsulta({"cedula": ...}, construir=lambda d: get_bot_configs(cid, d))
+        entradas.actualizar({"nombre": ..., "apellido": ...})   # identidad resuelta
+        entradas.cerrar()                                        # no llegará nada más
+
+    `construir(datos)` devuelve los bot_configs con los datos actuales; se usa
+    para re-enlazar los kwargs de los bots que esperaban algún campo.
+    """
+
+    def __init__(self, datos, construir=None):
+        self.datos = DatosParciales(datos or {})
+        self.cerrada = False
+        self._construir = construir
+        self._version = 0
+        self._configs = None
+        self._cambio = asyncio.Event()
+
+    def disponibles(self):
+        return {k for k, v in self.datos.items() if v not in (None, "")}
+
+    def faltantes(self, bot):
+        disponibles = self.disponibles()
+        return [c for c in campos_requeridos(bot) if c not in disponibles]
+
+    def actualizar(self, nuevos):
+        self.datos.update({k: v for k, v in (nuevos or {}).items() if v not in (None, "")})
+        self._version += 1
+        self._configs = None
+        self._cambio.set()
+
+    def cerrar(self):
+        self.cerrada = True
+        self._cambio.set()
+
+    async def esperar_cambio(self):
+        await self._cambio.wait()
+        self._cambio.clear()
+
+    def enlazar(self, bot):
+        """El bot con kwargs construidos a partir de los datos actuales."""
+        if self._version == 0 or self._construir is None:
+            return bot
+        if self._configs is None:
+            self._configs = {b.get("name"): b for b in self._construir(self.datos)}
+        nuevo = self._configs.get(bot.get("name"))
+        if nuevo is None:
+            return bot
+        return {**bot, "kwargs": nuevo["kwargs"]}
+
+
+# Segundos que se espera a que un bot cancelado termine su limpieza (finally).
+# Bots con `except:` desnudo pueden tragarse la cancelación; pasado este margen
+# se abandonan para no alargar la consulta.
+GRACIA_CANCELACION = 15
+
+# Segundos entre revisiones mientras `pausa()` detiene el arranque de bots
+PAUSA_REINTENTO = 2.0
+
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    orden = sorted(valores)
+    idx = min(len(orden) - 1, int(round(p / 100 * (len(orden) - 1))))
+    return orden[idx]
+
+
+def _reporte(etiqueta, modo, capacidad, makespan, tiempos, vencidos):
+    duraciones = list(tiempos.values())
+    suma = sum(duraciones)
+    reporte = {
+        "modo": modo,
+        "capacidad": capacidad,
+        "bots": len(tiempos),
+        "makespan": round(makespan, 2),
+        "suma_bots": round(suma, 2),
+        # 1.0 = slots siempre ocupados (aprox., ignora pesos)
+        "paralelismo_medio": round(suma / makespan, 2) if makespan else 0.0,
+        "p50": round(_percentil(duraciones, 50), 2),
+        "p95": round(_percentil(duraciones, 95), 2),
+        "timeouts": list(vencidos),
+        "mas_lentos": [
+            (nombre, round(t, 2))
+            for nombre, t in sorted(tiempos.items(), key=lambda kv: kv[1], reverse=True)[:5]
+        ],
+    }
+    print(
+        f"[scheduler] {etiqueta} modo={modo} capacidad={capacidad} bots={reporte['bots']} "
+        f"makespan={reporte['makespan']}s suma={reporte['suma_bots']}s "
+        f"p50={reporte['p50']}s p95={reporte['p95']}s timeouts={len(vencidos)} "
+        f"más lentos={reporte['mas_lentos']}"
+    )
+    return reporte
+
+
+async def _ejecutar_lotes(bot_configs, capacidad, medir, entradas=None, omitir=None):
+    pendientes = list(bot_configs)
+    while pendientes:
+        # Sin `entradas` hay una sola pasada; con ellas, primero los bots con
+        # sus datos completos y luego, al llegar (o cerrarse) el resto, los demás
+        if entradas is None:
+            listos, pendientes = pendientes, []
+        else:
+            listos = [b for b in pendientes if not entradas.faltantes(b)]
+            pendientes = [b for b in pendientes if entradas.faltantes(b)]
+            if entradas.cerrada:
+                for bot in pendientes:
+                    await omitir(bot, entradas.faltantes(bot))
+                pendientes = []
+            listos = [entradas.enlazar(b) for b in listos]
+        it = iter(listos)
+        while True:
+            lote = list(itertools.islice(it, capacidad))
+            if not lote:
+                break
+            await asyncio.gather(*(medir(bot) for bot in lote))
+        if pendientes and not listos:
+            await entradas.esperar_cambio()
+
+
+async def _ejecutar_ventana(bot_configs, capacidad, medir, limitador=None, vencido=lambda: False,
+                            entradas=None, omitir=None, pausa=None):
+    pendientes = list(bot_configs)
+    en_curso = {}  # task -> slots ocupados
+    libres = capacidad
+
+    async def con_permiso(bot, permiso):
+        try:
+            await medir(bot)
+        finally:
+            await limitador.liberar(permiso)
+
+    while pendientes or en_curso:
+        # Primer ajuste en orden: arranca todo lo que quepa en los slots libres
+        # y cuya fuente no esté saturada (si lo está, se sigue con otras fuentes)
+        saturados = False
+        sin_datos = False
+        pausado = False
+        for bot in list(pendientes):
+            # Worker sobre el techo de memoria: solo se espera a que terminen los que corren
+            if en_curso and pausa is not None and not vencido() and pausa():
+                pausado = True
+                break
+            if entradas is not None and not vencido():
+                faltan = entradas.faltantes(bot)
+                if faltan and entradas.cerrada:
+                    pendientes.remove(bot)
+                    await omitir(bot, faltan)
+                    continue
+                if faltan:
+                    sin_datos = True
+                    continue
+            peso = min(peso_bot(bot), capacidad)
+            if peso <= libres:
+                ejecutable = entradas.enlazar(bot) if entradas is not None else bot
+                # Vencido el plazo global ya no se espera cupo: medir() lo marca timeout
+                if limitador is not None and not vencido():
+                    permiso = await limitador.adquirir(bot, presupuesto_bot(bot) + GRACIA_CANCELACION)
+                    if permiso is None:
+                        saturados = True
+                        continue
+                    tarea = asyncio.ensure_future(con_permiso(ejecutable, permiso))
+                else:
+                    tarea = asyncio.ensure_future(medir(ejecutable))
+                pendientes.remove(bot)
+                libres -= peso
+                en_curso[tarea] = peso
+            if libres <= 0:
+                break
+
+        # Con fuentes saturadas se despierta periódicamente a reintentar
+        espera = limitador.reintento if (saturados and limitador is not None) else None
+        if pausado:
+            espera = min(espera or PAUSA_REINTENTO, PAUSA_REINTENTO)
+        esperas = set(en_curso)
+        cambio = None
+        if sin_datos:
+            # Bots esperando datos (p.ej. el nombre): despertar cuando lleguen
+            cambio = asyncio.ensure_future(entradas.esperar_cambio())
+            esperas.add(cambio)
+        if not esperas:
+            if not pendientes:
+                break
+            await asyncio.sleep(espera or 0)
+            continue
+        hechos, _ = await asyncio.wait(esperas, timeout=espera, return_when=asyncio.FIRST_COMPLETED)
+        if cambio is not None and not cambio.done():
+            cambio.cancel()
+        for t in hechos:
+            if t in en_curso:
+                libres += en_curso.pop(t)
+
+
+async def con_presupuesto(coro, segundos):
+    """
+    Ejecuta `coro` con un límite de `segundos`. Devuelve True si terminó a
+    tiempo; si no, la cancela, espera su limpieza (con margen) y devuelve False.
+    """
+    tarea = asyncio.ensure_future(coro)
+    if segundos <= 0:
+        hechos = set()
+    else:
+        hechos, _ = await asyncio.wait({tarea}, timeout=segundos)
+    if tarea in hechos:
+        tarea.result()
+        return True
+    tarea.cancel()
+    _, pendientes = await asyncio.wait({tarea}, timeout=GRACIA_CANCELACION)
+    if pendientes:
+        print(f"[scheduler] La tarea no terminó su limpieza tras {GRACIA_CANCELACION}s de cancelada; se abandona")
+    return False
+
+
+async def ejecutar_bots(bot_configs, run_bot, capacidad=None, etiqueta="", modo=None,
+                        plazo=None, al_vencer=None, limitador=None, entradas=None, al_omitir=None,
+                        pausa=None):
+    """
+    Ejecuta `run_bot(bot)` para cada bot_config respetando la capacidad y los
+    plazos, y devuelve el reporte de tiempos (makespan, p50/p95, timeouts,
+    bots más lentos).
+
+    - plazo: segundos máximos para toda la ejecución (None = sin plazo global).
+    - al_vencer: corrutina `al_vencer(bot, segundos)` llamada por cada bot
+      cancelado por tiempo (incluye los que no alcanzaron a arrancar).
+    - limitador: p.ej. core.utils.rate_limiter.LimitadorFuentes; se le pide
+      permiso antes de arrancar cada bot (solo en modo "ventana").
+    - entradas: EntradasConsulta; cada bot arranca cuando sus campos
+      requeridos están disponibles. al_omitir(bot, faltantes) se llama por los
+      bots que se quedaron sin datos.
+    - pausa: callable sin argumentos; mientras devuelva True no arrancan bots
+      nuevos (solo en modo "ventana").
+    """
+    capacidad = max(1, capacidad or capacidad_por_defecto())
+    modo = (modo or os.environ.get("BOT_SCHEDULER", "ventana")).strip().lower()
+    tiempos = {}
+    vencidos = []
+    inicio = perf_counter()
+    limite = inicio + plazo if plazo else None
+
+    async def medir(bot):
+        nombre = bot.get("name") or bot["func"].__name__
+        t0 = perf_counter()
+        presupuesto = presupuesto_bot(bot)
+        if limite is not None:
+            presupuesto = min(presupuesto, limite - t0)
+        try:
+            if not await con_presupuesto(run_bot(bot), presupuesto):
+                vencidos.append(nombre)
+                print(f"[scheduler] {etiqueta} bot={nombre} cancelado por tiempo ({perf_counter() - t0:.1f}s)")
+                if al_vencer is not None:
+                    try:
+                        await al_vencer(bot, perf_counter() - t0)
+                    except Exception as e:
+                        print(f"[scheduler] Error registrando timeout de {nombre}: {e}")
+        finally:
+            tiempos[nombre] = perf_counter() - t0
+
+    async def omitir(bot, faltantes):
+        nombre = bot.get("name") or bot["func"].__name__
+        omitidos.append(nombre)
+        print(f"[scheduler] {etiqueta} bot={nombre} omitido: faltan datos {faltantes}")
+        if al_omitir is not None:
+            try:
+                await al_omitir(bot, faltantes)
+            except Exception as e:
+                print(f"[scheduler] Error registrando omisión de {nombre}: {e}")
+
+    omitidos = []
+    if modo == "lotes":
+        await _ejecutar_lotes(bot_configs, capacidad, medir, entradas, omitir)
+    else:
+        modo = "ventana"
+        await _ejecutar_ventana(
+            bot_configs, capacidad, medir, limitador,
+            vencido=lambda: limite is not None and perf_counter() >= limite,
+            entradas=entradas, omitir=omitir, pausa=pausa,
+        )
+    reporte = _reporte(etiqueta, modo, capacidad, perf_counter() - inicio, tiempos, vencidos)
+    reporte["omitidos"] = omitidos
+    return reporte
@@ -0,0 +1,295 @@
+# core/utils/browser_governor.py
+"""
+Supervisor de navegadores y memoria del worker.
+
+Los bots cierran sus navegadores en finally de forma desigual: si el bot se
+cae antes de crear el contexto, si asyncio lo cancela a mitad de un `launch`
+o si usa Playwright directo (sin pasar por browser_pool), el Chromium queda
+vivo y el RSS del worker crece hasta que el sistema lo mata.
+
+El gobernador:
+
+    - registra cada Chromium que se lanza fuera del pool (headful,
+      launch_persistent_context, ...) con la consulta en curso
+      (`consulta_en_curso`, contextvar heredado por las tareas de los bots);
+    - al terminar la consulta (`cerrar_consulta`) mata los que sigan vivos y,
+      si no hay otra consulta corriendo en el proceso, cualquier Chromium
+      descendiente del worker que no sea del pool (bots con Playwright directo);
+    - mide el RSS del worker + todos sus descendientes + los Chromium
+      registrados (que pueden haber quedado huérfanos, colgados de init) y,
+      sobre GOBERNADOR_MAX_RSS_MB, el scheduler deja de arrancar bots nuevos
+      (`saturado()`) y se cierran las páginas calientes y los navegadores
+      ociosos del pool;
+    - `estado()` expone navegadores/contextos vivos, RSS y contadores. Cada
+      proceso worker lo publica en el Redis del broker cada
+      GOBERNADOR_INTERVALO s mientras corre bots (desde `saturado()`) y al
+      cerrar cada consulta, con vencimiento; `estados()` los junta para el
+      endpoint GET api/navegadores/estado/ (un proceso sin bots deja de figurar).
+
+Los navegadores del pool se reconocen por el PID que reporta el propio
+Chromium (browser_pool.pid_navegador), nunca por diferencias de /proc.
+
+Variables de entorno:
+    GOBERNADOR_MAX_RSS_MB     techo de memoria del proceso worker y sus navegadores (default 3000; 0 = sin techo)
+    GOBERNADOR_INTERVALO      segundos entre mediciones de RSS (default 5)
+"""
+import os
+import json
+import time
+import signal
+import socket
+import asyncio
+import itertools
+import contextvars
+
+from django.conf import settings
+
+from core.utils.browser_pool import _procesos, descendientes, pids_chromium, rss_mb, current_pool
+from core.utils.warm_pages import vaciar as vaciar_calientes
+
+try:
+    import redis.asyncio as aioredis
+except Exception:  # redis no instalado → el estado solo se ve en el log del worker
+    aioredis = None
+
+
+def _env_int(nombre, default):
+    try:
+        return int(os.environ.get(nombre, str(default)))
+    except Exception:
+        return default
+
+
+MAX_RSS_MB = _env_int("GOBERNADOR_MAX_RSS_MB", 3000)
+INTERVALO = _env_int("GOBERNADOR_INTERVALO", 5)
+
+# Consulta a la que pertenece la tarea asyncio actual
+_consulta_actual = contextvars.ContextVar("consulta_actual", default=None)
+
+# clave de ejecución → {pid: starttime} de los Chromium lanzados fuera del pool
+_registrados = {}
+_activas = set()
+_secuencia = itertools.count(1)
+
+_medicion = {"en": 0.0, "rss_mb": 0.0, "saturado": False}
+_contadores = {"eliminados": 0, "pausas": 0, "liberados": 0}
+
+# Estado publicado por proceso (ver `estados`)
+PREFIJO = "econfia:navegadores"
+VIGENCIA_ESTADO = 60
+_publicacion = {"en": 0.0, "cliente": None, "avisado": False}
+
+
+def _url_redis():
+    return getattr(settings, "CELERY_BROKER_URL", "redis://localhost:6379/0")
+
+
+async def _publicar(datos):
+    try:
+        if _publicacion["cliente"] is None:
+            _publicacion["cliente"] = aioredis.from_url(_url_redis(), socket_timeout=2, socket_connect_timeout=2)
+        clave = f"{PREFIJO}:{socket.gethostname()}:{os.getpid()}"
+        await _publicacion["cliente"].set(clave, json.dumps(datos), ex=VIGENCIA_ESTADO)
+    except Exception as e:
+        if not _publicacion["avisado"]:
+            print(f"[gobernador] No se pudo publicar el estado en Redis: {e}")
+            _publicacion["avisado"] = True
+
+
+def publicar_estado(forzar=False):
+    """Programa la publicación de `estado()` (como mucho cada GOBERNADOR_INTERVALO s). Desde el loop del worker."""
+    ahora = time.monotonic()
+    if aioredis is None or (not forzar and ahora - _publicacion["en"] < INTERVALO):
+        return
+    _publicacion["en"] = ahora
+    datos = {"host": socket.gethostname(), "pid": os.getpid(), "en": time.time(), **estado()}
+    asyncio.ensure_future(_publicar(datos))
+
+
+def consulta_en_curso(consulta_id):
+    """
+    Marca la consulta de la tarea asyncio actual y la da por activa. Devuelve
+    la clave para `cerrar_consulta` (dos grupos de la misma consulta en el
+    mismo proceso no se pisan).
+    """
+    clave = (consulta_id, next(_secuencia))
+    _consulta_actual.set(clave)
+    _activas.add(clave)
+    _registrados.setdefault(clave, {})
+    return clave
+
+
+def _inicio_proceso(pid):
+    """starttime de /proc/<pid>/stat (distingue un PID reutilizado)."""
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            stat = f.read()
+        return int(stat[stat.rindex(")") + 2:].split()[19])
+    except Exception:
+        return None
+
+
+def registrar_navegadores(pids):
+    """Asocia Chromium recién lanzados (fuera del pool) a la consulta en curso."""
+    consulta_id = _consulta_actual.get()
+    for pid in pids:
+        inicio = _inicio_proceso(pid)
+        if inicio is not None:
+            _registrados.setdefault(consulta_id, {})[pid] = inicio
+
+
+def _vivo(pid, inicio):
+    return _inicio_proceso(pid) == inicio
+
+
+def _pids_pool(pool):
+    return {s.pid for s in (pool._browsers if pool else []) if s.pid}
+
+
+def _pool_identificado(pool):
+    """
+    True si todos los navegadores del pool tienen PID conocido y no hay un
+    launch en curso (un Chromium recién lanzado aún no está en _browsers).
+    """
+    if pool is None:
+        return True
+    return not pool.lanzando and all(s.pid for s in pool._browsers)
+
+
+def _matar(pid, procs):
+    """SIGKILL a `pid` y todo su árbol. Devuelve cuántos procesos mató."""
+    muertos = 0
+    for p in descendientes(pid, procs) + [pid]:
+        try:
+            os.kill(p, signal.SIGKILL)
+            muertos += 1
+        except ProcessLookupError:
+            pass
+        except Exception as e:
+            print(f"[gobernador] No se pudo terminar pid={p}: {e}")
+    return muertos
+
+
+def cerrar_consulta(clave):
+    """
+    Llamar cuando terminan los bots de la consulta (`clave` de
+    consulta_en_curso): mata sus Chromium que sigan vivos y, si el proceso
+    queda sin consultas, los huérfanos sin registrar. Devuelve la cantidad de
+    navegadores eliminados.
+    """
+    _activas.discard(clave)
+    propios = _registrados.pop(clave, {})
+    procs = _procesos()
+    pool = current_pool()
+    en_pool = _pids_pool(pool)
+    # Un navegador del pool nunca es objetivo, aunque se haya registrado como propio
+    objetivos = {pid for pid, inicio in propios.items() if _vivo(pid, inicio)} - en_pool
+
+    # Sin consultas corriendo se barren los Chromium sin registrar, salvo que
+    # algún navegador del pool no tenga PID o se esté lanzando (páginas
+    # calientes, renovación de sesiones): no se podría distinguir
+    if not _activas and _pool_identificado(pool):
+        excluidos = set(en_pool)
+        for registrados in _registrados.values():
+            excluidos.update(registrados)
+        objetivos.update(pids_chromium(procs) - excluidos)
+
+    for pid in objetivos:
+        _matar(pid, procs)
+    # sin consulta (p.ej. renovación de sesiones): solo se conservan los vivos
+    _registrados[None] = {pid: inicio for pid, inicio in _registrados.get(None, {}).items() if _vivo(pid, inicio)}
+    if objetivos:
+        _contadores["eliminados"] += len(objetivos)
+        print(f"[gobernador] consulta={clave[0]}: {len(objetivos)} Chromium huérfanos eliminados {sorted(objetivos)}")
+    publicar_estado(forzar=True)
+    return len(objetivos)
+
+
+def _rss_total(procs):
+    """RSS del worker y sus descendientes + Chromium registrados fuera del árbol."""
+    total = rss_mb(os.getpid(), procs)
+    arbol = set(descendientes(os.getpid(), procs))
+    for registrados in _registrados.values():
+        for pid, inicio in registrados.items():
+            if pid not in arbol and _vivo(pid, inicio):
+                total += rss_mb(pid, procs)
+    return total
+
+
+def _liberar_ociosos(pool):
+    """Cierra los navegadores del pool sin contextos abiertos (se relanzan al volver a necesitarse)."""
+    if pool is None:
+        return
+    for slot in list(pool._browsers):
+        if slot.activos == 0:
+            slot.retirar = True
+            asyncio.ensure_future(pool._cerrar(slot))
+            _contadores["liberados"] += 1
+
+
+def saturado():
+    """
+    True si el worker está sobre el techo de memoria: el scheduler no arranca
+    bots nuevos mientras tanto. Mide como mucho cada GOBERNADOR_INTERVALO s.
+    Debe llamarse desde el loop del worker (cierra navegadores del pool).
+    """
+    publicar_estado()
+    if not MAX_RSS_MB:
+        return False
+    ahora = time.monotonic()
+    if ahora - _medicion["en"] < INTERVALO:
+        return _medicion["saturado"]
+    _medicion["en"] = ahora
+    _medicion["rss_mb"] = _rss_total(_procesos())
+    antes = _medicion["saturado"]
+    _medicion["saturado"] = _medicion["rss_mb"] > MAX_RSS_MB
+    if _medicion["saturado"]:
+        asyncio.ensure_future(vaciar_calientes())
+        _liberar_ociosos(current_pool())
+        if not antes:
+            _contadores["pausas"] += 1
+            print(f"[gobernador] RSS {_medicion['rss_mb']:.0f} MB > {MAX_RSS_MB} MB: se pausan bots nuevos")
+    elif antes:
+        print(f"[gobernador] RSS {_medicion['rss_mb']:.0f} MB: se reanudan bots")
+    return _medicion["saturado"]
+
+
+def estado():
+    """Navegadores/contextos vivos del proceso, memoria y contadores."""
+    procs = _procesos()
+    pool = current_pool()
+    stats = pool.stats() if pool else {}
+    en_pool = _pids_pool(pool)
+    propios = [
+        pid for registrados in _registrados.values()
+        for pid, inicio in registrados.items() if _vivo(pid, inicio)
+    ]
+    return {
+        "navegadores_pool": stats.get("navegadores", 0),
+        "contextos_activos": stats.get("contextos_activos", 0),
+        "navegadores_propios": len(propios),
+        "navegadores_sin_registrar": len(pids_chromium(procs) - en_pool - set(propios)),
+        "consultas_activas": len(_activas),
+        "rss_mb": round(_rss_total(procs), 1),
+        "max_rss_mb": MAX_RSS_MB,
+        "saturado": _medicion["saturado"],
+        **_contadores,
+    }
+
+
+async def estados():
+    """Último estado publicado por cada proceso worker vivo: {"host:pid": estado}."""
+    if aioredis is None:
+        return {}
+    cliente = aioredis.from_url(_url_redis(), socket_timeout=2, socket_connect_timeout=2)
+    try:
+        claves = [c async for c in cliente.scan_iter(match=f"{PREFIJO}:*")]
+        valores = await cliente.mget(claves) if claves else []
+    finally:
+        await cliente.aclose()
+    salida = {}
+    for clave, valor in zip(claves, valores):
+        if valor:
+            clave = clave.decode() if isinstance(clave, bytes) else clave
+            salida[clave[len(PREFIJO) + 1:]] = json.loads(valor)
+    return salida
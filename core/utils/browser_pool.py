@@ -0,0 +1,495 @@
+# core/utils/browser_pool.py
+"""
+Pool de navegadores Chromium "calientes" para los workers de Celery.
+
+Antes cada bot hacía `async with async_playwright()` + `chromium.launch()` para
+una sola página, así que una consulta arrancaba 100+ navegadores. Este módulo
+mantiene N Chromium abiertos en un event loop persistente del worker y le
+entrega a cada bot un BrowserContext nuevo (aislado: cookies, storage, cache).
+
+Uso desde los bots (drop-in):
+
+    from core.utils.browser_pool import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)   # lease del pool
+        context = await browser.new_context()              # contexto aislado
+        ...
+        await browser.close()                              # cierra SOLO sus contextos
+
+Si el código no corre en el loop del worker (vistas, scripts, shell) o el
+`launch()` pide algo que el pool no ofrece (headful, channel, slow_mo, proxy),
+se usa Playwright normal, igual que antes.
+
+Uso desde las tasks: `run_sync(coro_fn, *args)` en vez de `async_to_sync(coro_fn)(*args)`.
+
+Variables de entorno:
+    BROWSER_POOL_ENABLED       1/0 (default 1)
+    BROWSER_POOL_SIZE          navegadores calientes por proceso worker (default 4)
+    BROWSER_POOL_MAX_CONTEXTS  contextos servidos antes de reciclar un navegador (default 50)
+    BROWSER_POOL_MAX_RSS_MB    RSS (navegador + hijos) a partir del cual se recicla (default 1500)
+"""
+import os
+import time
+import asyncio
+import threading
+
+from asgiref.sync import async_to_sync, sync_to_async
+from celery.signals import worker_process_shutdown
+from django.db import close_old_connections
+from playwright.async_api import async_playwright as _async_playwright
+
+from core.utils.network_profile import aplicar_perfil
+from core.utils.page_settle import seguir_paginas
+from core.utils.stealth import preparar_contexto
+from core.utils.har_replay import activo as har_activo, instalar as instalar_har
+
+
+def _env_int(nombre, default):
+    try:
+        return int(os.environ.get(nombre, str(default)))
+    except Exception:
+        return default
+
+
+POOL_ENABLED = os.environ.get("BROWSER_POOL_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+POOL_SIZE = _env_int("BROWSER_POOL_SIZE", 4)
+POOL_MAX_CONTEXTS = _env_int("BROWSER_POOL_MAX_CONTEXTS", 50)
+POOL_MAX_RSS_MB = _env_int("BROWSER_POOL_MAX_RSS_MB", 1500)
+
+# Flags con los que arrancan los navegadores del pool. Un bot que pida un
+# subconjunto de estos args (lo habitual en core/bots) puede usar el pool.
+POOL_LAUNCH_ARGS = [
+    "--no-sandbox",
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-blink-features=AutomationControlled",
+]
+_LAUNCH_KWARGS_COMPATIBLES = {"headless", "args", "timeout"}
+
+# Cada cuánto (s) se mide el RSS de los navegadores; leer /proc no es gratis.
+_RSS_CHECK_INTERVAL = 10
+
+
+# ---------------------------------------------------------------------------
+# Procesos (Linux /proc). Playwright no expone el PID del navegador; se pide
+# por CDP (`pid_navegador`).
+# ---------------------------------------------------------------------------
+def _procesos():
+    """Devuelve {pid: (ppid, nombre)} leyendo /proc. Vacío si no hay /proc."""
+    procs = {}
+    try:
+        pids = [int(d) for d in os.listdir("/proc") if d.isdigit()]
+    except Exception:
+        return procs
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat", "r") as f:
+                stat = f.read()
+            # formato: pid (comm) state ppid ...
+            nombre = stat[stat.index("(") + 1:stat.rindex(")")]
+            ppid = int(stat[stat.rindex(")") + 2:].split()[1])
+            procs[pid] = (ppid, nombre)
+        except Exception:
+            continue
+    return procs
+
+
+def descendientes(pid, procs=None):
+    """PIDs de todos los descendientes de `pid` (hijos, nietos, ...)."""
+    procs = procs if procs is not None else _procesos()
+    hijos = {}
+    for p, (ppid, _) in procs.items():
+        hijos.setdefault(ppid, []).append(p)
+    out, pendientes = [], list(hijos.get(pid, []))
+    while pendientes:
+        p = pendientes.pop()
+        out.append(p)
+        pendientes.extend(hijos.get(p, []))
+    return out
+
+
+def pids_chromium(procs=None):
+    """PIDs raíz de Chromium lanzados (vía el driver de Playwright) por este proceso."""
+    procs = procs if procs is not None else _procesos()
+    chromes = {p for p in descendientes(os.getpid(), procs) if "chrom" in procs[p][1].lower()}
+    # raíz = chromium cuyo padre no es otro chromium
+    return {p for p in chromes if procs[p][0] not in chromes}
+
+
+async def pid_navegador(browser):
+    """
+    PID del proceso principal de `browser` según el propio Chromium
+    (CDP SystemInfo.getProcessInfo). None si no se puede obtener.
+    """
+    try:
+        sesion = await browser.new_browser_cdp_session()
+        try:
+            info = await sesion.send("SystemInfo.getProcessInfo")
+        finally:
+            await sesion.detach()
+    except Exception as e:
+        print(f"[browser_pool] No se pudo obtener el pid del navegador: {e}")
+        return None
+    for proceso in info.get("processInfo", []):
+        if proceso.get("type") == "browser":
+            return proceso.get("id")
+    return None
+
+
+def rss_mb(pid, procs=None):
+    """RSS en MB de `pid` más todos sus descendientes."""
+    total_kb = 0
+    for p in [pid] + descendientes(pid, procs):
+        try:
+            with open(f"/proc/{p}/status", "r") as f:
+                for linea in f:
+                    if linea.startswith("VmRSS:"):
+                        total_kb += int(linea.split()[1])
+                        break
+        except Exception:
+            continue
+    return total_kb / 1024
+
+
+# ---------------------------------------------------------------------------
+# Pool
+# ---------------------------------------------------------------------------
+class _PooledBrowser:
+    def __init__(self, browser, pid):
+        self.browser = browser
+        self.pid = pid
+        self.servidos = 0      # contextos entregados en toda su vida
+        self.activos = 0       # contextos abiertos ahora mismo
+        self.retirar = False   # no recibe más contextos; se cierra al quedar vacío
+
+
+class BrowserPool:
+    """
+    N navegadores Chromium reutilizables. Todos los métodos deben llamarse
+    desde el mismo event loop (el loop persistente del worker).
+    """
+
+    def __init__(self, size=POOL_SIZE, max_contexts=POOL_MAX_CONTEXTS,
+                 max_rss_mb=POOL_MAX_RSS_MB, launch_args=None):
+        self.size = max(1, size)
+        self.max_contexts = max_contexts
+        self.max_rss_mb = max_rss_mb
+        self.launch_args = list(launch_args or POOL_LAUNCH_ARGS)
+        self._pw_cm = None
+        self.playwright = None
+        self._browsers = []
+        self._lock = asyncio.Lock()
+        self._rss_checked_at = 0.0
+        self.reciclados = 0
+        self.lanzando = 0      # launch en curso: aún no están en _browsers
+
+    async def start(self):
+        if self.playwright is None:
+            self._pw_cm = _async_playwright()
+            self.playwright = await self._pw_cm.__aenter__()
+        return self
+
+    def acepta_launch(self, kwargs):
+        """True si un `chromium.launch(**kwargs)` puede atenderse con el pool."""
+        # Grabando/reproduciendo HAR todo pasa por el pool (core/utils/har_replay.py)
+        if har_activo():
+            return True
+        # slow_mo=0 (default de ADRES_SLOW_MO y similares) no cambia nada
+        kwargs = {k: v for k, v in kwargs.items() if not (k == "slow_mo" and not v)}
+        if set(kwargs) - _LAUNCH_KWARGS_COMPATIBLES:
+            return False
+        if kwargs.get("headless", True) is False:
+            return False
+        return set(kwargs.get("args") or []) <= set(self.launch_args)
+
+    async def _launch(self):
+        # El PID sale del navegador lanzado, no de comparar /proc antes/después:
+        # con otros launch en paralelo la diferencia puede traer un Chromium ajeno
+        self.lanzando += 1
+        try:
+            browser = await self.playwright.chromium.launch(headless=True, args=self.launch_args)
+            pid = await pid_navegador(browser)
+        finally:
+            self.lanzando -= 1
+        print(f"[browser_pool] Chromium lanzado (pid={pid}, version={browser.version})")
+        return _PooledBrowser(browser, pid)
+
+    async def _cerrar(self, slot):
+        try:
+            self._browsers.remove(slot)
+        except ValueError:
+            pass
+        try:
+            await slot.browser.close()
+        except Exception:
+            pass
+        self.reciclados += 1
+        print(f"[browser_pool] Chromium reciclado (pid={slot.pid}, contextos={slot.servidos})")
+
+    def _revisar_rss(self):
+        ahora = time.monotonic()
+        if not self.max_rss_mb or ahora - self._rss_checked_at < _RSS_CHECK_INTERVAL:
+            return
+        self._rss_checked_at = ahora
+        procs = _procesos()
+        for slot in self._browsers:
+            if slot.pid and not slot.retirar and rss_mb(slot.pid, procs) > self.max_rss_mb:
+                print(f"[browser_pool] Chromium pid={slot.pid} supera {self.max_rss_mb} MB, se recicla")
+                slot.retirar = True
+
+    async def _elegir(self):
+        # Descarta navegadores muertos y los retirados ya vacíos
+        for slot in list(self._browsers):
+            if not slot.browser.is_connected() or (slot.retirar and slot.activos == 0):
+                await self._cerrar(slot)
+
+        self._revisar_rss()
+        vivos = [s for s in self._browsers if not s.retirar]
+        if len(vivos) < self.size:
+            slot = await self._launch()
+            self._browsers.append(slot)
+            return slot
+        return min(vivos, key=lambda s: s.activos)
+
+    async def new_context(self, **kwargs):
+        """Crea un BrowserContext nuevo en el navegador menos cargado."""
+        await self.start()
+        async with self._lock:
+            slot = await self._elegir()
+            slot.activos += 1
+            slot.servidos += 1
+            if self.max_contexts and slot.servidos >= self.max_contexts:
+                slot.retirar = True
+        try:
+            # Perfil sigiloso si el bot lo pide (core/utils/stealth.py)
+            kwargs, script = preparar_contexto(kwargs, slot.browser.version)
+            context = await slot.browser.new_context(**kwargs)
+            if script:
+                await context.add_init_script(script=script)
+        except Exception:
+            self._liberar(slot)
+            raise
+        context.once("close", lambda _: self._liberar(slot))
+        # Peticiones en curso por página para esperar_estable (core/utils/page_settle.py)
+        seguir_paginas(context)
+        # Bloqueo de trackers/medios según el bot en curso (core/utils/network_profile.py)
+        context = await aplicar_perfil(context)
+        return await instalar_har(context)
+
+    def _liberar(self, slot):
+        slot.activos = max(0, slot.activos - 1)
+        if slot.retirar and slot.activos == 0 and slot in self._browsers:
+            asyncio.ensure_future(self._cerrar(slot))
+
+    def stats(self):
+        return {
+            "navegadores": len(self._browsers),
+            "contextos_activos": sum(s.activos for s in self._browsers),
+            "contextos_servidos": sum(s.servidos for s in self._browsers),
+            "reciclados": self.reciclados,
+        }
+
+    async def close(self):
+        for slot in list(self._browsers):
+            await self._cerrar(slot)
+        if self._pw_cm is not None:
+            try:
+                await self._pw_cm.__aexit__(None, None, None)
+            except Exception:
+                pass
+        self._pw_cm = None
+        self.playwright = None
+
+
+# ---------------------------------------------------------------------------
+# Proxies drop-in para `async with async_playwright() as p:` en los bots
+# ---------------------------------------------------------------------------
+class _BrowserLease:
+    """Se comporta como un Browser, pero sus contextos viven en el pool."""
+
+    def __init__(self, pool):
+        self._pool = pool
+        self._contexts = []
+        self._closed = False
+
+    async def new_context(self, **kwargs):
+        return self.adoptar(await self._pool.new_context(**kwargs))
+
+    def adoptar(self, context):
+        """Hace a este lease dueño de un contexto del pool (p.ej. una página caliente)."""
+        self._contexts.append(context)
+        context.once("close", lambda _: self._contexts.remove(context) if context in self._contexts else None)
+        return context
+
+    async def new_page(self, **kwargs):
+        # Igual que Browser.new_page: la página es dueña de su contexto
+        context = await self.new_context(**kwargs)
+        page = await context.new_page()
+        page.once("close", lambda _: asyncio.ensure_future(context.close()))
+        return page
+
+    @property
+    def contexts(self):
+        return list(self._contexts)
+
+    def is_connected(self):
+        return not self._closed
+
+    async def close(self, **kwargs):
+        self._closed = True
+        for context in list(self._contexts):
+            try:
+                await context.close()
+            except Exception:
+                pass
+        self._contexts.clear()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def __getattr__(self, name):
+        # version, browser_type, etc. → cualquier navegador real del pool
+        for slot in self._pool._browsers:
+            return getattr(slot.browser, name)
+        raise AttributeError(name)
+
+
+def _registrar_propios(pids):
+    """Chromium lanzados fuera del pool → gobernador (los mata si la consulta termina sin cerrarlos)."""
+    from core.utils.browser_governor import registrar_navegadores
+    registrar_navegadores(pids - {s.pid for s in (_pool._browsers if _pool else [])})
+
+
+class _PooledBrowserType:
+    def __init__(self, owner, real):
+        self._owner = owner
+        self._real = real
+
+    async def launch(self, **kwargs):
+        if self._owner._pool.acepta_launch(kwargs):
+            lease = _BrowserLease(self._owner._pool)
+            self._owner._recursos.append(lease)
+            return lease
+        antes = pids_chromium()
+        browser = await self._real.launch(**kwargs)
+        pid = await pid_navegador(browser)
+        _registrar_propios({pid} if pid else pids_chromium() - antes)
+        self._owner._recursos.append(browser)
+        return browser
+
+    async def launch_persistent_context(self, *args, **kwargs):
+        # Un contexto persistente no expone su Browser (sin CDP de navegador):
+        # queda la diferencia de /proc; el gobernador nunca mata los del pool
+        antes = pids_chromium()
+        context = await self._real.launch_persistent_context(*args, **kwargs)
+        _registrar_propios(pids_chromium() - antes)
+        seguir_paginas(context)
+        await instalar_har(context)
+        self._owner._recursos.append(context)
+        return context
+
+    def __getattr__(self, name):
+        return getattr(self._real, name)
+
+
+class _PooledPlaywright:
+    def __init__(self, pool):
+        self._pool = pool
+        self._recursos = []  # leases / navegadores propios abiertos a través de este objeto
+        self.chromium = _PooledBrowserType(self, pool.playwright.chromium)
+
+    def __getattr__(self, name):
+        return getattr(self._pool.playwright, name)
+
+    async def _cerrar_recursos(self):
+        for recurso in reversed(self._recursos):
+            try:
+                await recurso.close()
+            except Exception:
+                pass
+        self._recursos.clear()
+
+
+class _PooledPlaywrightContextManager:
+    def __init__(self, pool):
+        self._pool = pool
+        self._pw = None
+
+    async def __aenter__(self):
+        await self._pool.start()
+        self._pw = _PooledPlaywright(self._pool)
+        return self._pw
+
+    async def __aexit__(self, *exc):
+        # Equivale al cierre del driver: nada de lo que abrió el bot sobrevive
+        await self._pw._cerrar_recursos()
+
+
+# ---------------------------------------------------------------------------
+# Event loop persistente del worker
+# ---------------------------------------------------------------------------
+_loop = None
+_pool = None
+_loop_lock = threading.Lock()
+
+
+def _get_worker_loop():
+    global _loop, _pool
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="browser-pool-loop", daemon=True).start()
+            _pool = BrowserPool()
+    return _loop
+
+
+def current_pool():
+    """Pool del worker si estamos corriendo en su loop; None en cualquier otro caso."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    if _pool is not None and loop is _loop:
+        return _pool
+    return None
+
+
+def async_playwright():
+    """Reemplazo de playwright.async_api.async_playwright que usa el pool cuando existe."""
+    pool = current_pool()
+    if pool is None:
+        return _async_playwright()
+    return _PooledPlaywrightContextManager(pool)
+
+
+def run_sync(async_fn, *args, **kwargs):
+    """
+    Ejecuta `async_fn(*args, **kwargs)` en el loop persistente del worker y
+    espera su resultado. Sin pool habilitado es idéntico a async_to_sync.
+    """
+    if not POOL_ENABLED:
+        return async_to_sync(async_fn)(*args, **kwargs)
+
+    async def _wrapper():
+        await sync_to_async(close_old_connections)()
+        try:
+            return await async_fn(*args, **kwargs)
+        finally:
+            await sync_to_async(close_old_connections)()
+
+    future = asyncio.run_coroutine_threadsafe(_wrapper(), _get_worker_loop())
+    return future.result()
+
+
+@worker_process_shutdown.connect
+def _cerrar_pool(**kwargs):
+    if _loop is None or _pool is None or _loop.is_closed():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_pool.close(), _loop).result(timeout=30)
+    except Exception as e:
+        print(f"[browser_pool] Error cerrando el pool: {e}")
@@ -0,0 +1,256 @@
+# core/utils/evidence_encoder.py
+"""
+Codificación de evidencias (capturas) fuera del event loop.
+
+Los bots guardaban capturas full_page como PNG sin pérdida directamente desde
+el loop (hasta 1920x20000 px en procuraduría) y algunos las re-abrían con PIL
+para armar grillas (rama_judicial). Mientras tanto el loop del worker, que
+comparten todos los bots de la consulta, quedaba bloqueado.
+
+Aquí la captura se pide a Playwright como buffer y la reducción/codificación
+se hace en un pool de procesos, según una política configurable:
+
+    final = await guardar_captura(page, "/ruta/evidencia.png")   # ruta real (la extensión sigue el formato)
+    await captura_completa(page, ruta_png, full_page=True)       # misma ruta; en vez de page.screenshot(path=...)
+    final = await codificar(buffer_png, "/ruta/evidencia.png")
+    texto = await en_segundo_plano(_docx_to_text, ruta_docx)         # cualquier trabajo PIL/fitz
+
+Las evidencias que ya son PDF (certificados descargados, tablas armadas con
+ReportLab) se guardan como PDF vectorial en vez de rasterizarlas a PNG; el
+consolidado las anexa tal cual (core/utils/pdf_generator.py):
+
+    final = await evidencia_pdf("/ruta/certificado.pdf", "/ruta/certificado.png")
+
+Si el worker no puede crear procesos hijos (p.ej. procesos daemon del
+prefork de Celery), se usa un hilo: PIL libera el GIL al codificar, así que
+el loop sigue libre.
+
+Variables de entorno:
+    EVIDENCIA_FORMATO     png | webp | jpeg (default png, compatible con rutas .png existentes)
+    EVIDENCIA_MAX_ANCHO   ancho máximo en px (default 1600)
+    EVIDENCIA_MAX_ALTO    alto máximo en px (default 16000; WebP no admite más de 16383)
+    EVIDENCIA_CALIDAD     calidad webp/jpeg (default 80)
+    EVIDENCIA_PROCESOS    procesos del pool (default 2; 0 = usar hilos)
+    EVIDENCIA_PDF         pdf | png: evidencia PDF guardada tal cual o rasterizada (default pdf)
+    EVIDENCIA_PDF_MAX_PAGINAS  páginas que se conservan/rasterizan (default 10)
+"""
+import io
+import os
+import asyncio
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+def _env_int(nombre, default):
+    try:
+        return int(os.environ.get(nombre, str(default)))
+    except Exception:
+        return default
+
+
+FORMATO = (os.environ.get("EVIDENCIA_FORMATO", "png") or "png").strip().lower()
+MAX_ANCHO = _env_int("EVIDENCIA_MAX_ANCHO", 1600)
+MAX_ALTO = _env_int("EVIDENCIA_MAX_ALTO", 16000)
+CALIDAD = _env_int("EVIDENCIA_CALIDAD", 80)
+PROCESOS = _env_int("EVIDENCIA_PROCESOS", 2)
+EVIDENCIA_PDF = (os.environ.get("EVIDENCIA_PDF", "pdf") or "pdf").strip().lower()
+PDF_MAX_PAGINAS = _env_int("EVIDENCIA_PDF_MAX_PAGINAS", 10)
+
+EXTENSIONES = {"png": ".png", "webp": ".webp", "jpeg": ".jpg", "jpg": ".jpg"}
+
+_pool = None
+_sin_procesos = PROCESOS <= 0
+
+
+def ruta_con_formato(destino, formato=None):
+    """`destino` con la extensión del formato de salida."""
+    formato = (formato or FORMATO).lower()
+    base, _ = os.path.splitext(destino)
+    return base + EXTENSIONES.get(formato, ".png")
+
+
+def _codificar(datos, destino, formato, max_ancho, max_alto, calidad):
+    """Reduce y guarda la imagen `datos` (bytes). Corre en el pool; devuelve la ruta final."""
+    from PIL import Image
+
+    im = Image.open(io.BytesIO(datos))
+    im.load()
+    escala = min(
+        1.0,
+        (max_ancho / im.width) if max_ancho else 1.0,
+        (max_alto / im.height) if max_alto else 1.0,
+    )
+    if escala < 1.0:
+        im = im.resize((max(1, int(im.width * escala)), max(1, int(im.height * escala))), Image.LANCZOS)
+
+    final = ruta_con_formato(destino, formato)
+    os.makedirs(os.path.dirname(final) or ".", exist_ok=True)
+    if formato == "webp":
+        im.save(final, "WEBP", quality=calidad, method=4)
+    elif formato in ("jpeg", "jpg"):
+        im.convert("RGB").save(final, "JPEG", quality=calidad, optimize=True, progressive=True)
+    else:
+        if im.mode not in ("RGB", "RGBA", "P", "L"):
+            im = im.convert("RGB")
+        im.save(final, "PNG", optimize=True)
+    return final
+
+
+def _executor():
+    global _pool, _sin_procesos
+    if _sin_procesos:
+        return None
+    if _pool is None:
+        try:
+            _pool = ProcessPoolExecutor(max_workers=PROCESOS)
+        except Exception as e:
+            print(f"[evidencia] Sin pool de procesos ({e}); se codifica en hilos")
+            _sin_procesos = True
+            return None
+    return _pool
+
+
+async def en_segundo_plano(fn, *args, **kwargs):
+    """
+    Ejecuta `fn(*args, **kwargs)` (función de módulo, serializable) en el pool
+    de procesos, o en un hilo si no hay pool. Nunca en el event loop.
+    """
+    global _sin_procesos
+    llamada = functools.partial(fn, *args, **kwargs)
+    pool = _executor()
+    if pool is not None:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, llamada)
+        except (AssertionError, BrokenProcessPool) as e:
+            # procesos daemon (prefork) no pueden tener hijos, pool roto, etc.
+            print(f"[evidencia] Pool de procesos no disponible ({e}); se usan hilos")
+            _sin_procesos = True
+    return await asyncio.to_thread(llamada)
+
+
+async def codificar(datos, destino, formato=None, max_ancho=None, max_alto=None, calidad=None):
+    """Codifica el buffer `datos` según la política y lo guarda; devuelve la ruta final."""
+    return await en_segundo_plano(
+        _codificar, datos, destino,
+        (formato or FORMATO).lower(),
+        MAX_ANCHO if max_ancho is None else max_ancho,
+        MAX_ALTO if max_alto is None else max_alto,
+        CALIDAD if calidad is None else calidad,
+    )
+
+
+async def guardar_captura(objetivo, destino, formato=None, **kwargs):
+    """
+    Captura `objetivo` (Page, Locator o ElementHandle) como buffer PNG y la
+    guarda codificada. kwargs van a `screenshot()` (full_page, clip, ...).
+    `formato` fija el formato para bots que ya tienen la ruta .png armada.
+    Devuelve la ruta final.
+    """
+    kwargs.pop("path", None)
+    kwargs.pop("type", None)
+    kwargs.pop("quality", None)
+    datos = await objetivo.screenshot(type="png", **kwargs)
+    return await codificar(datos, destino, formato=formato)
+
+
+# Extensión de la ruta → formato que la conserva
+FORMATO_POR_EXTENSION = {".png": "png", ".webp": "webp", ".jpg": "jpeg", ".jpeg": "jpeg"}
+
+
+async def captura_completa(objetivo, destino, **kwargs):
+    """
+    Reemplazo directo de `await page.screenshot(path=destino, full_page=True)`:
+    misma ruta y formato según su extensión, pero reducida (EVIDENCIA_MAX_ANCHO/
+    ALTO) y codificada fuera del loop. Devuelve `destino`.
+    """
+    formato = FORMATO_POR_EXTENSION.get(os.path.splitext(destino)[1].lower(), "png")
+    final = await guardar_captura(objetivo, destino, formato=formato, **kwargs)
+    if final != destino:
+        # .jpeg o extensión desconocida: el bot guarda `destino` como evidencia
+        os.replace(final, destino)
+    return destino
+
+
+# ---------------------------------------------------------------------------
+# Evidencias PDF
+# ---------------------------------------------------------------------------
+def _recortar_pdf(ruta, max_paginas, destino):
+    """
+    PDF con a lo sumo `max_paginas` páginas. Corre en el pool; devuelve `ruta`
+    si no hace falta recortar, o `destino` con el recorte. El original no se
+    toca: el bot lo sigue leyendo (texto, OCR) después de armar la evidencia.
+    """
+    import fitz
+
+    with fitz.open(ruta) as doc:
+        if doc.page_count == 0:
+            raise ValueError("PDF sin páginas")
+        if not max_paginas or doc.page_count <= max_paginas:
+            return ruta
+        doc.select(list(range(max_paginas)))
+        tmp = destino + ".tmp"
+        doc.save(tmp, garbage=3, deflate=True)
+    os.replace(tmp, destino)
+    return destino
+
+
+def _pdf_a_imagen(ruta, destino, zoom, max_paginas, columnas, formato, max_ancho, max_alto, calidad):
+    """
+    Rasteriza hasta `max_paginas` páginas en una sola imagen (grilla de
+    `columnas`) y la guarda como `_codificar`. Corre en el pool.
+    """
+    import fitz
+    from PIL import Image
+
+    paginas = []
+    with fitz.open(ruta) as doc:
+        for i in range(min(doc.page_count, max_paginas or doc.page_count)):
+            pix = doc[i].get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            paginas.append(Image.frombytes("RGB", (pix.width, pix.height), pix.samples))
+    if not paginas:
+        raise ValueError("PDF sin páginas")
+
+    columnas = max(1, min(columnas, len(paginas)))
+    pad = 8
+    ancho = max(im.width for im in paginas)
+    filas = [paginas[i:i + columnas] for i in range(0, len(paginas), columnas)]
+    altos = [max(im.height for im in fila) for fila in filas]
+    lienzo = Image.new("RGB", (columnas * ancho + pad * (columnas - 1), sum(altos) + pad * (len(filas) - 1)), "white")
+    y = 0
+    for fila, alto in zip(filas, altos):
+        for c, im in enumerate(fila):
+            lienzo.paste(im, (c * (ancho + pad), y))
+        y += alto + pad
+
+    buffer = io.BytesIO()
+    lienzo.save(buffer, "PNG")
+    return _codificar(buffer.getvalue(), destino, formato, max_ancho, max_alto, calidad)
+
+
+async def evidencia_pdf(ruta_pdf, destino_imagen=None, zoom=2.0, max_paginas=None, columnas=2, modo=None):
+    """
+    Evidencia a partir de un PDF ya guardado. Devuelve la ruta a usar como
+    `archivo`, o None si el PDF no sirve (el bot sigue con su plan B):
+
+    - modo "pdf" (EVIDENCIA_PDF): el mismo PDF; si pasa de max_paginas, una
+      copia recortada "<nombre>_evidencia.pdf" (el original queda intacto).
+    - modo "png": una imagen con las primeras max_paginas (grilla de
+      `columnas`) en `destino_imagen` (default: junto al PDF), en EVIDENCIA_FORMATO.
+    """
+    modo = (modo or EVIDENCIA_PDF).lower()
+    max_paginas = PDF_MAX_PAGINAS if max_paginas is None else max_paginas
+    if not (os.path.exists(ruta_pdf) and os.path.getsize(ruta_pdf) > 0):
+        return None
+    try:
+        if modo == "pdf":
+            destino = os.path.splitext(ruta_pdf)[0] + "_evidencia.pdf"
+            return await en_segundo_plano(_recortar_pdf, ruta_pdf, max_paginas, destino)
+        destino = destino_imagen or os.path.splitext(ruta_pdf)[0] + ".png"
+        return await en_segundo_plano(
+            _pdf_a_imagen, ruta_pdf, destino, zoom, max_paginas, columnas,
+            FORMATO, MAX_ANCHO, MAX_ALTO, CALIDAD,
+        )
+    except Exception as e:
+        print(f"[evidencia] No se pudo preparar la evidencia de {os.path.basename(ruta_pdf)}: {e}")
+        return None
@@ -0,0 +1,360 @@
+# core/utils/har_replay.py
+"""
+Grabación y reproducción (HAR) del tráfico de los bots.
+
+Para medir el rendimiento de los bots o probarlos contra regresiones había que
+golpear los sitios del Estado, y scripts/test_bots_runner_dynamic.py solo
+anota PASS/FAIL. Con este módulo:
+
+    - modo "grabar": cada BrowserContext del pool (core/utils/browser_pool.py)
+      guarda sus peticiones/respuestas (cuerpo incluido) y la latencia de
+      cada una en HAR_DIR/<bot>.har, junto con las respuestas de captcha
+      (campo "_captchas" del HAR).
+    - modo "reproducir": el contexto no sale a la red; context.route sirve
+      cada petición desde el HAR del bot (mismo método + URL, en orden; si la
+      URL cambia solo en el query string se usa la de la misma ruta),
+      esperando la latencia grabada × HAR_LATENCIA. Lo que no está en el HAR
+      se aborta. Los captchas devuelven la respuesta grabada sin llamar al
+      proveedor.
+
+El bot se identifica por `name` de su bot_config (bot_en_curso). En ambos
+modos todo `chromium.launch()` pasa por el pool (también los headful o con
+proxy), para que ningún contexto quede fuera de la grabación.
+
+Solo se graba/reproduce lo que pasa por context.route: las descargas con
+aiohttp/httpx/requests y las de context.request/page.request (APIRequestContext)
+van a la red real. `fuera_del_har(bot)` da el motivo para esos bots (cliente
+HTTP importado en el módulo del bot, o 'har': False en su bot_config);
+scripts/har_bench.py no los corre al reproducir y lo anota en el CSV.
+
+Los HAR se escriben al cerrarse cada contexto, en segundo plano: antes de leer
+los archivos hay que esperar `vaciar()` en el loop del worker.
+
+scripts/har_bench.py corre el set completo de get_bot_configs en cualquiera
+de los dos modos y deja los tiempos por bot en CSV.
+
+Variables de entorno:
+    HAR_MODO      "grabar" | "reproducir" (default vacío = apagado)
+    HAR_DIR       carpeta de los HAR (default BASE_DIR/har)
+    HAR_LATENCIA  factor sobre la latencia grabada al reproducir (default 1.0; 0 = sin espera)
+"""
+import os
+import sys
+import json
+import uuid
+import base64
+import asyncio
+import contextvars
+import functools
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+from core.utils.network_profile import bot_actual
+
+
+def _env_float(nombre, default):
+    try:
+        return float(os.environ.get(nombre, str(default)))
+    except Exception:
+        return default
+
+
+MODO = os.environ.get("HAR_MODO", "").strip().lower()
+DIRECTORIO = Path(os.environ.get("HAR_DIR") or Path(getattr(settings, "BASE_DIR", ".")) / "har")
+LATENCIA = _env_float("HAR_LATENCIA", 1.0)
+
+# Encabezados que no aplican a un cuerpo ya decodificado
+_SIN_REPETIR = {"content-encoding", "content-length", "transfer-encoding"}
+
+_grabaciones = {}   # bot → {"entradas": [...], "captchas": [...]}
+_cargados = {}      # bot → HAR leído (modo reproducir)
+_escrituras = set() # HAR pendientes de escribir (ver `vaciar`)
+_sesion = contextvars.ContextVar("har_sesion", default=None)
+
+
+def configurar(modo, directorio=None, latencia=None):
+    """Fija el modo en tiempo de ejecución (p.ej. desde scripts/har_bench.py)."""
+    global MODO, DIRECTORIO, LATENCIA
+    MODO = (modo or "").strip().lower()
+    if directorio:
+        DIRECTORIO = Path(directorio)
+    if latencia is not None:
+        LATENCIA = float(latencia)
+    _grabaciones.clear()
+    _cargados.clear()
+
+
+def activo():
+    return MODO in ("grabar", "reproducir")
+
+
+# Clientes HTTP que no pasan por el navegador
+CLIENTES_FUERA = ("aiohttp", "httpx", "requests")
+
+
+def fuera_del_har(bot):
+    """Motivo por el que parte del tráfico de `bot` no queda en el HAR, o None."""
+    if bot.get("har") is False:
+        return "context.request"
+    modulo = sys.modules.get(getattr(bot.get("func"), "__module__", ""), None)
+    usados = [c for c in CLIENTES_FUERA if modulo is not None and hasattr(modulo, c)]
+    return ",".join(usados) or None
+
+
+def _nombre_bot():
+    bot = bot_actual() or {}
+    return bot.get("name") or getattr(bot.get("func"), "__name__", None) or "sin_bot"
+
+
+def _archivo(nombre):
+    return DIRECTORIO / f"{nombre}.har"
+
+
+# ---------------------------------------------------------------------------
+# Grabación
+# ---------------------------------------------------------------------------
+def _escribir(nombre):
+    grabacion = _grabaciones[nombre]
+    har = {
+        "log": {
+            "version": "1.2",
+            "creator": {"name": "econfia-har", "version": "1"},
+            "entries": grabacion["entradas"],
+            "_captchas": grabacion["captchas"],
+        }
+    }
+    DIRECTORIO.mkdir(parents=True, exist_ok=True)
+    tmp = _archivo(nombre).with_suffix(f".{uuid.uuid4().hex}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(har, f)
+    os.replace(tmp, _archivo(nombre))
+
+
+def _grabacion(nombre):
+    # La primera vez en el proceso se reemplaza el HAR anterior del bot
+    return _grabaciones.setdefault(nombre, {"entradas": [], "captchas": []})
+
+
+async def _entrada(request):
+    response = await request.response()
+    if response is None:
+        return None
+    try:
+        cuerpo = await response.body()
+    except Exception:  # redirecciones y respuestas sin cuerpo
+        cuerpo = b""
+    encabezados = await response.headers_array()
+    timing = request.timing or {}
+    espera = max(0.0, timing.get("responseEnd", 0.0))
+    inicio = timing.get("startTime") or 0
+    entrada = {
+        "startedDateTime": datetime.fromtimestamp(inicio / 1000 if inicio else 0, timezone.utc).isoformat(),
+        "time": espera,
+        "request": {
+            "method": request.method,
+            "url": request.url,
+            "httpVersion": "HTTP/1.1",
+            "headers": [{"name": k, "value": v} for k, v in request.headers.items()],
+            "queryString": [],
+            "cookies": [],
+            "headersSize": -1,
+            "bodySize": len(request.post_data_buffer or b""),
+        },
+        "response": {
+            "status": response.status,
+            "statusText": response.status_text,
+            "httpVersion": "HTTP/1.1",
+            "headers": encabezados,
+            "cookies": [],
+            "content": {
+                "size": len(cuerpo),
+                "mimeType": response.headers.get("content-type", ""),
+                "text": base64.b64encode(cuerpo).decode("ascii"),
+                "encoding": "base64",
+            },
+            "redirectURL": response.headers.get("location", ""),
+            "headersSize": -1,
+            "bodySize": len(cuerpo),
+        },
+        "cache": {},
+        "timings": {"send": 0, "wait": espera, "receive": 0},
+    }
+    if request.post_data is not None:
+        entrada["request"]["postData"] = {
+            "mimeType": request.headers.get("content-type", ""),
+            "text": request.post_data,
+        }
+    return entrada
+
+
+def _grabar(context, nombre):
+    grabacion = _grabacion(nombre)
+    pendientes = set()
+
+    async def _guardar(request):
+        try:
+            entrada = await _entrada(request)
+            if entrada is not None:
+                grabacion["entradas"].append(entrada)
+        except Exception as e:
+            print(f"[har] bot={nombre} no se pudo grabar {request.url}: {e}")
+
+    def _terminada(request):
+        tarea = asyncio.ensure_future(_guardar(request))
+        pendientes.add(tarea)
+        tarea.add_done_callback(pendientes.discard)
+
+    async def _cerrar():
+        if pendientes:
+            await asyncio.gather(*pendientes, return_exceptions=True)
+        try:
+            await asyncio.to_thread(_escribir, nombre)
+            print(f"[har] bot={nombre} {len(grabacion['entradas'])} peticiones grabadas en {_archivo(nombre)}")
+        except Exception as e:
+            print(f"[har] bot={nombre} no se pudo escribir el HAR: {e}")
+
+    def _al_cerrar(_):
+        tarea = asyncio.ensure_future(_cerrar())
+        _escrituras.add(tarea)
+        tarea.add_done_callback(_escrituras.discard)
+
+    context.on("requestfinished", _terminada)
+    context.once("close", _al_cerrar)
+
+
+async def vaciar():
+    """Espera a que se escriban los HAR de los contextos ya cerrados."""
+    # Deja correr los eventos "close" que ya estén en cola
+    await asyncio.sleep(0)
+    while _escrituras:
+        await asyncio.gather(*list(_escrituras), return_exceptions=True)
+
+
+# ---------------------------------------------------------------------------
+# Reproducción
+# ---------------------------------------------------------------------------
+def _leer(nombre):
+    if nombre not in _cargados:
+        try:
+            with open(_archivo(nombre), "r", encoding="utf-8") as f:
+                _cargados[nombre] = json.load(f)["log"]
+        except Exception as e:
+            print(f"[har] bot={nombre} sin HAR para reproducir ({e})")
+            _cargados[nombre] = {"entries": [], "_captchas": []}
+    return _cargados[nombre]
+
+
+def _sin_query(url):
+    partes = urlsplit(url)
+    return f"{partes.scheme}://{partes.netloc}{partes.path}"
+
+
+class _Reproduccion:
+    """Colas de respuestas de un bot en ejecución (una por método + URL)."""
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        log = _leer(nombre)
+        self.exactas = {}
+        self.por_ruta = {}
+        for entrada in log.get("entries", []):
+            metodo, url = entrada["request"]["method"], entrada["request"]["url"]
+            self.exactas.setdefault((metodo, url), []).append(entrada)
+            self.por_ruta.setdefault((metodo, _sin_query(url)), []).append(entrada)
+        self.captchas = list(log.get("_captchas", []))
+        self.faltantes = 0
+
+    def siguiente(self, metodo, url):
+        cola = self.exactas.get((metodo, url)) or self.por_ruta.get((metodo, _sin_query(url)))
+        if not cola:
+            return None
+        # La última respuesta de cada URL se repite si el bot la pide más veces
+        return cola.pop(0) if len(cola) > 1 else cola[0]
+
+
+def _respuesta(entrada):
+    respuesta = entrada["response"]
+    contenido = respuesta.get("content", {})
+    texto = contenido.get("text") or ""
+    cuerpo = base64.b64decode(texto) if contenido.get("encoding") == "base64" else texto.encode("utf-8")
+    encabezados = {}
+    for h in respuesta.get("headers", []):
+        nombre = h["name"].lower()
+        if nombre in _SIN_REPETIR:
+            continue
+        # Playwright separa varios set-cookie por salto de línea
+        encabezados[nombre] = f"{encabezados[nombre]}\n{h['value']}" if nombre in encabezados else h["value"]
+    return respuesta["status"], encabezados, cuerpo
+
+
+def _reproduccion():
+    """Estado de reproducción del bot de la tarea actual (uno por ejecución del bot)."""
+    reproduccion = _sesion.get()
+    nombre = _nombre_bot()
+    if reproduccion is None or reproduccion.nombre != nombre:
+        reproduccion = _Reproduccion(nombre)
+        _sesion.set(reproduccion)
+    return reproduccion
+
+
+async def _reproducir(context):
+    reproduccion = _reproduccion()
+
+    async def _ruta(route, request):
+        entrada = reproduccion.siguiente(request.method, request.url)
+        try:
+            if entrada is None:
+                reproduccion.faltantes += 1
+                await route.abort("internetdisconnected")
+                return
+            if LATENCIA > 0:
+                await asyncio.sleep(entrada.get("time", 0) / 1000 * LATENCIA)
+            status, encabezados, cuerpo = _respuesta(entrada)
+            await route.fulfill(status=status, headers=encabezados, body=cuerpo)
+        except Exception:
+            # la página/contexto ya se cerró
+            pass
+
+    def _cerrado(_):
+        if reproduccion.faltantes:
+            print(f"[har] bot={reproduccion.nombre} {reproduccion.faltantes} peticiones sin respuesta grabada")
+
+    # Registrada después del perfil de red: Playwright la consulta primero
+    await context.route("**/*", _ruta)
+    context.once("close", _cerrado)
+
+
+async def instalar(context):
+    """Graba o reproduce el tráfico de `context` según HAR_MODO. No falla nunca."""
+    if not activo():
+        return context
+    try:
+        if MODO == "grabar":
+            _grabar(context, _nombre_bot())
+        else:
+            await _reproducir(context)
+    except Exception as e:
+        print(f"[har] No se pudo preparar el contexto ({MODO}): {e}")
+    return context
+
+
+def captcha_grabado(resolver):
+    """
+    Decorador para los resolvers async de core/resolver: al grabar anota la
+    respuesta en el HAR del bot; al reproducir la devuelve sin llamar al proveedor.
+    """
+    @functools.wraps(resolver)
+    async def _resolver(*args, **kwargs):
+        if MODO == "reproducir":
+            captchas = _reproduccion().captchas
+            if captchas:
+                return captchas.pop(0) if len(captchas) > 1 else captchas[0]
+        respuesta = await resolver(*args, **kwargs)
+        if MODO == "grabar":
+            _grabacion(_nombre_bot())["captchas"].append(respuesta)
+        return respuesta
+
+    return _resolver
@@ -0,0 +1,198 @@
+# core/utils/network_profile.py
+"""
+Perfiles de red por bot (bloqueo de recursos con context.route).
+
+Casi todos los bots navegan portales completos y esperan "networkidle", así
+que cada ejecución descargaba analítica, fuentes, video y scripts de anuncios
+que no aportan nada a la evidencia. Cada BrowserContext del pool
+(core/utils/browser_pool.py) pasa por `aplicar_perfil`:
+
+    - DOMINIOS_BLOQUEADOS: trackers, anuncios, widgets y video → siempre abortados.
+    - TIPOS_BLOQUEADOS ('media'): siempre abortados.
+
+Imágenes y fuentes se cargan siempre: la evidencia (page/locator/element
+screenshot, iframes, fondos CSS) debe salir completa, y una imagen abortada
+no se recupera de forma fiable antes de capturar.
+
+Perfil por bot, claves del bot_config:
+    'red': False                                   → sin bloqueo
+    'red': {"permitir": ["media"], "bloquear": ["font"], "dominios": ["cdn.x.gov.co"]}
+        permitir: tipos de recurso que no se bloquean
+        bloquear: tipos extra que se bloquean (solo bots sin evidencia visual
+                  ni captcha de imagen, p.ej. rama_vigencias)
+        dominios: dominios que nunca se bloquean
+
+Al cerrar cada contexto se registra en log, por fuente, lo bloqueado y una
+estimación de bytes y tiempo ahorrados (bytes por tipo de recurso /
+throughput observado en el mismo contexto).
+
+Variables de entorno:
+    RED_BLOQUEO   1/0 (default 1)
+"""
+import os
+import time
+import contextvars
+from urllib.parse import urlsplit
+
+
+RED_BLOQUEO = os.environ.get("RED_BLOQUEO", "1").strip().lower() not in ("0", "false", "no")
+
+DOMINIOS_BLOQUEADOS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "connect.facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "newrelic.com",
+    "nr-data.net",
+    "mixpanel.com",
+    "segment.io",
+    "addthis.com",
+    "sharethis.com",
+    "platform.twitter.com",
+    "snap.licdn.com",
+    "analytics.tiktok.com",
+    "youtube.com",
+    "ytimg.com",
+    "player.vimeo.com",
+    "userway.org",
+)
+
+TIPOS_BLOQUEADOS = ("media",)
+
+# Tamaño típico por tipo de recurso; solo para estimar el ahorro en el log
+BYTES_ESTIMADOS = {
+    "image": 40_000,
+    "font": 50_000,
+    "media": 500_000,
+    "script": 60_000,
+    "stylesheet": 20_000,
+}
+BYTES_POR_DEFECTO = 10_000
+
+# Bot en ejecución en la tarea asyncio actual (lo fija `bot_en_curso`)
+_bot_actual = contextvars.ContextVar("bot_actual", default=None)
+
+# Acumulado por fuente en este proceso (ver `resumen`)
+_totales = {}
+
+
+def bot_en_curso(bot):
+    """Marca `bot` como el bot de la tarea asyncio actual (lo usa aplicar_perfil)."""
+    _bot_actual.set(bot)
+
+
+def bot_actual():
+    """bot_config del bot de la tarea asyncio actual (None fuera de un bot)."""
+    return _bot_actual.get()
+
+
+def _dominio(url):
+    try:
+        return (urlsplit(url).hostname or "").lower()
+    except Exception:
+        return ""
+
+
+def _coincide(host, dominios):
+    return any(host == d or host.endswith("." + d) for d in dominios)
+
+
+def perfil_bot(bot):
+    """Perfil efectivo {"bloquear": set, "dominios": tuple} o None si el bot no se intercepta."""
+    if not RED_BLOQUEO or bot is None:
+        return None
+    red = bot.get("red", {})
+    if red is False:
+        return None
+    red = red or {}
+    permitir = set(red.get("permitir") or ())
+    bloquear = (set(TIPOS_BLOQUEADOS) | set(red.get("bloquear") or ())) - permitir
+    return {"bloquear": bloquear, "dominios": tuple(red.get("dominios") or ())}
+
+
+class _EstadoRed:
+    def __init__(self, nombre, perfil):
+        self.nombre = nombre
+        self.perfil = perfil
+        self.bloqueadas = {}    # tipo → cantidad
+        self.bytes_bloqueados = 0
+        self.bytes_cargados = 0
+        self.inicio = time.monotonic()
+
+    def decidir(self, request):
+        """Motivo de bloqueo o None si la petición pasa."""
+        host = _dominio(request.url)
+        if _coincide(host, self.perfil["dominios"]):
+            return None
+        tipo = request.resource_type
+        if _coincide(host, DOMINIOS_BLOQUEADOS):
+            return tipo
+        if tipo in self.perfil["bloquear"]:
+            return tipo
+        return None
+
+    def registrar(self, tipo):
+        self.bloqueadas[tipo] = self.bloqueadas.get(tipo, 0) + 1
+        self.bytes_bloqueados += BYTES_ESTIMADOS.get(tipo, BYTES_POR_DEFECTO)
+
+    def cerrar(self):
+        total = sum(self.bloqueadas.values())
+        duracion = max(time.monotonic() - self.inicio, 1e-3)
+        throughput = self.bytes_cargados / duracion if self.bytes_cargados else 0
+        segundos = self.bytes_bloqueados / throughput if throughput else 0.0
+
+        acumulado = _totales.setdefault(self.nombre, {"contextos": 0, "bloqueadas": 0, "bytes": 0, "segundos": 0.0})
+        acumulado["contextos"] += 1
+        acumulado["bloqueadas"] += total
+        acumulado["bytes"] += self.bytes_bloqueados
+        acumulado["segundos"] += segundos
+        if total:
+            print(
+                f"[red] fuente={self.nombre} bloqueadas={total} {self.bloqueadas} "
+                f"ahorro≈{self.bytes_bloqueados / 1e6:.2f} MB ≈{segundos:.1f}s"
+            )
+
+
+async def aplicar_perfil(context):
+    """Instala el bloqueo en `context` según el bot de la tarea actual. No falla nunca."""
+    bot = _bot_actual.get()
+    perfil = perfil_bot(bot)
+    if perfil is None:
+        return context
+
+    estado = _EstadoRed(bot.get("name") or getattr(bot.get("func"), "__name__", "?"), perfil)
+
+    async def _ruta(route, request):
+        tipo = estado.decidir(request)
+        try:
+            if tipo is None:
+                await route.continue_()
+            else:
+                estado.registrar(tipo)
+                await route.abort("blockedbyclient")
+        except Exception:
+            # la página/contexto ya se cerró
+            pass
+
+    def _respuesta(response):
+        try:
+            estado.bytes_cargados += int(response.headers.get("content-length") or 0)
+        except Exception:
+            pass
+
+    try:
+        await context.route("**/*", _ruta)
+        context.on("response", _respuesta)
+        context.once("close", lambda _: estado.cerrar())
+    except Exception as e:
+        print(f"[red] No se pudo instalar el perfil de red para {estado.nombre}: {e}")
+    return context
+
+
+def resumen():
+    """Ahorro acumulado por fuente en este proceso."""
+    return {nombre: dict(v) for nombre, v in _totales.items()}
@@ -0,0 +1,170 @@
+# core/utils/page_settle.py
+"""
+Espera "inteligente" a que una página se asiente.
+
+Los bots tienen cientos de pausas fijas (wait_for_timeout(1000),
+asyncio.sleep(2), 0.25 s entre clics) que se pagan completas aunque la página
+ya esté lista. `esperar_estable` termina en cuanto:
+
+    - el DOM lleva `quieto_ms` sin mutaciones (MutationObserver), y
+    - no hay peticiones de red en curso de la página,
+
+con un tope duro `maximo_ms`. Para migrar una pausa fija sin riesgo se pasa
+el valor anterior como `reemplaza_ms`: ese es el tope, así que en el peor caso
+se espera lo mismo que antes.
+
+    # antes: await page.wait_for_timeout(2000)
+    await esperar_estable(page, reemplaza_ms=2000)
+
+Las peticiones en curso se cuentan desde que se crea la página: el pool de
+navegadores (core/utils/browser_pool.py) llama `seguir_paginas(context)` en
+cada contexto, así el XHR que dispara el click()/type() justo antes de
+esperar también cuenta. Una página de un contexto fuera del pool se empieza a
+seguir en su primera espera.
+
+Cada llamada registra, por fuente (el bot en curso, ver network_profile), lo
+que realmente esperó y lo ahorrado frente a la pausa fija; `resumen()` devuelve
+el acumulado del proceso.
+
+Variables de entorno:
+    SETTLE_QUIETO_MS  ms sin mutaciones para considerar la página quieta (default 300)
+    SETTLE_MAXIMO_MS  tope por defecto cuando no se pasa reemplaza_ms (default 5000)
+    SETTLE_LOG        1 → imprime cada espera (default 0)
+"""
+import os
+import asyncio
+import weakref
+from time import perf_counter
+
+from core.utils.network_profile import bot_actual
+
+
+def _env_int(nombre, default):
+    try:
+        return int(os.environ.get(nombre, str(default)))
+    except Exception:
+        return default
+
+
+QUIETO_MS = _env_int("SETTLE_QUIETO_MS", 300)
+MAXIMO_MS = _env_int("SETTLE_MAXIMO_MS", 5000)
+SETTLE_LOG = os.environ.get("SETTLE_LOG", "0").strip().lower() in ("1", "true", "si", "yes")
+
+# Espera dentro de la página a que el DOM quede quieto. Devuelve true si lo
+# logró antes de `maximo` ms. El observer se instala una vez por documento.
+_JS_DOM_QUIETO = """
+({quieto, maximo}) => new Promise(resolve => {
+    if (!window.__settleUltimaMutacion) {
+        window.__settleUltimaMutacion = Date.now();
+        new MutationObserver(() => { window.__settleUltimaMutacion = Date.now(); })
+            .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    }
+    const inicio = Date.now();
+    const revisar = () => {
+        const ahora = Date.now();
+        if (document.readyState !== "loading" && ahora - window.__settleUltimaMutacion >= quieto) return resolve(true);
+        if (ahora - inicio >= maximo) return resolve(false);
+        setTimeout(revisar, Math.min(50, quieto));
+    };
+    revisar();
+})
+"""
+
+# Acumulado por fuente en este proceso (ver `resumen`)
+_totales = {}
+
+# Page → _RedPagina (sin atributos propios en los objetos de Playwright)
+_redes = weakref.WeakKeyDictionary()
+
+
+class _RedPagina:
+    """Peticiones en curso de una página (se instala una vez por Page)."""
+
+    def __init__(self, page):
+        self.en_vuelo = set()
+        page.on("request", self._inicio)
+        page.on("requestfinished", self._fin)
+        page.on("requestfailed", self._fin)
+
+    def _inicio(self, request):
+        self.en_vuelo.add(request)
+
+    def _fin(self, request):
+        self.en_vuelo.discard(request)
+
+
+def _red(page):
+    red = _redes.get(page)
+    if red is None:
+        red = _redes[page] = _RedPagina(page)
+    return red
+
+
+def seguir_paginas(context):
+    """Cuenta las peticiones de cada página de `context` desde que se crea. No falla nunca."""
+    try:
+        for page in context.pages:
+            _red(page)
+        context.on("page", _red)
+    except Exception as e:
+        print(f"[settle] No se pudo seguir las páginas del contexto: {e}")
+    return context
+
+
+def _registrar(esperado_ms, reemplaza_ms, estable):
+    bot = bot_actual() or {}
+    nombre = bot.get("name") or "?"
+    acumulado = _totales.setdefault(nombre, {"esperas": 0, "esperado_ms": 0, "ahorrado_ms": 0, "tope": 0})
+    acumulado["esperas"] += 1
+    acumulado["esperado_ms"] += esperado_ms
+    if reemplaza_ms:
+        acumulado["ahorrado_ms"] += max(0, reemplaza_ms - esperado_ms)
+    if not estable:
+        acumulado["tope"] += 1
+    if SETTLE_LOG:
+        print(
+            f"[settle] fuente={nombre} esperó {esperado_ms}ms"
+            + (f" (antes {reemplaza_ms}ms)" if reemplaza_ms else "")
+            + ("" if estable else " — alcanzó el tope")
+        )
+
+
+async def esperar_estable(page, reemplaza_ms=None, quieto_ms=None, maximo_ms=None):
+    """
+    Espera a que `page` quede sin mutaciones de DOM durante `quieto_ms` y sin
+    peticiones en curso, como máximo `maximo_ms` (default: `reemplaza_ms` o
+    SETTLE_MAXIMO_MS). Devuelve los ms esperados. Nunca lanza excepción.
+    """
+    quieto_ms = QUIETO_MS if quieto_ms is None else quieto_ms
+    maximo_ms = maximo_ms or reemplaza_ms or MAXIMO_MS
+    quieto_ms = min(quieto_ms, maximo_ms)
+
+    t0 = perf_counter()
+    limite = t0 + maximo_ms / 1000
+    estable = False
+    red = _red(page)
+    while True:
+        restante_ms = int((limite - perf_counter()) * 1000)
+        if restante_ms <= 0:
+            break
+        try:
+            dom_quieto = await page.evaluate(_JS_DOM_QUIETO, {"quieto": quieto_ms, "maximo": restante_ms})
+        except Exception:
+            # navegación en curso (contexto destruido) o página cerrada
+            if page.is_closed():
+                break
+            await asyncio.sleep(0.05)
+            continue
+        if dom_quieto and not red.en_vuelo:
+            estable = True
+            break
+        await asyncio.sleep(0.05)
+
+    esperado_ms = int((perf_counter() - t0) * 1000)
+    _registrar(esperado_ms, reemplaza_ms, estable)
+    return esperado_ms
+
+
+def resumen():
+    """Esperas acumuladas por fuente en este proceso (esperado vs. ahorrado)."""
+    return {nombre: dict(v) for nombre, v in _totales.items()}
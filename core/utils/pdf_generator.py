@@ -41,7 +41,7 @@ def generar_pdf_consolidado(resultados, consulta_id):
             continue
         ext = os.path.splitext(archivo)[1].lower()
         try:
-            if ext in [".png", ".jpg", ".jpeg"]:
+            if ext in [".png", ".jpg", ".jpeg", ".webp"]:
                 # Convertir la imagen directamente a PDF en memoria (más rápido que crear
                 # un documento ReportLab por cada imagen). Pillow permite guardar como PDF.
                 try:
@@ -79,3 +79,33 @@ def generar_pdf_consolidado(resultados, consulta_id):
     pdf_merger.close()
     final_buffer.seek(0)
     return final_buffer
+
+
+def anexar_evidencias_pdf(pdf_bytes, resultados):
+    """
+    Anexa al final de `pdf_bytes` (reporte de WeasyPrint) las evidencias que
+    los bots guardaron como PDF (archivo relativo a MEDIA_ROOT). Devuelve bytes.
+    """
+    rutas = []
+    for r in resultados:
+        archivo = (r.get("archivo") or "").replace("\\", "/")
+        if archivo.lower().endswith(".pdf"):
+            ruta = os.path.join(settings.MEDIA_ROOT, archivo)
+            if os.path.exists(ruta):
+                rutas.append(ruta)
+    if not rutas:
+        return pdf_bytes
+
+    pdf_merger = PdfMerger()
+    pdf_merger.append(io.BytesIO(pdf_bytes))
+    for ruta in rutas:
+        try:
+            pdf_merger.append(ruta)
+        except Exception:
+            # ignorar archivos problemáticos y continuar
+            continue
+
+    final_buffer = io.BytesIO()
+    pdf_merger.write(final_buffer)
+    pdf_merger.close()
+    return final_buffer.getvalue()
@@ -0,0 +1,178 @@
+# core/utils/rate_limiter.py
+"""
+Limitador por fuente compartido entre workers (Redis).
+
+Con consultas masivas, decenas de workers golpean a la vez el mismo sitio del
+Estado (procuraduría, policía, ADRES, rama judicial) y terminan bloqueados.
+Aquí se combinan, por Fuente.nombre, dos límites guardados en el mismo Redis
+que usa Celery como broker:
+
+    - max_en_vuelo: bots ejecutándose a la vez contra la fuente (en todo el cluster).
+      Cada permiso es un "lease" con vencimiento, así un worker caído no lo retiene.
+    - por_minuto:   token bucket (con ráfaga = `rafaga`, default = max_en_vuelo o 1).
+
+El scheduler (core/utils/bot_scheduler.py) pide permiso sin bloquear antes de
+arrancar cada bot; si la fuente está saturada, sigue con bots de otras fuentes
+y reintenta después.
+
+Configuración (en orden de prioridad):
+    1. 'limite' en el bot_config: {"max_en_vuelo": 2, "por_minuto": 20}
+    2. env FUENTE_LIMITES (JSON): {"procuraduria": {"max_en_vuelo": 3}}
+    3. LIMITES_POR_DEFECTO (abajo)
+
+Si Redis no responde, el limitador deja pasar (fail-open) y lo avisa en log.
+"""
+import os
+import json
+import uuid
+import weakref
+import asyncio
+
+from django.conf import settings
+
+try:
+    import redis.asyncio as aioredis
+except Exception:  # redis no instalado → limitador deshabilitado
+    aioredis = None
+
+
+LIMITES_POR_DEFECTO = {
+    "procuraduria": {"max_en_vuelo": 4, "por_minuto": 30},
+    "policia_nacional": {"max_en_vuelo": 4, "por_minuto": 30},
+    "adres": {"max_en_vuelo": 4, "por_minuto": 30},
+    "rama_judicial": {"max_en_vuelo": 3, "por_minuto": 20},
+}
+
+# Fuentes distintas que golpean el mismo sitio comparten cupo
+SITIO_POR_FUENTE = {
+    "procuraduria_certificado": "procuraduria",
+}
+
+PREFIJO = "econfia:limite"
+
+# Segundos entre reintentos cuando todas las fuentes pendientes están saturadas
+REINTENTO = 2.0
+
+# Lua atómico: limpia leases vencidos, revisa en-vuelo y bucket, y si hay cupo
+# consume un token y registra el lease. Devuelve 1 (permiso) o 0 (saturado).
+_LUA_ADQUIRIR = """
+local t = redis.call('TIME')
+local ahora = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local max = tonumber(ARGV[1])
+local tasa = tonumber(ARGV[2])
+local rafaga = tonumber(ARGV[3])
+local ttl = tonumber(ARGV[4])
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ahora)
+if max > 0 and redis.call('ZCARD', KEYS[1]) >= max then
+    return 0
+end
+
+if tasa > 0 then
+    local b = redis.call('HMGET', KEYS[2], 'tokens', 'ts')
+    local tokens = tonumber(b[1]) or rafaga
+    local ts = tonumber(b[2]) or ahora
+    tokens = math.min(rafaga, tokens + (ahora - ts) * tasa)
+    if tokens < 1 then
+        redis.call('HSET', KEYS[2], 'tokens', tokens, 'ts', ahora)
+        return 0
+    end
+    redis.call('HSET', KEYS[2], 'tokens', tokens - 1, 'ts', ahora)
+    redis.call('EXPIRE', KEYS[2], 3600)
+end
+
+if max > 0 then
+    redis.call('ZADD', KEYS[1], ahora + ttl, ARGV[5])
+    redis.call('EXPIRE', KEYS[1], math.ceil(ttl) + 60)
+end
+return 1
+"""
+
+
+def _limites_env():
+    try:
+        return json.loads(os.environ.get("FUENTE_LIMITES", "") or "{}")
+    except Exception:
+        print("[rate_limiter] FUENTE_LIMITES no es JSON válido; se ignora")
+        return {}
+
+
+def sitio_de(nombre):
+    return SITIO_POR_FUENTE.get(nombre, nombre)
+
+
+def limites_fuente(nombre, bot=None):
+    """Límites efectivos de la fuente, o None si no tiene ninguno."""
+    if bot and bot.get("limite"):
+        limite = dict(bot["limite"])
+    else:
+        sitio = sitio_de(nombre)
+        limite = _limites_env().get(sitio) or LIMITES_POR_DEFECTO.get(sitio)
+    if not limite:
+        return None
+    max_en_vuelo = int(limite.get("max_en_vuelo") or 0)
+    por_minuto = float(limite.get("por_minuto") or 0)
+    if max_en_vuelo <= 0 and por_minuto <= 0:
+        return None
+    return {
+        "max_en_vuelo": max_en_vuelo,
+        "por_minuto": por_minuto,
+        "rafaga": int(limite.get("rafaga") or max_en_vuelo or 1),
+    }
+
+
+class LimitadorFuentes:
+    """
+    Interfaz que usa el scheduler:
+        permiso = await limitador.adquirir(bot, ttl)  → None si la fuente está saturada
+        await limitador.liberar(permiso)
+    """
+
+    reintento = REINTENTO
+
+    def __init__(self, url=None):
+        self.url = url or getattr(settings, "CELERY_BROKER_URL", "redis://localhost:6379/0")
+        self._clientes = weakref.WeakKeyDictionary()  # un cliente por event loop
+        self._avisado = False
+
+    def _cliente(self):
+        loop = asyncio.get_running_loop()
+        cliente = self._clientes.get(loop)
+        if cliente is None:
+            cliente = aioredis.from_url(self.url, socket_timeout=2, socket_connect_timeout=2)
+            self._clientes[loop] = cliente
+        return cliente
+
+    async def adquirir(self, bot, ttl):
+        nombre = bot.get("name") or ""
+        limite = limites_fuente(nombre, bot)
+        if not limite:
+            return {"sitio": None}
+        if aioredis is None:
+            return {"sitio": None}
+
+        sitio = sitio_de(nombre)
+        miembro = uuid.uuid4().hex
+        try:
+            ok = await self._cliente().eval(
+                _LUA_ADQUIRIR, 2,
+                f"{PREFIJO}:{sitio}:en_vuelo", f"{PREFIJO}:{sitio}:bucket",
+                limite["max_en_vuelo"], limite["por_minuto"] / 60.0, limite["rafaga"], float(ttl), miembro,
+            )
+        except Exception as e:
+            if not self._avisado:
+                print(f"[rate_limiter] Redis no disponible ({e}); se ejecuta sin límite por fuente")
+                self._avisado = True
+            return {"sitio": None}
+        if not ok:
+            return None
+        return {"sitio": sitio, "miembro": miembro}
+
+    async def liberar(self, permiso):
+        if not permiso or not permiso.get("sitio"):
+            return
+        try:
+            await self._cliente().zrem(f"{PREFIJO}:{permiso['sitio']}:en_vuelo", permiso["miembro"])
+        except Exception as e:
+            # el lease vence solo; no es crítico
+            print(f"[rate_limiter] No se pudo liberar permiso de {permiso['sitio']}: {e}")
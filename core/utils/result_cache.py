@@ -0,0 +1,136 @@
+# core/utils/result_cache.py
+"""
+Cache de resultados entre consultas.
+
+La misma cédula suele consultarse otra vez a las pocas horas por otro usuario
+y cada consulta volvía a ejecutar todos los bots. Si una fuente ya tiene un
+resultado 'validado' reciente para el mismo candidato, se copia a la nueva
+consulta (fila Resultado + archivo de evidencia) y el bot se salta.
+
+Clave: (Fuente, candidato). El candidato se identifica por cédula; además,
+tipo_doc y nombre/apellido de `datos` deben coincidir con los del candidato
+guardado, si no se re-consulta.
+
+La vigencia se configura por categoría en TipoFuente.vigencia_cache_horas
+(0 = no reutilizar, que es el default). `datos['sin_cache'] = True` fuerza a
+ejecutar todos los bots.
+"""
+import os
+import shutil
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.models import Candidato, Fuente, Resultado
+
+
+def _norm(valor):
+    return " ".join(str(valor or "").split()).lower()
+
+
+def _identidad_coincide(candidato, datos):
+    for campo in ("tipo_doc", "nombre", "apellido"):
+        actual = _norm(datos.get(campo))
+        if actual and actual != _norm(getattr(candidato, campo, "")):
+            return False
+    return True
+
+
+def _copiar_evidencia(archivo, consulta_id):
+    """Copia la evidencia a la carpeta de la nueva consulta. None si no existe."""
+    if not archivo:
+        return ""
+    origen = os.path.join(settings.MEDIA_ROOT, archivo)
+    if not os.path.isfile(origen):
+        return None
+    relative_folder = os.path.join("resultados", str(consulta_id))
+    destino_rel = os.path.join(relative_folder, os.path.basename(archivo))
+    destino = os.path.join(settings.MEDIA_ROOT, destino_rel)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    if os.path.abspath(origen) != os.path.abspath(destino):
+        shutil.copy2(origen, destino)
+    return destino_rel
+
+
+def _resultados_vigentes(fuente, cedula, consulta_id):
+    """Resultados de la consulta más reciente con un 'validado' vigente para la fuente."""
+    desde = timezone.now() - timedelta(hours=fuente.tipo.vigencia_cache_horas)
+    ultimo = (
+        Resultado.objects
+        .filter(
+            fuente=fuente,
+            consulta__candidato_id=cedula,
+            estado="validado",
+            fecha__gte=desde,
+            # solo ejecuciones reales: una copia no renueva la vigencia
+            reutilizado_de__isnull=True,
+        )
+        .exclude(consulta_id=consulta_id)
+        .order_by("-fecha")
+        .first()
+    )
+    if not ultimo:
+        return []
+    return list(
+        Resultado.objects
+        .filter(consulta_id=ultimo.consulta_id, fuente=fuente)
+        .exclude(estado__in=("offline", "timeout"))
+        .order_by("id")
+    )
+
+
+def reutilizar_resultados(consulta_id, datos, bot_configs):
+    """
+    Copia a `consulta_id` los resultados vigentes de otras consultas y devuelve
+    los bot_configs que sí hay que ejecutar.
+    """
+    if not bot_configs or (datos or {}).get("sin_cache"):
+        return bot_configs
+
+    cedula = str((datos or {}).get("cedula") or "").strip()
+    candidato = Candidato.objects.filter(cedula=cedula).first()
+    if not candidato or not _identidad_coincide(candidato, datos):
+        return bot_configs
+
+    nombres = [b.get("name") for b in bot_configs]
+    fuentes = {
+        f.nombre: f
+        for f in Fuente.objects
+        .filter(nombre__in=nombres, tipo__vigencia_cache_horas__gt=0)
+        .select_related("tipo")
+    }
+    if not fuentes:
+        return bot_configs
+
+    pendientes = []
+    reutilizadas = []
+    for bot in bot_configs:
+        fuente = fuentes.get(bot.get("name"))
+        previos = _resultados_vigentes(fuente, cedula, consulta_id) if fuente else []
+        copias = []
+        for previo in previos:
+            archivo = _copiar_evidencia(previo.archivo, consulta_id)
+            if archivo is None:
+                # falta la evidencia en disco → no se puede reutilizar
+                copias = []
+                break
+            copias.append(Resultado(
+                consulta_id=consulta_id,
+                fuente=fuente,
+                score=previo.score,
+                estado=previo.estado,
+                mensaje=previo.mensaje,
+                archivo=archivo,
+                reutilizado_de=previo,
+            ))
+        if not copias:
+            pendientes.append(bot)
+            continue
+        for copia in copias:
+            copia.save()
+        reutilizadas.append(bot.get("name"))
+
+    if reutilizadas:
+        print(f"[cache] consulta={consulta_id}: {len(reutilizadas)} fuentes reutilizadas {reutilizadas}")
+    return pendientes
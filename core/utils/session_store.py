@@ -0,0 +1,281 @@
+# core/utils/session_store.py
+"""
+Sesiones (storage_state de Playwright) compartidas entre workers.
+
+Cada bot con sitio de cookies/consentimiento/términos manejaba lo suyo:
+eris guardaba un JSON en BASE_DIR/storage_state, interpol leía
+INTERPOL_STORAGE_STATE y embajada_alemania creaba un perfil en
+playwright_user_data/ por consulta; en la práctica cada ejecución volvía a
+pasar por login, consentimiento y términos.
+
+Aquí se guarda, por fuente, el último storage_state *validado* (el bot lo
+guarda solo cuando la consulta le salió bien) en el Redis del broker, visible
+para todos los workers:
+
+    estado = await obtener_sesion("eris")            # dict o None
+    context = await browser.new_context(storage_state=estado, ...)
+    ...                                               # consulta OK
+    await guardar_sesion("eris", context)
+
+Vencimiento: la cookie que vence primero, o SESION_TTL_HORAS si no hay
+cookies con fecha. Cuando quedan menos de SESION_MARGEN_MIN minutos y la
+fuente tiene un renovador (`registrar_renovador`), la sesión se renueva en
+segundo plano; un lock en Redis evita que dos workers lo hagan a la vez y se
+suelta al terminar. Además la task `renovar_sesiones` (core/task.py) revisa
+cada SESION_REVISION_MIN minutos todas las fuentes con renovador y renueva
+las que están por vencer o ya vencieron, aunque ninguna consulta las lea.
+
+Si Redis no responde se usa BASE_DIR/storage_state/<fuente>.json (escritura
+atómica), que sirve a los workers de la misma máquina.
+
+Variables de entorno:
+    SESION_TTL_HORAS   vigencia máxima de una sesión guardada (default 12)
+    SESION_MARGEN_MIN  minutos antes del vencimiento para renovar (default 30)
+    SESION_REVISION_MIN  cada cuántos minutos revisa `renovar_sesiones` (default 10)
+"""
+import os
+import json
+import time
+import uuid
+import weakref
+import asyncio
+from pathlib import Path
+
+from django.conf import settings
+
+try:
+    import redis.asyncio as aioredis
+except Exception:  # redis no instalado → solo archivos locales
+    aioredis = None
+
+
+def _env_int(nombre, default):
+    try:
+        return int(os.environ.get(nombre, str(default)))
+    except Exception:
+        return default
+
+
+SESION_TTL = _env_int("SESION_TTL_HORAS", 12) * 3600
+SESION_MARGEN = _env_int("SESION_MARGEN_MIN", 30) * 60
+SESION_REVISION = max(1, _env_int("SESION_REVISION_MIN", 10)) * 60
+
+PREFIJO = "econfia:sesion"
+DIRECTORIO = Path(getattr(settings, "BASE_DIR", ".")) / "storage_state"
+
+# Segundos que un worker retiene el lock de renovación de una fuente
+LOCK_RENOVACION = 180
+
+# fuente → async def renovador(context) -> bool (True si dejó la sesión lista)
+RENOVADORES = {}
+
+_clientes = weakref.WeakKeyDictionary()  # un cliente Redis por event loop
+_renovando = set()  # fuentes con renovación en curso en este proceso
+_avisado = False
+
+
+def registrar_renovador(fuente, renovador=None):
+    """
+    `renovador(context)` abre el sitio y pasa login/consentimiento/términos.
+    Sirve también como decorador: @registrar_renovador("eris").
+    """
+    if renovador is None:
+        return lambda fn: registrar_renovador(fuente, fn)
+    RENOVADORES[fuente] = renovador
+    return renovador
+
+
+def vencimiento(estado, ttl=None):
+    """Epoch en que deja de servir `estado`: la primera cookie que vence o ahora + ttl."""
+    limite = time.time() + (ttl or SESION_TTL)
+    fechas = [c.get("expires") for c in (estado or {}).get("cookies", []) if (c.get("expires") or -1) > 0]
+    return min([limite] + fechas)
+
+
+def _cliente():
+    if aioredis is None:
+        return None
+    loop = asyncio.get_running_loop()
+    cliente = _clientes.get(loop)
+    if cliente is None:
+        url = getattr(settings, "CELERY_BROKER_URL", "redis://localhost:6379/0")
+        cliente = aioredis.from_url(url, socket_timeout=2, socket_connect_timeout=2)
+        _clientes[loop] = cliente
+    return cliente
+
+
+def _avisar(e):
+    global _avisado
+    if not _avisado:
+        print(f"[sesiones] Redis no disponible ({e}); se usan archivos en {DIRECTORIO}")
+        _avisado = True
+
+
+def _archivo(fuente):
+    return DIRECTORIO / f"{fuente}.json"
+
+
+def _leer_archivo(fuente):
+    try:
+        with open(_archivo(fuente), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def _escribir_archivo(fuente, registro):
+    DIRECTORIO.mkdir(parents=True, exist_ok=True)
+    tmp = _archivo(fuente).with_suffix(f".{uuid.uuid4().hex}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(registro, f)
+    os.replace(tmp, _archivo(fuente))
+
+
+async def _leer(fuente):
+    cliente = _cliente()
+    if cliente is not None:
+        try:
+            crudo = await cliente.get(f"{PREFIJO}:{fuente}")
+            return json.loads(crudo) if crudo else None
+        except Exception as e:
+            _avisar(e)
+    return await asyncio.to_thread(_leer_archivo, fuente)
+
+
+async def _escribir(fuente, registro):
+    ttl = max(1, int(registro["vence"] - time.time()))
+    cliente = _cliente()
+    if cliente is not None:
+        try:
+            await cliente.set(f"{PREFIJO}:{fuente}", json.dumps(registro), ex=ttl)
+            return
+        except Exception as e:
+            _avisar(e)
+    await asyncio.to_thread(_escribir_archivo, fuente, registro)
+
+
+async def obtener_sesion(fuente):
+    """storage_state vigente de la fuente (para new_context(storage_state=...)) o None."""
+    registro = await _leer(fuente)
+    if not registro or registro.get("vence", 0) <= time.time():
+        return None
+    if registro["vence"] - time.time() < SESION_MARGEN and fuente in RENOVADORES:
+        renovar_en_segundo_plano(fuente)
+    return registro["estado"]
+
+
+async def guardar_sesion(fuente, context, ttl=None):
+    """Guarda el storage_state de `context` como sesión validada de la fuente."""
+    try:
+        estado = await context.storage_state()
+        await _escribir(fuente, {"estado": estado, "guardada": time.time(), "vence": vencimiento(estado, ttl)})
+    except Exception as e:
+        print(f"[sesiones] No se pudo guardar la sesión de {fuente}: {e}")
+
+
+async def invalidar_sesion(fuente):
+    """Descarta la sesión guardada (p.ej. el sitio volvió a pedir login)."""
+    cliente = _cliente()
+    if cliente is not None:
+        try:
+            await cliente.delete(f"{PREFIJO}:{fuente}")
+        except Exception as e:
+            _avisar(e)
+    try:
+        _archivo(fuente).unlink()
+    except Exception:
+        pass
+
+
+async def _tomar_lock(fuente):
+    cliente = _cliente()
+    if cliente is None:
+        return True
+    try:
+        return bool(await cliente.set(f"{PREFIJO}:{fuente}:renovando", "1", nx=True, ex=LOCK_RENOVACION))
+    except Exception as e:
+        _avisar(e)
+        return True
+
+
+async def _soltar_lock(fuente):
+    cliente = _cliente()
+    if cliente is None:
+        return
+    try:
+        await cliente.delete(f"{PREFIJO}:{fuente}:renovando")
+    except Exception as e:
+        _avisar(e)
+
+
+async def renovar_sesion(fuente):
+    """Abre un contexto con la sesión actual, corre el renovador y guarda el resultado."""
+    renovador = RENOVADORES.get(fuente)
+    if renovador is None or not await _tomar_lock(fuente):
+        return False
+    from core.utils.browser_pool import async_playwright
+
+    try:
+        registro = await _leer(fuente)
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            kwargs = {"storage_state": registro["estado"]} if registro else {}
+            context = await browser.new_context(**kwargs)
+            try:
+                if not await renovador(context):
+                    print(f"[sesiones] El renovador de {fuente} no dejó la sesión lista")
+                    return False
+                await guardar_sesion(fuente, context)
+                print(f"[sesiones] Sesión de {fuente} renovada")
+                return True
+            finally:
+                await browser.close()
+    finally:
+        await _soltar_lock(fuente)
+
+
+async def tomar_turno_revision():
+    """
+    True si a este worker le toca la revisión periódica: solo una cadena de
+    `renovar_sesiones` sobrevive aunque cada worker arranque la suya.
+    """
+    cliente = _cliente()
+    if cliente is None:
+        return True
+    try:
+        return bool(await cliente.set(f"{PREFIJO}:revision", "1", nx=True, ex=max(1, SESION_REVISION - 5)))
+    except Exception as e:
+        _avisar(e)
+        return True
+
+
+async def renovar_pendientes():
+    """Renueva las fuentes con renovador cuya sesión falta, venció o vence dentro de SESION_MARGEN."""
+    renovadas = []
+    for fuente in list(RENOVADORES):
+        registro = await _leer(fuente)
+        if registro and registro.get("vence", 0) - time.time() >= SESION_MARGEN:
+            continue
+        try:
+            if await renovar_sesion(fuente):
+                renovadas.append(fuente)
+        except Exception as e:
+            print(f"[sesiones] Error renovando la sesión de {fuente}: {e}")
+    return renovadas
+
+
+def renovar_en_segundo_plano(fuente):
+    """Lanza `renovar_sesion` sin esperar (una a la vez por fuente y proceso)."""
+    if fuente in _renovando:
+        return
+
+    async def _renovar():
+        try:
+            await renovar_sesion(fuente)
+        except Exception as e:
+            print(f"[sesiones] Error renovando la sesión de {fuente}: {e}")
+        finally:
+            _renovando.discard(fuente)
+
+    _renovando.add(fuente)
+    asyncio.ensure_future(_renovar())
@@ -0,0 +1,220 @@
+# core/utils/stealth.py
+"""
+Perfil "sigiloso" para correr en headless los bots que forzaban Chrome visible.
+
+Varios bots (registraduría, ADRES/procuraduría bio, supersociedades, corte
+constitucional, cgfm, sideap, garantías mobiliarias, y los reintentos
+"headful" de medicaldevices, mofa, moci y homeaffairs) lanzaban
+headless=False, channel="chrome" o slow_mo porque el sitio detectaba el
+headless. Así no podían usar el pool (core/utils/browser_pool.py), que solo
+sirve Chromium headless, y slow_mo sumaba segundos por acción.
+
+Con el perfil, cada contexto del pool sale con:
+    - User-Agent de Chrome de escritorio (Windows) sin "HeadlessChrome",
+      con la versión mayor del Chromium real;
+    - client hints coherentes (sec-ch-ua*, navigator.userAgentData);
+    - Accept-Language, locale y zona horaria de Colombia;
+    - un init script que corrige lo que delata al headless: navigator.webdriver,
+      plugins, languages, window.chrome, permisos, WebGL, outerWidth/Height.
+Lo que el bot pase explícitamente en new_context (user_agent, locale,
+viewport, timezone_id, ...) se respeta.
+
+Selección por bot, clave 'sigilo' en el bot_config (como 'red'):
+    'sigilo': True    → perfil completo
+    'sigilo': False   → nunca (aunque SIGILO_TODOS=1)
+
+Variables de entorno:
+    SIGILO_TODOS   1 → aplica el perfil a todos los bots del pool (default 0)
+    SIGILO_UA      User-Agent fijo (default: Chrome/<versión del Chromium> en Windows)
+"""
+import os
+import re
+import json
+
+from core.utils.network_profile import bot_actual
+
+
+SIGILO_TODOS = os.environ.get("SIGILO_TODOS", "0").strip().lower() in ("1", "true", "si", "yes")
+SIGILO_UA = os.environ.get("SIGILO_UA", "").strip()
+
+UA_PLANTILLA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/{mayor}.0.0.0 Safari/537.36"
+)
+LOCALE = "es-CO"
+ZONA_HORARIA = "America/Bogota"
+VIEWPORT = {"width": 1366, "height": 900}
+ACCEPT_LANGUAGE = "es-CO,es;q=0.9,en;q=0.8"
+
+# Corre antes que cualquier script de la página, en cada frame
+_JS_SIGILO = r"""
+(() => {
+    const cfg = __CFG__;
+    const nativos = new WeakSet();
+    const definir = (obj, prop, getter) => {
+        try {
+            nativos.add(getter);
+            Object.defineProperty(obj, prop, {get: getter, configurable: true});
+        } catch (e) {}
+    };
+
+    definir(Navigator.prototype, "webdriver", () => false);
+    definir(Navigator.prototype, "languages", () => cfg.idiomas.slice());
+    definir(Navigator.prototype, "language", () => cfg.idiomas[0]);
+    definir(Navigator.prototype, "platform", () => "Win32");
+    definir(Navigator.prototype, "hardwareConcurrency", () => 8);
+    definir(Navigator.prototype, "deviceMemory", () => 8);
+
+    // Plugins de un Chrome de escritorio (headless no trae ninguno)
+    if (!navigator.plugins || navigator.plugins.length === 0) {
+        const nombres = ["PDF Viewer", "Chrome PDF Viewer", "Chromium PDF Viewer",
+                         "Microsoft Edge PDF Viewer", "WebKit built-in PDF"];
+        const mime = {type: "application/pdf", suffixes: "pdf", description: "Portable Document Format"};
+        const plugins = nombres.map(n => ({name: n, filename: "internal-pdf-viewer",
+                                           description: "Portable Document Format", length: 1, 0: mime}));
+        plugins.item = i => plugins[i] || null;
+        plugins.namedItem = n => plugins.find(p => p.name === n) || null;
+        plugins.refresh = () => {};
+        const mimes = [mime];
+        mimes.item = i => mimes[i] || null;
+        mimes.namedItem = t => mimes.find(m => m.type === t) || null;
+        definir(Navigator.prototype, "plugins", () => plugins);
+        definir(Navigator.prototype, "mimeTypes", () => mimes);
+        definir(Navigator.prototype, "pdfViewerEnabled", () => true);
+    }
+
+    // Client hints en JS, coherentes con los headers sec-ch-ua
+    if (navigator.userAgentData) {
+        const marcas = cfg.marcas;
+        const datos = {
+            brands: marcas, mobile: false, platform: "Windows",
+            getHighEntropyValues: async (pistas) => ({
+                brands: marcas, mobile: false, platform: "Windows",
+                platformVersion: "10.0.0", architecture: "x86", bitness: "64", model: "",
+                uaFullVersion: cfg.version, fullVersionList: marcas.map(m => ({brand: m.brand, version: cfg.version})),
+            }),
+            toJSON: () => ({brands: marcas, mobile: false, platform: "Windows"}),
+        };
+        definir(Navigator.prototype, "userAgentData", () => datos);
+    }
+
+    if (!window.chrome) {
+        window.chrome = {};
+    }
+    if (!window.chrome.runtime) {
+        window.chrome.runtime = {};
+    }
+    if (!window.chrome.app) {
+        window.chrome.app = {isInstalled: false, InstallState: {}, RunningState: {}};
+    }
+    if (!window.chrome.csi) {
+        window.chrome.csi = () => ({onloadT: Date.now(), startE: Date.now(), pageT: performance.now(), tran: 15});
+    }
+    if (!window.chrome.loadTimes) {
+        window.chrome.loadTimes = () => ({requestTime: Date.now() / 1000, navigationType: "Other", wasFetchedViaSpdy: true});
+    }
+
+    // Headless responde "denied" a notifications aunque Notification.permission sea "default"
+    if (navigator.permissions && navigator.permissions.query) {
+        const consultar = navigator.permissions.query.bind(navigator.permissions);
+        const query = (p) => (p && p.name === "notifications")
+            ? Promise.resolve({state: Notification.permission, onchange: null})
+            : consultar(p);
+        nativos.add(query);
+        navigator.permissions.query = query;
+    }
+
+    // WebGL con el renderer de una GPU común en vez de SwiftShader
+    for (const proto of [window.WebGLRenderingContext, window.WebGL2RenderingContext]) {
+        if (!proto) continue;
+        const original = proto.prototype.getParameter;
+        const getParameter = function (p) {
+            if (p === 37445) return "Google Inc. (Intel)";
+            if (p === 37446) return "ANGLE (Intel, Intel(R) UHD Graphics 620 Direct3D11 vs_5_0 ps_5_0, D3D11)";
+            return original.call(this, p);
+        };
+        nativos.add(getParameter);
+        proto.prototype.getParameter = getParameter;
+    }
+
+    // headless reporta outer* = 0
+    if (!window.outerWidth) definir(window, "outerWidth", () => window.innerWidth);
+    if (!window.outerHeight) definir(window, "outerHeight", () => window.innerHeight + 85);
+
+    // Las funciones parcheadas se ven nativas
+    const toString = Function.prototype.toString;
+    const parcheado = function () {
+        if (nativos.has(this)) return `function ${this.name || ""}() { [native code] }`;
+        return toString.call(this);
+    };
+    Object.defineProperty(parcheado, "name", {value: "toString"});
+    nativos.add(parcheado);
+    Function.prototype.toString = parcheado;
+})();
+"""
+
+
+def usa_sigilo(bot):
+    """True si el bot de la tarea actual debe salir con el perfil sigiloso."""
+    if bot is None:
+        return SIGILO_TODOS
+    sigilo = bot.get("sigilo")
+    if sigilo is None:
+        return SIGILO_TODOS
+    return bool(sigilo)
+
+
+def _mayor(version):
+    m = re.match(r"(\d+)", version or "")
+    return m.group(1) if m else "124"
+
+
+def _marcas(mayor):
+    return [
+        {"brand": "Chromium", "version": mayor},
+        {"brand": "Google Chrome", "version": mayor},
+        {"brand": "Not-A.Brand", "version": "99"},
+    ]
+
+
+def opciones_contexto(kwargs, version):
+    """
+    kwargs de new_context con el perfil sigiloso (sin pisar lo que el bot
+    pasó) y el init script a instalar. `version`: Browser.version del Chromium.
+    """
+    opciones = dict(kwargs)
+    ua = opciones.get("user_agent") or SIGILO_UA or UA_PLANTILLA.format(mayor=_mayor(version))
+    ua = ua.replace("HeadlessChrome", "Chrome")
+    opciones["user_agent"] = ua
+    opciones.setdefault("locale", LOCALE)
+    opciones.setdefault("timezone_id", ZONA_HORARIA)
+    if "viewport" not in opciones and not opciones.get("no_viewport"):
+        opciones["viewport"] = dict(VIEWPORT)
+
+    m = re.search(r"Chrome/(\d+)", ua)
+    mayor = m.group(1) if m else _mayor(version)
+    marcas = _marcas(mayor)
+    encabezados = {
+        "Accept-Language": ACCEPT_LANGUAGE,
+        "sec-ch-ua": ", ".join(f'"{b["brand"]}";v="{b["version"]}"' for b in marcas),
+        "sec-ch-ua-mobile": "?0",
+        "sec-ch-ua-platform": '"Windows"',
+    }
+    encabezados.update(opciones.get("extra_http_headers") or {})
+    opciones["extra_http_headers"] = encabezados
+
+    idioma = opciones["locale"]
+    idiomas = [idioma, idioma.split("-")[0]] + (["en"] if not idioma.startswith("en") else [])
+    cfg = {"idiomas": idiomas, "marcas": marcas, "version": f"{mayor}.0.0.0"}
+    script = _JS_SIGILO.replace("__CFG__", json.dumps(cfg))
+    return opciones, script
+
+
+def preparar_contexto(kwargs, version):
+    """
+    (kwargs, script) para el bot de la tarea actual: con perfil si usa_sigilo,
+    sin cambios (script None) si no.
+    """
+    if not usa_sigilo(bot_actual()):
+        return kwargs, None
+    return opciones_contexto(kwargs, version)
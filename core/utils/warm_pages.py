@@ -0,0 +1,228 @@
+# core/utils/warm_pages.py
+"""
+Páginas "calientes": contextos del pool ya parados en el formulario listo.
+
+En procuraduría (iframe webcert/Certificado.aspx), policía (términos y
+condiciones), ADRES (iframe BDUA) y RNMC buena parte de cada ejecución se va
+en cargar la página, el iframe y sus scripts antes de poder llenar el
+formulario. Con esta cache el worker mantiene, por fuente, unos pocos
+contextos del pool (core/utils/browser_pool.py) con el formulario ya cargado;
+el bot toma uno, lo re-valida y arranca directo en el llenado.
+
+Cada fuente registra en su módulo cómo llegar al formulario y cómo saber que
+sigue listo:
+
+    registrar_pagina_caliente(
+        nombre_sitio,
+        preparar=_preparar,   # async (context) -> page en el formulario, o None
+        listo=_listo,         # async (page) -> bool
+    )
+
+y en el bot:
+
+    context, page = await pagina_caliente(browser, nombre_sitio)
+    if page is None:          # no había página lista (o la fuente no está habilitada)
+        page = await context.new_page()
+        await page.goto(URL)  # flujo normal
+
+La página entregada es del bot: se cierra con su navegador/contexto (nunca se
+reutiliza) y la cache de esa fuente se repone en segundo plano. Las tasks de bots llaman
+`calentar(fuentes)` al arrancar cada consulta, así la primera ejecución de
+cada fuente ya encuentra páginas listas. Una página que supera
+PAGINAS_CALIENTES_MAX_SEG se cierra (aunque nadie la pida, para no retener
+un contexto del pool) y una que no pasa `listo` al tomarla se descarta.
+
+Variables de entorno:
+    PAGINAS_CALIENTES          fuentes habilitadas y cantidad por worker, p.ej.
+                               "procuraduria:2,policia_nacional,adres,rnmc" (default vacío = apagado)
+    PAGINAS_CALIENTES_MAX_SEG  vida máxima de una página caliente (default 600; las
+                               sesiones ASP.NET vencen a los 20 min)
+"""
+import os
+import time
+import asyncio
+
+from core.utils.network_profile import bot_en_curso
+
+
+def _env_int(nombre, default):
+    try:
+        return int(os.environ.get(nombre, str(default)))
+    except Exception:
+        return default
+
+
+def _leer_fuentes(valor):
+    """ "a:2,b" → {"a": 2, "b": 1} """
+    fuentes = {}
+    for parte in (valor or "").split(","):
+        nombre, _, cantidad = parte.strip().partition(":")
+        if not nombre:
+            continue
+        try:
+            fuentes[nombre] = max(1, int(cantidad or 1))
+        except ValueError:
+            fuentes[nombre] = 1
+    return fuentes
+
+
+FUENTES = _leer_fuentes(os.environ.get("PAGINAS_CALIENTES", ""))
+MAX_SEG = _env_int("PAGINAS_CALIENTES_MAX_SEG", 600)
+
+# Segundos para re-validar una página al tomarla
+VALIDACION_SEG = 5
+# Espera tras un `preparar` fallido antes de reintentar la misma fuente
+REINTENTO_SEG = 60
+
+# fuente → {"preparar", "listo", "contexto"}
+REGISTRO = {}
+
+_listas = {}        # fuente → [(context, page, creada)]
+_preparando = {}    # fuente → cantidad en preparación
+_fallo_en = {}      # fuente → monotonic del último preparar fallido
+_totales = {}       # fuente → {"aciertos", "fallos", "descartadas", "incompatibles"}
+
+
+def registrar_pagina_caliente(fuente, preparar, listo, contexto=None):
+    """
+    `preparar(context)` abre una página en `context` y la deja en el
+    formulario (None si no pudo); `listo(page)` confirma que sigue lista.
+    `contexto`: kwargs de new_context que el bot usaría.
+    """
+    REGISTRO[fuente] = {"preparar": preparar, "listo": listo, "contexto": dict(contexto or {})}
+
+
+def _pool():
+    from core.utils.browser_pool import current_pool
+    return current_pool()
+
+
+def _contar(fuente, clave):
+    acumulado = _totales.setdefault(fuente, {"aciertos": 0, "fallos": 0, "descartadas": 0, "incompatibles": 0})
+    acumulado[clave] += 1
+
+
+async def _cerrar(context):
+    try:
+        await context.close()
+    except Exception:
+        pass
+
+
+async def _preparar_una(pool, fuente):
+    spec = REGISTRO[fuente]
+    # Perfil de red/sigilo del bot dueño de la fuente
+    bot_en_curso({"name": fuente, "func": spec["preparar"]})
+    context = await pool.new_context(**spec["contexto"])
+    try:
+        page = await spec["preparar"](context)
+    except Exception as e:
+        print(f"[calientes] fuente={fuente} no se pudo preparar: {e}")
+        page = None
+    if page is None or page.is_closed():
+        await _cerrar(context)
+        _fallo_en[fuente] = time.monotonic()
+        return
+    entrada = (context, page, time.monotonic())
+    _listas.setdefault(fuente, []).append(entrada)
+    # Vencida, no debe seguir ocupando un contexto del pool (bloquea el reciclaje)
+    asyncio.get_running_loop().call_later(
+        MAX_SEG, lambda: asyncio.ensure_future(_vencer(fuente, entrada))
+    )
+
+
+async def _vencer(fuente, entrada):
+    """Cierra `entrada` si sigue en la cache al cumplir PAGINAS_CALIENTES_MAX_SEG."""
+    listas = _listas.get(fuente, [])
+    if entrada in listas:
+        listas.remove(entrada)
+        _contar(fuente, "descartadas")
+        await _cerrar(entrada[0])
+
+
+async def _reponer(fuente):
+    pool = _pool()
+    if pool is None:
+        return
+    try:
+        while len(_listas.get(fuente, [])) + _preparando.get(fuente, 0) < FUENTES.get(fuente, 0):
+            if time.monotonic() - _fallo_en.get(fuente, -REINTENTO_SEG) < REINTENTO_SEG:
+                return
+            _preparando[fuente] = _preparando.get(fuente, 0) + 1
+            try:
+                await _preparar_una(pool, fuente)
+            finally:
+                _preparando[fuente] -= 1
+    except Exception as e:
+        print(f"[calientes] fuente={fuente} error reponiendo: {e}")
+
+
+def calentar(fuentes=None):
+    """
+    Programa la reposición de las fuentes habilitadas (en el loop del worker);
+    con `fuentes`, solo de esas (p.ej. las de la consulta que arranca).
+    """
+    for fuente in FUENTES:
+        if fuentes is not None and fuente not in fuentes:
+            continue
+        if fuente in REGISTRO and not _preparando.get(fuente):
+            asyncio.ensure_future(_reponer(fuente))
+
+
+async def _tomar(fuente):
+    """Primera página caliente de la fuente que siga lista, o None."""
+    spec = REGISTRO[fuente]
+    listas = _listas.get(fuente, [])
+    while listas:
+        context, page, creada = listas.pop(0)
+        vigente = not page.is_closed() and time.monotonic() - creada < MAX_SEG
+        if vigente:
+            try:
+                vigente = await asyncio.wait_for(spec["listo"](page), VALIDACION_SEG)
+            except Exception:
+                vigente = False
+        if vigente:
+            return context, page
+        _contar(fuente, "descartadas")
+        await _cerrar(context)
+    return None
+
+
+async def pagina_caliente(browser, fuente, **kwargs):
+    """
+    (context, page) con el formulario ya listo si hay una página caliente de
+    `fuente`; si no, (browser.new_context(**kwargs), None) para el flujo normal.
+    Solo se entrega una página caliente si `kwargs` son los mismos `contexto`
+    con los que se registró la fuente (descargas, viewport, UA, ...).
+    """
+    adoptar = getattr(browser, "adoptar", None)
+    if fuente in FUENTES and fuente in REGISTRO and adoptar is not None and _pool() is not None:
+        if kwargs != REGISTRO[fuente]["contexto"]:
+            _contar(fuente, "incompatibles")
+            return await browser.new_context(**kwargs), None
+        tomada = await _tomar(fuente)
+        calentar({fuente})
+        if tomada is not None:
+            _contar(fuente, "aciertos")
+            context, page = tomada
+            adoptar(context)
+            return context, page
+        _contar(fuente, "fallos")
+    return await browser.new_context(**kwargs), None
+
+
+async def vaciar():
+    """Cierra todas las páginas calientes (p.ej. con el worker sobre el techo de memoria)."""
+    for fuente, listas in list(_listas.items()):
+        while listas:
+            context, _, _ = listas.pop()
+            _contar(fuente, "descartadas")
+            await _cerrar(context)
+
+
+def resumen():
+    """Páginas listas y aciertos/fallos por fuente en este proceso."""
+    return {
+        fuente: {"listas": len(_listas.get(fuente, [])), **_totales.get(fuente, {})}
+        for fuente in FUENTES
+    }
@@ -1,6 +1,6 @@
 from django.http import JsonResponse
 from .models import Consulta, Resultado, Candidato, Fuente
-from .task import procesar_consulta, reintentar_bot, procesar_consulta_por_nombres, procesar_consulta_contratista_por_nombres
+from .task import procesar_consulta, reintentar_bot, procesar_consulta_por_nombres, procesar_consulta_contratista_por_nombres, programar_lote, preparar_consulta
 from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
 from rest_framework import status
@@ -13,8 +13,10 @@ from django.shortcuts import get_object_or_404
 from django.db.models import Avg, Count
 from django.db.models import Max
 from django.http import FileResponse
-from .models import Resultado, Consulta, Perfil
-from .utils.pdf_generator import generar_pdf_consolidado
+from .models import Resultado, Consulta, Perfil, LoteConsulta
+from .utils.pdf_generator import generar_pdf_consolidado, anexar_evidencias_pdf
+from .resolver.telemetria import resumen as resumen_captchas
+from .utils.browser_governor import estados as estados_navegadores
 from django.views.decorators.http import require_GET
 from decimal import Decimal
 from rest_framework.decorators import api_view, permission_classes
@@ -23,7 +25,6 @@ from .serializers import ConsultaDetalleSerializer, ResultadoSerializer
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from asgiref.sync import async_to_sync
-from .consultar_registraduria import consultar_registraduria
 from django.template.loader import render_to_string
 from django.http import HttpResponse
 from weasyprint import HTML
@@ -40,10 +41,6 @@ from PIL import Image
 import traceback
 from .models import Resultado
 from django.core.files.base import ContentFile
-from .adres_bio import consultar_adres_bio
-from .procuraduria_bio import procuraduria_bio
-from .policia_bio import consultar_policia_nacional
-import asyncio
 from django.utils.encoding import force_bytes, force_str
 from django.core.mail import send_mail
 from django.contrib.auth.models import User
@@ -271,7 +268,6 @@ def activate(request, uidb64, token):
 
 
 from asgiref.sync import async_to_sync
-import asyncio
 
 
 def _extraer_token_strict(request):
@@ -516,112 +512,16 @@ def api_consultar(request):
                 datos["fecha_expedicion"] = fecha_expedicion_req
             estado = "en_proceso"
         else:
-            # Construcción inicial de datos para crear al candidato
-            async def obtener_datos():
-                print("🚀 Lanzando tareas para bots base (solo para construir Candidato)...")
-                coros = []
-
-                async def with_timeout(coro, t=50):
-                    try:
-                        return await asyncio.wait_for(coro, timeout=t)
-                    except asyncio.TimeoutError:
-                        print("Timeout individual de bot")
-                        return {}
-
-                if tipo_doc_req:
-                    coros += [
-                        with_timeout(procuraduria_bio(cedula, tipo_doc_req), 50),
-                        with_timeout(consultar_policia_nacional(cedula, tipo_doc_req), 50),
-                        with_timeout(consultar_adres_bio(cedula, tipo_doc_req), 50),
-                    ]
-                coros.append(with_timeout(consultar_registraduria(cedula), 50))
-
-                tareas = [asyncio.create_task(c) for c in coros]
-                GLOBAL_TIMEOUT = 60
-                loop = asyncio.get_running_loop()
-                inicio = loop.time()
-
-                try:
-                    while tareas:
-                        restante = GLOBAL_TIMEOUT - (loop.time() - inicio)
-                        if restante <= 0:
-                            for t in tareas:
-                                t.cancel()
-                            await asyncio.gather(*tareas, return_exceptions=True)
-                            return {}
-
-                        espera = min(10, max(1, int(restante)))
-                        done, pending = await asyncio.wait(
-                            tareas,
-                            return_when=asyncio.FIRST_COMPLETED,
-                            timeout=espera
-                        )
-
-                        if not done:
-                            tareas = list(pending)
-                            continue
-
-                        for t in done:
-                            try:
-                                r = t.result()
-                            except Exception:
-                                continue
-
-                            datos = r.get("datos", r) if isinstance(r, dict) else {}
-                            nombre = (datos.get("nombre") or "").strip()
-                            apellido = (datos.get("apellido") or "").strip()
-                            if nombre and apellido:
-                                for p in pending:
-                                    p.cancel()
-                                if pending:
-                                    await asyncio.gather(*pending, return_exceptions=True)
-                                return datos
-
-                        tareas = list(pending)
-                    return {}
-                finally:
-                    restos = [t for t in tareas if not t.done()]
-                    for t in restos:
-                        t.cancel()
-                    if restos:
-                        await asyncio.gather(*restos, return_exceptions=True)
-
-            datos = async_to_sync(obtener_datos)() or {}
-
-            if fecha_expedicion_req:
-                datos["fecha_expedicion"] = fecha_expedicion_req
-            if "sexo" in datos and isinstance(datos["sexo"], str):
-                datos["sexo"] = (datos["sexo"].strip().splitlines() or [""])[0]
-
-            if not datos:
-                # Crear candidato mínimo, incluyendo email/profesion si llegaron (NUEVO)
-                candidato = Candidato.objects.create(
-                    cedula=cedula,
-                    tipo_doc=tipo_doc_req or "",
-                    email=email_param or None,            # (NUEVO)
-                    profesion=profesion_param or "",      # (NUEVO)
-                )
-                estado = "no_encontrado"
-            else:
-                # Sobrescribir email/profesion si llegaron por parámetro (tienen prioridad) (NUEVO)
-                if email_param:
-                    datos["email"] = email_param
-                if profesion_param:
-                    datos["profesion"] = profesion_param
-
-                candidato = Candidato.objects.create(
-                    cedula=cedula,
-                    tipo_doc=datos.get("tipo_doc", tipo_doc_req or ""),
-                    nombre=datos.get("nombre", ""),
-                    apellido=datos.get("apellido", ""),
-                    fecha_nacimiento=datos.get("fecha_nacimiento") or None,
-                    fecha_expedicion=datos.get("fecha_expedicion") or None,
-                    tipo_persona=datos.get("tipo_persona", ""),
-                    sexo=datos.get("sexo", ""),
-                    email=datos.get("email") or None,           # (NUEVO)
-                    profesion=datos.get("profesion", ""),       # (NUEVO)
-                )
-                estado = "en_proceso"
+            # Cédula nueva: candidato mínimo; los datos los completa la task
+            # `preparar_consulta` (bots base) fuera del request
+            candidato = Candidato.objects.create(
+                cedula=cedula,
+                tipo_doc=tipo_doc_req or "",
+                email=email_param or None,
+                profesion=profesion_param or "",
+            )
+            datos = None
+            estado = "en_proceso"
 
         consulta = Consulta.objects.create(
             candidato=candidato,
@@ -633,15 +533,13 @@ def api_consultar(request):
         perfil.consultas_disponibles = max(0, (perfil.consultas_disponibles or 0) - 1)
         perfil.save(update_fields=["consultas_disponibles"])
 
-        # Enriquecer payload para las tasks
-        if isinstance(datos, dict):
+        # Enriquecer payload para las tasks (cédula nueva: lo hace preparar_consulta)
+        if datos is not None:
             datos = {
                 **datos,
                 "duenio_token": duenio_token,
                 "plan": perfil.plan,  # informativo, ya no decide la ruta
             }
-        else:
-            datos = {"duenio_token": duenio_token, "plan": perfil.plan}
 
         # Backfill de BOTS_CONTRATISTA_FIJOS si no existe
         try:
@@ -671,16 +569,41 @@ def api_consultar(request):
             )
             if not lista_final:
                 lista_final = BOTS_CONTRATISTA_FIJOS
+            tarea = "contratista"
+        else:
+            if lista_nombres and not isinstance(lista_nombres, list):
+                return Response({"error": "lista_nombres debe ser una lista"}, status=status.HTTP_400_BAD_REQUEST)
+            lista_final = lista_nombres or None
+            tarea = "nombres" if lista_final else "general"
+
+        if datos is None:
+            # Cédula nueva → etapa de arranque en Celery; se responde de inmediato
+            extra = {
+                "tipo_doc": tipo_doc_req,
+                "fecha_expedicion": fecha_expedicion_req,
+                "email": email_param,
+                "profesion": profesion_param,
+                "duenio_token": duenio_token,
+                "plan": perfil.plan,
+            }
+            preparar_consulta.delay(consulta.id, extra, tarea, lista_final)
+            return Response({
+                "consulta_id": consulta.id,
+                "estado": consulta.estado,
+                "token_de": duenio_token,
+                "plan": perfil.plan,
+                "contratista": es_contratista,
+            }, status=status.HTTP_202_ACCEPTED)
+
+        if tarea == "contratista":
             procesar_consulta_contratista_por_nombres.delay(consulta.id, datos, lista_final)
+        elif tarea == "nombres":
+            procesar_consulta_por_nombres.delay(consulta.id, datos, lista_final)
         else:
-            if lista_nombres:
-                if not isinstance(lista_nombres, list):
-                    return Response({"error": "lista_nombres debe ser una lista"}, status=status.HTTP_400_BAD_REQUEST)
-                procesar_consulta_por_nombres.delay(consulta.id, datos, lista_nombres)
-            else:
-                procesar_consulta.delay(consulta.id, datos)
+            procesar_consulta.delay(consulta.id, datos)
 
         return Response({
+            "consulta_id": consulta.id,
             "token_de": duenio_token,
             "plan": perfil.plan,            # solo informativo
             "contratista": es_contratista,  # ahora según email+profesion
@@ -694,6 +617,162 @@ def api_consultar(request):
             "plan": getattr(perfil, "plan", None),
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+import csv
+from django.db import transaction
+from django.utils import timezone
+
+LOTE_MAX_CEDULAS = 5000
+
+
+def _leer_cedulas_lote(request):
+    """
+    Cédulas del lote desde:
+      - archivo CSV (multipart, campo 'archivo'): columna 'cedula' (+ opcional 'tipo_doc'),
+        o la primera columna si no hay encabezado;
+      - JSON 'cedulas': lista de strings o de objetos {"cedula", "tipo_doc"}.
+    Devuelve lista de (cedula, tipo_doc) sin duplicados, en el orden recibido.
+    """
+    filas = []
+    archivo = request.FILES.get("archivo")
+    if archivo:
+        texto = archivo.read().decode("utf-8-sig", errors="ignore")
+        lineas = [l for l in texto.splitlines() if l.strip()]
+        if lineas and "cedula" in lineas[0].lower():
+            for row in csv.DictReader(lineas):
+                row = {k.strip().lower(): v for k, v in row.items() if k}
+                filas.append((row.get("cedula"), row.get("tipo_doc")))
+        else:
+            for row in csv.reader(lineas):
+                if row:
+                    filas.append((row[0], row[1] if len(row) > 1 else None))
+    else:
+        for item in request.data.get("cedulas") or []:
+            if isinstance(item, dict):
+                filas.append((item.get("cedula"), item.get("tipo_doc")))
+            else:
+                filas.append((item, None))
+
+    vistas = set()
+    cedulas = []
+    for cedula, tipo_doc in filas:
+        cedula = str(cedula or "").strip()
+        if not cedula or cedula in vistas:
+            continue
+        vistas.add(cedula)
+        cedulas.append((cedula, (str(tipo_doc).strip().upper() if tipo_doc else None)))
+    return cedulas
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def api_consultar_masivo(request):
+    """
+    Crea un LoteConsulta con una Consulta por cédula (deduplicadas) y descuenta
+    todas las consultas_disponibles en una sola transacción. La ejecución la
+    hace `programar_lote` por bloques; el avance se consulta en
+    api/consultar-masivo/<lote_id>/.
+    """
+    token_key, err = _extraer_token_strict(request)
+    if err:
+        return Response({"error": err}, status=status.HTTP_401_UNAUTHORIZED)
+
+    token_user, err = _resolver_usuario_por_token(token_key)
+    if err:
+        return Response({"error": err}, status=status.HTTP_401_UNAUTHORIZED)
+
+    if request.user.id != token_user.id:
+        return Response(
+            {"error": "Token no corresponde al usuario autenticado"},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+
+    if not request.FILES.get("archivo") and not isinstance(request.data.get("cedulas") or [], list):
+        return Response({"error": "cedulas debe ser una lista"}, status=status.HTTP_400_BAD_REQUEST)
+
+    cedulas = _leer_cedulas_lote(request)
+    if not cedulas:
+        return Response({"error": "No se recibieron cédulas (campo 'archivo' CSV o 'cedulas')"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(cedulas) > LOTE_MAX_CEDULAS:
+        return Response({"error": f"Máximo {LOTE_MAX_CEDULAS} cédulas por lote"}, status=status.HTTP_400_BAD_REQUEST)
+
+    lista_nombres = request.data.get("lista_nombres")
+    if lista_nombres is not None and not isinstance(lista_nombres, list):
+        return Response({"error": "lista_nombres debe ser una lista"}, status=status.HTTP_400_BAD_REQUEST)
+
+    with transaction.atomic():
+        perfil = Perfil.objects.select_for_update().filter(usuario=token_user).first()
+        if not perfil:
+            return Response({"error": "Perfil de usuario no encontrado"}, status=status.HTTP_400_BAD_REQUEST)
+        if (perfil.consultas_disponibles or 0) < len(cedulas):
+            return Response({
+                "error": "No tienes consultas disponibles suficientes para el lote",
+                "requeridas": len(cedulas),
+                "disponibles": perfil.consultas_disponibles,
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        lote = LoteConsulta.objects.create(
+            usuario=token_user,
+            total=len(cedulas),
+            lista_nombres=lista_nombres or None,
+        )
+
+        existentes = set(
+            Candidato.objects.filter(cedula__in=[c for c, _ in cedulas]).values_list("cedula", flat=True)
+        )
+        Candidato.objects.bulk_create([
+            Candidato(cedula=cedula, tipo_doc=tipo_doc or "CC")
+            for cedula, tipo_doc in cedulas if cedula not in existentes
+        ])
+        Consulta.objects.bulk_create([
+            Consulta(candidato_id=cedula, estado="pendiente", usuario=token_user, lote=lote)
+            for cedula, _ in cedulas
+        ])
+
+        perfil.consultas_disponibles = perfil.consultas_disponibles - len(cedulas)
+        perfil.save(update_fields=["consultas_disponibles"])
+
+        transaction.on_commit(lambda: programar_lote.delay(lote.id))
+
+    return Response({
+        "lote_id": lote.id,
+        "total": lote.total,
+        "consultas_disponibles": perfil.consultas_disponibles,
+        "progreso": f"/api/consultar-masivo/{lote.id}/",
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def progreso_lote(request, lote_id):
+    """Avance agregado del lote: conteo por estado, throughput y ETA."""
+    lote = get_object_or_404(LoteConsulta, id=lote_id, usuario=request.user)
+    por_estado = {
+        item["estado"]: item["total"]
+        for item in Consulta.objects.filter(lote=lote).values("estado").annotate(total=Count("id"))
+    }
+    terminadas = sum(por_estado.get(e, 0) for e in ("completado", "no_encontrado", "vencido"))
+    minutos = max((timezone.now() - lote.fecha).total_seconds() / 60, 1e-6)
+    por_minuto = terminadas / minutos
+    restantes = lote.total - terminadas
+
+    data = {
+        "lote_id": lote.id,
+        "estado": lote.estado,
+        "fecha": lote.fecha.isoformat(),
+        "total": lote.total,
+        "terminadas": terminadas,
+        "porcentaje": round(100.0 * terminadas / lote.total, 2) if lote.total else 100.0,
+        "por_estado": por_estado,
+        "consultas_por_minuto": round(por_minuto, 2),
+        "eta_segundos": int(restantes / por_minuto * 60) if por_minuto > 0 and restantes > 0 else None,
+    }
+    if request.query_params.get("detalle"):
+        data["consultas"] = list(
+            Consulta.objects.filter(lote=lote).order_by("id").values("id", "candidato_id", "estado")
+        )
+    return Response(data)
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def listar_consultas(request):
@@ -731,6 +810,23 @@ def listar_fuentes(request, consulta_id=None):
     serializer = FuenteSerializer(fuentes, many=True)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def telemetria_captcha(request):
+    """Intentos, aceptación y latencia (p50/p90/p95) de captchas por fuente y solver; ?fuente= filtra."""
+    data = async_to_sync(resumen_captchas)(fuente=request.GET.get("fuente") or None)
+    return Response(data, status=status.HTTP_200_OK)
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def estado_navegadores(request):
+    """Navegadores, memoria y contadores publicados por cada proceso worker con bots en curso (browser_governor)."""
+    try:
+        data = async_to_sync(estados_navegadores)()
+    except Exception as e:
+        return Response({"error": f"No se pudo leer el estado: {e}"}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return Response(data, status=status.HTTP_200_OK)
+
 @require_GET
 def resumen(request):
     total = Consulta.objects.count()
@@ -1384,6 +1480,7 @@ def reporte(request, consulta_id):
 
     html_string = render_to_string("reportes/consolidado.html", context)
     pdf = HTML(string=html_string, base_url=request.build_absolute_uri()).write_pdf()
+    pdf = anexar_evidencias_pdf(pdf, resultados)
 
     response = HttpResponse(pdf, content_type="application/pdf")
     response["Content-Disposition"] = "inline; filename=reporte.pdf"
@@ -1409,6 +1506,7 @@ def descargar_reporte(request, consulta_id):
     # Renderizar HTML y generar PDF
     html_string = render_to_string("reportes/consolidado.html", context)
     pdf = HTML(string=html_string, base_url=request.build_absolute_uri()).write_pdf()
+    pdf = anexar_evidencias_pdf(pdf, resultados)
 
     # Crear respuesta con descarga
     response = HttpResponse(pdf, content_type="application/pdf")
@@ -1598,6 +1696,9 @@ def generar_consolidado_interno(consulta_id, tipo_id, usuario, request=None):
         string=html_string,
         base_url=(request.build_absolute_uri() if request else None)
     ).write_pdf()
+    if tipo_id != 3:
+        # Evidencias guardadas como PDF (no van como <img> en el template)
+        pdf_bytes = anexar_evidencias_pdf(pdf_bytes, resultados)
 
     filename = safe_filename(candidato.nombre, candidato.apellido, candidato.cedula, ext="pdf")
 
@@ -1660,6 +1761,7 @@ def resumen_consulta_interno(consulta_id):
     offline = estados_dict.get("offline", 0)
     validados = estados_dict.get("validado", 0)
     pendientes = estados_dict.get("pendiente", 0)
+    timeouts = estados_dict.get("timeout", 0)
 
     # --- Promedio global del score 1–5 (opcional, lo dejo) ---
     promedio_score = (
@@ -1714,6 +1816,7 @@ def resumen_consulta_interno(consulta_id):
         "offline": offline,
         "validados": validados,
         "pendientes": pendientes,
+        "timeouts": timeouts,
         "promedio_score": promedio_score,
         "usuario": consulta.usuario.username,
         "fecha": consulta.fecha,
@@ -1837,6 +1940,7 @@ def generar_consolidado_api(request, consulta_id, tipo_id):
     # --- Render PDF ---
     html_string = render_to_string("reportes/consolidado_pdf.html", context)
     pdf_bytes = HTML(string=html_string, base_url=request.build_absolute_uri()).write_pdf()
+    pdf_bytes = anexar_evidencias_pdf(pdf_bytes, resultados)
 
     # --- Respuesta HTTP (mostrar inline en navegador) ---
     response = HttpResponse(pdf_bytes, content_type="application/pdf")
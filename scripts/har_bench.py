@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+"""
+Banco de pruebas offline de los bots con tráfico grabado (core/utils/har_replay.py).
+
+    # 1) Grabar una vez contra los sitios reales (HAR + captchas por bot)
+    python scripts/har_bench.py --modo grabar --cedula 1234567890 --nombre ... --apellido ...
+
+    # 2) Reproducir sin red, a la concurrencia que se quiera, tantas veces como haga falta
+    python scripts/har_bench.py --modo reproducir --concurrencia 30 --output har_30.csv
+
+Corre el set de get_bot_configs (o --bots a,b,c) con el scheduler de las
+tasks (core/utils/bot_scheduler.py) dentro del pool de navegadores, y deja
+por bot los segundos, el estado y el score del Resultado. Al grabar, los
+datos del candidato quedan en <har-dir>/datos.json y la reproducción los
+reutiliza, para que las URLs coincidan con las grabadas.
+
+Los bots con tráfico fuera del navegador (aiohttp/httpx/requests,
+context.request; ver har_replay.fuera_del_har) no se corren al reproducir,
+porque saldrían a la red: quedan en el CSV con estado "fuera_del_har" y el
+motivo en la columna "fuera_del_har" (al grabar la columna avisa que su HAR
+está incompleto).
+"""
+import os
+import sys
+import csv
+import json
+import argparse
+from datetime import datetime
+from time import perf_counter
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+import django
+django.setup()
+
+from django.contrib.auth import get_user_model
+from core.models import Candidato, Consulta, Resultado
+from core.bots.bot_configs import get_bot_configs
+from core.bots.bot_configs_contratista import get_bot_configs_contratista
+from core.task import run_bot
+from core.utils import har_replay
+from core.utils.browser_pool import run_sync, POOL_ENABLED
+from core.utils.bot_scheduler import ejecutar_bots
+
+
+def _datos(args):
+    ruta = os.path.join(args.har_dir, "datos.json")
+    if args.modo == "reproducir" and os.path.exists(ruta):
+        with open(ruta, "r", encoding="utf-8") as f:
+            return json.load(f)
+    datos = {
+        "cedula": args.cedula,
+        "tipo_doc": args.tipo_doc,
+        "nombre": args.nombre,
+        "apellido": args.apellido,
+        "fecha_nacimiento": args.fecha_nacimiento,
+        "fecha_expedicion": args.fecha_expedicion,
+        "tipo_persona": args.tipo_persona,
+        "sexo": args.sexo,
+        "email": args.email,
+        "error": "",
+    }
+    if args.modo == "grabar":
+        os.makedirs(args.har_dir, exist_ok=True)
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(datos, f, ensure_ascii=False, indent=2)
+    return datos
+
+
+def _consulta(datos):
+    candidato, _ = Candidato.objects.get_or_create(
+        cedula=datos["cedula"],
+        defaults={
+            "tipo_doc": datos["tipo_doc"],
+            "nombre": datos["nombre"],
+            "apellido": datos["apellido"],
+            "email": datos["email"],
+            "tipo_persona": datos["tipo_persona"],
+        },
+    )
+    User = get_user_model()
+    usuario = User.objects.first() or User.objects.create_user(username="harbench", password="harbench")
+    return Consulta.objects.create(candidato=candidato, usuario=usuario, estado="en_prueba")
+
+
+def main(args):
+    if not POOL_ENABLED:
+        sys.exit("[har_bench] La grabación/reproducción va en el pool de navegadores: quita BROWSER_POOL_ENABLED=0")
+    har_replay.configurar(args.modo, args.har_dir, args.latencia)
+    datos = _datos(args)
+    consulta = _consulta(datos)
+    datos["rutas"] = {}
+
+    bot_configs = get_bot_configs(consulta.id, datos)
+    if args.contratista:
+        bot_configs += get_bot_configs_contratista(consulta.id, datos)
+    if args.bots:
+        elegidos = {b.strip() for b in args.bots.split(",") if b.strip()}
+        bot_configs = [b for b in bot_configs if b.get("name") in elegidos]
+
+    fuera = {b.get("name") or b["func"].__name__: har_replay.fuera_del_har(b) for b in bot_configs}
+    fuera = {nombre: motivo for nombre, motivo in fuera.items() if motivo}
+    ejecutables = bot_configs
+    if args.modo == "reproducir":
+        ejecutables = [b for b in bot_configs if (b.get("name") or b["func"].__name__) not in fuera]
+
+    print(f"[har_bench] modo={args.modo} bots={len(ejecutables)} concurrencia={args.concurrencia} dir={args.har_dir}")
+    if fuera:
+        print(f"[har_bench] {len(fuera)} bots con tráfico fuera del HAR: {', '.join(sorted(fuera))}")
+
+    tiempos = {}
+
+    async def medir(bot):
+        t0 = perf_counter()
+        try:
+            await run_bot(bot)
+        finally:
+            tiempos[bot.get("name") or bot["func"].__name__] = perf_counter() - t0
+
+    async def correr():
+        return await ejecutar_bots(ejecutables, medir, capacidad=args.concurrencia, etiqueta=f"har={args.modo}")
+
+    reporte = run_sync(correr)
+    # Los HAR se escriben al cerrar cada contexto; que estén todos en disco antes del CSV
+    run_sync(har_replay.vaciar)
+
+    resultados = {}
+    for r in Resultado.objects.filter(consulta=consulta).select_related("fuente"):
+        if r.fuente:
+            resultados[r.fuente.nombre] = r
+
+    with open(args.output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["bot", "segundos", "estado", "score", "fuera_del_har", "modo", "concurrencia", "timestamp"])
+        writer.writeheader()
+        ahora = datetime.utcnow().isoformat()
+        for bot in bot_configs:
+            nombre = bot.get("name") or bot["func"].__name__
+            r = resultados.get(nombre)
+            segundos = tiempos.get(nombre)
+            if r:
+                estado = r.estado
+            elif args.modo == "reproducir" and nombre in fuera:
+                estado = "fuera_del_har"
+            else:
+                estado = "timeout" if nombre in reporte["timeouts"] else "sin_resultado"
+            writer.writerow({
+                "bot": nombre,
+                "segundos": round(segundos, 2) if segundos is not None else "",
+                "estado": estado,
+                "score": r.score if r else "",
+                "fuera_del_har": fuera.get(nombre, ""),
+                "modo": args.modo,
+                "concurrencia": args.concurrencia,
+                "timestamp": ahora,
+            })
+
+    if not args.conservar:
+        consulta.delete()
+
+    print(f"\n📊 {args.modo}: makespan={reporte['makespan']}s p50={reporte['p50']}s "
+          f"p95={reporte['p95']}s timeouts={len(reporte['timeouts'])}")
+    print(f"  📄 Reporte: {args.output}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Grabación/reproducción HAR de los bots para medir tiempos sin red')
+    parser.add_argument('--modo', choices=['grabar', 'reproducir'], required=True)
+    parser.add_argument('--har-dir', default=str(har_replay.DIRECTORIO), help='Carpeta de los HAR')
+    parser.add_argument('--latencia', type=float, default=1.0, help='Factor sobre la latencia grabada (reproducir)')
+    parser.add_argument('--concurrencia', type=int, default=10, help='Bots a la vez (slots del scheduler)')
+    parser.add_argument('--bots', default='', help='Nombres de bot separados por coma (default: todos)')
+    parser.add_argument('--contratista', action='store_true', help='Incluir get_bot_configs_contratista')
+    parser.add_argument('--conservar', action='store_true', help='No borrar la Consulta de prueba')
+    parser.add_argument('--output', default='har_bench.csv', help='Archivo de salida CSV')
+    parser.add_argument('--cedula', default='9999999999')
+    parser.add_argument('--tipo-doc', dest='tipo_doc', default='CC')
+    parser.add_argument('--nombre', default='TestBot')
+    parser.add_argument('--apellido', default='Runner')
+    parser.add_argument('--fecha-nacimiento', dest='fecha_nacimiento', default='')
+    parser.add_argument('--fecha-expedicion', dest='fecha_expedicion', default='')
+    parser.add_argument('--tipo-persona', dest='tipo_persona', default='natural')
+    parser.add_argument('--sexo', default='')
+    parser.add_argument('--email', default='test@example.com')
+    args = parser.parse_args()
+
+    main(args)